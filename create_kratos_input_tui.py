@@ -15,6 +15,7 @@ Kratos input based on Salome meshes.
 
 # python imports
 import os
+import math
 import logging
 
 # specify logging path
@@ -25,10 +26,12 @@ os.environ["KRATOS_SALOME_PLUGIN_LOG_FILE_PATH"] = os.getcwd()
 # plugin imports
 from kratos_salome_plugin.model_part import ModelPart
 from kratos_salome_plugin import geometries_io
+from kratos_salome_plugin import profiling
 from kratos_salome_plugin.mesh_interface import MeshInterface
 from kratos_salome_plugin.write_mdpa import WriteMdpa
 from kratos_salome_plugin import salome_utilities
 from kratos_salome_plugin import salome_mesh_utilities
+from kratos_salome_plugin.utilities import IsNumpyAvailable
 
 logger = logging.getLogger(__name__) # done after importing the plugin, which initializes the logging
 
@@ -59,17 +62,242 @@ class SalomeMesh(geometries_io.Mesh):
         super().__init__(mesh_interface, mesh_description, model_part_name)
 
 
-def CreateModelPart(meshes):
-    """Creates a ModelPart given meshes as input"""
+class ConversionPlan:
+    """Preflight of the conversion of meshes to a ModelPart and mdpa-file
+    It is based on "GeometriesIO.Plan", which only uses the counters of the meshes (no Nodes or geometrical entities are retrieved), hence it is cheap.
+    Based on the expected numbers of entities it estimates the size of the mdpa-file and the peak memory,
+    and selects the strategies for retrieving the meshes and for writing the mdpa-file.
+    Note that the numbers are upper bounds, entities that are shared by several meshes are counted multiple times.
+    """
+
+    # approximate sizes used for the estimations, in bytes
+    # measured with "development/measure_conversion_memory.py" (Python 3.11) and rounded up
+    # memory of the python-ModelPart (see "model_part.py")
+    _MEMORY_PER_NODE = 400
+    _MEMORY_PER_ENTITY = 430
+    _MEMORY_PER_ENTITY_NODE = 24
+    _MEMORY_PER_SUB_MODEL_PART_ENTRY = 110
+    # memory of the data retrieved from the MeshInterface
+    _MEMORY_PER_NODE_DICTS = 240
+    _MEMORY_PER_ENTITY_DICTS = 160
+    _MEMORY_PER_ENTITY_NODE_DICTS = 44
+    # the arrays are not measured, their sizes follow from the dtypes: Id (int64) and coordinates (3 float64), Id (int64), Node-Id (int64)
+    _MEMORY_PER_NODE_ARRAYS = 32
+    _MEMORY_PER_ENTITY_ARRAYS = 8
+    _MEMORY_PER_ENTITY_NODE_ARRAYS = 8
+    _MEMORY_PER_ID = 40 # the Ids of a mesh are retrieved at once also when retrieving in chunks, as list of python ints that is converted to an array
+    # one Node or entity in a chunk: the arrays of the chunk plus the python objects that are created from them while adding
+    # the chunk to the ModelPart (which are about as large as the data retrieved as dicts), rounded up
+    _MEMORY_PER_CHUNK_ENTRY = 256
+    # mdpa-file, see "write_mdpa.py"
+    _BYTES_PER_COORDINATE = 17 # precision is 10 digits after the comma
+
+    # thresholds for selecting the strategies
+    # below this number of Nodes and entities in a mesh the memory saved by the arrays is not relevant
+    _MIN_NUM_ENTITIES_FOR_ARRAYS = 100000
+    # the threads only overlap the waiting for the Salome server, which processes the requests one after the other, hence more threads don't help
+    _MAX_NUM_THREADS = 4
+    _MIN_FILE_SIZE_FOR_LARGE_BUFFER = 10*1024**2
+    _LARGE_WRITE_BUFFER_SIZE = 1024**2
+    # every chunk costs one request to the Salome server and the conversion to arrays,
+    # smaller chunks than this make the conversion notably slower
+    _MIN_CHUNK_SIZE = 10000
+    # larger chunks are not faster, but need more memory (about 250 MB for this size, see "_MEMORY_PER_CHUNK_ENTRY")
+    _MAX_CHUNK_SIZE = 1000000
+
+    def __init__(self, meshes, memory_budget=4*1024**3, allow_multiple_main_meshes=False):
+        """Keyword arguments:
+        meshes -- List of meshes (see "geometries_io.Mesh") that are to be converted
+        memory_budget -- memory in bytes that is available for the conversion. Strategies that use more memory are only selected if they fit in this budget
+        allow_multiple_main_meshes -- see "GeometriesIO.AddMeshes"
+        """
+        self.num_meshes = len(meshes)
+        self.memory_budget = memory_budget
+
+        with salome_mesh_utilities.MeshInfoCache(): # the number of geometries of each type is queried from the same meshes
+            self.add_meshes_plan = geometries_io.GeometriesIO.Plan(ModelPart(), meshes, allow_multiple_main_meshes)
+
+        for error in self.add_meshes_plan.errors:
+            logger.warning('Converting the meshes will fail: {}'.format(error))
+
+        mesh_sizes = self.add_meshes_plan.mesh_sizes
+        self.num_nodes = sum([num_nodes for num_nodes, _, _ in mesh_sizes])
+        self.num_elements = sum(self.add_meshes_plan.num_entities["elements"].values())
+        self.num_conditions = sum(self.add_meshes_plan.num_entities["conditions"].values())
+        num_entities = self.num_elements + self.num_conditions
+        num_entity_nodes = sum([num_entity_nodes for _, _, num_entity_nodes in mesh_sizes]) # sum of the number of nodes of all entities
+
+        # the entities are also listed in all parents of the SubModelPart
+        num_sub_model_part_entries = sum([len(mesh.model_part_name.split(".")) * (num_nodes + num_entities_mesh)
+            for mesh, (num_nodes, num_entities_mesh, _) in zip(meshes, mesh_sizes) if mesh.model_part_name != ""])
+
+        # size of the largest mesh, relevant for the memory when retrieving the meshes one after the other
+        max_num_nodes_and_entities_mesh = max([num_nodes + num_entities_mesh for num_nodes, num_entities_mesh, _ in mesh_sizes], default=0)
+        max_num_entity_nodes_mesh = max([num_entity_nodes for _, _, num_entity_nodes in mesh_sizes], default=0)
+
+        ### estimating the size of the mdpa-file
+        id_digits = len(str(max(self.num_nodes, num_entities, 1)))
+        bytes_per_node_line = 3*self._BYTES_PER_COORDINATE + id_digits + 5
+        self.estimated_mdpa_bytes = (
+            self.num_nodes * bytes_per_node_line +
+            num_entities * (id_digits + 5) + num_entity_nodes * (id_digits + 1) +
+            num_sub_model_part_entries * (id_digits + 3))
+
+        ### selecting the strategies
+        # retrieving the data as arrays requires much less memory, but is only worth it for large meshes
+        self.use_arrays = IsNumpyAvailable() and max_num_nodes_and_entities_mesh >= self._MIN_NUM_ENTITIES_FOR_ARRAYS
+
+        if self.use_arrays:
+            mem_per_node, mem_per_entity, mem_per_entity_node = self._MEMORY_PER_NODE_ARRAYS, self._MEMORY_PER_ENTITY_ARRAYS, self._MEMORY_PER_ENTITY_NODE_ARRAYS
+        else:
+            mem_per_node, mem_per_entity, mem_per_entity_node = self._MEMORY_PER_NODE_DICTS, self._MEMORY_PER_ENTITY_DICTS, self._MEMORY_PER_ENTITY_NODE_DICTS
+
+        memory_model_part = (
+            self.num_nodes * self._MEMORY_PER_NODE +
+            num_entities * self._MEMORY_PER_ENTITY + num_entity_nodes * self._MEMORY_PER_ENTITY_NODE +
+            num_sub_model_part_entries * self._MEMORY_PER_SUB_MODEL_PART_ENTRY)
+
+        # when retrieving the meshes concurrently the data of all meshes can be in memory at the same time
+        memory_all_meshes_data = self.num_nodes * mem_per_node + num_entities * mem_per_entity + num_entity_nodes * mem_per_entity_node
+        memory_largest_mesh_data = max_num_nodes_and_entities_mesh * max(mem_per_node, mem_per_entity) + max_num_entity_nodes_mesh * mem_per_entity_node
+
+        self.num_threads = 1
+        if self.num_meshes > 1 and memory_model_part + memory_all_meshes_data <= self.memory_budget:
+            self.num_threads = min(self.num_meshes, self._MAX_NUM_THREADS)
+
+        # if the data of the largest mesh does not fit in the memory, then it is retrieved in chunks
+        # the size of the chunks is selected such that the chunks fit in the remaining memory
+        # this reduces the memory, but does not bound it since the Ids of the largest mesh are still retrieved at once
+        # if retrieving all meshes at once does not fit in the memory, then the next mesh is retrieved while the current one is added
+        # this requires memory for the data of two meshes
+        self.chunk_size = 0
+        self.pipeline_depth = 0
+        if self.num_threads > 1:
+            self.estimated_peak_memory_bytes = memory_model_part + memory_all_meshes_data
+        elif self.num_meshes > 1 and memory_model_part + 2*memory_largest_mesh_data <= self.memory_budget:
+            self.pipeline_depth = 1
+            self.estimated_peak_memory_bytes = memory_model_part + 2*memory_largest_mesh_data
+        elif memory_model_part + memory_largest_mesh_data <= self.memory_budget or not IsNumpyAvailable():
+            self.estimated_peak_memory_bytes = memory_model_part + memory_largest_mesh_data
+        else:
+            self.use_arrays = True
+            memory_ids = max_num_nodes_and_entities_mesh * self._MEMORY_PER_ID
+            remaining_memory = self.memory_budget - memory_model_part - memory_ids
+            chunk_size = remaining_memory // self._MEMORY_PER_CHUNK_ENTRY
+            self.chunk_size = int(min(max(chunk_size, self._MIN_CHUNK_SIZE), self._MAX_CHUNK_SIZE))
+            self.estimated_peak_memory_bytes = memory_model_part + memory_ids + self.chunk_size*self._MEMORY_PER_CHUNK_ENTRY
+
+        if self.estimated_peak_memory_bytes > self.memory_budget:
+            logger.warning('The estimated peak memory ({}) exceeds the memory budget ({})'.format(_FormatBytes(self.estimated_peak_memory_bytes), _FormatBytes(self.memory_budget)))
+
+        # for large files the lines are passed to the file in chunks that fill the buffer, instead of line by line
+        self.write_buffer_size = -1 # default of python
+        self.write_chunk_size = 0
+        if self.estimated_mdpa_bytes >= self._MIN_FILE_SIZE_FOR_LARGE_BUFFER:
+            self.write_buffer_size = self._LARGE_WRITE_BUFFER_SIZE
+            self.write_chunk_size = self._LARGE_WRITE_BUFFER_SIZE // bytes_per_node_line
+
+        logger.info(str(self))
+
+    def GetAddMeshesSettings(self):
+        """settings to be passed to "GeometriesIO.AddMeshes" """
+        return {
+            "use_arrays"     : self.use_arrays,
+            "num_threads"    : self.num_threads,
+            "chunk_size"     : self.chunk_size,
+            "pipeline_depth" : self.pipeline_depth
+        }
+
+    def GetWriteMdpaSettings(self):
+        """settings to be passed to "WriteMdpa" """
+        return {
+            "buffer_size" : self.write_buffer_size,
+            "chunk_size"  : self.write_chunk_size
+        }
+
+    def PrintInfo(self, prefix_string=""):
+        return prefix_string + "ConversionPlan\n"
+
+    def PrintData(self, prefix_string=""):
+        string_buf  = "{}  Number of meshes: {}\n".format(prefix_string, self.num_meshes)
+        string_buf += "{}  Expected number of Nodes: {}\n".format(prefix_string, self.num_nodes)
+        string_buf += "{}  Expected number of Elements: {}\n".format(prefix_string, self.num_elements)
+        string_buf += "{}  Expected number of Conditions: {}\n".format(prefix_string, self.num_conditions)
+        string_buf += "{}  Estimated size of mdpa-file: {}\n".format(prefix_string, _FormatBytes(self.estimated_mdpa_bytes))
+        string_buf += "{}  Estimated peak memory: {}\n".format(prefix_string, _FormatBytes(self.estimated_peak_memory_bytes))
+        string_buf += "{}  Retrieving meshes as arrays: {}\n".format(prefix_string, self.use_arrays)
+        string_buf += "{}  Number of threads for retrieving meshes: {}\n".format(prefix_string, self.num_threads)
+        string_buf += "{}  Pipeline depth for retrieving meshes: {}\n".format(prefix_string, self.pipeline_depth)
+        string_buf += "{}  Chunk size for retrieving meshes: {}\n".format(prefix_string, "no chunks" if self.chunk_size == 0 else self.chunk_size)
+        string_buf += "{}  Write buffer size: {}\n".format(prefix_string, "default" if self.write_buffer_size < 0 else _FormatBytes(self.write_buffer_size))
+        string_buf += "{}  Chunk size for writing: {}\n".format(prefix_string, "line by line" if self.write_chunk_size == 0 else self.write_chunk_size)
+        return string_buf
+
+    def __str__(self):
+        string_buf = self.PrintInfo()
+        string_buf += self.PrintData()
+        return string_buf
+
+
+def CreateModelPart(meshes, plan=None, allow_multiple_main_meshes=False, coincident_nodes_tolerance=None):
+    """Creates a ModelPart given meshes as input
+    optionally a ConversionPlan can be passed which selects the strategies for retrieving the meshes
+    allow_multiple_main_meshes, coincident_nodes_tolerance -- for converting meshes of different main meshes
+    (e.g. the fluid and the structure of a FSI model) without concatenating them first, see "GeometriesIO.AddMeshes"
+    """
     logger.debug('Calling "CreateModelPart"')
-    model_part = ModelPart()
-    geometries_io.GeometriesIO.AddMeshes(model_part, meshes)
+    model_part, _ = _CreateModelPartAndConversionState(meshes, plan, allow_multiple_main_meshes, coincident_nodes_tolerance)
 
     return model_part
 
 
-def CreateMdpaFile(meshes, mdpa_file_name):
-    """Creates a mdpa-file given meshes as input"""
+def CreateMdpaFile(meshes, mdpa_file_name, plan=None, save_mapping_tables=False, profile=False, profiling_report_file_name="", allow_multiple_main_meshes=False, coincident_nodes_tolerance=None):
+    """Creates a mdpa-file given meshes as input
+    optionally a ConversionPlan can be passed which selects the strategies for the conversion
+    save_mapping_tables -- save the tables mapping the Ids of the geometries in Salome to the Ids of the
+    Elements and Conditions next to the mdpa-file, see "ConversionState.SaveMappingTables". Requires numpy
+    profile -- profile the stages of the conversion (retrieving the meshes, creating the entities, writing the file, ...)
+    and return the report, see "profiling.GetReport"
+    profiling_report_file_name -- if given the profiling report is saved to this json-file (also enables the profiling)
+    allow_multiple_main_meshes, coincident_nodes_tolerance -- see "CreateModelPart"
+    """
     logger.debug('Calling "CreateMdpaFile"')
-    model_part = CreateModelPart(meshes)
-    WriteMdpa(model_part, mdpa_file_name)
+
+    if not (profile or profiling_report_file_name):
+        _CreateMdpaFile(meshes, mdpa_file_name, plan, save_mapping_tables, allow_multiple_main_meshes, coincident_nodes_tolerance)
+        return
+
+    with profiling.Profile() as profiler:
+        with profiling.Timer("CreateMdpaFile"):
+            _CreateMdpaFile(meshes, mdpa_file_name, plan, save_mapping_tables, allow_multiple_main_meshes, coincident_nodes_tolerance)
+
+    if profiling_report_file_name:
+        profiling.SaveReport(profiling_report_file_name, profiler.report)
+
+    if profile:
+        return profiler.report
+
+
+def _CreateMdpaFile(meshes, mdpa_file_name, plan, save_mapping_tables, allow_multiple_main_meshes, coincident_nodes_tolerance):
+    model_part, conversion_state = _CreateModelPartAndConversionState(meshes, plan, allow_multiple_main_meshes, coincident_nodes_tolerance)
+    write_mdpa_settings = plan.GetWriteMdpaSettings() if plan else {}
+    WriteMdpa(model_part, mdpa_file_name, **write_mdpa_settings)
+
+    if save_mapping_tables:
+        conversion_state.SaveMappingTables(os.path.splitext(mdpa_file_name)[0])
+
+def _CreateModelPartAndConversionState(meshes, plan, allow_multiple_main_meshes=False, coincident_nodes_tolerance=None):
+    model_part = ModelPart()
+    add_meshes_settings = plan.GetAddMeshesSettings() if plan else {}
+    with salome_mesh_utilities.MeshInfoCache():
+        conversion_state = geometries_io.GeometriesIO.AddMeshes(model_part, meshes, allow_multiple_main_meshes=allow_multiple_main_meshes, coincident_nodes_tolerance=coincident_nodes_tolerance, **add_meshes_settings)
+
+    return model_part, conversion_state
+
+
+def _FormatBytes(num_bytes):
+    """formats a number of bytes to be human-readable, e.g. 1536 => "1.5 KB" """
+    if num_bytes < 1024:
+        return "{} B".format(num_bytes)
+    exponent = min(int(math.log(num_bytes, 1024)), 4)
+    return "{:.1f} {}".format(num_bytes / 1024**exponent, ["B", "KB", "MB", "GB", "TB"][exponent])
@@ -0,0 +1,61 @@
+'''Micro-benchmark for the helpers in "salome_mesh_utilities" that are called in the loops over the meshes and entity types
+Compares the lookup tables and the cache for "GetMeshInfo" with the previous implementations
+Has to be executed in salome, e.g. with "salome -t python benchmark_salome_mesh_utilities.py"
+'''
+
+import os
+import sys
+import timeit
+
+import salome
+salome.salome_init()
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+import SMESH
+from salome.geom import geomBuilder
+from salome.smesh import smeshBuilder
+
+from kratos_salome_plugin import salome_utilities
+from kratos_salome_plugin import salome_mesh_utilities
+
+geompy = geomBuilder.New()
+smesh = smeshBuilder.New()
+
+box = geompy.MakeBoxDXDYDZ(200, 200, 200)
+geompy.addToStudy(box, 'box')
+mesh = smesh.Mesh(box)
+mesh.Segment().MaxSize(20)
+mesh.Triangle()
+mesh.Tetrahedron()
+mesh.Compute()
+mesh_identifier = salome_utilities.GetSalomeID(mesh.GetMesh())
+
+
+# the previous implementations, for comparison
+def EntityTypeToStringPrevious(entity_type):
+    return str(entity_type)[7:]
+
+def EntityTypeFromStringPrevious(name_entity_type):
+    entity_types_dict = {EntityTypeToStringPrevious(entity_type) : entity_type for entity_type in SMESH.EntityType._items}
+    return entity_types_dict[name_entity_type]
+
+def GetMeshInfoPrevious(mesh_identifier):
+    return smesh.GetMeshInfo(salome_utilities.GetSalomeObject(mesh_identifier))
+
+
+def Benchmark(name, fct_ptr, number):
+    time_per_call = min(timeit.repeat(fct_ptr, number=number, repeat=5)) / number
+    print('{:<40} {:10.3f} [us]'.format(name, time_per_call*1e6))
+
+num_calls = 10000
+Benchmark("EntityTypeToString (previous)", lambda: EntityTypeToStringPrevious(SMESH.Entity_Tetra), num_calls)
+Benchmark("EntityTypeToString", lambda: salome_mesh_utilities.EntityTypeToString(SMESH.Entity_Tetra), num_calls)
+Benchmark("EntityTypeFromString (previous)", lambda: EntityTypeFromStringPrevious("Tetra"), num_calls)
+Benchmark("EntityTypeFromString", lambda: salome_mesh_utilities.EntityTypeFromString("Tetra"), num_calls)
+
+num_calls = 1000
+Benchmark("GetMeshInfo (previous)", lambda: GetMeshInfoPrevious(mesh_identifier), num_calls)
+Benchmark("GetMeshInfo", lambda: salome_mesh_utilities.GetMeshInfo(mesh_identifier), num_calls)
+with salome_mesh_utilities.MeshInfoCache():
+    Benchmark("GetMeshInfo (MeshInfoCache)", lambda: salome_mesh_utilities.GetMeshInfo(mesh_identifier), num_calls)
@@ -0,0 +1,42 @@
+'''Micro-benchmark for opening the windows of the plugin
+Compares creating the windows with the cached classes of the compiled "ui" files with loading the "ui" files every time
+Has to be executed in the python environment of salome, e.g. with "salome shell -- python benchmark_window_creation.py"
+'''
+
+import os
+import sys
+import timeit
+from pathlib import Path
+
+from PyQt5.QtWidgets import QApplication
+from PyQt5 import uic
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from kratos_salome_plugin.utilities import GetAbsPathInPlugin
+from kratos_salome_plugin.gui.plugin_main_window import PluginMainWindow
+from kratos_salome_plugin.gui.groups_window import GroupsWindow
+from kratos_salome_plugin.gui.groups_model import GroupsModel
+
+app = QApplication(sys.argv)
+
+
+# the previous implementation, for comparison
+def LoadUiFilesPrevious():
+    uic.loadUi(str(Path(GetAbsPathInPlugin("gui", "ui_forms", "plugin_main_window.ui"))))
+    uic.loadUi(str(Path(GetAbsPathInPlugin("gui", "ui_forms", "groups_window.ui"))))
+
+def CreateWindows():
+    main_window = PluginMainWindow()
+    GroupsWindow(main_window, GroupsModel())
+
+
+def Benchmark(name, fct_ptr, number):
+    time_per_call = min(timeit.repeat(fct_ptr, number=number, repeat=5)) / number
+    print('{:<40} {:10.3f} [ms]'.format(name, time_per_call*1e3))
+
+CreateWindows() # compiling the "ui" files is not part of the benchmark
+
+num_calls = 10
+Benchmark("Loading the ui files (previous)", LoadUiFilesPrevious, num_calls)
+Benchmark("Creating the windows", CreateWindows, num_calls)
@@ -0,0 +1,88 @@
+'''Measures the memory of the objects that are created when converting meshes
+The results are the sizes used by "ConversionPlan" (see "create_kratos_input_tui.py") for its estimations,
+they should be measured again if the ModelPart or the format of the retrieved data is changed
+The data is created in the same format as the MeshInterface returns it, hence Salome is not required, e.g. "python measure_conversion_memory.py"
+The data retrieved as arrays is not measured, its size follows from the dtypes (int64 and float64)
+'''
+
+import os
+import sys
+import tracemalloc
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from kratos_salome_plugin.model_part import ModelPart
+
+NUM_OBJECTS = 100000
+FIRST_ID = 1000000 # small ints are cached by python, the Ids of real meshes are not
+
+
+def MeasureMemoryPerObject(create_function):
+    """returns the memory (in bytes) per object that is allocated by "create_function" and still used afterwards"""
+    tracemalloc.start()
+    created_objects = create_function()
+    memory, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del created_objects
+    return memory / NUM_OBJECTS
+
+def MeasureMemoryPerNodeOfEntity(create_function):
+    """returns the memory (in bytes) per entity and per Node of an entity, by creating entities with 1 and 9 Nodes"""
+    memory_one_node = MeasureMemoryPerObject(lambda: create_function(1))
+    memory_per_entity_node = (MeasureMemoryPerObject(lambda: create_function(9)) - memory_one_node) / 8
+    return memory_one_node - memory_per_entity_node, memory_per_entity_node
+
+
+### data retrieved from the MeshInterface as dicts (see "MeshInterface.GetNodesAndGeometricalEntities")
+def CreateNodesDict():
+    return {FIRST_ID+i : [float(i), float(i+1), float(i+2)] for i in range(NUM_OBJECTS)}
+
+def CreateEntitiesDict(num_nodes_per_entity):
+    return {FIRST_ID+i : [FIRST_ID+i+j for j in range(num_nodes_per_entity)] for i in range(NUM_OBJECTS)}
+
+def CreateIdsList():
+    # the Ids of a mesh are retrieved as a list of python ints, also when retrieving in chunks
+    return [FIRST_ID+i for i in range(NUM_OBJECTS)]
+
+
+### python-ModelPart (see "model_part.py")
+def CreateModelPartWithNodes():
+    model_part = ModelPart()
+    for i in range(NUM_OBJECTS):
+        model_part.CreateNewNode(i+1, float(i), float(i+1), float(i+2))
+    return model_part
+
+model_part_with_nodes = CreateModelPartWithNodes()
+properties = model_part_with_nodes.CreateNewProperties(0)
+
+def CreateElementsWithoutConnectivities(num_nodes_per_entity):
+    """the connectivities are the input, they are not part of the memory of the ModelPart"""
+    tracemalloc.stop()
+    connectivities = [[(i+j)%NUM_OBJECTS+1 for j in range(num_nodes_per_entity)] for i in range(NUM_OBJECTS)]
+    first_id = max([elem.Id for elem in model_part_with_nodes.Elements], default=0) + 1
+    tracemalloc.start()
+    return model_part_with_nodes.CreateNewElements("Element", first_id, connectivities, properties)
+
+def AddNodesToSubModelPart():
+    tracemalloc.stop()
+    sub_model_part = model_part_with_nodes.CreateSubModelPart("nodes_{}".format(model_part_with_nodes.NumberOfSubModelParts()))
+    node_ids = list(range(1, NUM_OBJECTS+1))
+    tracemalloc.start()
+    sub_model_part.AddNodes(node_ids)
+    return sub_model_part
+
+
+if __name__ == '__main__':
+    print("python-ModelPart")
+    print("  per Node:                  {:.0f} bytes".format(MeasureMemoryPerObject(CreateModelPartWithNodes)))
+    memory_per_entity, memory_per_entity_node = MeasureMemoryPerNodeOfEntity(CreateElementsWithoutConnectivities)
+    print("  per entity:                {:.0f} bytes".format(memory_per_entity))
+    print("  per Node of an entity:     {:.0f} bytes".format(memory_per_entity_node))
+    print("  per SubModelPart entry:    {:.0f} bytes".format(MeasureMemoryPerObject(AddNodesToSubModelPart)))
+
+    print("Data retrieved as dicts")
+    print("  per Node:                  {:.0f} bytes".format(MeasureMemoryPerObject(CreateNodesDict)))
+    memory_per_entity, memory_per_entity_node = MeasureMemoryPerNodeOfEntity(CreateEntitiesDict)
+    print("  per entity:                {:.0f} bytes".format(memory_per_entity))
+    print("  per Node of an entity:     {:.0f} bytes".format(memory_per_entity_node))
+    print("  per Id (list of ints):     {:.0f} bytes".format(MeasureMemoryPerObject(CreateIdsList)))
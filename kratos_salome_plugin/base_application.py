@@ -19,6 +19,7 @@ from abc import ABCMeta, abstractmethod
 
 
 class Application(metaclass=ABCMeta):
+    _generation = 0 # increased with every modification, see "GetGeneration"
 
     ### public methods ###
     @abstractmethod
@@ -40,6 +41,18 @@ class Application(metaclass=ABCMeta):
         """
         pass
 
+    def GetGeneration(self) -> int:
+        """returns a counter that is increased whenever the application is modified
+        this is used for checking if the project has unsaved changes
+        """
+        return self._generation
+
+
+    ### protected methods ###
+    def _IncreaseGeneration(self) -> None:
+        """has to be called by all methods that modify the application"""
+        self._generation += 1
+
 
     ### protected class methods ###
     @classmethod
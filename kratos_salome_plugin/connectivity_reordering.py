@@ -0,0 +1,76 @@
+#  _  __         _          ___       _               ___ _           _
+# | |/ /_ _ __ _| |_ ___ __/ __| __ _| |___ _ __  ___| _ \ |_  _ __ _(_)_ _
+# | ' <| '_/ _` |  _/ _ (_-<__ \/ _` | / _ \ '  \/ -_)  _/ | || / _` | | ' \
+# |_|\_\_| \__,_|\__\___/__/___/\__,_|_\___/_|_|_\___|_| |_|\_,_\__, |_|_||_|
+#                                                               |___/
+# License: BSD License ; see LICENSE
+#
+# Main authors: Philipp Bucher (https://github.com/philbucher)
+#
+
+"""
+This file contains the reordering of the connectivities from Salome to Kratos
+For some entities the node ordering differs between Salome and Kratos, those have to be corrected
+see https://docs.salome-platform.org/latest/gui/SMESH/connectivity.html
+NOTE: This file must NOT have dependencies on Salome!
+"""
+
+# python imports
+from operator import itemgetter
+
+
+# Permutations of the Nodes of the Salome EntityTypes to obtain the Kratos ordering
+# Kratos-Node i is Salome-Node PERMUTATIONS[entity_type][i]
+# The Salome volumes are oriented opposite to the Kratos volumes, hence their bottom face is reversed
+# The 2D and 1D entities have the same ordering, they are listed for completeness
+PERMUTATIONS = {
+    "Edge"              : [0, 1],
+    "Quad_Edge"         : [0, 1, 2],
+    "Triangle"          : [0, 1, 2],
+    "Quad_Triangle"     : [0, 1, 2, 3, 4, 5],
+    "BiQuad_Triangle"   : [0, 1, 2, 3, 4, 5, 6],
+    "Quadrangle"        : [0, 1, 2, 3],
+    "Quad_Quadrangle"   : [0, 1, 2, 3, 4, 5, 6, 7],
+    "BiQuad_Quadrangle" : [0, 1, 2, 3, 4, 5, 6, 7, 8],
+    "Tetra"             : [0, 2, 1, 3],
+    "Quad_Tetra"        : [0, 2, 1, 3, 6, 5, 4, 7, 9, 8],
+    "Pyramid"           : [0, 3, 2, 1, 4],
+    "Quad_Pyramid"      : [0, 3, 2, 1, 4, 8, 7, 6, 5, 9, 12, 11, 10],
+    "Penta"             : [0, 2, 1, 3, 5, 4],
+    "Quad_Penta"        : [0, 2, 1, 3, 5, 4, 8, 7, 6, 12, 14, 13, 11, 10, 9],
+    "Hexa"              : [0, 3, 2, 1, 4, 7, 6, 5],
+    "Quad_Hexa"         : [0, 3, 2, 1, 4, 7, 6, 5, 11, 10, 9, 8, 16, 19, 18, 17, 15, 14, 13, 12]
+}
+
+
+def _IsIdentity(permutation):
+    return permutation == list(range(len(permutation)))
+
+def _CreateReorderFunction(permutation):
+    if _IsIdentity(permutation):
+        return lambda conn: conn
+    get_items = itemgetter(*permutation)
+    return lambda conn: list(get_items(conn))
+
+# created once, since this is called for every geometry type when creating entities
+_REORDER_FUNCTIONS = {entity_type : _CreateReorderFunction(permutation) for entity_type, permutation in PERMUTATIONS.items()}
+
+
+def GetReorderFunction(salome_entity_type):
+    """returns a function that reorders the connectivities of one entity of the given Salome EntityType (e.g. "Tetra")"""
+    return _REORDER_FUNCTIONS.get(salome_entity_type, lambda conn: conn)
+
+def ReorderConnectivitiesArray(salome_entity_type, connectivities):
+    """reorders the connectivities of all entities of the given Salome EntityType (e.g. "Tetra") at once
+    connectivities -- numpy array of shape (num_entities, num_nodes_per_entity)
+    """
+    permutation = PERMUTATIONS.get(salome_entity_type)
+    if permutation is None or _IsIdentity(permutation) or connectivities.size == 0:
+        return connectivities
+
+    if connectivities.shape[1] != len(permutation):
+        err_msg  = 'The connectivities of entity type "{}" have {} Nodes, '.format(salome_entity_type, connectivities.shape[1])
+        err_msg += 'but {} Nodes are expected!'.format(len(permutation))
+        raise Exception(err_msg)
+
+    return connectivities[:, permutation]
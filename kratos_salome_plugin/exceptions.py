@@ -13,3 +13,5 @@ This file defines the custom exceptions used in the plugin
 """
 
 class UserInputError(Exception): pass
+
+class JobCancelledError(Exception): pass
@@ -0,0 +1,518 @@
+#  _  __         _          ___       _               ___ _           _
+# | |/ /_ _ __ _| |_ ___ __/ __| __ _| |___ _ __  ___| _ \ |_  _ __ _(_)_ _
+# | ' <| '_/ _` |  _/ _ (_-<__ \/ _` | / _ \ '  \/ -_)  _/ | || / _` | | ' \
+# |_|\_\_| \__,_|\__\___/__/___/\__,_|_\___/_|_|_\___|_| |_|\_,_\__, |_|_||_|
+#                                                               |___/
+# License: BSD License ; see LICENSE
+#
+# Main authors: Philipp Bucher (https://github.com/philbucher)
+#
+
+"""
+This file contains the FileMeshInterface
+It reads a mesh that was exported from Salome to a file
+and provides the same access as the MeshInterface, but without requiring Salome
+Currently the DAT format (see "smeshBuilder.Mesh.ExportDAT") and the UNV format (see "smeshBuilder.Mesh.ExportUNV") are supported
+NOTE: This file must NOT have dependencies on Salome!
+"""
+
+# python imports
+import os
+import time
+from itertools import islice
+import logging
+logger = logging.getLogger(__name__)
+
+# plugin imports
+from . import profiling
+
+
+# in DAT files the type of an entity is given as: "dimension*100 + number of nodes"
+_DAT_ENTITY_TYPES = {
+    101 : "0D",
+    102 : "Edge",
+    103 : "Quad_Edge",
+    203 : "Triangle",
+    206 : "Quad_Triangle",
+    207 : "BiQuad_Triangle",
+    204 : "Quadrangle",
+    208 : "Quad_Quadrangle",
+    209 : "BiQuad_Quadrangle",
+    304 : "Tetra",
+    310 : "Quad_Tetra",
+    305 : "Pyramid",
+    313 : "Quad_Pyramid",
+    306 : "Penta",
+    315 : "Quad_Penta",
+    318 : "BiQuad_Penta",
+    308 : "Hexa",
+    320 : "Quad_Hexa",
+    327 : "TriQuad_Hexa",
+    312 : "Hexagonal_Prism"
+}
+
+# number of Nodes of the Salome EntityTypes that have a fixed number of Nodes (i.e. not polygons and polyhedrons), taken from the DAT types
+NUM_NODES_PER_ENTITY_TYPE = {entity_type : dat_type % 100 for dat_type, entity_type in _DAT_ENTITY_TYPES.items()}
+
+# in UNV files the type of an element is given by its FE descriptor, map: {FE descriptor : (entity type, node order)}
+# the node order converts the UNV (I-DEAS) ordering to the one of Salome (None if they are the same)
+_UNV_TRIANGLE = ("Triangle", None)
+_UNV_QUAD_TRIANGLE = ("Quad_Triangle", [0, 2, 4, 1, 3, 5]) # corner and mid nodes alternate in UNV
+_UNV_QUADRANGLE = ("Quadrangle", None)
+_UNV_QUAD_QUADRANGLE = ("Quad_Quadrangle", [0, 2, 4, 6, 1, 3, 5, 7])
+_UNV_ENTITY_TYPES = {
+    11  : ("Edge", None), # rod
+    21  : ("Edge", None), # linear beam
+    22  : ("Quad_Edge", [0, 2, 1]), # tapered beam
+    24  : ("Quad_Edge", [0, 2, 1]), # parabolic beam
+    41  : _UNV_TRIANGLE, 51 : _UNV_TRIANGLE, 61 : _UNV_TRIANGLE, 74 : _UNV_TRIANGLE, 81 : _UNV_TRIANGLE, 91 : _UNV_TRIANGLE,
+    42  : _UNV_QUAD_TRIANGLE, 52 : _UNV_QUAD_TRIANGLE, 62 : _UNV_QUAD_TRIANGLE, 72 : _UNV_QUAD_TRIANGLE, 82 : _UNV_QUAD_TRIANGLE, 92 : _UNV_QUAD_TRIANGLE,
+    44  : _UNV_QUADRANGLE, 54 : _UNV_QUADRANGLE, 64 : _UNV_QUADRANGLE, 71 : _UNV_QUADRANGLE, 84 : _UNV_QUADRANGLE, 94 : _UNV_QUADRANGLE,
+    45  : _UNV_QUAD_QUADRANGLE, 55 : _UNV_QUAD_QUADRANGLE, 65 : _UNV_QUAD_QUADRANGLE, 75 : _UNV_QUAD_QUADRANGLE, 85 : _UNV_QUAD_QUADRANGLE, 95 : _UNV_QUAD_QUADRANGLE,
+    111 : ("Tetra", [0, 2, 1, 3]), # volumes are oriented the other way round in UNV
+    112 : ("Penta", [0, 2, 1, 3, 5, 4]),
+    115 : ("Hexa", [0, 3, 2, 1, 4, 7, 6, 5])
+}
+_UNV_BEAM_DESCRIPTORS = {11, 21, 22, 23, 24, 25} # elements with an additional record for the beam orientation
+_UNV_GROUP_DATASETS = {2435, 2452, 2467, 2477} # datasets containing groups (in the same format)
+
+_SUPPORTED_FILE_FORMATS = [".dat", ".unv"]
+
+
+class FileMeshInterface:
+    def __init__(self, file_name, main_mesh_file_name="", group_name=""):
+        """Keyword arguments:
+        file_name -- the file containing the exported mesh
+        main_mesh_file_name -- the file containing the main mesh, in case "file_name" contains only a part of it (e.g. a group)
+        This is used to check whether meshes belong to the same main mesh, see "DoMeshesBelongToSameMainMesh"
+        Note that the part has to be exported without renumbering the Nodes and entities
+        group_name -- only the entities of this group (and their Nodes) are used, the file is the main mesh
+        Only UNV files contain groups, see "GetGroupNames"
+        """
+        self.file_name = file_name
+        self.main_mesh_file_name = main_mesh_file_name if main_mesh_file_name else file_name
+        self.group_name = group_name
+        self.__nodes = None
+        self.__geom_entities = None
+        self.__groups = None
+        self.__file_status = None # status of the file when it was read
+
+    def GetNodes(self):
+        if self.CheckMeshIsValid():
+            self.__ReadFileIfNecessary()
+            return dict(self.__nodes)
+        else:
+            return {}
+
+    def GetNodesAndGeometricalEntities(self, geometrical_entity_types=[]):
+        if self.CheckMeshIsValid():
+            nodes = self.GetNodes() # nodes are always needed
+
+            geom_entities = {}
+            logged_entity_types_in_mesh = False
+            for entity_type in geometrical_entity_types:
+                if entity_type == "Node": # nodes are treated separately
+                    continue
+                if entity_type in self.__geom_entities:
+                    geom_entities[entity_type] = dict(self.__geom_entities[entity_type])
+                else:
+                    geom_entities[entity_type] = {}
+                    self.__LogEntityTypeNotInMesh(entity_type, not logged_entity_types_in_mesh)
+                    logged_entity_types_in_mesh = True
+
+            return nodes, geom_entities
+
+        else:
+            return {}, {}
+
+    def GetNodesArray(self):
+        """returns the Nodes of the mesh as numpy arrays: (ids, coords)
+        see "MeshInterface.GetNodesArray"
+        """
+        import numpy as np
+
+        if self.CheckMeshIsValid():
+            self.__ReadFileIfNecessary()
+            num_nodes = len(self.__nodes)
+            ids = np.fromiter(self.__nodes.keys(), dtype=np.int64, count=num_nodes)
+            coords = np.array(list(self.__nodes.values()), dtype=np.float64).reshape(num_nodes, 3)
+            return ids, coords
+        else:
+            return np.empty(0, dtype=np.int64), np.empty((0, 3), dtype=np.float64)
+
+    def GetNodesChunks(self, chunk_size):
+        """generator yielding the Nodes of the mesh in chunks of (at most) "chunk_size" Nodes
+        see "MeshInterface.GetNodesChunks"
+        Note that the file is read completely, only the arrays are created per chunk
+        """
+        import numpy as np
+
+        if not self.CheckMeshIsValid():
+            return
+
+        self.__ReadFileIfNecessary()
+        nodes_iter = iter(self.__nodes.items())
+        for chunk in iter(lambda: list(islice(nodes_iter, chunk_size)), []):
+            yield np.array([node_id for node_id, _ in chunk], dtype=np.int64), np.array([coords for _, coords in chunk], dtype=np.float64)
+
+    def GetEntitiesChunks(self, geometrical_entity_type, chunk_size):
+        """generator yielding the geometrical entities of the given type (e.g. "Triangle") in chunks of (at most) "chunk_size" entities
+        see "MeshInterface.GetEntitiesChunks"
+        Note that the file is read completely, only the arrays are created per chunk
+        """
+        if not self.CheckMeshIsValid():
+            return
+
+        self.__ReadFileIfNecessary()
+        if geometrical_entity_type not in self.__geom_entities:
+            self.__LogEntityTypeNotInMesh(geometrical_entity_type, True)
+            return
+
+        entities_iter = iter(self.__geom_entities[geometrical_entity_type].items())
+        for chunk in iter(lambda: list(islice(entities_iter, chunk_size)), []):
+            yield _EntitiesToArrays(chunk, geometrical_entity_type)
+
+    def GetEntitiesArrays(self, geometrical_entity_types=[]):
+        """returns the requested geometrical entities of the mesh as numpy arrays
+        see "MeshInterface.GetEntitiesArrays"
+        """
+        import numpy as np
+
+        if not self.CheckMeshIsValid():
+            return {}
+
+        self.__ReadFileIfNecessary()
+
+        geom_entities = {}
+        logged_entity_types_in_mesh = False
+        for entity_type in geometrical_entity_types:
+            if entity_type == "Node": # nodes are treated separately
+                continue
+            entities = self.__geom_entities.get(entity_type, {})
+            if len(entities) > 0:
+                geom_entities[entity_type] = _EntitiesToArrays(list(entities.items()), entity_type)
+            else:
+                geom_entities[entity_type] = (np.empty(0, dtype=np.int64), np.empty((0, 0), dtype=np.int64))
+                self.__LogEntityTypeNotInMesh(entity_type, not logged_entity_types_in_mesh)
+                logged_entity_types_in_mesh = True
+
+        return geom_entities
+
+    def GetEntityTypesInMesh(self):
+        """returns the names of the entity types in the mesh (e.g. "Triangle")
+        Note: in contrast to the MeshInterface these are strings and not SMESH.EntityType, since Salome is not available
+        """
+        return list(self.GetMeshInformation().keys())
+
+    def GetMeshInformation(self):
+        if self.CheckMeshIsValid():
+            self.__ReadFileIfNecessary()
+            mesh_info = {}
+            if len(self.__nodes) > 0:
+                mesh_info["Node"] = len(self.__nodes)
+            for entity_type, entities in self.__geom_entities.items():
+                mesh_info[entity_type] = len(entities)
+            return mesh_info
+        else:
+            return {}
+
+    def GetNumberOfNodes(self):
+        """returns the number of Nodes of the mesh"""
+        if self.CheckMeshIsValid():
+            self.__ReadFileIfNecessary()
+            return len(self.__nodes)
+        else:
+            return 0
+
+    def GetNumberOfGeometries(self, geometry_type):
+        """returns the number of geometrical entities of the given type (e.g. "Triangle") in the mesh
+        returns -1 if the requested type is not available in the mesh
+        """
+        if self.CheckMeshIsValid():
+            self.__ReadFileIfNecessary()
+            num_geometries = len(self.__geom_entities.get(geometry_type, {}))
+            if num_geometries > 0:
+                return num_geometries
+        return -1
+
+    def GetFingerprint(self):
+        """returns a fingerprint of the mesh, which changes when the file is modified
+        it is based on the size and the modification time of the file, hence the file is not read
+        """
+        if self.CheckMeshIsValid():
+            return "{}:{}:{}:{}".format(os.path.realpath(self.file_name), self.group_name, *_GetFileStatus(self.file_name))
+        else:
+            return ""
+
+    def GetGroupNames(self):
+        """returns the names of the groups in the file"""
+        if self.CheckMeshIsValid():
+            self.__ReadFileIfNecessary()
+            return list(self.__groups.keys())
+        else:
+            return []
+
+    def GetMainMeshIdentifier(self):
+        """returns the identifier of the main mesh that this mesh belongs to (i.e. the file), see "DoMeshesBelongToSameMainMesh" """
+        if self.CheckMeshIsValid():
+            return os.path.realpath(self.main_mesh_file_name)
+        else:
+            return ""
+
+    def CheckMeshIsValid(self):
+        if not os.path.isfile(self.file_name):
+            logger.critical('File "{}" in FileMeshInterface does not exist'.format(self.file_name))
+            return False
+
+        file_extension = os.path.splitext(self.file_name)[1].lower()
+        if file_extension not in _SUPPORTED_FILE_FORMATS:
+            logger.critical('File "{}" in FileMeshInterface has an unsupported format! Supported are: "{}"'.format(self.file_name, '", "'.join(_SUPPORTED_FILE_FORMATS)))
+            return False
+
+        if self.group_name and file_extension != ".unv":
+            logger.critical('File "{}" in FileMeshInterface has no groups, only UNV files contain groups'.format(self.file_name))
+            return False
+
+        return True
+
+    def GetMeshName(self):
+        if self.CheckMeshIsValid():
+            if self.group_name:
+                return self.group_name
+            return os.path.splitext(os.path.basename(self.file_name))[0]
+        else:
+            return ""
+
+    def GetMeshType(self):
+        if self.CheckMeshIsValid():
+            file_type = os.path.splitext(self.file_name)[1][1:].upper() + "-File"
+            if self.group_name:
+                return file_type + "-Group"
+            return file_type
+        else:
+            return ""
+
+    def PrintInfo(self, prefix_string=""):
+        return prefix_string + "FileMeshInterface\n"
+
+    def PrintData(self, prefix_string=""):
+        string_buf  = "{}  File name: {}\n".format(prefix_string, self.file_name)
+        mesh_is_valid = self.CheckMeshIsValid()
+        string_buf += "{}  Mesh is valid: {}\n".format(prefix_string, mesh_is_valid)
+        if mesh_is_valid:
+            string_buf += "{}  Mesh has the following entities:\n".format(prefix_string)
+            for e, v in self.GetMeshInformation().items():
+                string_buf += "{}    {}: {}\n".format(prefix_string, e, v)
+
+        return string_buf
+
+    def __str__(self):
+        string_buf = self.PrintInfo()
+        string_buf += self.PrintData()
+        return string_buf
+
+    def __ReadFileIfNecessary(self):
+        """the file is read only once, afterwards the data is kept. It is read again if it was modified"""
+        file_status = _GetFileStatus(self.file_name)
+        if self.__nodes is None or file_status != self.__file_status:
+            start_time = time.time()
+            self.__file_status = file_status
+            with profiling.Timer("FileMeshInterface.ReadFile") as timer:
+                if os.path.splitext(self.file_name)[1].lower() == ".unv":
+                    self.__nodes, self.__geom_entities, self.__groups = _ReadUnvFile(self.file_name)
+                else:
+                    self.__nodes, self.__geom_entities = _ReadDatFile(self.file_name)
+                    self.__groups = {}
+                if self.group_name:
+                    self.__nodes, self.__geom_entities = _ExtractGroup(self.__nodes, self.__geom_entities, self.__groups, self.group_name, self.file_name)
+                timer.count = len(self.__nodes) + sum([len(ge) for ge in self.__geom_entities.values()])
+            logger.info('Reading {0} Nodes and {1} Geometrical Entities from file "{2}" took {3:.3f} [s]'.format(len(self.__nodes), sum([len(ge) for ge in self.__geom_entities.values()]), self.file_name, time.time()-start_time))
+
+    def __LogEntityTypeNotInMesh(self, entity_type, log_available_entity_types):
+        logger.warning('Entity type "{}" not in Mesh "{}"!'.format(entity_type, self.GetMeshName()))
+        if log_available_entity_types:
+            logger.info('The following entities are in this mesh: "{}"'.format('", "'.join(self.GetEntityTypesInMesh())))
+
+    @staticmethod
+    def DoMeshesBelongToSameMainMesh(list_mesh_interfaces):
+        """checks whether all meshes given a list of mesh interfaces belong to the same main mesh (i.e. file)"""
+        main_mesh_file_names = []
+        for mesh_interface in list_mesh_interfaces:
+            if isinstance(mesh_interface, FileMeshInterface) and mesh_interface.CheckMeshIsValid():
+                main_mesh_file_names.append(mesh_interface.GetMainMeshIdentifier())
+            else:
+                return False
+
+        return len(set(main_mesh_file_names)) < 2
+
+
+def _GetFileStatus(file_name):
+    """returns the size and the modification time (in ns) of a file"""
+    file_stat = os.stat(file_name)
+    return file_stat.st_size, file_stat.st_mtime_ns
+
+def _EntitiesToArrays(entities, entity_type):
+    """converts a list of entities [(entity_id, connectivities)] to numpy arrays (ids, connectivities)"""
+    import numpy as np
+
+    num_nodes_per_entity = len(entities[0][1])
+    if any(len(entity_nodes) != num_nodes_per_entity for _, entity_nodes in entities):
+        err_msg  = 'Entities of type "{}" have different number of Nodes!\n'.format(entity_type)
+        err_msg += 'Retrieving them as array is not possible, use "GetNodesAndGeometricalEntities" instead'
+        raise Exception(err_msg)
+
+    ids = np.array([entity_id for entity_id, _ in entities], dtype=np.int64)
+    connectivities = np.array([entity_nodes for _, entity_nodes in entities], dtype=np.int64).reshape(len(entities), num_nodes_per_entity)
+    return ids, connectivities
+
+def _ReadDatFile(file_name):
+    """reads a mesh in DAT format
+    format:
+        num_nodes num_entities
+        node_id x y z              (num_nodes lines)
+        entity_id type n_1 ... n_k (num_entities lines)
+    returns the Nodes {node_id : coords} and the geometrical entities {entity_type : {entity_id : connectivities}}, sorted by Id
+    """
+    with open(file_name, 'r') as dat_file:
+        lines = [line for line in (line.split() for line in dat_file) if line] # skip empty lines
+
+    if len(lines) == 0:
+        raise Exception('File "{}" is empty!'.format(file_name))
+
+    num_nodes = int(lines[0][0])
+    num_entities = int(lines[0][1])
+
+    if len(lines)-1 != num_nodes+num_entities:
+        err_msg  = 'File "{}" is inconsistent!\n'.format(file_name)
+        err_msg += 'The header specifies {} Nodes and {} entities, but the file contains {} lines'.format(num_nodes, num_entities, len(lines)-1)
+        raise Exception(err_msg)
+
+    nodes = {int(words[0]) : (float(words[1]), float(words[2]), float(words[3])) for words in lines[1:num_nodes+1]}
+
+    geom_entities = {}
+    for words in lines[num_nodes+1:]:
+        dat_entity_type = int(words[1])
+        entity_type = _DAT_ENTITY_TYPES.get(dat_entity_type)
+        if entity_type is None:
+            if dat_entity_type // 100 == 2:
+                entity_type = "Polygon"
+            else:
+                err_msg  = 'Entity type "{}" of entity with Id {} in file "{}" is not supported!\n'.format(dat_entity_type, words[0], file_name)
+                err_msg += 'Only the following entity types are supported:\n'
+                for dat_type, e_t in sorted(_DAT_ENTITY_TYPES.items()):
+                    err_msg += '    {} ({})\n'.format(dat_type, e_t)
+                raise Exception(err_msg)
+
+        geom_entities.setdefault(entity_type, {})[int(words[0])] = [int(node_id) for node_id in words[2:]]
+
+    # Ids are sorted as in the MeshInterface
+    nodes = {node_id : nodes[node_id] for node_id in sorted(nodes)}
+    geom_entities = {entity_type : {ent_id : entities[ent_id] for ent_id in sorted(entities)} for entity_type, entities in geom_entities.items()}
+
+    return nodes, geom_entities
+
+def _ReadUnvDatasets(file_name):
+    """generator yielding the datasets of a UNV file as (dataset number, lines)
+    each dataset is enclosed by two lines containing "-1"
+    """
+    with open(file_name, 'r') as unv_file:
+        for line in unv_file:
+            if line.strip() != "-1":
+                continue
+            dataset_number = int(next(unv_file).split()[0])
+            dataset_lines = []
+            for line in unv_file:
+                if line.strip() == "-1":
+                    break
+                dataset_lines.append(line)
+            yield dataset_number, dataset_lines
+
+def _ReadUnvFile(file_name):
+    """reads a mesh in UNV (I-DEAS universal) format
+    the following datasets are used, all others are ignored:
+        2411: the Nodes, two lines per Node ("node_id ..." and "x y z")
+        2412: the elements ("element_id fe_descriptor ... num_nodes", beams have an additional line, then the node ids)
+        2467 (and the equivalent 2435, 2452, 2477): the groups
+    returns the Nodes {node_id : coords}, the geometrical entities {entity_type : {entity_id : connectivities}}, sorted by Id
+    and the groups {group_name : (node_ids, element_ids)}
+    """
+    nodes = {}
+    geom_entities = {}
+    groups = {}
+
+    for dataset_number, lines in _ReadUnvDatasets(file_name):
+        if dataset_number == 2411:
+            for record_1, record_2 in zip(lines[0::2], lines[1::2]):
+                nodes[int(record_1.split()[0])] = tuple(float(coord.replace("D", "E")) for coord in record_2.split())
+
+        elif dataset_number == 2412:
+            words = [int(word) for line in lines for word in line.split()]
+            pos = 0
+            while pos < len(words):
+                entity_id, fe_descriptor, num_nodes = words[pos], words[pos+1], words[pos+5]
+                pos += 6
+                if fe_descriptor in _UNV_BEAM_DESCRIPTORS:
+                    pos += 3 # orientation node and cross sections
+                node_ids = words[pos:pos+num_nodes]
+                pos += num_nodes
+
+                if fe_descriptor not in _UNV_ENTITY_TYPES:
+                    err_msg  = 'Element type (FE descriptor) "{}" of element with Id {} in file "{}" is not supported!\n'.format(fe_descriptor, entity_id, file_name)
+                    err_msg += 'Only the following element types are supported:\n'
+                    for unv_type, (e_t, _) in sorted(_UNV_ENTITY_TYPES.items()):
+                        err_msg += '    {} ({})\n'.format(unv_type, e_t)
+                    raise Exception(err_msg)
+
+                entity_type, node_order = _UNV_ENTITY_TYPES[fe_descriptor]
+                if node_order is not None:
+                    node_ids = [node_ids[i] for i in node_order]
+                geom_entities.setdefault(entity_type, {})[entity_id] = node_ids
+
+        elif dataset_number in _UNV_GROUP_DATASETS:
+            pos = 0
+            while pos < len(lines):
+                num_group_entities = int(lines[pos].split()[7])
+                group_name = lines[pos+1].strip()
+                pos += 2
+                words = []
+                while len(words) < 4*num_group_entities:
+                    words.extend(int(word) for word in lines[pos].split())
+                    pos += 1
+                # each entity is given by: type (7: Node, 8: element), id, node leaf id, component
+                node_ids = [words[i+1] for i in range(0, len(words), 4) if words[i] == 7]
+                element_ids = [words[i+1] for i in range(0, len(words), 4) if words[i] == 8]
+                groups[group_name] = (node_ids, element_ids)
+
+    if len(nodes) == 0:
+        raise Exception('File "{}" contains no Nodes!'.format(file_name))
+
+    # Ids are sorted as in the MeshInterface
+    nodes = {node_id : nodes[node_id] for node_id in sorted(nodes)}
+    geom_entities = {entity_type : {ent_id : entities[ent_id] for ent_id in sorted(entities)} for entity_type, entities in geom_entities.items()}
+
+    return nodes, geom_entities, groups
+
+def _ExtractGroup(nodes, geom_entities, groups, group_name, file_name):
+    """returns the Nodes and the geometrical entities of a group
+    the Nodes are the ones of the group and the ones of its entities
+    """
+    if group_name not in groups:
+        err_msg  = 'Group "{}" does not exist in file "{}"!\n'.format(group_name, file_name)
+        err_msg += 'The following groups exist: "{}"'.format('", "'.join(groups.keys()))
+        raise Exception(err_msg)
+
+    group_node_ids, group_element_ids = groups[group_name]
+    group_element_ids = set(group_element_ids)
+
+    group_geom_entities = {}
+    node_ids = set(group_node_ids)
+    for entity_type, entities in geom_entities.items():
+        group_entities = {ent_id : connectivities for ent_id, connectivities in entities.items() if ent_id in group_element_ids}
+        if group_entities:
+            group_geom_entities[entity_type] = group_entities
+            for connectivities in group_entities.values():
+                node_ids.update(connectivities)
+
+    group_nodes = {node_id : coords for node_id, coords in nodes.items() if node_id in node_ids}
+
+    return group_nodes, group_geom_entities
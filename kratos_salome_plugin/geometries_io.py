@@ -14,9 +14,23 @@ based on the nodes and geometrical entities in a mesh.
 """
 
 # python imports
+import os
+import threading
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict, deque
+from queue import Queue, Full
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain
 import logging
 logger = logging.getLogger(__name__)
 
+# plugin imports
+from . import connectivity_reordering
+from .connectivity_reordering import GetReorderFunction # was defined here before, kept for backwards compatibility
+from .file_mesh_interface import NUM_NODES_PER_ENTITY_TYPE
+from . import profiling
+
 
 class Mesh:
     """Container for a mesh-interface, desription of what entities from it and the ModelPart name"""
@@ -66,17 +80,156 @@ class Mesh:
         return string_buf
 
 
+class ConversionState:
+    """State of the conversion of meshes into a ModelPart, returned by "GeometriesIO.AddMeshes"
+    It contains the fingerprints of the meshes and what they added to the ModelPart, which is
+    required for updating the ModelPart with "GeometriesIO.UpdateMeshes" after meshes were changed
+    """
+
+    def __init__(self, model_part_name, allow_multiple_main_meshes=False, coincident_nodes_tolerance=None):
+        self.model_part_name = model_part_name
+        self.elements   = _CreatedEntities()
+        self.conditions = _CreatedEntities()
+        self.mesh_records = [] # one per mesh, in the order of the meshes
+        # map: {main-mesh-identifier : _MainMesh}, None if all meshes have to belong to the same main mesh
+        self.main_meshes = OrderedDict() if allow_multiple_main_meshes else None
+        self.coincident_nodes_tolerance = coincident_nodes_tolerance
+
+    def GetMappingTables(self):
+        """returns the tables that map the Ids of the geometries (in Salome) to the Ids of the entities created from them, requires numpy
+        One dict per mesh (in the order of the meshes): {"model_part_name" : ..., "node_id_offset" : ..., "elements" : {element_name : table}, "conditions" : {condition_name : table}}
+        Each table is an array of shape (number of entities, 2) with the geometry-Ids (sorted) in the first and the entity-Ids in the second column,
+        see "GetEntityIdsFromMappingTable". The Nodes are not included since they have the same Ids as in Salome, shifted by "node_id_offset"
+        if meshes of multiple main meshes were converted (Nodes that were merged with coincident Nodes have the Id of the other Node)
+        """
+        import numpy as np
+        mapping_tables = []
+        for mesh_record in self.mesh_records:
+            mesh_mapping_tables = {
+                "model_part_name" : mesh_record.model_part_name,
+                "node_id_offset"  : mesh_record.node_id_offset
+            }
+            for entities_type, created_entities in [("elements", self.elements), ("conditions", self.conditions)]:
+                mesh_mapping_tables[entities_type] = {}
+                for entity_name, geometry_ids in mesh_record.geometry_ids[entities_type].items():
+                    geometry_ids = np.frombuffer(geometry_ids, dtype=np.int64)
+                    entity_ids = created_entities.entities_maps[entity_name].GetEntityIds(geometry_ids)
+                    sorted_indices = np.argsort(geometry_ids, kind="stable")
+                    mesh_mapping_tables[entities_type][entity_name] = np.column_stack((geometry_ids[sorted_indices]-mesh_record.geometry_id_offset, entity_ids[sorted_indices]))
+            mapping_tables.append(mesh_mapping_tables)
+        return mapping_tables
+
+    def SaveMappingTables(self, file_name_base):
+        """saves the mapping tables (see "GetMappingTables") as npy-files, one per mesh and entity, requires numpy
+        The files are named "<file_name_base>.<number of the mesh>.<elements/conditions>.<entity_name>.npy"
+        Returns the names of the saved files
+        """
+        import numpy as np
+        file_names = []
+        for i_mesh, mesh_mapping_tables in enumerate(self.GetMappingTables()):
+            for entities_type in ["elements", "conditions"]:
+                for entity_name, mapping_table in mesh_mapping_tables[entities_type].items():
+                    file_name = "{}.{}.{}.{}.npy".format(file_name_base, i_mesh+1, entities_type, entity_name)
+                    np.save(file_name, mapping_table)
+                    file_names.append(file_name)
+        logger.info('Saved {} mapping tables to "{}"'.format(len(file_names), os.path.dirname(os.path.abspath(file_name_base))))
+        return file_names
+
+    def __str__(self):
+        string_buf  = "ConversionState\n"
+        string_buf += "  ModelPart name: {}\n".format(self.model_part_name)
+        string_buf += "  Number of meshes: {}\n".format(len(self.mesh_records))
+        if self.main_meshes is not None:
+            string_buf += "  Number of main meshes: {}\n".format(len(self.main_meshes))
+        string_buf += "  Number of Elements: {}\n".format(self.elements.id_allocator.num_used_ids)
+        string_buf += "  Number of Conditions: {}\n".format(self.conditions.id_allocator.num_used_ids)
+        return string_buf
+
+
+class AddMeshesPlan:
+    """Result of "GeometriesIO.Plan", describes what "GeometriesIO.AddMeshes" would do with the meshes
+    It is based only on the number of Nodes and geometries in the meshes, hence the shared geometries
+    of different meshes (from which only one entity is created) are not known. Therefore the numbers of
+    entities and the Ids are the largest possible ones, they are exact if no geometries are shared
+    """
+
+    def __init__(self):
+        self.sub_model_parts = {} # tree of the SubModelParts: {name : {name_sub_sub_model_part : {...}}}
+        self.num_nodes = 0 # the meshes can share Nodes, hence this is the largest number of Nodes of a mesh
+        self.num_entities = {"elements" : {}, "conditions" : {}} # map: {entity_name : number of entities}
+        self.id_ranges = {"elements" : [], "conditions" : []} # list of (model_part_name, entity_name, first_id, last_id)
+        # one per mesh (in the order of the meshes): (number of Nodes, number of entities, number of Nodes of the entities)
+        # the Nodes of polygons and polyhedrons are not counted, since their number is not fixed
+        self.mesh_sizes = []
+        self.errors = []
+        self.warnings = []
+
+    def IsValid(self):
+        return len(self.errors) == 0
+
+    def PrintInfo(self, prefix_string=""):
+        return prefix_string + "AddMeshesPlan\n"
+
+    def PrintData(self, prefix_string=""):
+        def PrintSubModelParts(sub_model_parts, indentation):
+            string_buf = ""
+            for name, sub_sub_model_parts in sorted(sub_model_parts.items()):
+                string_buf += "{}{}{}\n".format(prefix_string, indentation, name)
+                string_buf += PrintSubModelParts(sub_sub_model_parts, indentation+"  ")
+            return string_buf
+
+        string_buf  = "{}  Is valid: {}\n".format(prefix_string, self.IsValid())
+        string_buf += "{}  Number of Nodes: {}\n".format(prefix_string, self.num_nodes)
+        string_buf += "{}  SubModelParts:\n".format(prefix_string)
+        string_buf += PrintSubModelParts(self.sub_model_parts, "    ")
+        for entities_type in ["elements", "conditions"]:
+            string_buf += "{}  {}:\n".format(prefix_string, entities_type.capitalize())
+            for model_part_name, entity_name, first_id, last_id in self.id_ranges[entities_type]:
+                string_buf += '{}    {} in "{}": Ids {} - {}\n'.format(prefix_string, entity_name, model_part_name, first_id, last_id)
+        for error in self.errors:
+            string_buf += "{}  Error: {}\n".format(prefix_string, error)
+        for warning in self.warnings:
+            string_buf += "{}  Warning: {}\n".format(prefix_string, warning)
+        return string_buf
+
+    def __str__(self):
+        string_buf = self.PrintInfo()
+        string_buf += self.PrintData()
+        return string_buf
+
+
 class GeometriesIO:
     """Creates Elements and Conditions based on the Geometries in a Mesh and adds them to a ModelPart"""
 
     @staticmethod
-    def AddMeshes(model_part, meshes):
+    def AddMeshes(model_part, meshes, use_arrays=False, num_threads=1, chunk_size=0, pipeline_depth=0, allow_multiple_main_meshes=False, coincident_nodes_tolerance=None, track_changes=False):
         """Keyword arguments:
         model_part -- the ModelPart to add the Nodes, Elements and Conditions
         meshes -- List of meshes from which to create the entities
         see "Mesh"
+        use_arrays -- retrieve the Nodes and geometrical entities from the MeshInterface as numpy arrays
+        (see "MeshInterface.GetNodesArray" and "MeshInterface.GetEntitiesArrays"), requires numpy
+        num_threads -- number of threads for retrieving the data of the meshes concurrently. Retrieving
+        the data from Salome is mostly waiting for the server, hence this can overlap. The meshes are
+        still added to the ModelPart in the order in which they are given, which keeps the numbering the same.
+        At most this many meshes are retrieved ahead. Cannot be combined with "pipeline_depth"
+        chunk_size -- if larger than 0 the Nodes and geometrical entities are retrieved and added in chunks of this size
+        (see "MeshInterface.GetNodesChunks" and "MeshInterface.GetEntitiesChunks"), requires numpy. Only the Ids are retrieved at once,
+        the coordinates and connectivities per chunk, which reduces the memory of the retrieved data. Since the chunks are retrieved while adding, "num_threads" is not used
+        pipeline_depth -- if larger than 0 a producer thread retrieves the next meshes while the current
+        mesh is added to the ModelPart. At most this many meshes are waiting to be added, which bounds the memory. The meshes are
+        still added in the order in which they are given. Cannot be combined with "num_threads", which also retrieves the next meshes ahead
+        allow_multiple_main_meshes -- allow meshes that belong to different main meshes (e.g. the fluid and the structure of a FSI model).
+        The Ids of the Nodes and geometries of each main mesh are shifted by an offset (the largest Id of the previous main meshes),
+        hence they don't collide. The meshes are added grouped by their main mesh
+        coincident_nodes_tolerance -- if given, Nodes of different main meshes whose distance is smaller than this are merged
+        (e.g. at the interface of the fluid and the structure), requires "allow_multiple_main_meshes"
+        track_changes -- compute the fingerprints of the meshes (see "MeshInterface.GetFingerprint"), then "UpdateMeshes" retrieves
+        only the meshes that were changed. Otherwise all meshes are retrieved again in the first update. Computing the fingerprints
+        requires retrieving the Ids of the meshes, hence it is only worth it if the ModelPart is updated later
 
         Ensures that the IDs are handled correctly when creating the entities
+        Returns the ConversionState, which is required for updating the ModelPart with "UpdateMeshes" after meshes were changed
         """
 
         if model_part.GetRootModelPart().NumberOfNodes() != 0:
@@ -85,49 +238,400 @@ class GeometriesIO:
             err_msg += 'This is required because otherwise the numbering of entities can get messed up'
             raise Exception(err_msg)
 
-        # maps to prevent recreating entities from the same geometry!
-        all_elements   = {} # map: {element_names   : {origin_ids : element} }
-        all_conditions = {} # map: {condition_names : {origin_ids : condition} }
+        GeometriesIO.__CheckRetrievalSettings(num_threads, pipeline_depth)
 
-        if len(meshes) > 0:
-            if not meshes[0].mesh_interface.DoMeshesBelongToSameMainMesh([m.mesh_interface for m in meshes]):
-                err_msg  = 'The meshes to be added to ModelPart "{}" '.format(model_part.FullName())
-                err_msg += 'don\'t belong to the same main mesh!\n'
-                err_msg += 'This is necessary to ensure a consistent numbering.'
-                raise Exception(err_msg)
+        if coincident_nodes_tolerance is not None:
+            if not allow_multiple_main_meshes:
+                raise Exception('Merging coincident Nodes requires "allow_multiple_main_meshes"!')
+            if coincident_nodes_tolerance <= 0.0:
+                raise Exception('The tolerance for merging coincident Nodes must be positive, got: {}'.format(coincident_nodes_tolerance))
 
-            for mesh in meshes:
-                default_mesh_description = {
-                    "elements"   : { },
-                    "conditions" : { }
-                }
+        # contains the maps to prevent recreating entities from the same geometry!
+        conversion_state = ConversionState(model_part.FullName(), allow_multiple_main_meshes, coincident_nodes_tolerance)
 
-                for k, v in default_mesh_description.items():
-                    if k not in mesh.mesh_description:
-                        mesh.mesh_description[k] = v
+        if len(meshes) > 0:
+            if not allow_multiple_main_meshes:
+                GeometriesIO.__CheckMeshesBelongToSameMainMesh(model_part, meshes)
+            _AddDefaultMeshDescriptions(meshes)
 
-                GeometriesIO.__AddEntitiesToModelPart(model_part, mesh, all_elements, all_conditions)
+            with profiling.Timer("GeometriesIO.AddMeshes", len(meshes)):
+                if track_changes:
+                    fingerprints = [_GetMeshFingerprint(mesh) for mesh in meshes]
+                else:
+                    fingerprints = [None] * len(meshes) # no fingerprint matches, hence all meshes count as changed in "UpdateMeshes"
+                conversion_state.mesh_records = [None] * len(meshes)
+                GeometriesIO.__AddMeshesWithRecords(model_part, meshes, list(range(len(meshes))), fingerprints, conversion_state, use_arrays, num_threads, chunk_size, pipeline_depth)
         else:
             logger.warning('Empty input, no meshes were added to ModelPart "{}"'.format(model_part.FullName()))
 
+        return conversion_state
+
+    @staticmethod
+    def UpdateMeshes(model_part, meshes, conversion_state, use_arrays=False, num_threads=1, chunk_size=0, pipeline_depth=0):
+        """Updates a ModelPart that was created with "AddMeshes" after some of the meshes were changed, added or removed
+        Only the meshes whose fingerprint changed are retrieved again (all of them if "AddMeshes" was called without "track_changes"). The entities (and Nodes) that were added only
+        by the changed meshes are removed and the changed meshes are added again, all other entities are not touched,
+        hence the Ids of the unchanged entities stay the same
+
+        Keyword arguments:
+        model_part -- the ModelPart that was passed to "AddMeshes"
+        meshes -- List of meshes that the ModelPart should contain now
+        conversion_state -- the ConversionState returned by "AddMeshes" (or by a previous update), it is updated
+        for the other arguments see "AddMeshes", meshes of multiple main meshes and merging coincident Nodes
+        are handled as configured in "AddMeshes"
+
+        Returns the updated ConversionState
+        """
+
+        if model_part.FullName() != conversion_state.model_part_name:
+            err_msg  = 'The ConversionState was created for ModelPart "{}", '.format(conversion_state.model_part_name)
+            err_msg += 'it cannot be used to update ModelPart "{}"!'.format(model_part.FullName())
+            raise Exception(err_msg)
+
+        GeometriesIO.__CheckRetrievalSettings(num_threads, pipeline_depth)
+
+        if len(meshes) > 0:
+            if conversion_state.main_meshes is None:
+                GeometriesIO.__CheckMeshesBelongToSameMainMesh(model_part, meshes)
+            _AddDefaultMeshDescriptions(meshes)
+
+        GeometriesIO.__UpdateIdAllocators(model_part, conversion_state)
+
+        fingerprints = [_GetMeshFingerprint(mesh) for mesh in meshes]
+
+        # the meshes with the same fingerprint as before are unchanged, their records are kept
+        removed_mesh_records = list(conversion_state.mesh_records)
+        mesh_records = []
+        for fingerprint in fingerprints:
+            mesh_record = next((r for r in removed_mesh_records if r.fingerprint == fingerprint), None)
+            if mesh_record is not None:
+                removed_mesh_records.remove(mesh_record)
+            mesh_records.append(mesh_record)
+
+        changed_meshes_indices = [i for i, mesh_record in enumerate(mesh_records) if mesh_record is None]
+        logger.info('Updating ModelPart "{}": {} of {} meshes changed, {} previous meshes are removed'.format(model_part.FullName(), len(changed_meshes_indices), len(meshes), len(removed_mesh_records)))
+
+        with profiling.Timer("GeometriesIO.RemoveMeshes", len(removed_mesh_records)):
+            GeometriesIO.__RemoveMeshRecords(model_part, removed_mesh_records, [r for r in mesh_records if r is not None], conversion_state)
+
+        conversion_state.mesh_records = mesh_records
+        with profiling.Timer("GeometriesIO.UpdateMeshes", len(changed_meshes_indices)):
+            GeometriesIO.__AddMeshesWithRecords(model_part, meshes, changed_meshes_indices, fingerprints, conversion_state, use_arrays, num_threads, chunk_size, pipeline_depth)
+
+        GeometriesIO.__RemoveUnusedSubModelParts(model_part, removed_mesh_records, mesh_records)
+
+        return conversion_state
+
     @staticmethod
-    def __AddEntitiesToModelPart(model_part, mesh, all_elems, all_conds):
+    def Plan(model_part, meshes, allow_multiple_main_meshes=False):
+        """Checks the meshes and their descriptions without retrieving the meshes, only the number of Nodes and geometries are used
+        Neither the ModelPart nor the meshes are modified. For "allow_multiple_main_meshes" see "AddMeshes"
+        Returns an AddMeshesPlan with the SubModelParts that would be created, the number of entities, their Ids and all errors that were found
+        """
+        plan = AddMeshesPlan()
+
+        def GetSubModelParts(current_model_part):
+            return {smp.Name : GetSubModelParts(smp) for smp in current_model_part.SubModelParts}
+        plan.sub_model_parts = GetSubModelParts(model_part)
+
+        root_model_part = model_part.GetRootModelPart()
+        if root_model_part.NumberOfNodes() != 0:
+            plan.errors.append('The Root-ModelPart "{}" is not empty!'.format(root_model_part.Name))
+
+        if len(meshes) == 0:
+            plan.warnings.append('Empty input, no meshes would be added to ModelPart "{}"'.format(model_part.FullName()))
+            return plan
+
+        meshes_are_valid = [mesh.mesh_interface.CheckMeshIsValid() for mesh in meshes]
+        for i_mesh, mesh_is_valid in enumerate(meshes_are_valid):
+            if not mesh_is_valid:
+                plan.errors.append('Mesh #{} is not valid!'.format(i_mesh+1))
+
+        if all(meshes_are_valid) and not allow_multiple_main_meshes and not meshes[0].mesh_interface.DoMeshesBelongToSameMainMesh([m.mesh_interface for m in meshes]):
+            plan.errors.append('The meshes to be added to ModelPart "{}" don\'t belong to the same main mesh!'.format(model_part.FullName()))
+
+        id_allocators = {
+            "elements"   : _IdAllocator([elem.Id for elem in root_model_part.Elements]),
+            "conditions" : _IdAllocator([cond.Id for cond in root_model_part.Conditions])
+        }
+        used_properties_ids = {} # map: {(entity_name, geometry_type) : {props_id : Mesh-numbers}}
+
+        for i_mesh, mesh in enumerate(meshes):
+            mesh_name = "#{}".format(i_mesh+1)
+
+            model_part_names = mesh.model_part_name.split(".") if mesh.model_part_name != "" else []
+            if "" in model_part_names:
+                plan.errors.append('Mesh {}: invalid ModelPart name "{}"'.format(mesh_name, mesh.model_part_name))
+            else:
+                sub_model_parts = plan.sub_model_parts
+                for name in model_part_names:
+                    sub_model_parts = sub_model_parts.setdefault(name, {})
+
+            for key in mesh.mesh_description:
+                if key not in id_allocators:
+                    plan.errors.append('Mesh {}: unknown key "{}" in the mesh description, only "elements" and "conditions" are allowed'.format(mesh_name, key))
+
+            if not meshes_are_valid[i_mesh]:
+                plan.mesh_sizes.append((0, 0, 0))
+                continue
+
+            num_nodes_mesh = mesh.mesh_interface.GetNumberOfNodes()
+            num_entities_mesh = 0
+            num_entity_nodes_mesh = 0
+            plan.num_nodes = max(plan.num_nodes, num_nodes_mesh)
+
+            for entities_type in ["elements", "conditions"]:
+                for geometry_type, entities_dict in mesh.mesh_description.get(entities_type, {}).items():
+                    try:
+                        num_geometries = mesh.mesh_interface.GetNumberOfGeometries(geometry_type)
+                    except Exception as e:
+                        plan.errors.append('Mesh {}: {}'.format(mesh_name, str(e).splitlines()[0]))
+                        continue
+
+                    if num_geometries < 1:
+                        plan.errors.append('Mesh {}: there are no geometries of type "{}" to create {} from'.format(mesh_name, geometry_type, entities_type))
+                        continue
+
+                    for entity_name, props_id in entities_dict.items():
+                        if not isinstance(props_id, int) or props_id < 0:
+                            plan.errors.append('Mesh {}: the Properties-Id of "{}" must be a non-negative integer, got "{}"'.format(mesh_name, entity_name, props_id))
+                            continue
+
+                        used_properties_ids.setdefault((entity_name, geometry_type), {}).setdefault(props_id, []).append(mesh_name)
+
+                        num_entities = plan.num_entities[entities_type]
+                        num_entities[entity_name] = num_entities.get(entity_name, 0) + num_geometries
+
+                        first_id = id_allocators[entities_type].Reserve(num_geometries)
+                        plan.id_ranges[entities_type].append((mesh.model_part_name, entity_name, first_id, first_id+num_geometries-1))
+
+                        num_entities_mesh += num_geometries
+                        num_entity_nodes_mesh += num_geometries * NUM_NODES_PER_ENTITY_TYPE.get(geometry_type, 0)
+
+            plan.mesh_sizes.append((num_nodes_mesh, num_entities_mesh, num_entity_nodes_mesh))
+
+        for (entity_name, geometry_type), props_ids in used_properties_ids.items():
+            if len(props_ids) > 1:
+                used_by = ", ".join(['{} in meshes {}'.format(props_id, ", ".join(mesh_names)) for props_id, mesh_names in sorted(props_ids.items())])
+                plan.warnings.append('"{}" is created from geometries of type "{}" with different Properties-Ids ({}), this fails if the meshes share geometries'.format(entity_name, geometry_type, used_by))
+
+        return plan
+
+    @staticmethod
+    def __UpdateIdAllocators(model_part, conversion_state):
+        """if entities were added to the ModelPart after the conversion (e.g. by the user),
+        their Ids are taken into account to not create new entities with the same Ids
+        the number of entities is not sufficient for detecting this, since other entities might have been removed
+        """
+        root_model_part = model_part.GetRootModelPart()
+        for created_entities, num_entities, entities in [
+            (conversion_state.elements,   root_model_part.NumberOfElements(),   root_model_part.Elements),
+            (conversion_state.conditions, root_model_part.NumberOfConditions(), root_model_part.Conditions)]:
+            id_allocator = created_entities.id_allocator
+            if num_entities != id_allocator.num_used_ids or not id_allocator.AreUsed(entity.Id for entity in entities):
+                logger.info('Entities were added to or removed from ModelPart "{}" after the conversion, their Ids are collected'.format(root_model_part.Name))
+                created_entities.id_allocator = _IdAllocator([entity.Id for entity in entities])
+
+    @staticmethod
+    def __CheckRetrievalSettings(num_threads, pipeline_depth):
+        if num_threads > 1 and pipeline_depth > 0:
+            err_msg  = 'Retrieving the meshes with multiple threads ({}) and in a pipeline (depth {}) is not possible!\n'.format(num_threads, pipeline_depth)
+            err_msg += 'Both retrieve the next meshes while the current one is added, use only one of them'
+            raise Exception(err_msg)
+
+    @staticmethod
+    def __CheckMeshesBelongToSameMainMesh(model_part, meshes):
+        if not meshes[0].mesh_interface.DoMeshesBelongToSameMainMesh([m.mesh_interface for m in meshes]):
+            err_msg  = 'The meshes to be added to ModelPart "{}" '.format(model_part.FullName())
+            err_msg += 'don\'t belong to the same main mesh!\n'
+            err_msg += 'This is necessary to ensure a consistent numbering.'
+            raise Exception(err_msg)
+
+    @staticmethod
+    def __AddMeshesWithRecords(model_part, meshes, meshes_indices, fingerprints, conversion_state, use_arrays, num_threads, chunk_size, pipeline_depth):
+        """adds the meshes with the given indices to the ModelPart and saves their records in the ConversionState
+        With multiple main meshes the meshes are added grouped by their main mesh (the known ones first), since
+        the offsets of the Ids of a new main mesh are computed from the Ids of the previously added main meshes
+        """
+        main_meshes = conversion_state.main_meshes
+        if main_meshes is None:
+            main_mesh_identifiers = {i : None for i in meshes_indices}
+        else:
+            main_mesh_identifiers = {i : meshes[i].mesh_interface.GetMainMeshIdentifier() for i in meshes_indices}
+            first_occurrences = {}
+            for i in meshes_indices:
+                first_occurrences.setdefault(main_mesh_identifiers[i], i)
+            meshes_indices = sorted(meshes_indices, key=lambda i: (main_mesh_identifiers[i] not in main_meshes, first_occurrences[main_mesh_identifiers[i]], i))
+
+        coincident_nodes = None
+        if conversion_state.coincident_nodes_tolerance is not None:
+            coincident_nodes = GeometriesIO.__CreateCoincidentNodesFinder(model_part.GetRootModelPart(), conversion_state)
+
+        meshes_to_add = [meshes[i] for i in meshes_indices]
+        for i, (mesh, mesh_data) in zip(meshes_indices, _RetrieveMeshesData(meshes_to_add, use_arrays, num_threads, chunk_size, pipeline_depth)):
+            main_mesh = None
+            if main_meshes is not None:
+                main_mesh = GeometriesIO.__GetMainMesh(main_meshes, main_mesh_identifiers[i])
+            conversion_state.mesh_records[i] = GeometriesIO.__AddEntitiesToModelPart(model_part, mesh, mesh_data, conversion_state, fingerprints[i], main_mesh, coincident_nodes)
+            if main_mesh is not None:
+                GeometriesIO.__CheckIdRangeOfMainMesh(main_meshes, main_mesh_identifiers[i])
+
+    @staticmethod
+    def __GetMainMesh(main_meshes, main_mesh_identifier):
+        """returns the main mesh with the given identifier, a new one starts after the largest Ids of the existing main meshes"""
+        main_mesh = main_meshes.get(main_mesh_identifier)
+        if main_mesh is None:
+            node_id_offset = max([m.node_id_offset+m.max_node_id for m in main_meshes.values()], default=0)
+            geometry_id_offset = max([m.geometry_id_offset+m.max_geometry_id for m in main_meshes.values()], default=0)
+            logger.info('Ids of main mesh "{}" are shifted by {} (Nodes) and {} (geometries)'.format(main_mesh_identifier, node_id_offset, geometry_id_offset))
+            main_mesh = main_meshes[main_mesh_identifier] = _MainMesh(node_id_offset, geometry_id_offset)
+        return main_mesh
+
+    @staticmethod
+    def __CheckIdRangeOfMainMesh(main_meshes, main_mesh_identifier):
+        """checks that the shifted Ids of a main mesh are below the offsets of the next main mesh
+        this can happen if a main mesh got larger Ids (e.g. by refining it) when updating the ModelPart
+        """
+        main_meshes_list = list(main_meshes.values())
+        main_mesh = main_meshes[main_mesh_identifier]
+        index = main_meshes_list.index(main_mesh)
+        if index+1 < len(main_meshes_list):
+            next_main_mesh = main_meshes_list[index+1]
+            if main_mesh.node_id_offset+main_mesh.max_node_id > next_main_mesh.node_id_offset or main_mesh.geometry_id_offset+main_mesh.max_geometry_id > next_main_mesh.geometry_id_offset:
+                err_msg  = 'The Ids of main mesh "{}" exceed the range that is reserved for it!\n'.format(main_mesh_identifier)
+                err_msg += 'The ModelPart has to be created again with "AddMeshes"'
+                raise Exception(err_msg)
+
+    @staticmethod
+    def __CreateCoincidentNodesFinder(root_model_part, conversion_state):
+        """creates the search structure for coincident Nodes, containing the Nodes that already exist in the ModelPart"""
+        main_meshes = conversion_state.main_meshes
+        coincident_nodes = _CoincidentNodesFinder(conversion_state.coincident_nodes_tolerance)
+        if root_model_part.NumberOfNodes() == 0:
+            return coincident_nodes
+
+        # the merged Nodes that no longer exist are created again
+        for main_mesh in main_meshes.values():
+            main_mesh.merged_node_ids = {node_id : merged_node_id for node_id, merged_node_id in main_mesh.merged_node_ids.items() if root_model_part.HasNode(merged_node_id)}
+
+        # each Node belongs to the main mesh with the largest offset below its Id
+        main_meshes_list = list(main_meshes.values())
+        node_id_offsets = [main_mesh.node_id_offset for main_mesh in main_meshes_list]
+        for node in root_model_part.Nodes:
+            index = bisect_left(node_id_offsets, node.Id) - 1
+            if index >= 0:
+                coincident_nodes.Add(node.Id, (node.X, node.Y, node.Z), main_meshes_list[index])
+
+        return coincident_nodes
+
+    @staticmethod
+    def __AddEntitiesToModelPart(model_part, mesh, mesh_data, conversion_state, fingerprint, main_mesh, coincident_nodes):
         model_part_to_add_to = GeometriesIO.__GetModelPartToAddTo(model_part, mesh.model_part_name)
 
         logger.info('Adding mesh to ModelPart "{}"'.format(model_part_to_add_to.FullName()))
 
         mesh_description = mesh.mesh_description
-        mesh_interface = mesh.mesh_interface
-        unique_keys = set(list(mesh_description["elements"].keys()) + list(mesh_description["conditions"].keys()))
-        nodes, geometries = mesh_interface.GetNodesAndGeometricalEntities(unique_keys)
+        nodes, geometries = mesh_data
+        mesh_record = _MeshRecord(fingerprint, mesh.model_part_name)
+        if main_mesh is not None:
+            mesh_record.node_id_offset = main_mesh.node_id_offset
+            mesh_record.geometry_id_offset = main_mesh.geometry_id_offset
 
-        GeometriesIO.__AddNodes(model_part_to_add_to, nodes)
+        GeometriesIO.__AddNodes(model_part_to_add_to, nodes, mesh_record.node_ids, main_mesh, coincident_nodes)
 
         # Get Properties => See "read_materials_utility.cpp" function "AssignPropertyBlock"
         if len(mesh_description["elements"]) > 0:
-            GeometriesIO.__AddElemensts(model_part_to_add_to, geometries, mesh_description["elements"], all_elems)
+            GeometriesIO.__AddElemensts(model_part_to_add_to, geometries, mesh_description["elements"], conversion_state.elements, mesh_record.geometry_ids["elements"], main_mesh)
         if len(mesh_description["conditions"]) > 0:
-            GeometriesIO.__AddConditions(model_part_to_add_to, geometries, mesh_description["conditions"], all_conds)
+            GeometriesIO.__AddConditions(model_part_to_add_to, geometries, mesh_description["conditions"], conversion_state.conditions, mesh_record.geometry_ids["conditions"], main_mesh)
+
+        return mesh_record
+
+    @staticmethod
+    def __RemoveMeshRecords(model_part, removed_mesh_records, kept_mesh_records, conversion_state):
+        """removes the Nodes and entities of the removed meshes from the ModelParts they were added to (incl. the parents)
+        unless they also belong to a kept mesh that was added to the same ModelPart (or one of its SubModelParts)
+        """
+        if len(removed_mesh_records) == 0:
+            return
+
+        def GetModelParts(mesh_record):
+            # the ModelPart the mesh was added to and all its parents, since they contain the entities too
+            current_model_part = GeometriesIO.__GetModelPartToAddTo(model_part, mesh_record.model_part_name)
+            model_parts = [current_model_part]
+            while current_model_part.IsSubModelPart():
+                current_model_part = current_model_part.GetParentModelPart()
+                model_parts.append(current_model_part)
+            return model_parts
+
+        def GetEntityIds(mesh_record, entities_type):
+            entities_maps = getattr(conversion_state, entities_type).entities_maps
+            return chain.from_iterable(entities_maps[entity_name].GetEntityIds(geometry_ids) for entity_name, geometry_ids in mesh_record.geometry_ids[entities_type].items())
+
+        # {ModelPart-name : [ModelPart, Node-Ids, Element-Ids, Condition-Ids]} of the candidates for removing
+        candidates = {}
+        for mesh_record in removed_mesh_records:
+            node_ids = set(mesh_record.node_ids)
+            element_ids = set(GetEntityIds(mesh_record, "elements"))
+            condition_ids = set(GetEntityIds(mesh_record, "conditions"))
+            for current_model_part in GetModelParts(mesh_record):
+                candidate = candidates.setdefault(current_model_part.FullName(), [current_model_part, set(), set(), set()])
+                candidate[1].update(node_ids)
+                candidate[2].update(element_ids)
+                candidate[3].update(condition_ids)
+
+        for mesh_record in kept_mesh_records:
+            for current_model_part in GetModelParts(mesh_record):
+                candidate = candidates.get(current_model_part.FullName())
+                if candidate is not None:
+                    candidate[1].difference_update(mesh_record.node_ids)
+                    candidate[2].difference_update(GetEntityIds(mesh_record, "elements"))
+                    candidate[3].difference_update(GetEntityIds(mesh_record, "conditions"))
+
+        # removing from a ModelPart also removes from its SubModelParts, the deepest ones are processed first
+        for current_model_part, node_ids, element_ids, condition_ids in sorted(candidates.values(), key=lambda c: -c[0].FullName().count(".")):
+            logger.debug('Removing {} Nodes, {} Elements and {} Conditions from ModelPart "{}"'.format(len(node_ids), len(element_ids), len(condition_ids), current_model_part.FullName()))
+            for node_id in node_ids:
+                current_model_part.RemoveNode(node_id)
+            for element_id in element_ids:
+                current_model_part.RemoveElement(element_id)
+            for condition_id in condition_ids:
+                current_model_part.RemoveCondition(condition_id)
+
+        # the entities that no longer exist must be created again if their geometries are added again
+        root_candidate = candidates[model_part.GetRootModelPart().FullName()]
+        conversion_state.elements.id_allocator.Release(len(root_candidate[2]))
+        conversion_state.conditions.id_allocator.Release(len(root_candidate[3]))
+        for mesh_record in removed_mesh_records:
+            for entities_type, removed_entity_ids in [("elements", root_candidate[2]), ("conditions", root_candidate[3])]:
+                entities_maps = getattr(conversion_state, entities_type).entities_maps
+                for entity_name, geometry_ids in mesh_record.geometry_ids[entities_type].items():
+                    entities_map = entities_maps[entity_name]
+                    entity_ids = entities_map.GetEntityIds(geometry_ids)
+                    entities_map.RemoveGeometries([g_id for g_id, e_id in zip(geometry_ids, entity_ids) if e_id in removed_entity_ids])
+
+    @staticmethod
+    def __RemoveUnusedSubModelParts(model_part, removed_mesh_records, mesh_records):
+        """removes the (empty) SubModelParts that were created for the removed meshes and are no longer used"""
+        used_model_part_names = set()
+        for mesh_record in mesh_records:
+            names = mesh_record.model_part_name.split(".")
+            used_model_part_names.update(".".join(names[:i+1]) for i in range(len(names)))
+
+        for mesh_record in removed_mesh_records:
+            names = mesh_record.model_part_name.split(".") if mesh_record.model_part_name != "" else []
+            while len(names) > 0 and ".".join(names) not in used_model_part_names:
+                parent_model_part = model_part
+                for name in names[:-1]:
+                    parent_model_part = parent_model_part.GetSubModelPart(name)
+                if not parent_model_part.HasSubModelPart(names[-1]):
+                    break # already removed
+                sub_model_part = parent_model_part.GetSubModelPart(names[-1])
+                if sub_model_part.NumberOfNodes() > 0 or sub_model_part.NumberOfSubModelParts() > 0:
+                    break # e.g. created by the user
+                logger.debug('Removing unused SubModelPart "{}"'.format(sub_model_part.FullName()))
+                parent_model_part.RemoveSubModelPart(names[-1])
+                names.pop()
 
     @staticmethod
     def __GetModelPartToAddTo(model_part, model_part_name):
@@ -152,56 +656,85 @@ class GeometriesIO:
             return RecursiveCreateModelParts(model_part, model_part_name)
 
     @staticmethod
-    def __AddNodes(model_part_to_add_to, new_nodes):
+    def __AddNodes(model_part_to_add_to, new_nodes, added_node_ids, main_mesh, coincident_nodes):
         # Note: NOT checking the coordinates here since this is done in the ModelPart
-        for node_id, node_coords in new_nodes.items():
-            model_part_to_add_to.CreateNewNode(node_id, node_coords[0], node_coords[1], node_coords[2])
+        num_previously_added_nodes = len(added_node_ids)
+        with profiling.Timer("GeometriesIO.AddNodes") as timer:
+            if coincident_nodes is None:
+                for node_id, node_coords in _IterateNodes(new_nodes, main_mesh):
+                    model_part_to_add_to.CreateNewNode(node_id, node_coords[0], node_coords[1], node_coords[2])
+                    added_node_ids.append(node_id)
+            else:
+                root_model_part = model_part_to_add_to.GetRootModelPart()
+                merged_node_ids = main_mesh.merged_node_ids
+                existing_node_ids = []
+                for node_id, node_coords in _IterateNodes(new_nodes, main_mesh):
+                    if not root_model_part.HasNode(node_id):
+                        merged_node_id = merged_node_ids.get(node_id)
+                        if merged_node_id is None:
+                            merged_node_id = coincident_nodes.Find(node_coords, main_mesh)
+                        if merged_node_id is not None:
+                            # the Node of the other main mesh is used instead
+                            merged_node_ids[node_id] = merged_node_id
+                            existing_node_ids.append(merged_node_id)
+                            added_node_ids.append(merged_node_id)
+                            continue
+                        coincident_nodes.Add(node_id, node_coords, main_mesh)
+                    model_part_to_add_to.CreateNewNode(node_id, node_coords[0], node_coords[1], node_coords[2])
+                    added_node_ids.append(node_id)
+                if len(existing_node_ids) > 0:
+                    logger.info('{} Nodes were merged with coincident Nodes of other main meshes'.format(len(existing_node_ids)))
+                    model_part_to_add_to.AddNodes(existing_node_ids)
+            timer.count = len(added_node_ids) - num_previously_added_nodes
 
     @staticmethod
-    def __AddElemensts(model_part_to_add_to, geometries, elements_creation, all_elements):
-        element_id_counter = model_part_to_add_to.GetRootModelPart().NumberOfElements() + 1
-
-        def CreateAndSaveNewElement(element_name, geometry_id, connectivities, properties, element_id_counter):
-            new_element = model_part_to_add_to.CreateNewElement(element_name, element_id_counter, connectivities, properties)
-            all_elements[element_name][geometry_id] = new_element
-            return element_id_counter+1
+    def __AddElemensts(model_part_to_add_to, geometries, elements_creation, created_elements, added_geometry_ids, main_mesh):
+        def CreateNewElements(element_name, connectivities, properties, first_element_id):
+            if hasattr(model_part_to_add_to, "CreateNewElements"): # the ModelPart of Kratos can create them only one by one
+                model_part_to_add_to.CreateNewElements(element_name, first_element_id, connectivities, properties)
+            else:
+                for element_id, element_connectivities in enumerate(connectivities, start=first_element_id):
+                    model_part_to_add_to.CreateNewElement(element_name, element_id, element_connectivities, properties)
 
-        def AddExistingElement(model_part, element):
-            model_part.AddElement(element, 0) # 0 is the mesh_id, required for Kratos
+        def AddExistingElements(model_part, element_ids):
+            model_part.AddElements(element_ids)
 
         GeometriesIO.__AddGeometricalEntities(model_part_to_add_to,
                                               geometries,
                                               elements_creation,
-                                              all_elements,
-                                              CreateAndSaveNewElement,
-                                              AddExistingElement,
-                                              element_id_counter)
+                                              created_elements,
+                                              CreateNewElements,
+                                              AddExistingElements,
+                                              added_geometry_ids,
+                                              main_mesh)
 
     @staticmethod
-    def __AddConditions(model_part_to_add_to, geometries, conditions_creation, all_conditions):
-        condition_id_counter = model_part_to_add_to.GetRootModelPart().NumberOfConditions() + 1
-
-        def CreateAndSaveNewCondition(condition_name, geometry_id, connectivities, properties, condition_id_counter):
-            new_condition = model_part_to_add_to.CreateNewCondition(condition_name, condition_id_counter, connectivities, properties)
-            all_conditions[condition_name][geometry_id] = new_condition
-            return condition_id_counter+1
+    def __AddConditions(model_part_to_add_to, geometries, conditions_creation, created_conditions, added_geometry_ids, main_mesh):
+        def CreateNewConditions(condition_name, connectivities, properties, first_condition_id):
+            if hasattr(model_part_to_add_to, "CreateNewConditions"): # the ModelPart of Kratos can create them only one by one
+                model_part_to_add_to.CreateNewConditions(condition_name, first_condition_id, connectivities, properties)
+            else:
+                for condition_id, condition_connectivities in enumerate(connectivities, start=first_condition_id):
+                    model_part_to_add_to.CreateNewCondition(condition_name, condition_id, condition_connectivities, properties)
 
-        def AddExistingCondition(model_part, condition):
-            model_part.AddCondition(condition, 0) # 0 is the mesh_id, required for Kratos
+        def AddExistingConditions(model_part, condition_ids):
+            model_part.AddConditions(condition_ids)
 
         GeometriesIO.__AddGeometricalEntities(model_part_to_add_to,
                                               geometries,
                                               conditions_creation,
-                                              all_conditions,
-                                              CreateAndSaveNewCondition,
-                                              AddExistingCondition,
-                                              condition_id_counter)
+                                              created_conditions,
+                                              CreateNewConditions,
+                                              AddExistingConditions,
+                                              added_geometry_ids,
+                                              main_mesh)
 
     @staticmethod
-    def __AddGeometricalEntities(model_part_to_add_to, geometries, entities_creation, all_entities, fct_ptr_create_save_new_entity, fct_ptr_add_existing_entity, id_counter):
-        for geometry_type, entities_dict in entities_creation.items():
-            reorder_conn_fct_ptr = GetReorderFunction(geometry_type)
+    def __AddGeometricalEntities(model_part_to_add_to, geometries, entities_creation, created_entities, fct_ptr_create_new_entities, fct_ptr_add_existing_entities, added_geometry_ids, main_mesh):
+        all_entities = created_entities.entities_maps
+        id_allocator = created_entities.id_allocator
 
+        for geometry_type, entities_dict in entities_creation.items():
             for entity_name, props_id in entities_dict.items():
 
                 if model_part_to_add_to.RecursivelyHasProperties(props_id):
@@ -217,42 +750,487 @@ class GeometriesIO:
 
                 if entity_name in all_entities: # entities of this type already exist
                     logger.debug('Entities with name "{}" exist already'.format(entity_name))
-
-                    for geometry_id, connectivities in geometries[geometry_type].items():
-                        existing_entity = all_entities[entity_name].get(geometry_id)
-                        if existing_entity:
-                            # an entity was already created from this geometry
-                            # therefore NOT creating a new one but adding the existing one
-                            if props_id != existing_entity.Properties.Id:
-                                err_msg  = 'Mismatch in properties Ids!\n'
-                                err_msg += 'Trying to use properties with Id {} '.format(props_id)
-                                err_msg += 'with an existing entity that has the properties with Id {}'.format(existing_entity.Properties.Id)
-                                raise Exception(err_msg)
-                            fct_ptr_add_existing_entity(model_part_to_add_to, existing_entity)
-                            already_existing_entities+=1
-                        else:
-                            # no entity has yet been created from this geometry
-                            # hence creating a new one
-                            reordered_conn = reorder_conn_fct_ptr(connectivities)
-                            id_counter = fct_ptr_create_save_new_entity(entity_name, geometry_id, reordered_conn, props, id_counter)
-                            newly_created_entities+=1
-
-                else: # no entities of this type exist yet, new entities can be added without checking
+                else:
                     logger.debug('No entities with name "{}" exist already'.format(entity_name))
-                    all_entities[entity_name] = {}
-                    for geometry_id, connectivities in geometries[geometry_type].items():
-                        reordered_conn = reorder_conn_fct_ptr(connectivities)
-                        id_counter = fct_ptr_create_save_new_entity(entity_name, geometry_id, reordered_conn, props, id_counter)
-                        newly_created_entities+=1
+                    all_entities[entity_name] = _GeometryEntitiesMap()
+                entities_map = all_entities[entity_name]
+
+                for geometry_ids, connectivities in _IterateGeometryBlocks(geometries[geometry_type], geometry_type, main_mesh):
+                    # entities that were already created from these geometries are NOT created again, the existing ones are added
+                    with profiling.Timer("GeometriesIO.FindExistingEntities", len(geometry_ids)):
+                        existing_entity_ids, new_geometries_indices = entities_map.FindExistingEntities(geometry_ids, props_id)
+
+                    if len(existing_entity_ids) > 0:
+                        with profiling.Timer("GeometriesIO.AddExistingEntities", len(existing_entity_ids)):
+                            fct_ptr_add_existing_entities(model_part_to_add_to, existing_entity_ids)
+                        already_existing_entities += len(existing_entity_ids)
+
+                    with profiling.Timer("GeometriesIO.CreateEntities", len(new_geometries_indices)):
+                        # the reserved Ids are checked only once for existing entities (if supported by the ModelPart)
+                        first_new_id = id_allocator.Reserve(len(new_geometries_indices))
+                        fct_ptr_create_new_entities(entity_name, [connectivities[i] for i in new_geometries_indices], props, first_new_id)
+                        entities_map.AddEntities(geometry_ids, new_geometries_indices, first_new_id, props_id)
+                    newly_created_entities += len(new_geometries_indices)
+
+                    _AppendIds(added_geometry_ids.setdefault(entity_name, array('q')), geometry_ids)
 
                 logger.debug('{} new entities were created and {} existed already'.format(newly_created_entities, already_existing_entities))
 
 
-def GetReorderFunction(salome_entity_type):
-    # for some entities the node ordering differs between Salome and Kratos
-    # those have to be corrected
-    return {
-        "Tetra" : lambda conn: [conn[i] for i in [0, 2, 1, 3]],
-        "Hexa"  : lambda conn: [conn[i] for i in [0, 3, 2, 1, 4, 7, 6, 5]],
-        "Penta" : lambda conn: [conn[i] for i in [0, 2, 1, 3, 5, 4]]
-    }.get(salome_entity_type, lambda conn: conn)
+def GetEntityIdsFromMappingTable(mapping_table, geometry_ids):
+    """returns the Ids of the entities created from the given geometries (numpy array), see "ConversionState.GetMappingTables"
+    The lookup is vectorized, e.g. results of the entities can be mapped back to the geometries with "results[GetEntityIdsFromMappingTable(...)]"
+    """
+    import numpy as np
+    geometry_ids = np.asarray(geometry_ids, dtype=np.int64)
+    if mapping_table.shape[0] == 0:
+        indices = np.zeros(geometry_ids.size, dtype=np.int64)
+        not_found = np.ones(geometry_ids.size, dtype=bool)
+    else:
+        indices = np.minimum(np.searchsorted(mapping_table[:,0], geometry_ids), mapping_table.shape[0]-1)
+        not_found = mapping_table[indices,0] != geometry_ids
+    if not_found.any():
+        raise Exception('No entities were created from the geometries with Ids: {}'.format(geometry_ids[not_found].tolist()))
+    return mapping_table[indices,1]
+
+
+class _CreatedEntities:
+    """The Elements or Conditions created by the GeometriesIO"""
+
+    def __init__(self):
+        self.entities_maps = {} # map: {entity_name : _GeometryEntitiesMap}
+        self.id_allocator = _IdAllocator()
+
+
+class _IdAllocator:
+    """Allocates the Ids for new entities. The free Ids are saved as ranges, the last one is open,
+    hence existing Ids (also sparse ones) are never used again and checking for them is not necessary
+    A contiguous block of Ids is reserved for all new entities at once, which is O(1) unless gaps
+    between the existing Ids have to be skipped because they are too small
+    The Ids of removed entities are not freed, hence they are not reused for other entities
+    """
+
+    def __init__(self, used_ids=[]):
+        self.__starts = [] # first Id of each free range
+        self.__ends   = [] # last Id of each free range, None for the last (open) range
+        next_free_id = 1
+        for used_id in sorted(used_ids):
+            if used_id > next_free_id:
+                self.__starts.append(next_free_id)
+                self.__ends.append(used_id-1)
+            next_free_id = max(next_free_id, used_id+1)
+        self.__starts.append(next_free_id)
+        self.__ends.append(None)
+
+        self.num_used_ids = len(used_ids)
+
+    def Reserve(self, num_ids):
+        """reserves a contiguous block of Ids and returns the first Id of it"""
+        for i, (start, end) in enumerate(zip(self.__starts, self.__ends)):
+            if end is None or end-start+1 >= num_ids:
+                if end is not None and end-start+1 == num_ids:
+                    del self.__starts[i]
+                    del self.__ends[i]
+                else:
+                    self.__starts[i] += num_ids
+                self.num_used_ids += num_ids
+                return start
+
+    def Release(self, num_ids):
+        """the entities were removed, but their Ids are not reused"""
+        self.num_used_ids -= num_ids
+
+    def AreUsed(self, ids):
+        """returns whether all of the given Ids are used, i.e. none of them is in a free range and could be reserved"""
+        for used_id in ids:
+            i = bisect_right(self.__starts, used_id) - 1
+            if i >= 0 and (self.__ends[i] is None or used_id <= self.__ends[i]):
+                return False
+        return True
+
+
+class _MainMesh:
+    """The Ids of the Nodes and geometries of one main mesh are shifted by these offsets, which avoids
+    collisions with the Ids of the other main meshes. The shifted Ids are used in the ModelPart and the mesh records
+    """
+
+    def __init__(self, node_id_offset, geometry_id_offset):
+        self.node_id_offset = node_id_offset
+        self.geometry_id_offset = geometry_id_offset
+        self.max_node_id = 0 # largest (not shifted) Ids that were added, the next main mesh starts after them
+        self.max_geometry_id = 0
+        self.merged_node_ids = {} # map: {shifted Node-Id : Id of the coincident Node of another main mesh that is used instead}
+
+
+class _CoincidentNodesFinder:
+    """Finds coincident Nodes of other main meshes
+    The Nodes are sorted into the cells of a regular grid whose size is the tolerance, hence only the Nodes in the
+    neighboring cells have to be checked
+    """
+
+    def __init__(self, tolerance):
+        self.__tolerance = tolerance
+        self.__cells = {} # map: {cell-indices : [(node_id, coordinates, main_mesh)]}
+
+    def Add(self, node_id, coords, main_mesh):
+        self.__cells.setdefault(self.__GetCell(coords), []).append((node_id, coords, main_mesh))
+
+    def Find(self, coords, main_mesh):
+        """returns the Id of the closest Node of another main mesh within the tolerance, None if there is no such Node"""
+        i, j, k = self.__GetCell(coords)
+        closest_node_id = None
+        closest_distance_squared = self.__tolerance**2
+        for di in (-1, 0, 1):
+            for dj in (-1, 0, 1):
+                for dk in (-1, 0, 1):
+                    for node_id, other_coords, other_main_mesh in self.__cells.get((i+di, j+dj, k+dk), []):
+                        if other_main_mesh is main_mesh:
+                            continue
+                        distance_squared = sum([(c1-c2)**2 for c1, c2 in zip(coords, other_coords)])
+                        if distance_squared <= closest_distance_squared:
+                            closest_node_id = node_id
+                            closest_distance_squared = distance_squared
+        return closest_node_id
+
+    def __GetCell(self, coords):
+        return tuple([int(c // self.__tolerance) for c in coords])
+
+
+class _MeshRecord:
+    """What one mesh added to the ModelPart, the entities are saved by the Ids of their geometries"""
+
+    def __init__(self, fingerprint, model_part_name):
+        self.fingerprint = fingerprint
+        self.model_part_name = model_part_name
+        self.node_id_offset = 0 # offsets of the Ids of the main mesh, see "_MainMesh"
+        self.geometry_id_offset = 0
+        self.node_ids = array('q')
+        self.geometry_ids = {
+            "elements"   : {}, # map: {element_name   : geometry-Ids}
+            "conditions" : {}  # map: {condition_name : geometry-Ids}
+        }
+
+
+class _GeometryEntitiesMap:
+    """Maps the Ids of the geometries to the Ids (and Properties-Ids) of the entities created from them, for one entity-name
+    The Ids of the geometries in Salome are consecutive, hence dense tables (indexed by the geometry-Id) are used,
+    which need 16 bytes per geometry instead of a dict-entry and a reference to the entity
+    The geometry-Ids can be given as list (checked one by one) or as numpy array (checked at once)
+    """
+
+    def __init__(self):
+        self.__entity_ids = array('q') # 0 means that no entity was created from the geometry
+        self.__properties_ids = array('q')
+
+    def FindExistingEntities(self, geometry_ids, props_id):
+        """returns the Ids of the entities that were already created from the given geometries
+        and the indices (in "geometry_ids") of the geometries from which no entity was created yet
+        """
+        if isinstance(geometry_ids, list):
+            num_geometries = len(self.__entity_ids)
+            existing_entity_ids = []
+            new_geometries_indices = []
+            for i, geometry_id in enumerate(geometry_ids):
+                entity_id = self.__entity_ids[geometry_id] if geometry_id < num_geometries else 0
+                if entity_id > 0:
+                    self.__CheckPropertiesId(props_id, self.__properties_ids[geometry_id])
+                    existing_entity_ids.append(entity_id)
+                else:
+                    new_geometries_indices.append(i)
+            return existing_entity_ids, new_geometries_indices
+
+        import numpy as np
+        if len(self.__entity_ids) == 0:
+            return [], list(range(geometry_ids.size))
+
+        entity_ids_table = np.frombuffer(self.__entity_ids, dtype=np.int64)
+        entity_ids = np.zeros(geometry_ids.size, dtype=np.int64)
+        in_table = geometry_ids < entity_ids_table.size
+        entity_ids[in_table] = entity_ids_table[geometry_ids[in_table]]
+        existing = entity_ids > 0
+
+        if existing.any():
+            existing_props_ids = np.frombuffer(self.__properties_ids, dtype=np.int64)[geometry_ids[existing]]
+            mismatch = existing_props_ids != props_id
+            if mismatch.any():
+                self.__CheckPropertiesId(props_id, existing_props_ids[mismatch][0])
+
+        return entity_ids[existing].tolist(), np.flatnonzero(~existing).tolist()
+
+    def AddEntities(self, geometry_ids, new_geometries_indices, first_entity_id, props_id):
+        """saves the entities created from the geometries, their Ids are consecutive starting with "first_entity_id" """
+        if len(new_geometries_indices) == 0:
+            return
+
+        if isinstance(geometry_ids, list):
+            new_geometry_ids = [geometry_ids[i] for i in new_geometries_indices]
+            self.__Resize(max(new_geometry_ids)+1)
+            for entity_id, geometry_id in enumerate(new_geometry_ids, start=first_entity_id):
+                self.__entity_ids[geometry_id] = entity_id
+                self.__properties_ids[geometry_id] = props_id
+        else:
+            import numpy as np
+            new_geometry_ids = geometry_ids[new_geometries_indices]
+            self.__Resize(int(new_geometry_ids.max())+1)
+            np.frombuffer(self.__entity_ids, dtype=np.int64)[new_geometry_ids] = np.arange(first_entity_id, first_entity_id+new_geometry_ids.size)
+            np.frombuffer(self.__properties_ids, dtype=np.int64)[new_geometry_ids] = props_id
+
+    def GetEntityIds(self, geometry_ids):
+        """returns the Ids of the entities created from the given geometries, 0 if no entity was created from a geometry
+        for geometry-Ids given as numpy array, the entity-Ids are returned as numpy array
+        """
+        num_geometries = len(self.__entity_ids)
+        if isinstance(geometry_ids, (list, array)):
+            return [self.__entity_ids[geometry_id] if geometry_id < num_geometries else 0 for geometry_id in geometry_ids]
+
+        import numpy as np
+        entity_ids = np.zeros(geometry_ids.size, dtype=np.int64)
+        if num_geometries > 0:
+            in_table = geometry_ids < num_geometries
+            entity_ids[in_table] = np.frombuffer(self.__entity_ids, dtype=np.int64)[geometry_ids[in_table]]
+        return entity_ids
+
+    def RemoveGeometries(self, geometry_ids):
+        """removes the entities created from the given geometries, new entities will be created if they are added again"""
+        num_geometries = len(self.__entity_ids)
+        for geometry_id in geometry_ids:
+            if geometry_id < num_geometries:
+                self.__entity_ids[geometry_id] = 0
+
+    def __Resize(self, size):
+        num_missing = size - len(self.__entity_ids)
+        if num_missing > 0:
+            self.__entity_ids.frombytes(bytes(num_missing*self.__entity_ids.itemsize))
+            self.__properties_ids.frombytes(bytes(num_missing*self.__properties_ids.itemsize))
+
+    @staticmethod
+    def __CheckPropertiesId(props_id, existing_props_id):
+        if props_id != existing_props_id:
+            err_msg  = 'Mismatch in properties Ids!\n'
+            err_msg += 'Trying to use properties with Id {} '.format(props_id)
+            err_msg += 'with an existing entity that has the properties with Id {}'.format(existing_props_id)
+            raise Exception(err_msg)
+
+
+class _MeshDataChunks:
+    """Re-iterable source of chunks of Nodes or geometries
+    Each iteration retrieves the chunks again from the MeshInterface, hence the chunks are not kept in memory.
+    This is necessary since the geometries of one type are iterated once per entity that is created from them
+    """
+
+    def __init__(self, fct_ptr_get_chunks, *args):
+        self.__fct_ptr_get_chunks = fct_ptr_get_chunks
+        self.__args = args
+
+    def __iter__(self):
+        return self.__fct_ptr_get_chunks(*self.__args)
+
+
+def _AddDefaultMeshDescriptions(meshes):
+    for mesh in meshes:
+        default_mesh_description = {
+            "elements"   : { },
+            "conditions" : { }
+        }
+
+        for k, v in default_mesh_description.items():
+            if k not in mesh.mesh_description:
+                mesh.mesh_description[k] = v
+
+def _GetMeshFingerprint(mesh):
+    """the fingerprint of a mesh changes if the mesh itself, its description or the ModelPart it is added to changes"""
+    mesh_description = sorted((entities_type, sorted((geometry_type, sorted(entities.items())) for geometry_type, entities in entities_dict.items()))
+                              for entities_type, entities_dict in mesh.mesh_description.items())
+    return (mesh.mesh_interface.GetFingerprint(), repr(mesh_description), mesh.model_part_name)
+
+def _AppendIds(ids_array, ids):
+    """appends the Ids (given as list or as numpy array) to an array('q')"""
+    if isinstance(ids, list):
+        ids_array.extend(ids)
+    else:
+        ids_array.frombytes(ids.astype('int64', copy=False).tobytes())
+
+def _RetrieveMeshData(mesh, use_arrays, chunk_size=0):
+    """retrieves the Nodes and the geometries required by the mesh-description from the MeshInterface
+    with chunks the data is not retrieved here but only once it is iterated
+    """
+    mesh_description = mesh.mesh_description
+    mesh_interface = mesh.mesh_interface
+    unique_keys = set(list(mesh_description["elements"].keys()) + list(mesh_description["conditions"].keys()))
+    if chunk_size > 0:
+        nodes = _MeshDataChunks(mesh_interface.GetNodesChunks, chunk_size)
+        geometries = {geometry_type : _MeshDataChunks(mesh_interface.GetEntitiesChunks, geometry_type, chunk_size) for geometry_type in unique_keys}
+        return nodes, geometries
+    with profiling.Timer("GeometriesIO.RetrieveMeshData", 1):
+        if use_arrays:
+            return mesh_interface.GetNodesArray(), mesh_interface.GetEntitiesArrays(unique_keys)
+        else:
+            return mesh_interface.GetNodesAndGeometricalEntities(unique_keys)
+
+def _RetrieveMeshesData(meshes, use_arrays, num_threads, chunk_size=0, pipeline_depth=0):
+    """generator yielding the meshes together with their data (nodes, geometries) in the order of the input
+    with more than one thread the data of the meshes is retrieved concurrently in a ThreadPool
+    with a pipeline the data of the meshes is retrieved one after the other in a producer thread
+    """
+    if chunk_size > 0:
+        # the chunks are retrieved while adding them, hence retrieving concurrently is not possible
+        for mesh in meshes:
+            yield mesh, _RetrieveMeshData(mesh, use_arrays, chunk_size)
+    elif num_threads > 1 and len(meshes) > 1:
+        logger.debug('Retrieving the data of {} meshes with {} threads'.format(len(meshes), num_threads))
+        executor = ThreadPoolExecutor(max_workers=num_threads)
+        # at most "num_threads" meshes are retrieved ahead, this way the data of all meshes is not held in memory at the same time
+        meshes_iter = iter(meshes)
+        futures = deque()
+        def SubmitNextMesh():
+            mesh = next(meshes_iter, None)
+            if mesh is not None:
+                futures.append((mesh, executor.submit(_RetrieveMeshData, mesh, use_arrays)))
+        try:
+            for _ in range(num_threads):
+                SubmitNextMesh()
+            while futures:
+                mesh, future = futures.popleft()
+                mesh_data = future.result()
+                SubmitNextMesh()
+                yield mesh, mesh_data
+        finally:
+            # e.g. if adding a mesh failed, no need to retrieve the remaining ones
+            for _, future in futures:
+                future.cancel()
+            executor.shutdown(wait=True)
+    elif pipeline_depth > 0 and len(meshes) > 1:
+        logger.debug('Retrieving the data of {} meshes in a pipeline with depth {}'.format(len(meshes), pipeline_depth))
+        yield from _RetrieveMeshesDataPipelined(meshes, use_arrays, pipeline_depth)
+    else:
+        for mesh in meshes:
+            yield mesh, _RetrieveMeshData(mesh, use_arrays)
+
+def _RetrieveMeshesDataPipelined(meshes, use_arrays, pipeline_depth):
+    """generator yielding the meshes together with their data (nodes, geometries) in the order of the input
+    the data is retrieved in a producer thread and passed through a bounded queue,
+    hence the next meshes are retrieved while the current one is being processed
+    exceptions in the producer are raised when the corresponding mesh would be yielded
+    """
+    data_queue = Queue(maxsize=pipeline_depth)
+    stop_producing = threading.Event()
+    end_of_meshes = object()
+
+    def PutInQueue(item):
+        # not blocking forever, the consumer might have stopped
+        while not stop_producing.is_set():
+            try:
+                data_queue.put(item, timeout=0.1)
+                return True
+            except Full:
+                pass
+        return False
+
+    def Producer():
+        for mesh in meshes:
+            if stop_producing.is_set():
+                return
+            try:
+                item = (mesh, _RetrieveMeshData(mesh, use_arrays), None)
+            except Exception as e:
+                PutInQueue((mesh, None, e))
+                return
+            if not PutInQueue(item):
+                return
+        PutInQueue(end_of_meshes)
+
+    producer_thread = threading.Thread(target=Producer, name="GeometriesIO-Producer", daemon=True)
+    producer_thread.start()
+
+    try:
+        while True:
+            item = data_queue.get()
+            if item is end_of_meshes:
+                break
+            mesh, mesh_data, exception = item
+            if exception is not None:
+                raise exception
+            yield mesh, mesh_data
+    finally:
+        # e.g. if adding a mesh failed, no need to retrieve the remaining ones
+        stop_producing.set()
+        producer_thread.join()
+
+def _IterateNodes(nodes, main_mesh=None):
+    """iterates the Nodes as pairs of (node_id, coordinates)
+    the Nodes can be given as dict ({node_id : coordinates}), as arrays ((ids, coords), see "MeshInterface.GetNodesArray")
+    or in chunks of arrays (see "MeshInterface.GetNodesChunks")
+    if the main mesh is given, the Ids are shifted by its offset
+    """
+    if isinstance(nodes, _MeshDataChunks):
+        return chain.from_iterable(_IterateNodes(chunk, main_mesh) for chunk in nodes)
+    if isinstance(nodes, dict):
+        if main_mesh is None:
+            return nodes.items()
+        if len(nodes) > 0:
+            main_mesh.max_node_id = max(main_mesh.max_node_id, max(nodes.keys()))
+        node_id_offset = main_mesh.node_id_offset
+        return ((node_id+node_id_offset, node_coords) for node_id, node_coords in nodes.items())
+    ids, coords = nodes
+    if main_mesh is not None:
+        if ids.size > 0:
+            main_mesh.max_node_id = max(main_mesh.max_node_id, int(ids.max()))
+        ids = ids + main_mesh.node_id_offset
+    return zip(ids.tolist(), coords.tolist()) # "tolist" converts to python types, which is also required by Kratos
+
+def _IterateGeometryBlocks(geometries, geometry_type, main_mesh=None):
+    """iterates the geometries in blocks of (geometry_ids, connectivities), the connectivities are reordered to the Kratos ordering
+    the geometries can be given as dict ({geometry_id : connectivities}), as arrays ((ids, connectivities), see "MeshInterface.GetEntitiesArrays")
+    or in chunks of arrays (see "MeshInterface.GetEntitiesChunks")
+    geometries given as dict are one block with the Ids as list, geometries given as arrays are one block per array with the Ids as array
+    if the main mesh is given, the Ids of the geometries and the Nodes are shifted by its offsets
+    (this is done after the Nodes were added, hence the merged Nodes are known)
+    """
+    if isinstance(geometries, dict):
+        reorder_conn_fct_ptr = connectivity_reordering.GetReorderFunction(geometry_type)
+        with profiling.Timer("GeometriesIO.ReorderConnectivities", len(geometries)):
+            reordered_connectivities = [reorder_conn_fct_ptr(connectivities) for connectivities in geometries.values()]
+        geometry_ids = list(geometries.keys())
+        if main_mesh is not None and len(geometry_ids) > 0:
+            main_mesh.max_geometry_id = max(main_mesh.max_geometry_id, max(geometry_ids))
+            geometry_ids, reordered_connectivities = _ShiftIds(geometry_ids, reordered_connectivities, main_mesh)
+        yield geometry_ids, reordered_connectivities
+    elif isinstance(geometries, _MeshDataChunks):
+        for chunk in geometries:
+            yield from _IterateGeometryBlocks(chunk, geometry_type, main_mesh)
+    else:
+        ids, connectivities = geometries
+        # arrays are reordered at once, "tolist" converts to python types, which is also required by Kratos
+        with profiling.Timer("GeometriesIO.ReorderConnectivities", len(ids)):
+            reordered_connectivities = connectivity_reordering.ReorderConnectivitiesArray(geometry_type, connectivities)
+        if main_mesh is not None and ids.size > 0:
+            main_mesh.max_geometry_id = max(main_mesh.max_geometry_id, int(ids.max()))
+            ids, reordered_connectivities = _ShiftIdsArrays(ids, reordered_connectivities, main_mesh)
+        yield ids, reordered_connectivities.tolist()
+
+def _ShiftIds(geometry_ids, connectivities, main_mesh):
+    """shifts the Ids of the geometries and their Nodes (given as lists) by the offsets of the main mesh"""
+    geometry_id_offset = main_mesh.geometry_id_offset
+    node_id_offset = main_mesh.node_id_offset
+    merged_node_ids = main_mesh.merged_node_ids
+    shifted_geometry_ids = [geometry_id+geometry_id_offset for geometry_id in geometry_ids]
+    if len(merged_node_ids) > 0:
+        shifted_connectivities = [[merged_node_ids.get(node_id+node_id_offset, node_id+node_id_offset) for node_id in connectivity] for connectivity in connectivities]
+    else:
+        shifted_connectivities = [[node_id+node_id_offset for node_id in connectivity] for connectivity in connectivities]
+    return shifted_geometry_ids, shifted_connectivities
+
+def _ShiftIdsArrays(geometry_ids, connectivities, main_mesh):
+    """shifts the Ids of the geometries and their Nodes (given as numpy arrays) by the offsets of the main mesh at once"""
+    import numpy as np
+
+    shifted_geometry_ids = geometry_ids + main_mesh.geometry_id_offset
+    shifted_connectivities = connectivities + main_mesh.node_id_offset
+    merged_node_ids = main_mesh.merged_node_ids
+    if len(merged_node_ids) > 0 and shifted_connectivities.size > 0:
+        merged_ids = np.array(sorted(merged_node_ids.keys()), dtype=np.int64)
+        replacement_ids = np.array([merged_node_ids[node_id] for node_id in merged_ids.tolist()], dtype=np.int64)
+        positions = np.minimum(np.searchsorted(merged_ids, shifted_connectivities), merged_ids.size-1)
+        is_merged = merged_ids[positions] == shifted_connectivities
+        shifted_connectivities[is_merged] = replacement_ids[positions[is_merged]]
+    return shifted_geometry_ids, shifted_connectivities
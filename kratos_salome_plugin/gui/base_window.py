@@ -11,6 +11,8 @@
 """Base main window for the Plugin. Defines some basic functionalities"""
 
 # python imports
+from pathlib import Path
+from io import StringIO
 import logging
 logger = logging.getLogger(__name__)
 
@@ -26,6 +28,10 @@ from kratos_salome_plugin.utilities import GetAbsPathInPlugin
 from kratos_salome_plugin.utilities import PathCheck
 
 
+_ui_form_classes = {} # cache for the classes of the compiled "ui" files, map: {path : (modification time, class)}
+_window_icon = None # created when it is used for the first time, see "__InitUI"
+
+
 class BaseWindow(QMainWindow):
     def __init__(self, ui_form_path, parent=None):
         super().__init__()
@@ -97,10 +103,17 @@ class BaseWindow(QMainWindow):
         """initialize the user interface from the "ui" file
         also set some settings that cannot be specified through the "ui" file
         """
-        uic.loadUi(str(ui_form_path), self)
+        # the compiled "ui" file creates the widgets as members of the "ui_form", hence moving them to the window
+        ui_form = GetUiFormClass(ui_form_path)()
+        ui_form.setupUi(self)
+        for name, widget in vars(ui_form).items():
+            setattr(self, name, widget)
 
         # manual adaptations that can't be done with QtDesigner
-        self.setWindowIcon(QIcon(GetAbsPathInPlugin("misc","kratos_logo.png")))
+        global _window_icon
+        if _window_icon is None:
+            _window_icon = QIcon(GetAbsPathInPlugin("misc","kratos_logo.png"))
+        self.setWindowIcon(_window_icon)
 
         self.statusbar.setStyleSheet("background-color: white")
 
@@ -135,6 +148,34 @@ class BaseWindow(QMainWindow):
             QTimer.singleShot(delay_base_color, lambda: self.statusbar.setStyleSheet("background-color: white"))
 
 
+def GetUiFormClass(ui_form_path: Path):
+    """returns the class of the form defined in the "ui" file (e.g. "Ui_MainWindow"), which is used for setting up the window
+    parsing the "ui" file is slow, hence it is compiled to python code once per session and the class is cached (in memory only)
+    the "ui" file is compiled again if it was modified
+    """
+    ui_form_path = ui_form_path.resolve()
+    modification_time = ui_form_path.stat().st_mtime_ns
+
+    cached_form = _ui_form_classes.get(ui_form_path)
+    if cached_form and cached_form[0] == modification_time:
+        return cached_form[1]
+
+    logger.debug('Compiling "%s"', ui_form_path)
+    compiled_form = StringIO()
+    uic.compileUi(str(ui_form_path), compiled_form)
+
+    compiled_form_namespace = {"__name__" : ui_form_path.stem}
+    exec(compile(compiled_form.getvalue(), str(ui_form_path), "exec"), compiled_form_namespace)
+
+    form_classes = [obj for name, obj in compiled_form_namespace.items() if name.startswith("Ui_")]
+    if len(form_classes) != 1:
+        raise Exception('Expected one form in "{}", found {}'.format(ui_form_path, len(form_classes)))
+
+    _ui_form_classes[ui_form_path] = (modification_time, form_classes[0])
+
+    return form_classes[0]
+
+
 # for testing / debugging
 if __name__ == '__main__':
     import sys
@@ -9,8 +9,267 @@
 #
 
 """
+The GroupsModel contains the Groups of the project, it is the (Qt) model for showing them in views
+It is designed for many (thousands of) groups:
+- the rows are made available to the views in batches (lazy fetching), see "canFetchMore" and "fetchMore"
+- the number of entities of the groups is computed in a background thread and only for the rows that are shown
+  the thread is shared by all models, hence replacing the model (e.g. for a new project) does not leave threads behind
+- the groups of a mesh can be looked up without iterating the groups
 """
 
-class GroupsModel:
-    def Serialize(self): return {}
-    def Deserialize(self, serialized_obj): pass
\ No newline at end of file
+# python imports
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import weakref
+import logging
+logger = logging.getLogger(__name__)
+
+# qt imports
+from PyQt5.QtCore import Qt, QAbstractListModel, QModelIndex, pyqtSignal
+try:
+    from PyQt5 import sip
+except ImportError: # before PyQt5 5.11
+    import sip
+
+# plugin imports
+from kratos_salome_plugin.gui.group import Group
+
+
+_executor = None # shared by all models, created when it is used for the first time, see "_GetExecutor"
+
+class GroupsModel(QAbstractListModel):
+    fetch_batch_size = 256 # number of rows that are made available to the views at once, see "fetchMore"
+    max_recorded_changes = 1000 # the older modifications are forgotten, see "GetChanges"
+
+    _generation = 0 # increased with every modification, see "GetGeneration"
+
+    # emitted from the background thread, the results are processed in the GUI thread
+    _entity_counts_computed = pyqtSignal(str, object) # mesh identifier, number of entities per type
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.__groups = []
+        self.__rows = {} # map: {group : row}
+        self.__groups_of_meshes = {} # map: {mesh identifier : list of groups}
+        self.__num_fetched_rows = 0
+        self.__changes = deque(maxlen=self.max_recorded_changes) # modifications of the groups, see "GetChanges"
+
+        self.__entity_counts = {} # map: {mesh identifier : number of entities per type}
+        self.__pending_meshes = set() # meshes whose entities are currently counted
+
+        # queued, since the signal is emitted in the GUI thread if the counting finished before the callback was added
+        self._entity_counts_computed.connect(self.__OnEntityCountsComputed, Qt.QueuedConnection)
+
+    ### methods for the groups ###
+    def AddGroup(self, group: Group) -> None:
+        row = len(self.__groups)
+        all_rows_fetched = self.__num_fetched_rows == row
+        if all_rows_fetched:
+            self.beginInsertRows(QModelIndex(), row, row)
+
+        self.__groups.append(group)
+        self.__rows[group] = row
+        self.__groups_of_meshes.setdefault(group.mesh_identifier, []).append(group)
+
+        if all_rows_fetched:
+            self.__num_fetched_rows += 1
+            self.endInsertRows()
+
+        self._IncreaseGeneration()
+        self.__RecordChange("add", group)
+
+    def RemoveGroup(self, group: Group) -> None:
+        row = self.__rows[group]
+        is_fetched = row < self.__num_fetched_rows
+        if is_fetched:
+            self.beginRemoveRows(QModelIndex(), row, row)
+
+        del self.__groups[row]
+        del self.__rows[group]
+        for i in range(row, len(self.__groups)): # the following groups move up
+            self.__rows[self.__groups[i]] = i
+
+        groups_of_mesh = self.__groups_of_meshes[group.mesh_identifier]
+        groups_of_mesh.remove(group)
+        if not groups_of_mesh:
+            del self.__groups_of_meshes[group.mesh_identifier]
+
+        if is_fetched:
+            self.__num_fetched_rows -= 1
+            self.endRemoveRows()
+
+        self._IncreaseGeneration()
+        self.__RecordChange("remove", group)
+
+    def GetGroup(self, row: int) -> Group:
+        return self.__groups[row]
+
+    def GetGroups(self) -> list:
+        return list(self.__groups)
+
+    def GetGroupsOfMesh(self, mesh_identifier: str) -> list:
+        """returns the groups of the given mesh, without iterating the groups"""
+        return list(self.__groups_of_meshes.get(mesh_identifier, []))
+
+    def GetNumberOfGroups(self) -> int:
+        """returns the number of all groups, unlike "rowCount" this includes the rows that were not yet fetched"""
+        return len(self.__groups)
+
+    def GetEntityCount(self, group: Group) -> int:
+        """returns the number of entities of the group
+        if it is not yet known then it is computed in the background and None is returned
+        the views are updated once the number is available
+        """
+        entity_counts = self.__entity_counts.get(group.mesh_identifier)
+        if entity_counts is None:
+            self.__RequestEntityCounts(group.mesh_identifier)
+            return None
+        return entity_counts.get(group.entity_type, 0)
+
+    def RefreshEntityCounts(self, mesh_identifier: str="") -> None:
+        """recomputes the number of entities (e.g. after a mesh was modified), of all meshes if no identifier is given"""
+        if mesh_identifier:
+            self.__entity_counts.pop(mesh_identifier, None)
+        else:
+            self.__entity_counts.clear()
+
+        if self.__num_fetched_rows > 0:
+            self.dataChanged.emit(self.index(0), self.index(self.__num_fetched_rows-1), [Qt.DisplayRole])
+
+    def Serialize(self) -> dict:
+        return {"groups" : [[group.name, group.mesh_identifier, group.entity_type] for group in self.__groups]}
+
+    def Deserialize(self, serialized_obj: dict, is_modification: bool=False) -> None:
+        """replaces the groups, the views are reset only once
+        is_modification -- whether replacing the groups is a modification (e.g. restoring unsaved groups), see "GetGeneration"
+        """
+        self.beginResetModel()
+
+        self.__groups = [Group(*serialized_group) for serialized_group in serialized_obj.get("groups", [])]
+        self.__rows = {group : row for row, group in enumerate(self.__groups)}
+        self.__groups_of_meshes = {}
+        for group in self.__groups:
+            self.__groups_of_meshes.setdefault(group.mesh_identifier, []).append(group)
+        self.__num_fetched_rows = min(len(self.__groups), self.fetch_batch_size)
+        self.__changes.clear()
+
+        if is_modification:
+            self._IncreaseGeneration()
+
+        self.endResetModel()
+
+    def GetGeneration(self) -> int:
+        """returns a counter that is increased whenever the groups are modified
+        this makes checking for modifications cheap, the groups don't have to be compared
+        """
+        return self._generation
+
+    def GetChanges(self, since_generation: int) -> list:
+        """returns the modifications of the groups after the given generation (see "GetGeneration")
+        as list of (operation, serialized group), the operation is "add" or "remove"
+        this way they can be saved without serializing all groups, see "ProjectManager.Autosave"
+        returns None if the modifications are not known completely (e.g. too many), then all groups have to be serialized
+        the modifications up to the given generation are forgotten
+        """
+        while self.__changes and self.__changes[0][0] <= since_generation:
+            self.__changes.popleft()
+
+        num_changes = self._generation - since_generation
+        if len(self.__changes) != num_changes or (self.__changes and self.__changes[0][0] != since_generation+1):
+            return None
+
+        return [(operation, serialized_group) for _, operation, serialized_group in self.__changes]
+
+    def _IncreaseGeneration(self) -> None:
+        """has to be called by all methods that modify the groups"""
+        self._generation += 1
+
+    ### methods of QAbstractListModel ###
+    def rowCount(self, parent=QModelIndex()) -> int:
+        if parent.isValid(): # it is a list, the rows have no children
+            return 0
+        return self.__num_fetched_rows
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or index.row() >= self.__num_fetched_rows:
+            return None
+
+        group = self.__groups[index.row()]
+
+        if role == Qt.DisplayRole:
+            entity_count = self.GetEntityCount(group) # only computed for the rows that are shown
+            return "{} ({}: {})".format(group.name, group.entity_type, "..." if entity_count is None else entity_count)
+        elif role == Qt.ToolTipRole:
+            return group.mesh_identifier
+
+        return None
+
+    def canFetchMore(self, parent) -> bool:
+        if parent.isValid():
+            return False
+        return self.__num_fetched_rows < len(self.__groups)
+
+    def fetchMore(self, parent) -> None:
+        if parent.isValid():
+            return
+        num_rows_to_fetch = min(self.fetch_batch_size, len(self.__groups) - self.__num_fetched_rows)
+        if num_rows_to_fetch <= 0:
+            return
+
+        self.beginInsertRows(QModelIndex(), self.__num_fetched_rows, self.__num_fetched_rows + num_rows_to_fetch - 1)
+        self.__num_fetched_rows += num_rows_to_fetch
+        self.endInsertRows()
+
+    ### private methods ###
+    def __RecordChange(self, operation: str, group: Group) -> None:
+        self.__changes.append((self._generation, operation, [group.name, group.mesh_identifier, group.entity_type]))
+
+    def __RequestEntityCounts(self, mesh_identifier: str) -> None:
+        if mesh_identifier in self.__pending_meshes:
+            return
+        self.__pending_meshes.add(mesh_identifier)
+
+        # the model is only weakly referenced, this way a pending count does not keep a replaced model alive
+        model_ref = weakref.ref(self)
+        future = _GetExecutor().submit(_CountEntities, mesh_identifier)
+        future.add_done_callback(lambda future: _EmitEntityCounts(model_ref, mesh_identifier, future.result()))
+
+    def __OnEntityCountsComputed(self, mesh_identifier: str, entity_counts: dict) -> None:
+        self.__pending_meshes.discard(mesh_identifier)
+        self.__entity_counts[mesh_identifier] = entity_counts
+
+        for group in self.__groups_of_meshes.get(mesh_identifier, []):
+            row = self.__rows[group]
+            if row < self.__num_fetched_rows:
+                model_index = self.index(row)
+                self.dataChanged.emit(model_index, model_index, [Qt.DisplayRole])
+
+
+def _GetExecutor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=1)
+    return _executor
+
+def _CountEntities(mesh_identifier: str) -> dict:
+    """executed in the background thread
+    counting is cheap (the numbers are queried from Salome, the entities are not retrieved), hence the results are not cached
+    the imports require Salome, they are done here such that the model can be used without it
+    """
+    try:
+        from kratos_salome_plugin.mesh_interface import MeshInterface
+        from kratos_salome_plugin.salome_mesh_utilities import EntityTypeToString
+        mesh_interface = MeshInterface(mesh_identifier)
+        entity_counts = {EntityTypeToString(entity_type) : num_entities for entity_type, num_entities in mesh_interface.GetMeshInformation().items()}
+        entity_counts["Node"] = mesh_interface.GetNumberOfNodes()
+        return entity_counts
+    except Exception as e:
+        logger.error('Counting the entities of mesh "%s" failed: "%s"', mesh_identifier, e)
+        return {}
+
+def _EmitEntityCounts(model_ref, mesh_identifier: str, entity_counts: dict) -> None:
+    """executed in the background thread, the results are processed in the GUI thread"""
+    model = model_ref()
+    if model is None or sip.isdeleted(model): # the model was replaced while the entities were counted
+        return
+    model._entity_counts_computed.emit(mesh_identifier, entity_counts)
@@ -16,6 +16,7 @@ from pathlib import Path
 
 # qt imports
 from PyQt5.QtCore import Qt
+from PyQt5.QtWidgets import QListView
 
 # plugin imports
 from kratos_salome_plugin.utilities import GetAbsPathInPlugin
@@ -29,13 +30,21 @@ class GroupsWindow(BaseWindow):
         # this window should stay on top, it is much more convenient to select meshes then
         self.setWindowFlags(self.windowFlags() | Qt.WindowStaysOnTopHint)
 
+        # the view only creates the rows that are shown, this is necessary for many groups
+        self.listView.setUniformItemSizes(True) # otherwise the size of every row is computed
+        self.listView.setLayoutMode(QListView.Batched)
+        self.listView.setBatchSize(model.fetch_batch_size)
+        self.listView.setModel(model)
+        self.model = model
+
 
 # for testing / debugging
 if __name__ == '__main__':
     import sys
     from PyQt5.QtWidgets import QApplication
     app = QApplication(sys.argv)
-    win = GroupsWindow(None)
+    from kratos_salome_plugin.gui.groups_model import GroupsModel
+    win = GroupsWindow(None, GroupsModel())
     win.show()
     # win.StatusBarWarning("Obacht")
     win.StatusBarInfo("hey")
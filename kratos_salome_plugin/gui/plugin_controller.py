@@ -19,14 +19,22 @@ import webbrowser
 import logging
 logger = logging.getLogger(__name__)
 
+# qt imports
+from PyQt5.QtCore import QTimer
+from PyQt5.QtWidgets import QApplication
+
 # plugin imports
-from kratos_salome_plugin.exceptions import UserInputError
+from kratos_salome_plugin.exceptions import UserInputError, JobCancelledError
 from kratos_salome_plugin.gui.plugin_main_window import PluginMainWindow
 from kratos_salome_plugin.gui.groups_window import GroupsWindow
 from kratos_salome_plugin.gui.about import ShowAbout
 import kratos_salome_plugin.gui.active_window as active_window
 from kratos_salome_plugin.gui.project_manager import ProjectManager
 from kratos_salome_plugin.gui.project_path_handler import ProjectPathHandler
+from kratos_salome_plugin.gui.utilities import RunJobWithProgressDialog
+
+
+AUTOSAVE_INTERVAL_MS = 30000 # the project manager decides what is actually saved, see "ProjectManager.Autosave"
 
 def ShowNotImplementedMessage():
     from PyQt5.QtWidgets import QMessageBox
@@ -43,12 +51,18 @@ class PluginController:
 
         self.__ConnectMainWindow()
 
+        # the project manager is replaced when a new project is created, hence not connecting it directly
+        self.__autosave_timer = QTimer()
+        self.__autosave_timer.timeout.connect(self.__Autosave)
+        self.__autosave_timer.start(AUTOSAVE_INTERVAL_MS)
+
 
     def __InitializeMembers(self) -> None:
         """completely reinitialize members to clean them"""
         self._project_manager = ProjectManager()
         self._project_path_handler = ProjectPathHandler()
         self._previous_save_path = None
+        self._groups_window = None # reused when it is opened again, see "_Groups"
 
     def __ConnectMainWindow(self) -> None:
         ### File menu
@@ -98,7 +112,13 @@ class PluginController:
             self._main_window.StatusBarWarning(msg)
             return
 
-        open_successful = self._project_manager.OpenProject(path)
+        try:
+            open_successful = self._project_manager.OpenProject(path, self.__RunJob)
+        except JobCancelledError:
+            msg = "Opening was cancelled"
+            logger.info(msg)
+            self._main_window.StatusBarWarning(msg)
+            return
 
         if open_successful:
             msg = 'Successfully opened project from "{}"'.format(path)
@@ -150,10 +170,17 @@ class PluginController:
 
     ### Kratos menu
     def _Groups(self) -> None:
-        """open the groups window"""
+        """open the groups window
+        the window is reused as long as the groups are the same (i.e. the same project), this is much faster than recreating it
+        """
         logger.debug("Opening Groups")
-        _groups_widget = GroupsWindow(self._main_window, self._project_manager.groups_model)
-        _groups_widget.show() # showing makes it the active window, hence no need to save it as member
+        groups_model = self._project_manager.groups_model
+        if self._groups_window is None or self._groups_window.model is not groups_model:
+            self._groups_window = GroupsWindow(self._main_window, groups_model)
+        else:
+            self._main_window.hide() # done when creating the window
+        groups_model.RefreshEntityCounts() # the meshes might have been modified (e.g. remeshed) in the meantime
+        self._groups_window.ShowOnTop() # showing makes it the active window
 
     def _LoadApplication(self) -> None:
         ShowNotImplementedMessage()
@@ -166,7 +193,14 @@ class PluginController:
         and issue the appropriate infos for the user
         returns if saving was successful
         """
-        save_successful = self._project_manager.SaveProject(path)
+        try:
+            save_successful = self._project_manager.SaveProject(path, self.__RunJob)
+        except JobCancelledError:
+            msg = "Saving was cancelled"
+            logger.info(msg)
+            self._main_window.StatusBarWarning(msg)
+            return False
+
         if save_successful:
             msg = 'Saved project under "{}"'.format(path)
             logger.info(msg)
@@ -175,6 +209,18 @@ class PluginController:
             logger.critical('Failed to save project under "%s"!', path)
         return save_successful
 
+    def __Autosave(self) -> None:
+        """autosave the project, see "ProjectManager.Autosave"
+        skipped while a modal dialog is open (e.g. the user is asked something), it is done with the next timeout instead
+        """
+        if QApplication.activeModalWidget() is not None:
+            return
+        self._project_manager.Autosave(self.__RunJob)
+
+    def __RunJob(self, job):
+        """run the (long running) job while showing its progress, this way the GUI stays responsive"""
+        return RunJobWithProgressDialog(job, self._main_window)
+
 
 # for testing / debugging
 if __name__ == '__main__':
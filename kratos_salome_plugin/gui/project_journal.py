@@ -0,0 +1,80 @@
+#  _  __         _          ___       _               ___ _           _
+# | |/ /_ _ __ _| |_ ___ __/ __| __ _| |___ _ __  ___| _ \ |_  _ __ _(_)_ _
+# | ' <| '_/ _` |  _/ _ (_-<__ \/ _` | / _ \ '  \/ -_)  _/ | || / _` | | ' \
+# |_|\_\_| \__,_|\__\___/__/___/\__,_|_\___/_|_|_\___|_| |_|\_,_\__, |_|_||_|
+#                                                               |___/
+# License: BSD License ; see LICENSE
+#
+# Main authors: Philipp Bucher (https://github.com/philbucher)
+#
+
+"""
+The ProjectJournal records the changes of the plugin data (groups, application) that were not yet saved
+It is used by the ProjectManager for autosaving, after a crash the changes are replayed when the project is opened
+"""
+
+# python imports
+from pathlib import Path
+from os import fsync, replace
+import json
+import logging
+logger = logging.getLogger(__name__)
+
+
+class ProjectJournal:
+    """append-only journal, each entry is written as one line of json
+    appending an entry is cheap, the journal is compacted once it has too many entries
+    """
+
+    def __init__(self, journal_path: Path):
+        self.journal_path = journal_path
+        entries, is_complete = self.__ReadEntries()
+        self.num_entries = len(entries)
+        if not is_complete:
+            # removing the incomplete entry, otherwise the entries appended after it could not be read
+            self.Replace(entries)
+
+    def Append(self, entry: dict) -> None:
+        """appends an entry, it is written to the disk immediately"""
+        self.Extend([entry])
+
+    def Extend(self, entries: list) -> None:
+        """appends several entries, they are written to the disk at once"""
+        with open(str(self.journal_path), 'a') as journal_file:
+            for entry in entries:
+                journal_file.write(json.dumps(entry) + "\n")
+            journal_file.flush()
+            fsync(journal_file.fileno())
+        self.num_entries += len(entries)
+
+    def Read(self) -> list:
+        """returns the entries of the journal
+        an incomplete last entry (e.g. due to a crash while appending it) is ignored
+        """
+        return self.__ReadEntries()[0]
+
+    def Replace(self, entries: list) -> None:
+        """replaces the entries of the journal atomically"""
+        tmp_journal_path = self.journal_path.with_name(self.journal_path.name + ".tmp")
+        with open(str(tmp_journal_path), 'w') as journal_file:
+            for entry in entries:
+                journal_file.write(json.dumps(entry) + "\n")
+            journal_file.flush()
+            fsync(journal_file.fileno())
+        replace(str(tmp_journal_path), str(self.journal_path))
+        self.num_entries = len(entries)
+
+    def __ReadEntries(self):
+        """returns the entries of the journal and whether it is complete, i.e. has no incomplete last entry"""
+        if not self.journal_path.is_file():
+            return [], True
+
+        entries = []
+        with open(str(self.journal_path), 'r') as journal_file:
+            for line in journal_file:
+                try:
+                    entries.append(json.loads(line))
+                except ValueError:
+                    logger.warning('Ignoring incomplete entry in journal "%s"', self.journal_path)
+                    return entries, False
+        return entries, True
@@ -15,9 +15,12 @@ It can save and open projects
 
 # python imports
 from pathlib import Path
-from os import makedirs
+import os
+from os import makedirs, replace, link, fsync
+from shutil import rmtree, copytree, copy2
 import sys
 import json
+from importlib import import_module
 import time
 import logging
 logger = logging.getLogger(__name__)
@@ -26,70 +29,224 @@ logger = logging.getLogger(__name__)
 from ..version import GetVersions as GetVersionsPlugin
 from kratos_salome_plugin.utilities import PathCheck
 from kratos_salome_plugin.salome_utilities import GetVersions as GetSalomeVersions
-from kratos_salome_plugin.salome_study_utilities import SaveStudy, OpenStudy
+from kratos_salome_plugin.job import Job, CopyFile
+from kratos_salome_plugin.salome_study_utilities import SaveStudy, OpenStudy, IsStudyModified, GetStudyFilePath, SetStudyFilePath, SetStudyModified, GetStudyModificationState
+from kratos_salome_plugin.gui.group import Group
 from kratos_salome_plugin.gui.groups_model import GroupsModel
+from kratos_salome_plugin.gui.project_journal import ProjectJournal
 
 
+_application_modules = {} # cache for the modules of the applications, map: {module name : module}
+
+_JOURNAL_FILE_NAME = "plugin_data.journal"
+_AUTOSAVE_STUDY_FILE_NAME = "salome_study.autosave.hdf"
+_AUTOSAVE_FILE_NAMES = (_JOURNAL_FILE_NAME, _AUTOSAVE_STUDY_FILE_NAME) # these are not kept when saving the project
+
 class ProjectManager:
+    journal_max_entries = 50 # the journal is compacted if it has more entries, see "Autosave"
+    study_autosave_interval = 600.0 # [s] minimum time between autosaving the Salome study, see "Autosave"
+
     def __init__(self):
         self.__InitializeMembers()
+        self.__copied_study = None # (path, modification state) of the last copy of the study, see "__IsStudySavedIn"
+        self.__job_is_running = False
+
+    def SaveProject(self, save_path: Path, job_runner=None) -> bool:
+        """save the current project under the given path
+        the Salome study is only saved if it was modified or if it was not saved in this project before
+        job_runner -- function for running the job (e.g. "gui.utilities.RunJobWithProgressDialog"), by default it is run directly
+        raises JobCancelledError if saving was cancelled, the previously saved project is unchanged in this case
+        """
+        return self.__RunJob(self.__CreateSaveProjectJob(save_path), job_runner)
+
+    def OpenProject(self, open_path: Path, job_runner=None) -> bool:
+        """open a project from the given path
+        job_runner -- see "SaveProject"
+        raises JobCancelledError if opening was cancelled, the current project is unchanged in this case
+        """
+        return self.__RunJob(self.__CreateOpenProjectJob(open_path), job_runner)
+
+    @property
+    def application(self):
+        """the application of the project
+        after opening a project the application is loaded when it is accessed for the first time
+        None if the application cannot be loaded, its data is kept in this case, hence it is not lost when the project is saved
+        """
+        if isinstance(self.__application, _PendingApplication):
+            pending_application = self.__application
+            if pending_application.load_failed:
+                return None
+            application = pending_application.Load()
+            if application is None:
+                pending_application.load_failed = True # not loaded again, the errors were logged already
+                return None
+            self.__application = application
+            # loading is not a modification, the other parts of the states are kept (e.g. unsaved changes of the groups)
+            self.__saved_state = self.__ReplacePendingApplication(self.__saved_state, pending_application)
+            self.__autosaved_state = self.__ReplacePendingApplication(self.__autosaved_state, pending_application)
+        return self.__application
+
+    @application.setter
+    def application(self, application) -> None:
+        self.__application = application
 
-    def SaveProject(self, save_path: Path) -> bool:
-        """save the current project under the given path"""
+    def ProjectHasUnsavedChanges(self) -> bool:
+        """checks if the project was modified since it was saved or opened
+        this is cheap (no comparison of the data), hence it can be checked e.g. every time before closing
+        """
+        return IsStudyModified() or self.__study_autosaved or self.__GetModificationState() != self.__saved_state
+
+    def Autosave(self, job_runner=None) -> None:
+        """autosaves the changes of the project, this is meant to be called periodically
+        the changed parts of the plugin data (groups, application) are appended to the journal of the project,
+        which is cheap. The Salome study is only saved every "study_autosave_interval" seconds if it was modified,
+        this is done as a job since it can take long (e.g. the progress is shown to the user)
+        job_runner -- see "SaveProject"
+        the autosaved changes are restored when the project is opened next time (e.g. after a crash), they
+        are removed when the project is saved
+        nothing is done if the project was not yet saved or opened, or while it is being saved or opened
+        """
+        if self.__project_path is None or self.__job_is_running:
+            return
+
+        try:
+            self.__AutosavePluginData()
+            self.__AutosaveStudy(job_runner)
+        except OSError as e:
+            logger.error('Autosaving project "%s" failed: "%s"', self.__project_path, e)
+
+    def __CreateSaveProjectJob(self, save_path: Path) -> Job:
+        """creates the job for saving the project
+        the project is written to a temporary directory next to it, which replaces the existing project only
+        at the end (this step cannot be cancelled). This way cancelling or a crash leaves a previously saved project intact
+        the files of the existing project that are not written (e.g. an unmodified study) are hardlinked, hence not copied
+        """
         PathCheck(save_path)
 
         save_path = save_path.with_suffix(".ksp") # if necessary change suffix to ".ksp"
 
-        logger.debug('Saving project: "%s" ...', save_path)
-
-        if save_path.is_dir():
-            logger.debug('Project "%s" exists already, the plugin related data will be overwritten', save_path)
-        else:
-            makedirs(save_path)
+        _RecoverInterruptedSave(save_path)
 
-        # save study
+        tmp_path = _GetTemporaryProjectPath(save_path)
         salome_study_path = save_path / "salome_study.hdf"
-        save_successful = SaveStudy(salome_study_path)
-
-        # save plugin data
-        project_dict = {"general":{}}
-
-        # general information
-        general = project_dict["general"]
-        general["version_plugin"] = GetVersionsPlugin()
-        general["version_salome"] = GetSalomeVersions()
-
-        localtime = time.asctime( time.localtime(time.time()) )
-        general["creation_time"] = localtime
-
-        general["operating_system"] = sys.platform
-
-        # groups
-        project_dict["groups"] = self.groups_model.Serialize()
-
-        # application
-        if self.application:
-            serializing_successful, serialized_app = self.application.Serialize()
-            save_successful = save_successful and serializing_successful
-            project_dict["application"] = {}
-            project_dict["application"]["application_module"] = mod(self.application) # necessary for deserialization
-            project_dict["application"]["application_data"] = serialized_app
+        tmp_salome_study_path = tmp_path / "salome_study.hdf"
+        tmp_plugin_data_path = tmp_path / "plugin_data.json"
+
+        job = Job('Saving project "{}"'.format(save_path))
+        project = {"written_parts" : [], "save_successful" : True}
+
+        def CollectPluginData(job):
+            logger.debug('Saving project: "%s" ...', save_path)
+
+            if save_path.is_dir():
+                logger.debug('Project "%s" exists already, the plugin related data will be overwritten', save_path)
+
+            if tmp_path.is_dir(): # leftover of a cancelled or crashed save
+                rmtree(str(tmp_path))
+            makedirs(tmp_path)
+            job.AddCleanup(lambda: rmtree(str(tmp_path), ignore_errors=True))
+
+            project["modification_state"] = self.__GetModificationState() # modifications after this are not saved
+            project["serializing_successful"], project["plugin_data"] = self.__SerializePluginData()
+
+        def WritePluginData(job):
+            with open(tmp_plugin_data_path, "w") as data_file:
+                json.dump(project["plugin_data"], data_file, indent=4)
+                data_file.flush()
+                fsync(data_file.fileno())
+
+        def LinkExistingFiles(job):
+            # the study is only kept if it is reused, otherwise it was written before
+            # the autosaved study is only kept if saving the study failed, the journal is written again in "Finalize"
+            discarded_file_names = _AUTOSAVE_FILE_NAMES if project["save_successful"] else (_JOURNAL_FILE_NAME,)
+            for existing_path in save_path.iterdir():
+                tmp_file_path = tmp_path / existing_path.name
+                if not tmp_file_path.exists() and existing_path.name not in discarded_file_names:
+                    job.CheckCancelled()
+                    if existing_path.is_dir():
+                        copytree(str(existing_path), str(tmp_file_path), copy_function=_LinkOrCopyFile)
+                    else:
+                        _LinkOrCopyFile(str(existing_path), str(tmp_file_path))
+
+        def CopyStudy(job):
+            CopyFile(study_file_path, tmp_salome_study_path, job)
+            _FsyncFile(tmp_salome_study_path)
+            project["study_copied"] = True
+
+        def SaveSalomeStudy(job):
+            # saving changes the path of the study and clears its modified flag, this is undone if the job fails afterwards
+            # otherwise the study would refer to a file in the removed temporary directory and seem to be saved
+            previous_study_file_path, study_was_modified = GetStudyFilePath(), IsStudyModified()
+            job.AddCleanup(lambda: _RestoreStudyFilePath(previous_study_file_path, study_was_modified))
+            project["save_successful"] = project["study_saved"] = SaveStudy(tmp_salome_study_path)
+            if project["study_saved"]:
+                _FsyncFile(tmp_salome_study_path)
+            project["written_parts"].append("salome study")
+
+        def Finalize(job):
+            _FsyncDirectory(tmp_path)
+            _ReplaceDirectory(tmp_path, save_path)
+
+            if project.get("study_saved"):
+                # the study was saved in the temporary directory
+                SetStudyFilePath(salome_study_path)
+            if project.get("study_copied"):
+                # the copied file might be removed (e.g. the autosaved study)
+                SetStudyFilePath(salome_study_path)
+                self.__copied_study = (salome_study_path.resolve(), GetStudyModificationState())
+                project["written_parts"].append("salome study (copied)")
+
+            project["written_parts"].append("plugin data")
+
+            save_successful = project["save_successful"] and project["serializing_successful"]
+
+            self.__SetProjectPath(save_path)
+            self.__autosaved_state = project["modification_state"]
+            if save_successful:
+                self.__saved_state = project["modification_state"]
+            else:
+                # the changes remain unsaved, hence the written plugin data is also journaled
+                # this way they are reported as unsaved changes when the project is opened next time (e.g. after a crash)
+                plugin_data = project["plugin_data"]
+                self.__journal.Replace([
+                    {"part" : "groups", "data" : plugin_data["groups"]},
+                    {"part" : "application", "data" : plugin_data.get("application")}
+                ])
+                self.__study_autosaved = (save_path / _AUTOSAVE_STUDY_FILE_NAME).is_file()
+
+            logger.debug('Saved project (written: %s)', ", ".join(project["written_parts"]))
+
+            return save_successful
+
+        job.AddStep(CollectPluginData, "Collecting plugin data", run_in_background=False)
+        job.AddStep(WritePluginData, "Writing plugin data")
+
+        study_file_path = GetStudyFilePath() if not IsStudyModified() else None
+        if self.__IsStudySavedIn(salome_study_path):
+            logger.debug('Salome study is unmodified, reusing "%s"', salome_study_path)
+        elif study_file_path is not None and study_file_path.is_file():
+            # the study is unmodified, copying the file is much faster than saving it again
+            job.AddStep(CopyStudy, "Copying Salome study", weight=10.0)
+        else:
+            job.AddStep(SaveSalomeStudy, "Saving Salome study", run_in_background=False, cancellable=False, weight=10.0)
 
-        # dump to json
-        plugin_data_path = save_path / "plugin_data.json"
-        with open(plugin_data_path, "w") as data_file:
-            json.dump(project_dict, data_file, indent=4)
+        if save_path.is_dir():
+            job.AddStep(LinkExistingFiles, "Keeping existing files")
 
-        logger.debug("Saved project")
+        job.AddStep(Finalize, "Finalizing", run_in_background=False, cancellable=False)
 
-        return save_successful
+        return job
 
-    def OpenProject(self, open_path: Path) -> bool:
-        """open a project from the given path"""
+    def __CreateOpenProjectJob(self, open_path: Path) -> Job:
+        """creates the job for opening the project
+        the current project (members and Salome study) is only changed in the steps that cannot be cancelled
+        """
         PathCheck(open_path)
 
         logger.info('opening project: "%s" ...', open_path)
 
+        _RecoverInterruptedSave(open_path)
+
         # check the necessary files exist
         if not open_path.is_dir():
             raise NotADirectoryError('Attempting to open project "{}" failed, it does not exist!'.format(open_path))
@@ -103,51 +260,335 @@ class ProjectManager:
         if not plugin_data_path.is_file():
             raise FileNotFoundError('Plugin data file does not exist in project "{}"'.format(open_path))
 
-        # clean leftovers
-        self.__InitializeMembers()
+        autosave_study_path = open_path / _AUTOSAVE_STUDY_FILE_NAME
+        if autosave_study_path.is_file():
+            logger.warning('Opening the autosaved Salome study of project "%s"', open_path)
+            salome_study_path = autosave_study_path
 
-        # open study
-        open_successful = OpenStudy(salome_study_path)
+        job = Job('Opening project "{}"'.format(open_path))
+        project = {}
 
-        with open(plugin_data_path, 'r') as plugin_data_file:
-            plugin_data = json.load(plugin_data_file)
+        def ReadPluginData(job):
+            with open(plugin_data_path, 'r') as plugin_data_file:
+                project["plugin_data"] = json.load(plugin_data_file)
 
-        # check versions
-        # this might be useful in the future for backwards compatibility
-        logger.info("Version plugin: %s",    plugin_data["general"]["version_plugin"])
-        logger.info("Salome plugin: %s",     plugin_data["general"]["version_salome"])
-        logger.info("Creation time: %s",     plugin_data["general"]["creation_time"])
-        logger.debug("Operating system: %s", plugin_data["general"]["operating_system"])
+        def OpenSalomeStudy(job):
+            project["open_successful"] = OpenStudy(salome_study_path)
 
-        # loading groups
-        self.groups_model.Deserialize(plugin_data["groups"])
+        def LoadPluginData(job):
+            plugin_data = project["plugin_data"]
 
-        if "application" in plugin_data:
-            application_module_name = plugin_data["application"]["application_module"]
-            logger.info('loading application from module: "%s"', application_module_name)
-            application_module = __import__(application_module_name) # TODO use importlib
-            self.application = application_module.Create()
-            open_successful = open_successful and self.application.Deserialize(plugin_data["application"]["application_data"])
+            # clean leftovers
+            self.__InitializeMembers()
 
-        logger.info("opened project")
+            # check versions
+            # this might be useful in the future for backwards compatibility
+            logger.info("Version plugin: %s",    plugin_data["general"]["version_plugin"])
+            logger.info("Salome plugin: %s",     plugin_data["general"]["version_salome"])
+            logger.info("Creation time: %s",     plugin_data["general"]["creation_time"])
+            logger.debug("Operating system: %s", plugin_data["general"]["operating_system"])
 
-        return open_successful
+            # loading groups
+            self.groups_model.Deserialize(plugin_data["groups"])
 
-    def ProjectHasUnsavedChanges(self) -> bool:
-        # check if study is empty
-        # if not empty check if is modified
-        # if is modified then ask if proceed
+            if "application" in plugin_data:
+                # the application is only loaded when it is used, see "application"
+                self.__application = _PendingApplication(plugin_data["application"]["application_module"], plugin_data["application"]["application_data"])
+
+            self.__saved_state = self.__autosaved_state = self.__GetModificationState()
+            self.__SetProjectPath(open_path)
+
+            journal_entries = self.__journal.Read()
+            if journal_entries:
+                logger.warning('Restoring %d autosaved changes of project "%s"', len(journal_entries), open_path)
+                for entry in journal_entries:
+                    self.__ApplyJournalEntry(entry)
+                self.__autosaved_state = self.__GetModificationState()
+                self.__CompactJournal()
+            self.__study_autosaved = salome_study_path == autosave_study_path
+
+            logger.info("opened project")
+
+            return project["open_successful"]
 
-        # check Salome Study
-        # is modified?
-        # number of things in study => if nothing is there I don't need to check anything
+        job.AddStep(ReadPluginData, "Reading plugin data")
+        job.AddStep(OpenSalomeStudy, "Opening Salome study", run_in_background=False, cancellable=False, weight=10.0)
+        job.AddStep(LoadPluginData, "Loading plugin data", run_in_background=False, cancellable=False)
 
-        # check GroupsManager
+        return job
 
-        # check Application
+    def __SerializePluginData(self):
+        """serialize the data of the plugin (groups, application, ...)
+        returns whether serializing all the data was successful and the serialized data
+        """
+        serializing_successful = True
 
-        return False
+        project_dict = {"general":{}}
+
+        # general information
+        general = project_dict["general"]
+        general["version_plugin"] = GetVersionsPlugin()
+        general["version_salome"] = GetSalomeVersions()
+
+        localtime = time.asctime( time.localtime(time.time()) )
+        general["creation_time"] = localtime
+
+        general["operating_system"] = sys.platform
+
+        # groups
+        project_dict["groups"] = self.groups_model.Serialize()
+
+        # application
+        if self.__application:
+            serializing_successful, project_dict["application"] = self.__SerializeApplication()
+
+        return serializing_successful, project_dict
+
+    def __SerializeApplication(self):
+        """returns whether serializing the application was successful and the serialized application"""
+        if isinstance(self.__application, _PendingApplication):
+            # the application was not loaded, hence it is unchanged
+            return True, {
+                "application_module" : self.__application.module_name,
+                "application_data"   : self.__application.data
+            }
+
+        serializing_successful, serialized_app = self.__application.Serialize()
+        return serializing_successful, {
+            "application_module" : self.__application.__module__, # necessary for deserialization
+            "application_data"   : serialized_app
+        }
+
+    def __AutosavePluginData(self) -> None:
+        """appends the parts of the plugin data that changed since the last autosave to the journal"""
+        modification_state = self.__GetModificationState()
+
+        if modification_state[:2] != self.__autosaved_state[:2]:
+            # the modifications of the groups are journaled individually, only if they are not known all groups are journaled
+            group_changes = None
+            if modification_state[0] is self.__autosaved_state[0]: # same groups model
+                group_changes = self.groups_model.GetChanges(self.__autosaved_state[1])
+
+            if group_changes is None:
+                self.__journal.Append({"part" : "groups", "data" : self.groups_model.Serialize()})
+            else:
+                self.__journal.Extend([{"part" : "groups_" + operation, "data" : serialized_group} for operation, serialized_group in group_changes])
+
+        if modification_state[2:] != self.__autosaved_state[2:]:
+            serialized_app = self.__SerializeApplication()[1] if self.__application else None
+            self.__journal.Append({"part" : "application", "data" : serialized_app})
+
+        self.__autosaved_state = modification_state
+
+        if self.__journal.num_entries > self.journal_max_entries:
+            self.__CompactJournal()
+
+    def __CompactJournal(self) -> None:
+        """replaces the entries of the journal with the current state of the journaled parts"""
+        journaled_parts = {entry["part"] for entry in self.__journal.Read()}
+
+        entries = []
+        if any(part.startswith("groups") for part in journaled_parts):
+            entries.append({"part" : "groups", "data" : self.groups_model.Serialize()})
+        if "application" in journaled_parts:
+            serialized_app = self.__SerializeApplication()[1] if self.__application else None
+            entries.append({"part" : "application", "data" : serialized_app})
+
+        logger.debug('Compacting journal "%s" to %d entries', self.__journal.journal_path, len(entries))
+        self.__journal.Replace(entries)
+
+    def __AutosaveStudy(self, job_runner) -> None:
+        """saves the Salome study if it was modified, at most every "study_autosave_interval" seconds
+        afterwards the study is no longer modified, "__study_autosaved" keeps track that it was not saved in the project
+        """
+        if not IsStudyModified() or time.monotonic() - self.__last_study_autosave_time < self.study_autosave_interval:
+            return
+
+        job = Job('Autosaving project "{}"'.format(self.__project_path))
+
+        def SaveSalomeStudy(job):
+            if SaveStudy(self.__project_path / _AUTOSAVE_STUDY_FILE_NAME):
+                self.__study_autosaved = True
+
+        job.AddStep(SaveSalomeStudy, "Saving Salome study", run_in_background=False, cancellable=False)
+
+        try:
+            self.__RunJob(job, job_runner)
+        finally:
+            self.__last_study_autosave_time = time.monotonic()
+
+    def __ApplyJournalEntry(self, entry: dict) -> None:
+        if entry["part"] == "groups":
+            self.groups_model.Deserialize(entry["data"], is_modification=True) # the restored groups are not saved
+        elif entry["part"] == "groups_add":
+            self.groups_model.AddGroup(Group(*entry["data"]))
+        elif entry["part"] == "groups_remove":
+            name, mesh_identifier, entity_type = entry["data"]
+            for group in self.groups_model.GetGroupsOfMesh(mesh_identifier):
+                if group.name == name and group.entity_type == entity_type:
+                    self.groups_model.RemoveGroup(group)
+                    break
+            else:
+                logger.warning('Cannot restore the removal of group "%s", it does not exist', name)
+        elif entry["part"] == "application":
+            serialized_app = entry["data"]
+            if serialized_app:
+                self.__application = _PendingApplication(serialized_app["application_module"], serialized_app["application_data"])
+            else:
+                self.__application = None
+        else:
+            logger.warning('Ignoring unknown entry in journal: "%s"', entry["part"])
+
+    def __SetProjectPath(self, project_path: Path) -> None:
+        """the changes are autosaved in this project, see "Autosave" """
+        self.__project_path = project_path
+        self.__journal = ProjectJournal(project_path / _JOURNAL_FILE_NAME)
+        self.__study_autosaved = False
+        self.__last_study_autosave_time = time.monotonic()
+
+    def __IsStudySavedIn(self, salome_study_path: Path) -> bool:
+        """checks if the study is unmodified and was saved under (or opened from or copied to) the given path
+        in this case the existing file can be reused instead of saving the study again
+        """
+        if IsStudyModified() or not salome_study_path.is_file():
+            return False
+        if self.__copied_study == (salome_study_path.resolve(), GetStudyModificationState()):
+            return True
+        study_file_path = GetStudyFilePath()
+        return study_file_path is not None and study_file_path.is_file() and study_file_path.samefile(salome_study_path)
+
+    def __GetModificationState(self) -> tuple:
+        """returns an identifier for the current state of the plugin data (groups and application)
+        it changes when they are modified or replaced
+        """
+        # a pending application is not loaded, it is unchanged as long as it is not loaded
+        if self.__application and not isinstance(self.__application, _PendingApplication):
+            application_generation = self.__application.GetGeneration()
+        else:
+            application_generation = 0
+        return (self.groups_model, self.groups_model.GetGeneration(), self.__application, application_generation)
+
+    def __ReplacePendingApplication(self, modification_state: tuple, pending_application) -> tuple:
+        """replaces the pending application in the modification state with the loaded application
+        a state that refers to another application (e.g. one restored from the journal) is returned unchanged
+        """
+        if modification_state[2] is not pending_application:
+            return modification_state
+        return modification_state[:2] + (self.__application, self.__application.GetGeneration())
+
+    def __RunJob(self, job: Job, job_runner):
+        self.__job_is_running = True # no autosaving while saving or opening
+        try:
+            if job_runner is None:
+                return job.Run()
+            return job_runner(job)
+        finally:
+            self.__job_is_running = False
 
     def __InitializeMembers(self) -> None:
         self.groups_model = GroupsModel()
-        self.application = None
+        self.__application = None
+        self.__saved_state = self.__autosaved_state = self.__GetModificationState() # a new project has no changes
+        self.__project_path = None # not yet saved or opened, see "Autosave"
+        self.__study_autosaved = False
+
+
+class _PendingApplication:
+    """application of an opened project that was not yet loaded"""
+    def __init__(self, module_name: str, data: dict):
+        self.module_name = module_name
+        self.data = data
+        self.load_failed = False
+
+    def Load(self):
+        """creates and deserializes the application
+        returns None if the application cannot be loaded
+        """
+        logger.info('loading application from module: "%s"', self.module_name)
+        try:
+            application = _ImportApplicationModule(self.module_name).Create()
+        except ImportError as e:
+            logger.error('Failed to import the application module "%s": "%s"', self.module_name, e)
+            return None
+        if not application.Deserialize(self.data):
+            logger.error('Failed to deserialize the application from module: "%s"', self.module_name)
+            return None
+        return application
+
+
+def _ImportApplicationModule(module_name: str):
+    """imports the module of an application, the modules are cached, hence importing them again is cheap"""
+    application_module = _application_modules.get(module_name)
+    if application_module is None:
+        application_module = _application_modules[module_name] = import_module(module_name)
+    return application_module
+
+def _RestoreStudyFilePath(study_file_path: Path, is_modified: bool) -> None:
+    """restores the path of the study after saving the project failed"""
+    SetStudyFilePath(study_file_path)
+    if is_modified:
+        SetStudyModified()
+
+def _GetTemporaryProjectPath(project_path: Path) -> Path:
+    """the project is written to this directory before it replaces the existing project"""
+    return project_path.with_name(project_path.name + ".tmp")
+
+def _GetBackupProjectPath(project_path: Path) -> Path:
+    """the existing project is moved to this directory while it is replaced"""
+    return project_path.with_name(project_path.name + ".bak")
+
+def _ReplaceDirectory(source_path: Path, target_path: Path) -> None:
+    """replaces the target directory with the source directory
+    a directory cannot be renamed onto a non-empty directory, hence the target is first moved to a backup
+    if this is interrupted, then "_RecoverInterruptedSave" restores the backup
+    """
+    backup_path = _GetBackupProjectPath(target_path)
+    if target_path.is_dir():
+        replace(str(target_path), str(backup_path))
+    try:
+        replace(str(source_path), str(target_path))
+    except BaseException:
+        _RecoverInterruptedSave(target_path)
+        raise
+    _FsyncDirectory(target_path.parent)
+    if backup_path.is_dir():
+        rmtree(str(backup_path))
+
+def _RecoverInterruptedSave(project_path: Path) -> None:
+    """cleans up after saving the project was interrupted (e.g. Salome crashed)
+    if the project was moved to its backup but not yet replaced then the backup is restored
+    """
+    backup_path = _GetBackupProjectPath(project_path)
+    if not backup_path.is_dir():
+        return
+
+    if project_path.is_dir():
+        # the project was replaced, only removing the backup was interrupted
+        rmtree(str(backup_path))
+    else:
+        logger.warning('Saving project "%s" was interrupted, restoring the previous version', project_path)
+        replace(str(backup_path), str(project_path))
+
+def _LinkOrCopyFile(source_path: str, target_path: str) -> None:
+    """hardlinks the file if possible (much faster for large files), otherwise it is copied"""
+    try:
+        link(source_path, target_path)
+    except OSError: # e.g. the file system does not support hardlinks
+        copy2(source_path, target_path)
+
+def _FsyncFile(file_path: Path) -> None:
+    """makes sure the file is written to the disk"""
+    with open(str(file_path), 'rb') as opened_file:
+        fsync(opened_file.fileno())
+
+def _FsyncDirectory(dir_path: Path) -> None:
+    """makes sure the entries of the directory (e.g. renamed files) are written to the disk
+    directories cannot be opened on Windows, where this is not necessary
+    """
+    if os.name == "nt":
+        return
+    dir_fd = os.open(str(dir_path), os.O_RDONLY)
+    try:
+        fsync(dir_fd)
+    finally:
+        os.close(dir_fd)
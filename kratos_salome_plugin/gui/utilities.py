@@ -13,8 +13,12 @@ This file contains utility functions for GUI related functionalities
 NOTE: This file must NOT have dependencies on other files in the plugin!
 """
 
+# python imports
+import threading
+
 # qt imports
-from PyQt5.QtWidgets import QMessageBox
+from PyQt5.QtCore import Qt, QCoreApplication, QEventLoop, QTimer
+from PyQt5.QtWidgets import QMessageBox, QProgressDialog, QPushButton
 
 
 def CreateInformativeMessageBox(
@@ -63,3 +67,76 @@ def CreateInformativeMessageBox(
         fct_ptr(mbx)
 
     mbx.exec()
+
+
+def RunJobWithProgressDialog(job, parent=None, fct_ptr=None):
+    """Runs a job (see "kratos_salome_plugin.job") and shows its progress in a dialog
+    The steps that can run in the background are executed in a separate thread, while
+    the event loop keeps running. This way the GUI stays responsive, e.g. for cancelling the job
+    The other steps (e.g. saving the Salome study) are executed in the GUI thread
+    "fct_ptr" can be used to pass an additional function that can operate on the dialog before the job is started.
+    This is particularily helpful for testing
+    returns the result of the job, raises JobCancelledError if the job was cancelled
+    """
+    dialog = QProgressDialog(parent)
+    dialog.setWindowTitle("KratosMultiphysics")
+    dialog.setWindowModality(Qt.WindowModal)
+    dialog.setRange(0, 100)
+    dialog.setMinimumDuration(500) # short jobs don't show the dialog
+    dialog.setAutoClose(False)
+    dialog.setAutoReset(False)
+
+    cancel_button = QPushButton("Cancel")
+    dialog.setCancelButton(cancel_button)
+    dialog.canceled.disconnect() # otherwise the dialog is closed even if the job cannot be cancelled anymore
+    dialog.canceled.connect(job.Cancel)
+
+    def UpdateDialog():
+        fraction, description = job.GetProgress()
+        dialog.setLabelText("{}\n{}".format(job.name, description))
+        dialog.setValue(int(fraction*100))
+        cancel_button.setEnabled(job.IsCancellable() and not job.IsCancelled())
+
+    def ExecuteStep(step, job):
+        UpdateDialog()
+
+        if not step.run_in_background:
+            QCoreApplication.processEvents() # update the dialog before the GUI thread is blocked
+            return step.fct_ptr(job)
+
+        step_output = {}
+        def ExecuteStepInThread():
+            try:
+                step_output["result"] = step.fct_ptr(job)
+            except BaseException as e:
+                step_output["exception"] = e
+
+        thread = threading.Thread(target=ExecuteStepInThread, daemon=True)
+        event_loop = QEventLoop()
+
+        def CheckThread():
+            UpdateDialog()
+            if not thread.is_alive():
+                event_loop.quit()
+
+        timer = QTimer()
+        timer.setInterval(50)
+        timer.timeout.connect(CheckThread)
+
+        thread.start()
+        timer.start()
+        event_loop.exec_()
+        timer.stop()
+        thread.join()
+
+        if "exception" in step_output:
+            raise step_output["exception"]
+        return step_output.get("result")
+
+    if fct_ptr:
+        fct_ptr(dialog)
+
+    try:
+        return job.Run(ExecuteStep)
+    finally:
+        dialog.close()
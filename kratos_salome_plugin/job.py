@@ -0,0 +1,161 @@
+#  _  __         _          ___       _               ___ _           _
+# | |/ /_ _ __ _| |_ ___ __/ __| __ _| |___ _ __  ___| _ \ |_  _ __ _(_)_ _
+# | ' <| '_/ _` |  _/ _ (_-<__ \/ _` | / _ \ '  \/ -_)  _/ | || / _` | | ' \
+# |_|\_\_| \__,_|\__\___/__/___/\__,_|_\___/_|_|_\___|_| |_|\_,_\__, |_|_||_|
+#                                                               |___/
+# License: BSD License ; see LICENSE
+#
+# Main authors: Philipp Bucher (https://github.com/philbucher)
+#
+
+"""
+This file contains the Job, which splits long running operations (e.g. saving a project) into steps
+The steps that don't interact with Salome can be executed in a background thread, see "gui.utilities.RunJobWithProgressDialog"
+NOTE: This file must NOT have dependencies on other files in the plugin!
+(except exceptions)
+"""
+
+# python imports
+from collections import namedtuple
+import threading
+import logging
+logger = logging.getLogger(__name__)
+
+# plugin imports
+from .exceptions import JobCancelledError
+
+
+_JobStep = namedtuple("_JobStep", ["fct_ptr", "description", "run_in_background", "cancellable", "weight"])
+
+
+class Job:
+    """A job consists of steps that are executed in order
+    Each step is a function that is called with the job, it can report its progress and check if the job was cancelled
+    The job can be cancelled until the first step that cannot be cancelled is started, afterwards it is completed
+    If the job is cancelled or fails then the cleanup functions are called (in reverse order)
+    Cancelling and reporting / querying the progress is thread-safe
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.__steps = []
+        self.__cleanups = []
+        self.__lock = threading.Lock()
+        self.__cancel_requested = False
+        self.__cancellable = True
+        self.__description = ""
+        self.__completed_weight = 0.0
+        self.__current_weight = 0.0
+        self.__step_fraction = 0.0
+
+    def AddStep(self, fct_ptr, description: str, run_in_background: bool=True, cancellable: bool=True, weight: float=1.0) -> None:
+        """adds a step to the job
+        run_in_background -- whether the step can be executed in a background thread, this is not possible for steps that interact with Salome
+        cancellable -- whether the job can be cancelled in this step, this is not possible once files of the previous state are overwritten
+        weight -- relative duration of the step, used for computing the progress of the job
+        """
+        self.__steps.append(_JobStep(fct_ptr, description, run_in_background, cancellable, weight))
+
+    def AddCleanup(self, fct_ptr) -> None:
+        """adds a function that is called if the job is cancelled or fails"""
+        self.__cleanups.append(fct_ptr)
+
+    def Run(self, execute_step=None):
+        """executes the steps in order and returns the result of the last step
+        execute_step -- function for executing a step (e.g. in a background thread)
+                        it is called with the step and the job and has to return the result of the step
+        raises JobCancelledError if the job was cancelled
+        """
+        logger.debug('Running job "%s"', self.name)
+
+        total_weight = sum(step.weight for step in self.__steps)
+        result = None
+
+        try:
+            for step in self.__steps:
+                self.__StartStep(step, total_weight)
+                if execute_step is None:
+                    result = step.fct_ptr(self)
+                else:
+                    result = execute_step(step, self)
+                with self.__lock:
+                    self.__completed_weight += self.__current_weight
+                    self.__current_weight = self.__step_fraction = 0.0
+        except BaseException:
+            self.__Cleanup()
+            raise
+
+        logger.debug('Finished job "%s"', self.name)
+
+        return result
+
+    def Cancel(self) -> bool:
+        """requests to cancel the job, it is cancelled at the next check in a step that can be cancelled
+        returns whether the job can still be cancelled
+        """
+        with self.__lock:
+            if self.__cancellable:
+                self.__cancel_requested = True
+            return self.__cancellable
+
+    def IsCancellable(self) -> bool:
+        with self.__lock:
+            return self.__cancellable
+
+    def IsCancelled(self) -> bool:
+        with self.__lock:
+            return self.__cancel_requested and self.__cancellable
+
+    def CheckCancelled(self) -> None:
+        """raises JobCancelledError if the job was cancelled, should be called regularly in long running steps"""
+        if self.IsCancelled():
+            raise JobCancelledError('Job "{}" was cancelled'.format(self.name))
+
+    def ReportProgress(self, fraction: float) -> None:
+        """reports the progress of the current step, fraction between 0 and 1"""
+        with self.__lock:
+            self.__step_fraction = min(max(fraction, 0.0), 1.0)
+
+    def GetProgress(self):
+        """returns the progress of the job (fraction between 0 and 1) and the description of the current step"""
+        with self.__lock:
+            return self.__completed_weight + self.__current_weight*self.__step_fraction, self.__description
+
+    def __StartStep(self, step, total_weight: float) -> None:
+        # a pending request is still respected before the first step that cannot be cancelled
+        self.CheckCancelled()
+
+        with self.__lock:
+            if not step.cancellable:
+                self.__cancellable = False
+            self.__description = step.description
+            self.__current_weight = step.weight/total_weight if total_weight > 0.0 else 0.0
+
+        logger.debug('Job "%s": %s', self.name, step.description)
+
+    def __Cleanup(self) -> None:
+        for fct_ptr in reversed(self.__cleanups):
+            try:
+                fct_ptr()
+            except Exception as e:
+                logger.error('Exception in cleanup of job "%s": "%s"', self.name, e)
+
+
+def CopyFile(source_path, target_path, job: Job=None, chunk_size: int=16*1024**2) -> None:
+    """copies a file in chunks, this way the progress can be reported to the job and it can be cancelled while copying
+    large files (e.g. Salome studies)
+    """
+    file_size = max(source_path.stat().st_size, 1)
+    copied_size = 0
+
+    with open(str(source_path), 'rb') as source_file, open(str(target_path), 'wb') as target_file:
+        while True:
+            if job:
+                job.CheckCancelled()
+            chunk = source_file.read(chunk_size)
+            if not chunk:
+                break
+            target_file.write(chunk)
+            copied_size += len(chunk)
+            if job:
+                job.ReportProgress(copied_size/file_size)
@@ -15,18 +15,24 @@ It interacts with the database of Salome to access the Mesh
 
 # python imports
 import time
+import hashlib
+from array import array
+from itertools import chain
 import logging
 logger = logging.getLogger(__name__)
 
 # plugin imports
 from . import salome_utilities
 from . import salome_mesh_utilities
+from . import profiling
 
 # salome imports
 import SMESH
 
 smesh = salome_mesh_utilities.GetSmesh()
 
+_NUM_FINGERPRINT_SAMPLE_NODES = 1000 # number of Nodes whose coordinates are included in the fingerprint, see "MeshInterface.GetFingerprint"
+
 
 class MeshInterface:
     def __init__(self, mesh_identifier):
@@ -35,21 +41,10 @@ class MeshInterface:
     def GetNodes(self):
         if self.CheckMeshIsValid():
             start_time = time.time()
-            current_mesh = salome_utilities.GetSalomeObject(self.mesh_identifier)
-
-            if salome_mesh_utilities.IsSubMeshProxy(current_mesh):
-                main_mesh = current_mesh.GetMesh()
-                get_nodes_fct_ptr = lambda mesh : mesh.GetNodesId()
-
-            elif salome_mesh_utilities.IsMeshGroup(current_mesh):
-                main_mesh = current_mesh.GetMesh()
-                get_nodes_fct_ptr = lambda mesh : mesh.GetNodeIDs()
-
-            else: # MeshProxy
-                main_mesh = current_mesh
-                get_nodes_fct_ptr = lambda mesh : mesh.GetNodesId()
+            main_mesh, node_ids = self.__GetMainMeshAndNodeIds()
 
-            nodes = {node_id : main_mesh.GetNodeXYZ(node_id) for node_id in sorted(get_nodes_fct_ptr(current_mesh))}
+            with profiling.Timer("MeshInterface.GetCoordinates", len(node_ids)):
+                nodes = {node_id : main_mesh.GetNodeXYZ(node_id) for node_id in sorted(node_ids)}
             logger.info('Getting {0} Nodes from Mesh "{1}" of type "{2}" took {3:.3} [s]'.format(len(nodes), self.GetMeshName(), self.GetMeshType(), time.time()-start_time))
             return nodes
         else:
@@ -69,40 +64,18 @@ class MeshInterface:
             start_time = time.time()
 
             geom_entities = {}
-            current_mesh = salome_utilities.GetSalomeObject(self.mesh_identifier)
-
             entity_types_in_mesh = self.GetEntityTypesInMesh()
             logged_entity_types_in_mesh = False
             for entity_type in geometrical_entity_types_salome:
                 entity_type_str = salome_mesh_utilities.EntityTypeToString(entity_type)
                 if entity_type in entity_types_in_mesh:
-
-                    if salome_mesh_utilities.IsSubMeshProxy(current_mesh):
-                        main_mesh = smesh.Mesh(current_mesh.GetFather())
-                        sub_shape = current_mesh.GetSubShape()
-                        c1 = smesh.GetCriterion(SMESH.ALL, SMESH.FT_EntityType, '=', entity_type, BinaryOp=SMESH.FT_LogicalAND)
-                        c2 = smesh.GetCriterion(SMESH.ALL, SMESH.FT_BelongToGeom, sub_shape)
-                        entities_filter = smesh.GetFilterFromCriteria([c1,c2])
-                        entities_ids = main_mesh.GetIdsFromFilter(entities_filter)
-
-                    elif salome_mesh_utilities.IsMeshGroup(current_mesh):
-                        main_mesh = current_mesh.GetMesh()
-                        entities_ids = current_mesh.GetListOfID()
-
-                    else: # MeshProxy
-                        entities_filter = smesh.GetFilter(SMESH.ALL, SMESH.FT_EntityType,'=', entity_type)
-                        main_mesh = smesh.Mesh(current_mesh)
-                        entities_ids = main_mesh.GetIdsFromFilter(entities_filter)
-
-                    geom_entities[entity_type_str] = {ent_id : main_mesh.GetElemNodes(ent_id) for ent_id in sorted(entities_ids)}
+                    main_mesh, entities_ids = self.__GetMainMeshAndEntityIds(entity_type)
+                    with profiling.Timer("MeshInterface.GetConnectivities", len(entities_ids)):
+                        geom_entities[entity_type_str] = {ent_id : main_mesh.GetElemNodes(ent_id) for ent_id in sorted(entities_ids)}
                 else:
                     geom_entities[entity_type_str] = {}
-
-                    logger.warning('Entity type "{}" not in Mesh "{}"!'.format(salome_mesh_utilities.EntityTypeToString(entity_type), self.GetMeshName()))
-                    if not logged_entity_types_in_mesh:
-                        logged_entity_types_in_mesh = True
-                        avail_entity_types_as_str = [salome_mesh_utilities.EntityTypeToString(e) for e in entity_types_in_mesh]
-                        logger.info('The following entities are in this mesh: "{}"'.format('", "'.join(avail_entity_types_as_str)))
+                    self.__LogEntityTypeNotInMesh(entity_type, entity_types_in_mesh, not logged_entity_types_in_mesh)
+                    logged_entity_types_in_mesh = True
 
             logger.info('Getting {0} Geometrical Entities from Mesh "{1}" of type "{2}" took {3:.3f} [s]'.format(sum([len(ge) for ge in geom_entities.values()]), self.GetMeshName(), self.GetMeshType(), time.time()-start_time))
 
@@ -111,28 +84,190 @@ class MeshInterface:
         else:
             return {}, {}
 
+    def GetNodesArray(self):
+        """returns the Nodes of the mesh as numpy arrays: (ids, coords)
+        ids: Ids of the Nodes (int64) in ascending order, shape (n,)
+        coords: Coordinates of the Nodes (float64), shape (n, 3)
+        This avoids creating a tuple and a dict-entry per Node, which matters for large meshes
+        """
+        import numpy as np
+
+        if self.CheckMeshIsValid():
+            start_time = time.time()
+            main_mesh, node_ids = self.__GetMainMeshAndNodeIds()
+
+            ids = np.array(node_ids, dtype=np.int64)
+            ids.sort()
+            coords = _GetCoordinatesArray(main_mesh, ids)
+
+            logger.info('Getting {0} Nodes (as array) from Mesh "{1}" of type "{2}" took {3:.3} [s]'.format(ids.size, self.GetMeshName(), self.GetMeshType(), time.time()-start_time))
+            return ids, coords
+        else:
+            return np.empty(0, dtype=np.int64), np.empty((0, 3), dtype=np.float64)
+
+    def GetNodesChunks(self, chunk_size):
+        """generator yielding the Nodes of the mesh in chunks of (at most) "chunk_size" Nodes
+        The chunks have the same format as "GetNodesArray": (ids, coords)
+        Only the coordinates of one chunk are retrieved at the same time
+        Note that the Ids of all Nodes are retrieved at once (Salome provides no access by range), hence the memory still grows with the size of the mesh
+        """
+        import numpy as np
+
+        if not self.CheckMeshIsValid():
+            return
+
+        start_time = time.time()
+        main_mesh, node_ids = self.__GetMainMeshAndNodeIds()
+
+        ids = np.array(node_ids, dtype=np.int64)
+        del node_ids # the list of python ints is much larger than the array
+        ids.sort()
+
+        for start in range(0, ids.size, chunk_size):
+            chunk_ids = ids[start:start+chunk_size]
+            yield chunk_ids, _GetCoordinatesArray(main_mesh, chunk_ids)
+
+        logger.info('Getting {0} Nodes (in chunks of {1}) from Mesh "{2}" of type "{3}" took {4:.3} [s]'.format(ids.size, chunk_size, self.GetMeshName(), self.GetMeshType(), time.time()-start_time))
+
+    def GetEntitiesArrays(self, geometrical_entity_types=[]):
+        """returns the requested geometrical entities of the mesh as numpy arrays
+        format: {entity_type : (ids, connectivities)}
+        ids: Ids of the entities (int64) in ascending order, shape (n,)
+        connectivities: Node-Ids of the entities (int64), shape (n, num_nodes_per_entity)
+        Only entity types with a fixed number of Nodes are supported (i.e. not polygons and polyhedrons)
+        """
+        import numpy as np
+
+        if not self.CheckMeshIsValid():
+            return {}
+
+        geometrical_entity_types_salome = [salome_mesh_utilities.EntityTypeFromString(entity) for entity in geometrical_entity_types if entity != "Node"] # nodes are treated separately
+
+        if len(geometrical_entity_types_salome) == 0:
+            return {}
+
+        start_time = time.time()
+
+        geom_entities = {}
+        entity_types_in_mesh = self.GetEntityTypesInMesh()
+        logged_entity_types_in_mesh = False
+        for entity_type in geometrical_entity_types_salome:
+            entity_type_str = salome_mesh_utilities.EntityTypeToString(entity_type)
+            if entity_type in entity_types_in_mesh:
+                main_mesh, entities_ids = self.__GetMainMeshAndEntityIds(entity_type)
+
+                ids = np.array(entities_ids, dtype=np.int64)
+                ids.sort()
+                geom_entities[entity_type_str] = (ids, _GetConnectivitiesArray(main_mesh, ids, entity_type_str))
+            else:
+                geom_entities[entity_type_str] = (np.empty(0, dtype=np.int64), np.empty((0, 0), dtype=np.int64))
+                self.__LogEntityTypeNotInMesh(entity_type, entity_types_in_mesh, not logged_entity_types_in_mesh)
+                logged_entity_types_in_mesh = True
+
+        logger.info('Getting {0} Geometrical Entities (as arrays) from Mesh "{1}" of type "{2}" took {3:.3f} [s]'.format(sum([ge[0].size for ge in geom_entities.values()]), self.GetMeshName(), self.GetMeshType(), time.time()-start_time))
+
+        return geom_entities
+
+    def GetEntitiesChunks(self, geometrical_entity_type, chunk_size):
+        """generator yielding the geometrical entities of the given type (e.g. "Triangle") in chunks of (at most) "chunk_size" entities
+        The chunks have the same format as the values of "GetEntitiesArrays": (ids, connectivities)
+        Only the connectivities of one chunk are retrieved at the same time
+        Note that the Ids of all entities are retrieved at once (Salome provides no access by range), hence the memory still grows with the size of the mesh
+        """
+        import numpy as np
+
+        if not self.CheckMeshIsValid():
+            return
+
+        entity_type = salome_mesh_utilities.EntityTypeFromString(geometrical_entity_type)
+        entity_types_in_mesh = self.GetEntityTypesInMesh()
+        if entity_type not in entity_types_in_mesh:
+            self.__LogEntityTypeNotInMesh(entity_type, entity_types_in_mesh, True)
+            return
+
+        start_time = time.time()
+        main_mesh, entities_ids = self.__GetMainMeshAndEntityIds(entity_type)
+
+        ids = np.array(entities_ids, dtype=np.int64)
+        del entities_ids # the list of python ints is much larger than the array
+        ids.sort()
+
+        for start in range(0, ids.size, chunk_size):
+            chunk_ids = ids[start:start+chunk_size]
+            yield chunk_ids, _GetConnectivitiesArray(main_mesh, chunk_ids, geometrical_entity_type)
+
+        logger.info('Getting {0} Geometrical Entities of type "{1}" (in chunks of {2}) from Mesh "{3}" of type "{4}" took {5:.3f} [s]'.format(ids.size, geometrical_entity_type, chunk_size, self.GetMeshName(), self.GetMeshType(), time.time()-start_time))
+
     def GetEntityTypesInMesh(self):
         # Note: EntityTypes != GeometryTypes in Salome, see the documentation of SMESH
         if self.CheckMeshIsValid():
-            mesh = salome_utilities.GetSalomeObject(self.mesh_identifier)
-            return [e for e, v in smesh.GetMeshInfo(mesh).items() if v > 0]
+            return [e for e, v in salome_mesh_utilities.GetMeshInfo(self.mesh_identifier).items() if v > 0]
         else:
             return []
 
     def GetMeshInformation(self):
         if self.CheckMeshIsValid():
-            mesh = salome_utilities.GetSalomeObject(self.mesh_identifier)
             # TODO probably has to be converted to string
-            return {e : v for e, v in smesh.GetMeshInfo(mesh).items() if v > 0}
+            return {e : v for e, v in salome_mesh_utilities.GetMeshInfo(self.mesh_identifier).items() if v > 0}
         else:
             return {}
 
     def GetNumberOfNodes(self):
-        raise NotImplementedError
+        """returns the number of Nodes of the mesh, without retrieving them"""
+        if self.CheckMeshIsValid():
+            current_mesh = salome_utilities.GetSalomeObject(self.mesh_identifier)
+            if salome_mesh_utilities.IsSubMeshProxy(current_mesh):
+                return current_mesh.GetNumberOfNodes(True) # True: including the Nodes of the sub-shapes
+            elif salome_mesh_utilities.IsMeshGroup(current_mesh):
+                return current_mesh.GetNumberOfNodes()
+            else: # MeshProxy
+                return current_mesh.NbNodes()
+        else:
+            return 0
 
     def GetNumberOfGeometries(self, geometry_type):
-        # return -1 if the requested type is not available
-        raise NotImplementedError
+        """returns the number of geometrical entities of the given type (e.g. "Triangle") in the mesh, without retrieving them
+        returns -1 if the requested type is not available in the mesh
+        """
+        if self.CheckMeshIsValid():
+            entity_type = salome_mesh_utilities.EntityTypeFromString(geometry_type)
+            num_geometries = salome_mesh_utilities.GetMeshInfo(self.mesh_identifier).get(entity_type, 0)
+            if num_geometries > 0:
+                return num_geometries
+        return -1
+
+    def GetFingerprint(self):
+        """returns a fingerprint of the mesh, which changes when the mesh is modified
+        it is computed from the Ids of the Nodes and entities, the number of entities per type, the bounding box
+        and the coordinates of a sample of (at most 1000, evenly spaced) Nodes, hence not all coordinates and no connectivities are retrieved
+        Note that moving only Nodes that are not in the sample (e.g. a single Node inside the bounding box) is not detected
+        The number of entities is never taken from the cache (see "salome_mesh_utilities.MeshInfoCache"), since the fingerprint detects modifications
+        """
+        if self.CheckMeshIsValid():
+            current_mesh = salome_utilities.GetSalomeObject(self.mesh_identifier)
+            main_mesh, node_ids = self.__GetMainMeshAndNodeIds()
+            if salome_mesh_utilities.IsMeshGroup(current_mesh):
+                entity_ids = current_mesh.GetListOfID()
+            else:
+                entity_ids = current_mesh.GetElementsId()
+
+            fingerprint = hashlib.sha1()
+            fingerprint.update(self.GetMeshType().encode())
+            fingerprint.update(repr(sorted((str(e), v) for e, v in smesh.GetMeshInfo(current_mesh).items() if v > 0)).encode())
+            fingerprint.update(array('q', node_ids).tobytes())
+            fingerprint.update(array('q', entity_ids).tobytes())
+            fingerprint.update(repr(smesh.BoundingBox(current_mesh)).encode())
+            fingerprint.update(array('d', chain.from_iterable(main_mesh.GetNodeXYZ(node_id) for node_id in _GetFingerprintSampleNodeIds(node_ids))).tobytes())
+            return fingerprint.hexdigest()
+        else:
+            return ""
+
+    def GetMainMeshIdentifier(self):
+        """returns the identifier of the main mesh that this mesh belongs to, see "DoMeshesBelongToSameMainMesh" """
+        if self.CheckMeshIsValid():
+            return salome_mesh_utilities.GetMainMeshIdentifier(self.mesh_identifier)
+        else:
+            return ""
 
     def CheckMeshIsValid(self):
         # check if object exists
@@ -174,10 +309,9 @@ class MeshInterface:
         string_buf += "{}  Mesh is valid: {}\n".format(prefix_string, mesh_is_valid)
         if mesh_is_valid:
             string_buf += "{}  Mesh has the following entities:\n".format(prefix_string)
-            mesh = salome_utilities.GetSalomeObject(self.mesh_identifier)
-            for e, v in smesh.GetMeshInfo(mesh).items():
+            for e, v in salome_mesh_utilities.GetMeshInfo(self.mesh_identifier).items():
                 if v > 0:
-                    string_buf += "{}    {}: {}\n".format(prefix_string, str(e)[7:], v)
+                    string_buf += "{}    {}: {}\n".format(prefix_string, salome_mesh_utilities.EntityTypeToString(e), v)
 
         return string_buf
 
@@ -186,6 +320,53 @@ class MeshInterface:
         string_buf += self.PrintData()
         return string_buf
 
+    def __GetMainMeshAndNodeIds(self):
+        """returns the main mesh (to query the coordinates from) and the Ids of the Nodes of this mesh"""
+        with profiling.Timer("MeshInterface.GetNodeIds") as timer:
+            current_mesh = salome_utilities.GetSalomeObject(self.mesh_identifier)
+
+            if salome_mesh_utilities.IsSubMeshProxy(current_mesh):
+                main_mesh, node_ids = current_mesh.GetMesh(), current_mesh.GetNodesId()
+            elif salome_mesh_utilities.IsMeshGroup(current_mesh):
+                main_mesh, node_ids = current_mesh.GetMesh(), current_mesh.GetNodeIDs()
+            else: # MeshProxy
+                main_mesh, node_ids = current_mesh, current_mesh.GetNodesId()
+
+            timer.count = len(node_ids)
+
+        return main_mesh, node_ids
+
+    def __GetMainMeshAndEntityIds(self, entity_type):
+        """returns the main mesh (to query the connectivities from) and the Ids of the entities of the given type of this mesh"""
+        with profiling.Timer("MeshInterface.GetEntityIds") as timer:
+            current_mesh = salome_utilities.GetSalomeObject(self.mesh_identifier)
+
+            if salome_mesh_utilities.IsSubMeshProxy(current_mesh):
+                main_mesh = smesh.Mesh(current_mesh.GetFather())
+                sub_shape = current_mesh.GetSubShape()
+                c1 = smesh.GetCriterion(SMESH.ALL, SMESH.FT_EntityType, '=', entity_type, BinaryOp=SMESH.FT_LogicalAND)
+                c2 = smesh.GetCriterion(SMESH.ALL, SMESH.FT_BelongToGeom, sub_shape)
+                entities_filter = smesh.GetFilterFromCriteria([c1,c2])
+                entities_ids = main_mesh.GetIdsFromFilter(entities_filter)
+
+            elif salome_mesh_utilities.IsMeshGroup(current_mesh):
+                main_mesh, entities_ids = current_mesh.GetMesh(), current_mesh.GetListOfID()
+
+            else: # MeshProxy
+                entities_filter = smesh.GetFilter(SMESH.ALL, SMESH.FT_EntityType,'=', entity_type)
+                main_mesh = smesh.Mesh(current_mesh)
+                entities_ids = main_mesh.GetIdsFromFilter(entities_filter)
+
+            timer.count = len(entities_ids)
+
+        return main_mesh, entities_ids
+
+    def __LogEntityTypeNotInMesh(self, entity_type, entity_types_in_mesh, log_available_entity_types):
+        logger.warning('Entity type "{}" not in Mesh "{}"!'.format(salome_mesh_utilities.EntityTypeToString(entity_type), self.GetMeshName()))
+        if log_available_entity_types:
+            avail_entity_types_as_str = [salome_mesh_utilities.EntityTypeToString(e) for e in entity_types_in_mesh]
+            logger.info('The following entities are in this mesh: "{}"'.format('", "'.join(avail_entity_types_as_str)))
+
     @staticmethod
     def DoMeshesBelongToSameMainMesh(list_mesh_interfaces):
         """checks whether all meshes given a list of mesh interfaces belong to the same main mesh"""
@@ -197,3 +378,44 @@ class MeshInterface:
                 return False
 
         return salome_mesh_utilities.DoMeshesBelongToSameMainMesh(mesh_identifiers)
+
+
+def _GetFingerprintSampleNodeIds(node_ids):
+    """returns at most "_NUM_FINGERPRINT_SAMPLE_NODES" evenly spaced Nodes of the (sorted) Nodes
+    the step is rounded up, otherwise almost twice as many Nodes are sampled (e.g. 1999 Nodes with step 1)
+    """
+    step = max(1, -(-len(node_ids) // _NUM_FINGERPRINT_SAMPLE_NODES))
+    return sorted(node_ids)[::step]
+
+def _GetCoordinatesArray(main_mesh, node_ids):
+    """retrieves the coordinates of the given Nodes as a 2D numpy array of shape (n, 3)"""
+    import numpy as np
+
+    num_nodes = node_ids.size
+    with profiling.Timer("MeshInterface.GetCoordinates", num_nodes):
+        return np.fromiter(chain.from_iterable(main_mesh.GetNodeXYZ(node_id) for node_id in node_ids.tolist()), dtype=np.float64, count=3*num_nodes).reshape(num_nodes, 3)
+
+def _GetConnectivitiesArray(main_mesh, entities_ids, entity_type_str):
+    """retrieves the connectivities of the given entities as a 2D numpy array
+    the number of nodes per entity is taken from the first entity, all other entities must have the same number
+    """
+    import numpy as np
+
+    num_entities = entities_ids.size
+    if num_entities == 0:
+        return np.empty((0, 0), dtype=np.int64)
+
+    ids_list = entities_ids.tolist()
+    num_nodes_per_entity = len(main_mesh.GetElemNodes(ids_list[0]))
+
+    def EntitiesNodes():
+        for ent_id in ids_list:
+            entity_nodes = main_mesh.GetElemNodes(ent_id)
+            if len(entity_nodes) != num_nodes_per_entity:
+                err_msg  = 'Entities of type "{}" have different number of Nodes ({} and {})!\n'.format(entity_type_str, num_nodes_per_entity, len(entity_nodes))
+                err_msg += 'Retrieving them as array is not possible, use "GetNodesAndGeometricalEntities" instead'
+                raise Exception(err_msg)
+            yield from entity_nodes
+
+    with profiling.Timer("MeshInterface.GetConnectivities", num_entities):
+        return np.fromiter(EntitiesNodes(), dtype=np.int64, count=num_entities*num_nodes_per_entity).reshape(num_entities, num_nodes_per_entity)
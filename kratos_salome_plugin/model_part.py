@@ -13,6 +13,9 @@ from collections import OrderedDict
 import logging
 logger = logging.getLogger(__name__)
 
+# plugin imports
+from . import profiling
+
 
 class DataValueContainer:
     def __init__(self):
@@ -218,6 +221,9 @@ class ModelPart(DataValueContainer):
         except KeyError:
             raise RuntimeError('SubModelPart "{}" not found'.format(smp_name))
 
+    def RemoveSubModelPart(self, smp_name):
+        self.__sub_model_parts.pop(smp_name, None)
+
     def IsSubModelPart(self):
         return self.__parent_model_part is not None
 
@@ -242,6 +248,9 @@ class ModelPart(DataValueContainer):
     def NumberOfNodes(self):
         return len(self.__nodes)
 
+    def HasNode(self, node_id):
+        return node_id in self.__nodes
+
     def GetNode(self, node_id):
         try:
             return self.__nodes[node_id]
@@ -267,11 +276,18 @@ class ModelPart(DataValueContainer):
                 if nodes_to_add[-1] is None:
                     raise RuntimeError("the node with Id {} does not exist in the root model part".format(node_id))
 
-            current_model_part = self
-            while(current_model_part.IsSubModelPart()):
-                for node in nodes_to_add:
-                    current_model_part.__nodes[node.Id] = node
-                current_model_part = current_model_part.GetParentModelPart()
+            with profiling.Timer("ModelPart.AddNodes", len(nodes_to_add)):
+                current_model_part = self
+                while(current_model_part.IsSubModelPart()):
+                    for node in nodes_to_add:
+                        current_model_part.__nodes[node.Id] = node
+                    current_model_part = current_model_part.GetParentModelPart()
+
+    def RemoveNode(self, node_id):
+        # removes it from this ModelPart and all its SubModelParts (same as in Kratos)
+        self.__nodes.pop(node_id, None)
+        for smp in self.__sub_model_parts.values():
+            smp.RemoveNode(node_id)
 
     def CreateNewNode(self, node_id, coord_x, coord_y, coord_z):
         if self.IsSubModelPart():
@@ -327,11 +343,18 @@ class ModelPart(DataValueContainer):
                 if elements_to_add[-1] is None:
                     raise RuntimeError("the element with Id {} does not exist in the root model part".format(elem_id))
 
-            current_model_part = self
-            while(current_model_part.IsSubModelPart()):
-                for elem in elements_to_add:
-                    current_model_part.__elements[elem.Id] = elem
-                current_model_part = current_model_part.GetParentModelPart()
+            with profiling.Timer("ModelPart.AddElements", len(elements_to_add)):
+                current_model_part = self
+                while(current_model_part.IsSubModelPart()):
+                    for elem in elements_to_add:
+                        current_model_part.__elements[elem.Id] = elem
+                    current_model_part = current_model_part.GetParentModelPart()
+
+    def RemoveElement(self, element_id):
+        # removes it from this ModelPart and all its SubModelParts (same as in Kratos)
+        self.__elements.pop(element_id, None)
+        for smp in self.__sub_model_parts.values():
+            smp.RemoveElement(element_id)
 
     def CreateNewElement(self, element_name, element_id, node_ids, properties):
         if self.IsSubModelPart():
@@ -347,6 +370,25 @@ class ModelPart(DataValueContainer):
             self.__elements[element_id] = new_element
             return new_element
 
+    def CreateNewElements(self, element_name, first_element_id, connectivities, properties):
+        """creates Elements with consecutive Ids, starting with "first_element_id" (one per entry in "connectivities")
+        the range of Ids is checked at once for existing Elements, instead of checking every Id separately
+        Note: this is not available in Kratos
+        """
+        if self.IsSubModelPart():
+            new_elements = self.__parent_model_part.CreateNewElements(element_name, first_element_id, connectivities, properties)
+            self.__elements.update((element.Id, element) for element in new_elements)
+            return new_elements
+        else:
+            element_ids = range(first_element_id, first_element_id+len(connectivities))
+            if not self.__elements.keys().isdisjoint(element_ids):
+                raise RuntimeError('trying to construct elements with IDs {} to {} however elements with Ids in this range already exist'.format(first_element_id, element_ids[-1]))
+
+            with profiling.Timer("ModelPart.CreateNewElements", len(element_ids)):
+                new_elements = [GeometricalObject(element_id, [self.GetNode(node_id) for node_id in node_ids], element_name, properties) for element_id, node_ids in zip(element_ids, connectivities)]
+                self.__elements.update(zip(element_ids, new_elements))
+            return new_elements
+
 
     ### Methods related to Conditions ###
     @property
@@ -381,11 +423,18 @@ class ModelPart(DataValueContainer):
                 if conditions_to_add[-1] is None:
                     raise RuntimeError("the condition with Id {} does not exist in the root model part".format(cond_id))
 
-            current_model_part = self
-            while(current_model_part.IsSubModelPart()):
-                for cond in conditions_to_add:
-                    current_model_part.__conditions[cond.Id] = cond
-                current_model_part = current_model_part.GetParentModelPart()
+            with profiling.Timer("ModelPart.AddConditions", len(conditions_to_add)):
+                current_model_part = self
+                while(current_model_part.IsSubModelPart()):
+                    for cond in conditions_to_add:
+                        current_model_part.__conditions[cond.Id] = cond
+                    current_model_part = current_model_part.GetParentModelPart()
+
+    def RemoveCondition(self, condition_id):
+        # removes it from this ModelPart and all its SubModelParts (same as in Kratos)
+        self.__conditions.pop(condition_id, None)
+        for smp in self.__sub_model_parts.values():
+            smp.RemoveCondition(condition_id)
 
     def CreateNewCondition(self, condition_name, condition_id, node_ids, properties):
         if self.IsSubModelPart():
@@ -401,6 +450,25 @@ class ModelPart(DataValueContainer):
             self.__conditions[condition_id] = new_condition
             return new_condition
 
+    def CreateNewConditions(self, condition_name, first_condition_id, connectivities, properties):
+        """creates Conditions with consecutive Ids, starting with "first_condition_id" (one per entry in "connectivities")
+        the range of Ids is checked at once for existing Conditions, instead of checking every Id separately
+        Note: this is not available in Kratos
+        """
+        if self.IsSubModelPart():
+            new_conditions = self.__parent_model_part.CreateNewConditions(condition_name, first_condition_id, connectivities, properties)
+            self.__conditions.update((condition.Id, condition) for condition in new_conditions)
+            return new_conditions
+        else:
+            condition_ids = range(first_condition_id, first_condition_id+len(connectivities))
+            if not self.__conditions.keys().isdisjoint(condition_ids):
+                raise RuntimeError('trying to construct conditions with IDs {} to {} however conditions with Ids in this range already exist'.format(first_condition_id, condition_ids[-1]))
+
+            with profiling.Timer("ModelPart.CreateNewConditions", len(condition_ids)):
+                new_conditions = [GeometricalObject(condition_id, [self.GetNode(node_id) for node_id in node_ids], condition_name, properties) for condition_id, node_ids in zip(condition_ids, connectivities)]
+                self.__conditions.update(zip(condition_ids, new_conditions))
+            return new_conditions
+
 
     ### Methods related to Properties ###
     @property
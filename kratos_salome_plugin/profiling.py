@@ -0,0 +1,168 @@
+#  _  __         _          ___       _               ___ _           _
+# | |/ /_ _ __ _| |_ ___ __/ __| __ _| |___ _ __  ___| _ \ |_  _ __ _(_)_ _
+# | ' <| '_/ _` |  _/ _ (_-<__ \/ _` | / _ \ '  \/ -_)  _/ | || / _` | | ' \
+# |_|\_\_| \__,_|\__\___/__/___/\__,_|_\___/_|_|_\___|_| |_|\_,_\__, |_|_||_|
+#                                                               |___/
+# License: BSD License ; see LICENSE
+#
+# Main authors: Philipp Bucher (https://github.com/philbucher)
+#
+
+"""
+This file contains a lightweight profiler for the conversion of meshes
+It collects the time and the number of processed items (e.g. Nodes) of named stages
+The profiler is disabled by default, then the timers and counters do nothing
+The stages can be nested, e.g. "GeometriesIO.AddMeshes" contains "GeometriesIO.AddNodes"
+NOTE: This file must NOT have dependencies on other files in the plugin!
+"""
+
+# python imports
+import sys
+import json
+import time
+import threading
+from collections import OrderedDict
+import logging
+logger = logging.getLogger(__name__)
+
+
+_enabled = False
+_stages = OrderedDict() # map: {stage_name : [time, number of calls, number of items]}, in the order in which the stages were started
+_lock = threading.Lock() # the meshes can be retrieved in several threads
+
+
+class _Timer:
+    """measures the time of a stage, the number of processed items can be set also while it is running"""
+    __slots__ = ["name", "count", "__start_time"]
+
+    def __init__(self, name, count):
+        self.name = name
+        self.count = count
+
+    def __enter__(self):
+        _AddToStage(self.name, 0.0, 0, 0) # registers the stage, this way nested stages are listed after the enclosing ones
+        self.__start_time = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        _AddToStage(self.name, time.perf_counter()-self.__start_time, 1, self.count)
+        return False
+
+
+class _NoOpTimer:
+    """used when the profiler is disabled, setting the count does nothing"""
+    __slots__ = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+    def __setattr__(self, name, value):
+        pass
+
+_NO_OP_TIMER = _NoOpTimer()
+
+
+def Timer(name, count=0):
+    """context manager measuring the time of the stage with the given name
+    count -- number of items processed in the stage, can also be set on the returned object: "timer.count = ..."
+    """
+    if _enabled:
+        return _Timer(name, count)
+    return _NO_OP_TIMER
+
+def AddCount(name, count):
+    """adds a number of processed items to the stage with the given name, without measuring the time"""
+    if _enabled:
+        _AddToStage(name, 0.0, 0, count)
+
+def IsEnabled():
+    return _enabled
+
+def Enable():
+    global _enabled
+    _enabled = True
+
+def Disable():
+    global _enabled
+    _enabled = False
+
+def Reset():
+    with _lock:
+        _stages.clear()
+
+def GetReport():
+    """returns the collected data as dict:
+    {
+        "stages" : {
+            stage_name : {"time" : [s], "calls" : ..., "count" : ..., "throughput" : [items/s]}
+        },
+        "peak_memory" : peak resident memory (RSS) of the process in bytes (None if not available)
+    }
+    """
+    report_stages = OrderedDict()
+    with _lock:
+        for name, (stage_time, num_calls, count) in _stages.items():
+            report_stages[name] = {
+                "time"       : stage_time,
+                "calls"      : num_calls,
+                "count"      : count,
+                "throughput" : count/stage_time if stage_time > 0.0 else None
+            }
+
+    return {
+        "stages"      : report_stages,
+        "peak_memory" : GetPeakMemory()
+    }
+
+def SaveReport(file_name, report=None):
+    """saves the report (by default the current one, see "GetReport") as json-file"""
+    if report is None:
+        report = GetReport()
+    with open(file_name, 'w') as report_file:
+        json.dump(report, report_file, indent=4)
+    logger.info('Saved profiling report to "{}"'.format(file_name))
+
+def GetPeakMemory():
+    """returns the peak resident memory (RSS) of the process in bytes, None if it is not available (e.g. on Windows)"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak_memory = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS reports bytes
+    return peak_memory if sys.platform == "darwin" else peak_memory*1024
+
+
+class Profile:
+    """context manager that enables the profiler (starting with no data) and restores the previous state afterwards
+    the report is available in "report" after the context is left
+    """
+
+    def __init__(self):
+        self.report = None
+
+    def __enter__(self):
+        self.__was_enabled = IsEnabled()
+        Reset()
+        Enable()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.report = GetReport()
+        if not self.__was_enabled:
+            Disable()
+        return False
+
+
+def _AddToStage(name, stage_time, num_calls, count):
+    with _lock:
+        stage = _stages.get(name)
+        if stage is None:
+            _stages[name] = [stage_time, num_calls, count]
+        else:
+            stage[0] += stage_time
+            stage[1] += num_calls
+            stage[2] += count
@@ -30,13 +30,17 @@ MODULE_RELOAD_ORDER = [
     "exceptions",
     "version",
     "utilities",
+    "profiling",
+    "job",
     "salome_utilities",
     "salome_gui_utilities",
     "salome_mesh_utilities",
     "salome_study_utilities",
     "reload_modules",
     "mesh_interface",
+    "file_mesh_interface",
     "model_part",
+    "connectivity_reordering",
     "geometries_io",
     "write_mdpa",
     "plugin_logging",
@@ -45,6 +49,7 @@ MODULE_RELOAD_ORDER = [
     "gui.about",
     "gui.active_window",
     "gui.project_path_handler",
+    "gui.project_journal",
     "gui.project_manager",
     "gui.base_window",
     "gui.plugin_main_window",
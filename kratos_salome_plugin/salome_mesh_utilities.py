@@ -15,6 +15,7 @@ NOTE: This file must NOT have dependencies on other files in the plugin!
 """
 
 # python imports
+import threading
 from typing import List, Dict, Any
 
 # plugin imports
@@ -26,6 +27,18 @@ from salome.smesh import smeshBuilder
 smesh = smeshBuilder.New()
 
 
+# tables for converting the entity types to strings and back, built when they are used the first time
+_entity_types_to_string = None   # map: {SMESH.EntityType : name}
+_entity_types_from_string = None # map: {name : SMESH.EntityType}
+
+# cache for "GetMeshInfo", only used inside of "MeshInfoCache"
+# it is shared by all threads (e.g. the threads retrieving the meshes in "GeometriesIO.AddMeshes"), hence it is protected by the lock
+_mesh_info_cache = {} # map: {mesh_identifier : {SMESH.EntityType : number of entities}}
+_mesh_info_cache_depth = 0
+_mesh_info_cache_generation = 0 # increased when cached information is removed, results queried before are not cached then
+_mesh_info_cache_lock = threading.Lock()
+
+
 def IsMesh(obj: Any) -> bool:
     """returns whether an object is a Mesh"""
     return isinstance(obj, smeshBuilder.Mesh)
@@ -51,21 +64,25 @@ def IsAnyMesh(obj: Any) -> bool:
     """returns whether an object is any Mesh"""
     return any([IsMesh(obj), IsMeshProxy(obj), IsSubMeshProxy(obj), IsMeshGroup(obj)])
 
+def GetMainMeshIdentifier(mesh_identifier: str) -> str:
+    """returns the identifier of the main mesh that a mesh belongs to (the identifier itself for a main mesh)
+    Throws if the mesh identifier does not belong to a mesh
+    """
+    mesh_obj = salome_utilities.GetSalomeObject(mesh_identifier)
+    if IsMeshProxy(mesh_obj):
+        return mesh_identifier
+    elif IsSubMeshProxy(mesh_obj) or IsMeshGroup(mesh_obj):
+        return salome_utilities.GetSalomeID(mesh_obj.GetMesh())
+    else:
+        obj_type = type(mesh_obj)
+        obj_name = salome_utilities.GetObjectName(mesh_identifier)
+        raise Exception('Object with identifier "{}" is not a mesh! Name: "{}" , Type: "{}"'.format(mesh_identifier, obj_name, obj_type))
+
 def DoMeshesBelongToSameMainMesh(list_mesh_identifiers: List[str]) -> bool:
     """checks whether all meshes given a list of mesh identifiers belong to the same main mesh
     Throws if an mesh identifier does not belong to a mesh
     """
-    main_mesh_identifiers = []
-    for mesh_identifier in list_mesh_identifiers:
-        mesh_obj = salome_utilities.GetSalomeObject(mesh_identifier)
-        if IsMeshProxy(mesh_obj):
-            main_mesh_identifiers.append(mesh_identifier)
-        elif IsSubMeshProxy(mesh_obj) or IsMeshGroup(mesh_obj):
-            main_mesh_identifiers.append(salome_utilities.GetSalomeID(mesh_obj.GetMesh()))
-        else:
-            obj_type = type(mesh_obj)
-            obj_name = salome_utilities.GetObjectName(mesh_identifier)
-            raise Exception('Object with identifier "{}" is not a mesh! Name: "{}" , Type: "{}"'.format(mesh_identifier, obj_name, obj_type))
+    main_mesh_identifiers = [GetMainMeshIdentifier(mesh_identifier) for mesh_identifier in list_mesh_identifiers]
 
     return len(set(main_mesh_identifiers)) <= 1 # also works for empty input
 
@@ -74,7 +91,10 @@ def EntityTypeToString(entity_type: SMESH.EntityType) -> str:
     e.g. Entity_Triangle (type: SMESH.EntityType) to "Triangle"
     see https://docs.salome-platform.org/latest/gui/SMESH/smesh_module.html#entitytype
     """
-    return str(entity_type)[7:]
+    entity_type_str = _GetEntityTypesToString().get(entity_type)
+    if entity_type_str is None:
+        return str(entity_type)[7:]
+    return entity_type_str
 
 def EntityTypeFromString(name_entity_type: str) -> SMESH.EntityType:
     """converts an entity type name to an entity type
@@ -82,23 +102,99 @@ def EntityTypeFromString(name_entity_type: str) -> SMESH.EntityType:
     see https://docs.salome-platform.org/latest/gui/SMESH/smesh_module.html#entitytype
     """
     # Note: EntityTypes != GeometryTypes in Salome, see the documentation of SMESH
-    entity_types_dict = {EntityTypeToString(entity_type) : entity_type for entity_type in SMESH.EntityType._items} # all entities available in salome
-    if name_entity_type not in entity_types_dict:
+    entity_types_dict = _GetEntityTypesFromString() # all entities available in salome
+    entity_type = entity_types_dict.get(name_entity_type)
+    if entity_type is None:
         err_msg  = 'The requested entity type "{}" is not available!\n'.format(name_entity_type)
         err_msg += 'Only the following entity types are available:\n'
         for e_t in sorted(entity_types_dict.keys()):
             err_msg += '    {}\n'.format(e_t)
         raise Exception(err_msg)
-    return entity_types_dict[name_entity_type]
+    return entity_type
+
+def GetMeshInfo(mesh_identifier: str) -> Dict[SMESH.EntityType, int]:
+    """returns the number of entities per entity type of a mesh (see "smesh.GetMeshInfo")
+    inside of "MeshInfoCache" the result is cached per mesh, this avoids querying the same mesh several times
+    """
+    with _mesh_info_cache_lock:
+        is_cache_enabled = _mesh_info_cache_depth > 0
+        mesh_info = _mesh_info_cache.get(mesh_identifier)
+        generation = _mesh_info_cache_generation
+    if mesh_info is not None:
+        return mesh_info
+
+    # queried without holding the lock, since this waits for the Salome server
+    mesh_info = smesh.GetMeshInfo(salome_utilities.GetSalomeObject(mesh_identifier))
+    if is_cache_enabled:
+        with _mesh_info_cache_lock:
+            if _mesh_info_cache_depth > 0 and generation == _mesh_info_cache_generation:
+                # another thread might have queried the same mesh meanwhile
+                mesh_info = _mesh_info_cache.setdefault(mesh_identifier, mesh_info)
+    return mesh_info
+
+def InvalidateMeshInfoCache(mesh_identifier: str = "") -> None:
+    """removes the cached information of a mesh (e.g. after it was modified), of all meshes if no identifier is given"""
+    global _mesh_info_cache_generation
+    with _mesh_info_cache_lock:
+        _mesh_info_cache_generation += 1
+        if mesh_identifier:
+            _mesh_info_cache.pop(mesh_identifier, None)
+        else:
+            _mesh_info_cache.clear()
+
+class MeshInfoCache:
+    """context manager that enables the cache of "GetMeshInfo", the cache is cleared when the (outermost) context is left
+    The meshes must not be modified inside of it, otherwise "InvalidateMeshInfoCache" has to be called
+    """
+
+    def __enter__(self):
+        global _mesh_info_cache_depth
+        with _mesh_info_cache_lock:
+            _mesh_info_cache_depth += 1
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        global _mesh_info_cache_depth, _mesh_info_cache_generation
+        with _mesh_info_cache_lock:
+            _mesh_info_cache_depth -= 1
+            if _mesh_info_cache_depth == 0:
+                _mesh_info_cache_generation += 1
+                _mesh_info_cache.clear()
+        return False
 
 def GetEntityTypesInMesh(mesh_obj) -> List[str]:
-    return [EntityTypeToString(e) for e, v in smesh.GetMeshInfo(mesh_obj).items() if v > 0]
+    return [EntityTypeToString(e) for e, v in _GetMeshInfoOfObject(mesh_obj).items() if v > 0]
 
 def GetMeshInformation(mesh_obj) -> Dict[str, int]:
-    return {EntityTypeToString(e) : v for e, v in smesh.GetMeshInfo(mesh).items() if v > 0}
+    return {EntityTypeToString(e) : v for e, v in _GetMeshInfoOfObject(mesh_obj).items() if v > 0}
 
 def MeshHasEntitiesOfType(mesh_obj, entity_type: str) -> bool:
     return entity_type in GetEntityTypesInMesh(mesh_obj)
 
 def GetSmesh():
     return smesh
+
+def _GetMeshInfoOfObject(mesh_obj) -> Dict[SMESH.EntityType, int]:
+    """like "GetMeshInfo" but for a mesh object
+    the identifier of the object is only looked up if the cache is enabled
+    objects that are not published in the study have no identifier, they are not cached
+    """
+    with _mesh_info_cache_lock:
+        is_cache_enabled = _mesh_info_cache_depth > 0
+    if is_cache_enabled:
+        mesh_identifier = salome_utilities.GetSalomeID(mesh_obj)
+        if mesh_identifier:
+            return GetMeshInfo(mesh_identifier)
+    return smesh.GetMeshInfo(mesh_obj)
+
+def _GetEntityTypesToString() -> Dict[SMESH.EntityType, str]:
+    global _entity_types_to_string
+    if _entity_types_to_string is None:
+        _entity_types_to_string = {entity_type : str(entity_type)[7:] for entity_type in SMESH.EntityType._items}
+    return _entity_types_to_string
+
+def _GetEntityTypesFromString() -> Dict[str, SMESH.EntityType]:
+    global _entity_types_from_string
+    if _entity_types_from_string is None:
+        _entity_types_from_string = {entity_type_str : entity_type for entity_type, entity_type_str in _GetEntityTypesToString().items()}
+    return _entity_types_from_string
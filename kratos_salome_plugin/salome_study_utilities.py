@@ -17,6 +17,7 @@ NOTE: This file must NOT have dependencies on other files in the plugin!
 # python imports
 import os
 from pathlib import Path
+from typing import List
 import logging
 logger = logging.getLogger(__name__)
 
@@ -27,31 +28,95 @@ from .utilities import PathCheck
 from salome import myStudy
 
 
-def GetNumberOfObjectsInComponent(component) -> int:
-    """Counts the number of objects in a component (e.g. GEOM, SMESH)
-    adapted from "KERNEL/lib/python3.6/site-packages/salome/salome_study.py"
+_study_generation = 0 # increased when the study is saved, opened or reset, see "GetStudyModificationState"
+_num_objects_cache = {} # cache for "GetNumberOfObjectsInStudy", map: {max_depth : number of objects}
+
+
+def IterateStudy(root=None, max_depth: int=-1, object_types=None, component_types=None):
+    """Iterates the objects in the study (depth-first, in the order of the study tree)
+    Yields tuples of the study object (SObject) and its path (e.g. "/Mesh/main_mesh/Groups of Faces/face_1_faces")
+    The tree is traversed iteratively, hence deep studies cannot exceed the recursion limit
+    root -- study object whose children are iterated, by default the objects of all components (e.g. GEOM, SMESH) are iterated
+    max_depth -- only objects up to this level below the root are iterated (e.g. 1 for the direct children), -1 for all
+    object_types -- only objects whose (CORBA) object is an instance of these types are yielded (e.g. SMESH.SMESH_Mesh)
+                    the children of objects that are not yielded are still iterated
+    component_types -- only the components with these data types are iterated (e.g. ["SMESH"]), ignored if root is given
     """
-    num_objs_in_comp = 0
-    it = myStudy.NewChildIterator(component)
-    while it.More():
-        component_child = it.Value()
-        num_objs_in_comp += 1 + GetNumberOfObjectsInComponent(component_child) # +1 bcs recursion
+    if root is None:
+        roots = []
+        itcomp = myStudy.NewComponentIterator()
+        while itcomp.More(): # loop components (e.g. GEOM, SMESH)
+            component = itcomp.Value()
+            if component_types is None or component.ComponentDataType() in component_types:
+                roots.append(component)
+            itcomp.Next()
+    else:
+        roots = [root]
+
+    if max_depth == 0:
+        return
+
+    # stack of child iterators, the study is traversed without recursion
+    iterators = [(myStudy.NewChildIterator(obj), myStudy.GetObjectPath(obj), 1) for obj in reversed(roots)]
+    while iterators:
+        it, parent_path, depth = iterators[-1]
+        if not it.More():
+            iterators.pop()
+            continue
+
+        obj = it.Value()
         it.Next()
-    return num_objs_in_comp
+        path = parent_path + "/" + obj.GetName()
+
+        if object_types is None or isinstance(obj.GetObject(), object_types):
+            yield obj, path
+
+        if depth != max_depth:
+            iterators.append((myStudy.NewChildIterator(obj), path, depth+1))
+
+def GetNumberOfObjectsInComponent(component, max_depth: int=-1) -> int:
+    """Counts the number of objects in a component (e.g. GEOM, SMESH)
+    max_depth -- see "IterateStudy"
+    """
+    return sum(1 for _ in IterateStudy(component, max_depth))
 
-def GetNumberOfObjectsInStudy() -> int:
+def GetNumberOfObjectsInStudy(max_depth: int=-1) -> int:
     """Counts the number of objects in the study, for all components
-    adapted from "KERNEL/lib/python3.6/site-packages/salome/salome_study.py"
+    The result is cached as long as the study is not modified, see "GetStudyModificationState"
+    Use "IsStudyEmpty" for checking if the study contains objects, it is much faster for large studies
+    max_depth -- see "IterateStudy"
     """
     # myStudy.DumpStudy() # for debugging
 
+    modification_state = GetStudyModificationState()
+    if _num_objects_cache.get("state") != modification_state:
+        _num_objects_cache.clear()
+        _num_objects_cache["state"] = modification_state
+
+    num_objs_in_study = _num_objects_cache.get(max_depth)
+    if num_objs_in_study is None:
+        num_objs_in_study = sum(1 for _ in IterateStudy(max_depth=max_depth))
+        _num_objects_cache[max_depth] = num_objs_in_study
+
+    return num_objs_in_study
+
+def IsStudyEmpty() -> bool:
+    """returns whether the study contains no objects
+    stops at the first object that is found, hence unlike "GetNumberOfObjectsInStudy" the study is not traversed
+    """
     itcomp = myStudy.NewComponentIterator()
-    num_objs_in_study = 0
     while itcomp.More(): # loop components (e.g. GEOM, SMESH)
-        component = itcomp.Value()
-        num_objs_in_study += GetNumberOfObjectsInComponent(component)
+        if myStudy.NewChildIterator(itcomp.Value()).More():
+            return False
         itcomp.Next()
-    return num_objs_in_study
+    return True
+
+def GetStudyModificationState() -> tuple:
+    """returns an identifier for the current state of the study
+    it changes when the study is modified, saved, opened or reset
+    """
+    properties = myStudy.GetProperties()
+    return (_study_generation, myStudy._get_URL(), properties.IsModified(), properties.GetModified())
 
 def IsStudyModified() -> bool:
     """returns whether the study has unsaved modifications
@@ -59,6 +124,30 @@ def IsStudyModified() -> bool:
     """
     return myStudy.GetProperties().IsModified()
 
+def GetStudyFilePath() -> Path:
+    """returns the path of the file under which the study was saved last (or from which it was opened)
+    None if the study was never saved
+    """
+    study_url = myStudy._get_URL()
+    if study_url:
+        return Path(study_url)
+    return None
+
+def SetStudyFilePath(file_path: Path) -> None:
+    """sets the path of the file of the study, without saving it
+    used if the study file was moved after saving it (e.g. from a temporary directory)
+    None resets the path, as if the study was never saved
+    """
+    if file_path is None:
+        myStudy._set_URL("")
+        return
+    PathCheck(file_path)
+    myStudy._set_URL(str(file_path))
+
+def SetStudyModified() -> None:
+    """marks the study as modified, e.g. if the file it was saved to was removed afterwards"""
+    myStudy.Modified()
+
 def SaveStudy(file_path: Path) -> bool:
     """saves the study as a single file, non-ascii
     returns whether saving the study was successful
@@ -76,6 +165,8 @@ def SaveStudy(file_path: Path) -> bool:
     if not file_path.parent.is_dir():
         os.makedirs(file_path.parent)
 
+    _IncreaseStudyGeneration()
+
     try:
         save_successful = myStudy.SaveAs(str(file_path), False, False) # args: use_multifile, use_acsii
         if save_successful and not file_path.is_file(): # make sure the file was actually created!
@@ -105,9 +196,11 @@ def OpenStudy(file_path: Path) -> bool:
     if file_path.suffix != ".hdf":
         logger.warning('Opening study from file without ".hdf" extension: "%s"',file_path)
 
-    if IsStudyModified() and GetNumberOfObjectsInStudy() > 0:
+    if IsStudyModified() and not IsStudyEmpty():
         logger.warning('Opening study when current study has unsaved changes')
 
+    _IncreaseStudyGeneration()
+
     try:
         open_successful = myStudy.Open(str(file_path))
     except BaseException as e: # catch all exceptions
@@ -126,5 +219,75 @@ def ResetStudy() -> None:
     see https://docs.salome-platform.org/latest/tui/KERNEL/kernel_salome.html
     """
     logger.debug("Resetting Study")
+    _IncreaseStudyGeneration()
     myStudy.Clear()
     myStudy.Init()
+
+
+class StudyIndex:
+    """Index for looking up the identifiers (entries) of objects in the study by their name or path
+    It is built in one traversal of the study (see "IterateStudy")
+    The study is traversed again only if it was modified (see "GetStudyModificationState"):
+    - path lookups check that the indexed object still has this path, only if it does not the index is rebuilt
+    - name lookups rebuild the index since objects with this name might have been added
+    NOTE: the index is not updated incrementally, since Salome only provides the modification state of the whole study
+          (not which objects changed). Rebuilding traverses all indexed components, use "component_types" and
+          "object_types" to limit this. Lookups in an unmodified study don't traverse it
+    """
+
+    def __init__(self, object_types=None, component_types=None):
+        """object_types, component_types -- see "IterateStudy"
+        """
+        self.__object_types = object_types
+        self.__component_types = component_types
+        self.__entries_by_path = {}
+        self.__entries_by_name = {} # names are not unique, map: {name : [entries]}
+        self.__modification_state = None
+
+    def GetEntryByPath(self, path: str) -> str:
+        """returns the entry of the object with the given path, None if no such object exists"""
+        entry = self.__entries_by_path.get(path)
+
+        if not self.IsUpToDate():
+            if entry is not None:
+                obj = myStudy.FindObjectID(entry)
+                if obj is not None and myStudy.GetObjectPath(obj) == path:
+                    return entry
+            self.Refresh()
+            entry = self.__entries_by_path.get(path)
+
+        return entry
+
+    def GetEntriesByName(self, name: str) -> List[str]:
+        """returns the entries of the objects with the given name (in the order of the study tree)"""
+        self.Refresh()
+        return list(self.__entries_by_name.get(name, []))
+
+    def IsUpToDate(self) -> bool:
+        return self.__modification_state == GetStudyModificationState()
+
+    def Refresh(self) -> None:
+        """rebuilds the index if the study was modified since it was built (completely, see the class description)"""
+        modification_state = GetStudyModificationState()
+        if self.__modification_state == modification_state:
+            return
+
+        self.__entries_by_path.clear()
+        self.__entries_by_name.clear()
+        for obj, path in IterateStudy(object_types=self.__object_types, component_types=self.__component_types):
+            entry = obj.GetID()
+            self.__entries_by_path[path] = entry
+            self.__entries_by_name.setdefault(obj.GetName(), []).append(entry)
+
+        self.__modification_state = modification_state
+        logger.debug("Built study index with %d objects", len(self.__entries_by_path))
+
+    def __len__(self):
+        self.Refresh()
+        return len(self.__entries_by_path)
+
+
+def _IncreaseStudyGeneration():
+    global _study_generation
+    _study_generation += 1
+    _num_objects_cache.clear()
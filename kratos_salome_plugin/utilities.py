@@ -60,6 +60,16 @@ def GetInitModulesInDirectory(dir_name):
     """This function returns a list of all "__init__.py" modules in a directory"""
     return ConvertPythonFilesToPythonModules(GetInitFilesInDirectory(dir_name))
 
+def IsNumpyAvailable() -> bool:
+    """Check if numpy can be imported
+    numpy is available in Salome, but it is not a requirement of the plugin
+    """
+    try:
+        import numpy
+        return True
+    except ImportError:
+        return False
+
 def PathCheck(path: Path) -> None:
     """Check if the path input is valid / usable"""
     if not isinstance(path, Path):
@@ -13,8 +13,12 @@ import os
 import time
 import logging
 import copy
+from itertools import islice
 logger = logging.getLogger(__name__)
 
+# plugin imports
+from . import profiling
+
 def _WriteHeaderMdpa(model_part, additional_header, write_creation_time, file_stream):
     def WriteSubModelPartInfo(model_part,
                               file_stream,
@@ -43,29 +47,44 @@ def _WriteHeaderMdpa(model_part, additional_header, write_creation_time, file_st
     WriteSubModelPartInfo(model_part,file_stream, level=1)
     file_stream.write("\n")
 
-def _WriteNodesMdpa(nodes, file_stream):
+def _WriteLines(lines, file_stream, chunk_size=0):
+    """writes the lines to the file
+    if chunk_size is larger than 0 then chunks of this many lines are passed to the file at once (with "writelines"),
+    which reduces the number of python-calls. The lines are not joined, hence no additional memory is required
+    """
+    if chunk_size > 0:
+        lines = iter(lines)
+        for first_line in lines: # the remaining lines of the chunk are taken from the same iterator
+            file_stream.write(first_line)
+            file_stream.writelines(islice(lines, chunk_size-1))
+    else:
+        for line in lines:
+            file_stream.write(line)
+
+def _WriteNodesMdpa(nodes, file_stream, chunk_size=0):
     if len(nodes) > 0:
         file_stream.write("Begin Nodes\n")
         precision = 10
-        for node in nodes:
-            file_stream.write('\t{0}\t{1:.{4}f}\t{2:.{4}f}\t{3:.{4}f}\n'.format(node.Id, node.X, node.Y, node.Z, precision))
+        _WriteLines(('\t{0}\t{1:.{4}f}\t{2:.{4}f}\t{3:.{4}f}\n'.format(node.Id, node.X, node.Y, node.Z, precision) for node in nodes), file_stream, chunk_size)
         file_stream.write("End Nodes\n\n")
 
-def _WriteEntitiesMdpa(entities, entities_name, file_stream):
-    if len(entities) > 0:
-        current_entity_name = next(iter(entities)).name # get name of first entity
-
-        file_stream.write("Begin {}s {}\n".format(entities_name, current_entity_name))
-
+def _WriteEntitiesMdpa(entities, entities_name, file_stream, chunk_size=0):
+    def EntitiesLines(current_entity_name):
         for entity in entities:
             entity_name = entity.name
             if entity_name != current_entity_name:
-                file_stream.write("End {}s // {}\n\n".format(entities_name, current_entity_name))
+                yield "End {}s // {}\n\n".format(entities_name, current_entity_name)
                 current_entity_name = entity_name
-                file_stream.write("Begin {}s {}\n".format(entities_name, current_entity_name))
+                yield "Begin {}s {}\n".format(entities_name, current_entity_name)
 
-            file_stream.write('\t{}\t{}\t{}\n'.format(entity.Id, entity.Properties.Id, "\t".join([str(node.Id) for node in entity.GetNodes()])))
-        file_stream.write("End {}s // {}\n\n".format(entities_name, current_entity_name))
+            yield '\t{}\t{}\t{}\n'.format(entity.Id, entity.Properties.Id, "\t".join([str(node.Id) for node in entity.GetNodes()]))
+        yield "End {}s // {}\n\n".format(entities_name, current_entity_name)
+
+    if len(entities) > 0:
+        current_entity_name = next(iter(entities)).name # get name of first entity
+
+        file_stream.write("Begin {}s {}\n".format(entities_name, current_entity_name))
+        _WriteLines(EntitiesLines(current_entity_name), file_stream, chunk_size)
 
 def __VariableFormatter(val):
     def ListToString(the_list):
@@ -138,11 +157,11 @@ def _WriteModelPartDataMdpa(model_part, file_stream, level=0):
     if level == 0:
         file_stream.write("\n")
 
-def _WriteSubModelPartsMdpa(sub_model_part, file_stream, level=0):
+def _WriteSubModelPartsMdpa(sub_model_part, file_stream, level=0, chunk_size=0):
     def WriteSubModelPartEntities(entities, entities_name, file_stream, level):
         file_stream.write("{}Begin SubModelPart{}\n".format("\t"*level, entities_name))
-        for entity in entities:
-            file_stream.write("{}{}\n".format("\t"*(level+1), entity.Id))
+        indentation = "\t"*(level+1)
+        _WriteLines(("{}{}\n".format(indentation, entity.Id) for entity in entities), file_stream, chunk_size)
         file_stream.write("{}End SubModelPart{}\n".format("\t"*level, entities_name))
 
     file_stream.write("{}Begin SubModelPart {}\n".format("\t"*level, sub_model_part.Name))
@@ -161,18 +180,24 @@ def _WriteSubModelPartsMdpa(sub_model_part, file_stream, level=0):
 
     # write SubModelParts recursively
     for smp in sub_model_part.SubModelParts:
-        _WriteSubModelPartsMdpa(smp, file_stream, level+1)
+        _WriteSubModelPartsMdpa(smp, file_stream, level+1, chunk_size)
     file_stream.write("{}End SubModelPart // {}\n".format("\t"*level, sub_model_part.Name))
 
 
-def WriteMdpa(model_part, file_name, additional_header="", write_creation_time=True):
+def WriteMdpa(model_part, file_name, additional_header="", write_creation_time=True, buffer_size=-1, chunk_size=0):
+    """writes the ModelPart to a mdpa-file
+    buffer_size -- size of the file buffer in bytes, a larger buffer reduces the number of writes for large files.
+    The default (-1) uses the default buffer size of python
+    chunk_size -- number of lines (e.g. Nodes) that are passed to the file at once. The default (0) writes line by line
+    """
     if not file_name.endswith(".mdpa"):
         file_name += ".mdpa"
 
     logger.info('Starting to write ModelPart "%s" to file "%s"', model_part.Name, os.path.abspath(file_name))
     start_time = time.time()
 
-    with open(file_name, 'w') as mdpa_file:
+    num_entities = model_part.NumberOfNodes() + model_part.NumberOfElements() + model_part.NumberOfConditions()
+    with profiling.Timer("WriteMdpa", num_entities), open(file_name, 'w', buffering=buffer_size) as mdpa_file:
         _WriteHeaderMdpa(model_part, additional_header, write_creation_time, mdpa_file)
 
         if model_part.HasData():
@@ -180,15 +205,19 @@ def WriteMdpa(model_part, file_name, additional_header="", write_creation_time=T
 
         _WritePropertiesMdpa(model_part.Properties, mdpa_file)
 
-        _WriteNodesMdpa(model_part.Nodes, mdpa_file)
-        _WriteEntitiesMdpa(model_part.Elements, "Element", mdpa_file)
-        _WriteEntitiesMdpa(model_part.Conditions, "Condition", mdpa_file)
+        with profiling.Timer("WriteMdpa.Nodes", model_part.NumberOfNodes()):
+            _WriteNodesMdpa(model_part.Nodes, mdpa_file, chunk_size)
+        with profiling.Timer("WriteMdpa.Elements", model_part.NumberOfElements()):
+            _WriteEntitiesMdpa(model_part.Elements, "Element", mdpa_file, chunk_size)
+        with profiling.Timer("WriteMdpa.Conditions", model_part.NumberOfConditions()):
+            _WriteEntitiesMdpa(model_part.Conditions, "Condition", mdpa_file, chunk_size)
 
         _WriteEntityDataMdpa(model_part.Nodes, "Nod", mdpa_file)
         _WriteEntityDataMdpa(model_part.Elements, "Element", mdpa_file)
         _WriteEntityDataMdpa(model_part.Conditions, "Condition", mdpa_file)
 
-        for smp in model_part.SubModelParts:
-            _WriteSubModelPartsMdpa(smp, mdpa_file)
+        with profiling.Timer("WriteMdpa.SubModelParts", model_part.NumberOfSubModelParts()):
+            for smp in model_part.SubModelParts:
+                _WriteSubModelPartsMdpa(smp, mdpa_file, chunk_size=chunk_size)
 
     logger.info('Writing ModelPart took {0:.{1}f} [s]'.format(time.time()-start_time,2))
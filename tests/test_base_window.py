@@ -12,15 +12,18 @@
 import initialize_testing_environment
 
 # python imports
+from pathlib import Path
+import os
 import unittest
+from shutil import copyfile
 from unittest.mock import MagicMock, patch
 
 # plugin imports
-from kratos_salome_plugin.gui.base_window import BaseWindow
+from kratos_salome_plugin.gui.base_window import BaseWindow, GetUiFormClass
 import kratos_salome_plugin.gui.active_window as active_window
 
 # tests imports
-from testing_utilities import QtTestCase, GetTestsPath
+from testing_utilities import QtTestCase, GetTestsPath, DeleteFileIfExisting
 
 # qt imports
 from PyQt5.QtCore import Qt
@@ -157,5 +160,40 @@ class TestBaseWindowMinimize_ActiveWindow(QtTestCase):
         self.assertIs(active_window.ACTIVE_WINDOW, parent_window)
 
 
+class TestBaseWindowUiFormCache(QtTestCase):
+    def test_GetUiFormClass(self):
+        ui_file_copy = Path("base_window_ui_form_cache_test.ui")
+        self.addCleanup(lambda: DeleteFileIfExisting(ui_file_copy))
+        copyfile(str(ui_file), str(ui_file_copy))
+
+        ui_form_class = GetUiFormClass(ui_file_copy)
+        self.assertIs(ui_form_class, GetUiFormClass(ui_file_copy)) # cached
+
+        # modifying the "ui" file recompiles it
+        modification_time = ui_file_copy.stat().st_mtime_ns + 10**9
+        os.utime(str(ui_file_copy), ns=(modification_time, modification_time))
+        with self.assertLogs('kratos_salome_plugin.gui.base_window', level='DEBUG') as cm:
+            self.assertIsNot(ui_form_class, GetUiFormClass(ui_file_copy))
+        self.assertEqual(cm.output[0], 'DEBUG:kratos_salome_plugin.gui.base_window:Compiling "{}"'.format(ui_file_copy.resolve()))
+
+        window = BaseWindow(ui_file_copy)
+        self.assertTrue(hasattr(window, "statusbar"))
+
+    def test_window_creation_uses_cache(self):
+        """opening the windows of the plugin again does not compile the "ui" files again"""
+        from kratos_salome_plugin.gui.plugin_main_window import PluginMainWindow
+        from kratos_salome_plugin.gui.groups_window import GroupsWindow
+        from kratos_salome_plugin.gui.groups_model import GroupsModel
+
+        PluginMainWindow() # the "ui" files are compiled if they are not cached yet
+        GroupsWindow(None, GroupsModel())
+
+        with patch('kratos_salome_plugin.gui.base_window.uic.compileUi') as patch_fct_compile_ui:
+            for _ in range(3):
+                main_window = PluginMainWindow()
+                GroupsWindow(main_window, GroupsModel())
+            self.assertFalse(patch_fct_compile_ui.called)
+
+
 if __name__ == '__main__':
     unittest.main()
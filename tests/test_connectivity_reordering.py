@@ -0,0 +1,173 @@
+#  _  __         _          ___       _               ___ _           _
+# | |/ /_ _ __ _| |_ ___ __/ __| __ _| |___ _ __  ___| _ \ |_  _ __ _(_)_ _
+# | ' <| '_/ _` |  _/ _ (_-<__ \/ _` | / _ \ '  \/ -_)  _/ | || / _` | | ' \
+# |_|\_\_| \__,_|\__\___/__/___/\__,_|_\___/_|_|_\___|_| |_|\_,_\__, |_|_||_|
+#                                                               |___/
+# License: BSD License ; see LICENSE
+#
+# Main authors: Philipp Bucher (https://github.com/philbucher)
+#
+
+# set up testing environment (before anything else)
+import initialize_testing_environment
+
+# python imports
+import unittest
+
+# plugin imports
+from kratos_salome_plugin import connectivity_reordering
+from kratos_salome_plugin import geometries_io
+
+# tests imports
+from testing_utilities import CheckIfNumpyAvailable
+
+numpy_available = CheckIfNumpyAvailable()
+if numpy_available:
+    import numpy as np
+
+
+# corners of the linear entities, oriented as in Salome
+# see https://docs.salome-platform.org/latest/gui/SMESH/connectivity.html
+SALOME_CORNERS = {
+    "Edge"       : [(0,0,0), (1,0,0)],
+    "Triangle"   : [(0,0,0), (1,0,0), (0,1,0)],
+    "Quadrangle" : [(0,0,0), (1,0,0), (1,1,0), (0,1,0)],
+    "Tetra"      : [(0,0,0), (0,1,0), (1,0,0), (0,0,1)],
+    "Pyramid"    : [(0,0,0), (0,1,0), (1,1,0), (1,0,0), (0.5,0.5,1)],
+    "Penta"      : [(0,0,0), (0,1,0), (1,0,0), (0,0,1), (0,1,1), (1,0,1)],
+    "Hexa"       : [(0,0,0), (0,1,0), (1,1,0), (1,0,0), (0,0,1), (0,1,1), (1,1,1), (1,0,1)]
+}
+
+# the additional Nodes of the quadratic entities, given by the corners they are located in between
+SALOME_ADDITIONAL_NODES = {
+    "Quad_Edge"         : ("Edge",       [(0,1)]),
+    "Quad_Triangle"     : ("Triangle",   [(0,1), (1,2), (2,0)]),
+    "BiQuad_Triangle"   : ("Triangle",   [(0,1), (1,2), (2,0), (0,1,2)]),
+    "Quad_Quadrangle"   : ("Quadrangle", [(0,1), (1,2), (2,3), (3,0)]),
+    "BiQuad_Quadrangle" : ("Quadrangle", [(0,1), (1,2), (2,3), (3,0), (0,1,2,3)]),
+    "Quad_Tetra"        : ("Tetra",      [(0,1), (1,2), (2,0), (0,3), (1,3), (2,3)]),
+    "Quad_Pyramid"      : ("Pyramid",    [(0,1), (1,2), (2,3), (3,0), (0,4), (1,4), (2,4), (3,4)]),
+    "Quad_Penta"        : ("Penta",      [(0,1), (1,2), (2,0), (3,4), (4,5), (5,3), (0,3), (1,4), (2,5)]),
+    "Quad_Hexa"         : ("Hexa",       [(0,1), (1,2), (2,3), (3,0), (4,5), (5,6), (6,7), (7,4), (0,4), (1,5), (2,6), (3,7)])
+}
+
+# the additional Nodes of the quadratic geometries in Kratos
+# see e.g. "tetrahedra_3d_10.h" or "hexahedra_3d_20.h" in the Kratos core
+KRATOS_ADDITIONAL_NODES = {
+    "Quad_Edge"         : [(0,1)],
+    "Quad_Triangle"     : [(0,1), (1,2), (2,0)],
+    "BiQuad_Triangle"   : [(0,1), (1,2), (2,0), (0,1,2)],
+    "Quad_Quadrangle"   : [(0,1), (1,2), (2,3), (3,0)],
+    "BiQuad_Quadrangle" : [(0,1), (1,2), (2,3), (3,0), (0,1,2,3)],
+    "Quad_Tetra"        : [(0,1), (1,2), (2,0), (0,3), (1,3), (2,3)],
+    "Quad_Pyramid"      : [(0,1), (1,2), (2,3), (3,0), (0,4), (1,4), (2,4), (3,4)],
+    "Quad_Penta"        : [(0,1), (1,2), (2,0), (0,3), (1,4), (2,5), (3,4), (4,5), (5,3)],
+    "Quad_Hexa"         : [(0,1), (1,2), (2,3), (3,0), (0,4), (1,5), (2,6), (3,7), (4,5), (5,6), (6,7), (7,4)]
+}
+
+# the Nodes spanning the volume at the first Node, the volume is positive for Kratos geometries
+KRATOS_VOLUME_NODES = {
+    "Tetra"   : (1, 2, 3),
+    "Pyramid" : (1, 3, 4),
+    "Penta"   : (1, 2, 3),
+    "Hexa"    : (1, 3, 4)
+}
+
+
+def Mean(points):
+    return tuple(sum(coords)/len(points) for coords in zip(*points))
+
+def Sub(a, b):
+    return tuple(x-y for x, y in zip(a, b))
+
+def Det(a, b, c):
+    return a[0]*(b[1]*c[2]-b[2]*c[1]) - a[1]*(b[0]*c[2]-b[2]*c[0]) + a[2]*(b[0]*c[1]-b[1]*c[0])
+
+def CreateSalomeEntity(entity_type):
+    """returns the coordinates of the Nodes of an entity, ordered as in Salome"""
+    if entity_type in SALOME_CORNERS:
+        return list(SALOME_CORNERS[entity_type])
+    linear_entity_type, additional_nodes = SALOME_ADDITIONAL_NODES[entity_type]
+    corners = SALOME_CORNERS[linear_entity_type]
+    return corners + [Mean([corners[i] for i in nodes]) for nodes in additional_nodes]
+
+def GetLinearEntityType(entity_type):
+    return SALOME_ADDITIONAL_NODES[entity_type][0] if entity_type in SALOME_ADDITIONAL_NODES else entity_type
+
+
+class TestConnectivityReordering(unittest.TestCase):
+    def test_all_entity_types_are_tested(self):
+        self.assertCountEqual(connectivity_reordering.PERMUTATIONS.keys(), list(SALOME_CORNERS.keys()) + list(SALOME_ADDITIONAL_NODES.keys()))
+
+    def test_permutations_are_valid(self):
+        for entity_type, permutation in connectivity_reordering.PERMUTATIONS.items():
+            self.assertListEqual(list(range(len(permutation))), sorted(permutation), msg=entity_type)
+            self.assertEqual(len(CreateSalomeEntity(entity_type)), len(permutation), msg=entity_type)
+
+    def test_volumes_are_positive(self):
+        for entity_type, permutation in connectivity_reordering.PERMUTATIONS.items():
+            linear_entity_type = GetLinearEntityType(entity_type)
+            if linear_entity_type not in KRATOS_VOLUME_NODES:
+                continue
+
+            salome_nodes = CreateSalomeEntity(entity_type)
+            kratos_nodes = connectivity_reordering.GetReorderFunction(entity_type)(salome_nodes)
+
+            i, j, k = KRATOS_VOLUME_NODES[linear_entity_type]
+            volume_salome = Det(Sub(salome_nodes[i], salome_nodes[0]), Sub(salome_nodes[j], salome_nodes[0]), Sub(salome_nodes[k], salome_nodes[0]))
+            volume_kratos = Det(Sub(kratos_nodes[i], kratos_nodes[0]), Sub(kratos_nodes[j], kratos_nodes[0]), Sub(kratos_nodes[k], kratos_nodes[0]))
+            self.assertLess(volume_salome, 0.0, msg=entity_type) # Salome volumes are oriented opposite
+            self.assertGreater(volume_kratos, 0.0, msg=entity_type)
+
+    def test_faces_keep_orientation(self):
+        for entity_type in connectivity_reordering.PERMUTATIONS:
+            if GetLinearEntityType(entity_type) not in ["Triangle", "Quadrangle"]:
+                continue
+
+            kratos_nodes = connectivity_reordering.GetReorderFunction(entity_type)(CreateSalomeEntity(entity_type))
+            normal_z = Det(Sub(kratos_nodes[1], kratos_nodes[0]), Sub(kratos_nodes[2], kratos_nodes[0]), (0,0,1))
+            self.assertGreater(normal_z, 0.0, msg=entity_type)
+
+    def test_additional_nodes_follow_kratos_ordering(self):
+        for entity_type, kratos_additional_nodes in KRATOS_ADDITIONAL_NODES.items():
+            kratos_nodes = connectivity_reordering.GetReorderFunction(entity_type)(CreateSalomeEntity(entity_type))
+            num_corners = len(SALOME_CORNERS[GetLinearEntityType(entity_type)])
+
+            for i, corners in enumerate(kratos_additional_nodes):
+                exp_coords = Mean([kratos_nodes[c] for c in corners])
+                for exp_coord, coord in zip(exp_coords, kratos_nodes[num_corners+i]):
+                    self.assertAlmostEqual(exp_coord, coord, msg='Node {} of "{}"'.format(num_corners+i, entity_type))
+
+    def test_GetReorderFunction(self):
+        self.assertListEqual([1, 3, 2, 4], connectivity_reordering.GetReorderFunction("Tetra")([1, 2, 3, 4]))
+        self.assertListEqual([1, 2, 3], connectivity_reordering.GetReorderFunction("Triangle")([1, 2, 3]))
+        self.assertListEqual([5], connectivity_reordering.GetReorderFunction("Ball")([5])) # not in the table
+        self.assertIs(connectivity_reordering.GetReorderFunction("Hexa"), connectivity_reordering.GetReorderFunction("Hexa")) # not recreated
+
+        # still available from the geometries_io, where it was defined before
+        self.assertIs(geometries_io.GetReorderFunction, connectivity_reordering.GetReorderFunction)
+
+    @unittest.skipUnless(numpy_available, "numpy not available")
+    def test_ReorderConnectivitiesArray(self):
+        for entity_type, permutation in connectivity_reordering.PERMUTATIONS.items():
+            connectivities = np.arange(5*len(permutation), dtype=np.int64).reshape(5, len(permutation))
+            reorder_fct = connectivity_reordering.GetReorderFunction(entity_type)
+
+            reordered_connectivities = connectivity_reordering.ReorderConnectivitiesArray(entity_type, connectivities)
+            self.assertListEqual([reorder_fct(conn) for conn in connectivities.tolist()], reordered_connectivities.tolist(), msg=entity_type)
+
+    @unittest.skipUnless(numpy_available, "numpy not available")
+    def test_ReorderConnectivitiesArray_special_cases(self):
+        connectivities = np.arange(6, dtype=np.int64).reshape(3, 2)
+        self.assertIs(connectivities, connectivity_reordering.ReorderConnectivitiesArray("Ball", connectivities)) # not in the table
+        self.assertIs(connectivities, connectivity_reordering.ReorderConnectivitiesArray("Edge", connectivities)) # same ordering
+
+        empty_connectivities = np.empty((0, 0), dtype=np.int64)
+        self.assertIs(empty_connectivities, connectivity_reordering.ReorderConnectivitiesArray("Tetra", empty_connectivities))
+
+        with self.assertRaisesRegex(Exception, 'The connectivities of entity type "Tetra" have 2 Nodes, but 4 Nodes are expected!'):
+            connectivity_reordering.ReorderConnectivitiesArray("Tetra", connectivities)
+
+
+if __name__ == '__main__':
+    unittest.main()
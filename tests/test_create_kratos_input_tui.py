@@ -13,13 +13,21 @@ import initialize_testing_environment
 
 # python imports
 import unittest
+from pathlib import Path
+from unittest.mock import MagicMock, patch
 
 # plugin imports
 from kratos_salome_plugin import salome_utilities
+from kratos_salome_plugin.mesh_interface import MeshInterface
+from kratos_salome_plugin.geometries_io import Mesh
 import create_kratos_input_tui
 
 # tests imports
-from testing_utilities import SalomeTestCaseWithBox, CompareMdpaWithReferenceFile
+from testing_utilities import SalomeTestCaseWithBox, CompareMdpaWithReferenceFile, CheckIfNumpyAvailable, DeleteFileIfExisting
+
+numpy_available = CheckIfNumpyAvailable()
+if numpy_available:
+    import numpy as np
 
 
 class TestSalomeMesh(SalomeTestCaseWithBox):
@@ -79,6 +87,122 @@ class TestSalomeMesh(SalomeTestCaseWithBox):
             create_kratos_input_tui.SalomeMesh(self.box, {})
 
 
+class TestConversionPlan(unittest.TestCase):
+    def _CreateMockMesh(self, num_nodes, num_geometries, mesh_description, model_part_name=""):
+        mesh_interface_mock = MagicMock(spec=MeshInterface)
+        mesh_interface_mock.GetNumberOfNodes.return_value = num_nodes
+        mesh_interface_mock.GetNumberOfGeometries.side_effect = lambda geometry_type: num_geometries.get(geometry_type, -1)
+        return Mesh(mesh_interface_mock, mesh_description, model_part_name)
+
+    def test_counts(self):
+        meshes = [
+            self._CreateMockMesh(100, {"Tetra" : 300, "Triangle" : 120}, {
+                "elements"   : {"Tetra" : {"Element3D4N" : 0}},
+                "conditions" : {"Triangle" : {"SurfaceCondition3D3N" : 1, "SurfaceLoadCondition3D3N" : 2}}
+            }, "domain"),
+            self._CreateMockMesh(20, {"Edge" : 15}, {
+                "conditions" : {"Edge" : {"LineCondition3D2N" : 3}, "Quadrangle" : {"SurfaceCondition3D4N" : 4}} # no Quadrangles in this mesh
+            }, "domain.edges"),
+            self._CreateMockMesh(5, {}, {}) # only Nodes
+        ]
+
+        plan = create_kratos_input_tui.ConversionPlan(meshes)
+
+        self.assertEqual(3, plan.num_meshes)
+        self.assertEqual(125, plan.num_nodes)
+        self.assertEqual(300, plan.num_elements)
+        self.assertEqual(2*120+15, plan.num_conditions)
+        self.assertGreater(plan.estimated_mdpa_bytes, 0)
+        self.assertGreater(plan.estimated_peak_memory_bytes, 0)
+
+        # no entities are retrieved
+        for mesh in meshes:
+            self.assertEqual(0, mesh.mesh_interface.GetNodes.call_count)
+            self.assertEqual(0, mesh.mesh_interface.GetNodesAndGeometricalEntities.call_count)
+
+    def test_estimations_scale_with_size(self):
+        mesh_description = {"elements" : {"Hexa" : {"Element3D8N" : 0}}}
+        with patch('create_kratos_input_tui.IsNumpyAvailable', return_value=False): # using arrays reduces the memory consumption
+            plan_small = create_kratos_input_tui.ConversionPlan([self._CreateMockMesh(1000, {"Hexa" : 800}, mesh_description)])
+            plan_large = create_kratos_input_tui.ConversionPlan([self._CreateMockMesh(1000000, {"Hexa" : 800000}, mesh_description)])
+
+        self.assertGreater(plan_large.estimated_mdpa_bytes, 900*plan_small.estimated_mdpa_bytes)
+        self.assertGreater(plan_large.estimated_peak_memory_bytes, 900*plan_small.estimated_peak_memory_bytes)
+
+        # 1 mio Nodes with 10 digits after the comma take at least 50 MB
+        self.assertGreater(plan_large.estimated_mdpa_bytes, 50*1000**2)
+        self.assertGreater(plan_large.GetWriteMdpaSettings()["buffer_size"], 0)
+        self.assertEqual(-1, plan_small.GetWriteMdpaSettings()["buffer_size"])
+
+        # the lines of large files are written in chunks that fill the buffer
+        self.assertGreater(plan_large.GetWriteMdpaSettings()["chunk_size"], 0)
+        self.assertLess(plan_large.GetWriteMdpaSettings()["chunk_size"], plan_large.write_buffer_size)
+        self.assertEqual(0, plan_small.GetWriteMdpaSettings()["chunk_size"])
+        self.assertEqual(0, plan_large.chunk_size) # the write chunks are independent of the chunks for retrieving the meshes
+
+    def test_strategies(self):
+        mesh_description = {"conditions" : {"Triangle" : {"SurfaceCondition3D3N" : 0}}}
+
+        plan_one_mesh = create_kratos_input_tui.ConversionPlan([self._CreateMockMesh(50, {"Triangle" : 80}, mesh_description)])
+        self.assertDictEqual({"use_arrays" : False, "num_threads" : 1, "chunk_size" : 0, "pipeline_depth" : 0}, plan_one_mesh.GetAddMeshesSettings())
+
+        meshes = [self._CreateMockMesh(50, {"Triangle" : 80}, mesh_description) for _ in range(10)]
+        plan_many_meshes = create_kratos_input_tui.ConversionPlan(meshes)
+        self.assertGreater(plan_many_meshes.num_threads, 1)
+        self.assertLessEqual(plan_many_meshes.num_threads, 10)
+
+        # concurrent retrieval is not used if the memory does not suffice
+        plan_low_memory = create_kratos_input_tui.ConversionPlan(meshes, memory_budget=1024)
+        self.assertEqual(1, plan_low_memory.num_threads)
+        self.assertEqual(0, plan_low_memory.pipeline_depth)
+
+        # the memory suffices for retrieving the next mesh while adding the current one, but not for retrieving all at once
+        plan_pipeline = create_kratos_input_tui.ConversionPlan(meshes, memory_budget=700000)
+        self.assertEqual(1, plan_pipeline.num_threads)
+        self.assertEqual(1, plan_pipeline.pipeline_depth)
+        self.assertLessEqual(plan_pipeline.estimated_peak_memory_bytes, 700000)
+        self.assertEqual(0, plan_many_meshes.pipeline_depth)
+
+    def test_use_arrays_for_large_meshes(self):
+        mesh_description = {"elements" : {"Tetra" : {"Element3D4N" : 0}}}
+        meshes = [self._CreateMockMesh(200000, {"Tetra" : 1000000}, mesh_description)]
+
+        with patch('create_kratos_input_tui.IsNumpyAvailable', return_value=True):
+            self.assertTrue(create_kratos_input_tui.ConversionPlan(meshes).use_arrays)
+
+        with patch('create_kratos_input_tui.IsNumpyAvailable', return_value=False):
+            self.assertFalse(create_kratos_input_tui.ConversionPlan(meshes).use_arrays)
+
+    def test_chunks_for_low_memory(self):
+        mesh_description = {"elements" : {"Tetra" : {"Element3D4N" : 0}}}
+        meshes = [self._CreateMockMesh(2000000, {"Tetra" : 10000000}, mesh_description) for _ in range(2)]
+        memory_budget = 12100*1024**2 # enough for the ModelPart, but not for retrieving a mesh at once
+
+        with patch('create_kratos_input_tui.IsNumpyAvailable', return_value=True):
+            plan = create_kratos_input_tui.ConversionPlan(meshes, memory_budget)
+            plan_enough_memory = create_kratos_input_tui.ConversionPlan(meshes, 2*memory_budget)
+
+        self.assertGreater(plan.chunk_size, 0)
+        self.assertTrue(plan.use_arrays)
+        self.assertEqual(1, plan.num_threads)
+        self.assertLessEqual(plan.estimated_peak_memory_bytes, memory_budget)
+        self.assertEqual(plan.chunk_size, plan.GetAddMeshesSettings()["chunk_size"])
+        self.assertNotEqual(plan.chunk_size, plan.GetWriteMdpaSettings()["chunk_size"])
+
+        self.assertEqual(0, plan_enough_memory.chunk_size)
+
+        # chunks are retrieved as arrays, hence this requires numpy
+        with patch('create_kratos_input_tui.IsNumpyAvailable', return_value=False):
+            self.assertEqual(0, create_kratos_input_tui.ConversionPlan(meshes, memory_budget).chunk_size)
+
+    def test_printing(self):
+        plan = create_kratos_input_tui.ConversionPlan([self._CreateMockMesh(50, {"Triangle" : 80}, {"conditions" : {"Triangle" : {"SurfaceCondition3D3N" : 0}}})])
+        plan_str = str(plan)
+        self.assertTrue(plan_str.startswith("ConversionPlan\n"))
+        self.assertIn("Expected number of Nodes: 50\n", plan_str)
+        self.assertIn("Expected number of Conditions: 80\n", plan_str)
+
+
 class TestCreateModelPart(SalomeTestCaseWithBox):
     def test_one_mesh(self):
         mesh_description_3D = { "elements" : {"Hexa" : {"MyFancyElement" : 0} } }
@@ -208,6 +332,72 @@ class TestCreateMdpaFile(SalomeTestCaseWithBox):
 
         CompareMdpaWithReferenceFile(mdpa_file_name, self)
 
+        # the strategies selected by the plan must not change the result
+        plan = create_kratos_input_tui.ConversionPlan(meshes)
+        self.assertEqual(plan.num_nodes, 729+81+92+6) # Nodes shared by meshes are counted multiple times
+        self.assertEqual(plan.num_elements, 512+6)
+        self.assertEqual(plan.num_conditions, 512+64+2*96)
+
+        create_kratos_input_tui.CreateMdpaFile(meshes, mdpa_file_name, plan)
+
+        CompareMdpaWithReferenceFile(mdpa_file_name, self)
+
+
+class TestCreateMdpaFileMappingTables(unittest.TestCase):
+    @unittest.skipUnless(numpy_available, "numpy not available")
+    def test_save_mapping_tables(self):
+        mesh_interface_mock = MagicMock(spec=MeshInterface)
+        mesh_interface_mock.GetNodesAndGeometricalEntities.return_value = (
+            {i+1 : [float(i), 0.0, 0.0] for i in range(4)},
+            {"Edge" : {i+11 : [i+1, i+2] for i in range(3)}}
+        )
+        meshes = [Mesh(mesh_interface_mock, {"conditions" : {"Edge" : {"LineCondition2D2N" : 0}}}, "lines")]
+
+        mdpa_file_name = "create_mdpa_mapping_tables.mdpa"
+        mapping_table_file_name = Path("create_mdpa_mapping_tables.1.conditions.LineCondition2D2N.npy")
+        self.addCleanup(lambda: DeleteFileIfExisting(Path(mdpa_file_name)))
+        self.addCleanup(lambda: DeleteFileIfExisting(mapping_table_file_name))
+
+        create_kratos_input_tui.CreateMdpaFile(meshes, mdpa_file_name)
+        self.assertFalse(mapping_table_file_name.is_file())
+
+        create_kratos_input_tui.CreateMdpaFile(meshes, mdpa_file_name, save_mapping_tables=True)
+        self.assertTrue(mapping_table_file_name.is_file())
+        self.assertListEqual([[11, 1], [12, 2], [13, 3]], np.load(str(mapping_table_file_name)).tolist())
+
+
+class TestCreateMdpaFileProfiling(unittest.TestCase):
+    def test_profiling_report(self):
+        mesh_interface_mock = MagicMock(spec=MeshInterface)
+        mesh_interface_mock.GetNodesAndGeometricalEntities.return_value = (
+            {i+1 : [float(i), 0.0, 0.0] for i in range(4)},
+            {"Edge" : {i+11 : [i+1, i+2] for i in range(3)}}
+        )
+        meshes = [Mesh(mesh_interface_mock, {"elements" : {"Edge" : {"Element2D2N" : 0}}, "conditions" : {"Edge" : {"LineCondition2D2N" : 1}}}, "lines")]
+
+        mdpa_file_name = "create_mdpa_profiling.mdpa"
+        report_file_name = Path("create_mdpa_profiling.json")
+        self.addCleanup(lambda: DeleteFileIfExisting(Path(mdpa_file_name)))
+        self.addCleanup(lambda: DeleteFileIfExisting(report_file_name))
+
+        self.assertIsNone(create_kratos_input_tui.CreateMdpaFile(meshes, mdpa_file_name))
+
+        report = create_kratos_input_tui.CreateMdpaFile(meshes, mdpa_file_name, profile=True, profiling_report_file_name=str(report_file_name))
+        stages = report["stages"]
+
+        self.assertEqual(1, stages["CreateMdpaFile"]["calls"])
+        self.assertEqual(1, stages["GeometriesIO.AddMeshes"]["count"])
+        self.assertEqual(4, stages["GeometriesIO.AddNodes"]["count"])
+        self.assertEqual(6, stages["GeometriesIO.CreateEntities"]["count"])
+        self.assertEqual(4, stages["WriteMdpa.Nodes"]["count"])
+        self.assertEqual(3, stages["WriteMdpa.Elements"]["count"])
+        self.assertEqual(3, stages["WriteMdpa.Conditions"]["count"])
+        self.assertEqual(10, stages["WriteMdpa"]["count"])
+        self.assertGreaterEqual(stages["CreateMdpaFile"]["time"], stages["WriteMdpa"]["time"])
+
+        self.assertTrue(report_file_name.is_file())
+        self.assertFalse(create_kratos_input_tui.profiling.IsEnabled())
+
 
 if __name__ == '__main__':
     unittest.main()
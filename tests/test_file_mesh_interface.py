@@ -0,0 +1,546 @@
+#  _  __         _          ___       _               ___ _           _
+# | |/ /_ _ __ _| |_ ___ __/ __| __ _| |___ _ __  ___| _ \ |_  _ __ _(_)_ _
+# | ' <| '_/ _` |  _/ _ (_-<__ \/ _` | / _ \ '  \/ -_)  _/ | || / _` | | ' \
+# |_|\_\_| \__,_|\__\___/__/___/\__,_|_\___/_|_|_\___|_| |_|\_,_\__, |_|_||_|
+#                                                               |___/
+# License: BSD License ; see LICENSE
+#
+# Main authors: Philipp Bucher (https://github.com/philbucher)
+#
+
+# set up testing environment (before anything else)
+import initialize_testing_environment
+
+# python imports
+import unittest
+from pathlib import Path
+
+# plugin imports
+from kratos_salome_plugin.file_mesh_interface import FileMeshInterface
+from kratos_salome_plugin.mesh_interface import MeshInterface
+from kratos_salome_plugin import geometries_io
+from kratos_salome_plugin.model_part import ModelPart
+from kratos_salome_plugin.write_mdpa import WriteMdpa
+from kratos_salome_plugin import salome_utilities
+
+# tests imports
+from testing_utilities import SalomeTestCaseWithBox, DeleteFileIfExisting, CheckIfNumpyAvailable
+
+numpy_available = CheckIfNumpyAvailable()
+if numpy_available:
+    import numpy as np
+
+
+# two hexahedrons with quadrilaterals on the top and one edge
+dat_file_content = '''12 5
+1 0.0 0.0 0.0
+2 1.0 0.0 0.0
+3 2.0 0.0 0.0
+4 0.0 1.0 0.0
+5 1.0 1.0 0.0
+6 2.0 1.0 0.0
+7 0.0 0.0 1.0
+8 1.0 0.0 1.0
+9 2.0 0.0 1.0
+10 0.0 1.0 1.0
+11 1.0 1.0 1.0
+12 2.0 1.0 1.0
+4 308 1 2 5 4 7 8 11 10
+3 308 2 3 6 5 8 9 12 11
+1 204 7 8 11 10
+2 204 8 9 12 11
+
+5 102 7 8
+'''
+
+# the quadrilaterals of the top, exported separately
+dat_file_content_top = '''6 2
+7 0.0 0.0 1.0
+8 1.0 0.0 1.0
+9 2.0 0.0 1.0
+10 0.0 1.0 1.0
+11 1.0 1.0 1.0
+12 2.0 1.0 1.0
+1 204 7 8 11 10
+2 204 8 9 12 11
+'''
+
+# a shell on top of the hexahedrons, in a separate main mesh (the Nodes coincide with the ones of the top)
+dat_file_content_shell = '''6 2
+1 0.0 0.0 1.0
+2 1.0 0.0 1.0
+3 2.0 0.0 1.0
+4 0.0 1.0 1.0
+5 1.0 1.0 1.0
+6 2.0 1.0 1.0
+1 204 1 2 5 4
+2 204 2 3 6 5
+'''
+
+# the same mesh as "dat_file_content" in UNV format, with groups
+# the hexahedrons are oriented the other way round and the edge has the additional record of beams
+unv_file_content = '''    -1
+  2411
+         1         1         1        11
+   0.0000000000000000D+00   0.0000000000000000D+00   0.0000000000000000D+00
+         2         1         1        11
+   1.0000000000000000D+00   0.0000000000000000D+00   0.0000000000000000D+00
+         3         1         1        11
+   2.0000000000000000D+00   0.0000000000000000D+00   0.0000000000000000D+00
+         4         1         1        11
+   0.0000000000000000D+00   1.0000000000000000D+00   0.0000000000000000D+00
+         5         1         1        11
+   1.0000000000000000D+00   1.0000000000000000D+00   0.0000000000000000D+00
+         6         1         1        11
+   2.0000000000000000D+00   1.0000000000000000D+00   0.0000000000000000D+00
+         7         1         1        11
+   0.0000000000000000D+00   0.0000000000000000D+00   1.0000000000000000D+00
+         8         1         1        11
+   1.0000000000000000D+00   0.0000000000000000D+00   1.0000000000000000D+00
+         9         1         1        11
+   2.0000000000000000D+00   0.0000000000000000D+00   1.0000000000000000D+00
+        10         1         1        11
+   0.0000000000000000D+00   1.0000000000000000D+00   1.0000000000000000D+00
+        11         1         1        11
+   1.0000000000000000D+00   1.0000000000000000D+00   1.0000000000000000D+00
+        12         1         1        11
+   2.0000000000000000D+00   1.0000000000000000D+00   1.0000000000000000D+00
+    -1
+    -1
+  2412
+         5        11         2         1         7         2
+         0         1         1
+         7         8
+         1        44         2         1         7         4
+         7         8        11        10
+         2        44         2         1         7         4
+         8         9        12        11
+         4       115         2         1         7         8
+         1         4         5         2         7        10        11         8
+         3       115         2         1         7         8
+         2         5         6         3         8        11        12         9
+    -1
+    -1
+  2467
+         1         0         0         0         0         0         0         2
+top
+         8         1         0         0         8         2         0         0
+         2         0         0         0         0         0         0         3
+edge_and_nodes
+         8         5         0         0         7         1         0         0
+         7         4         0         0
+    -1
+'''
+
+
+def WriteFile(file_path, content):
+    with open(str(file_path), 'w') as f:
+        f.write(content)
+
+
+class TestFileMeshInterface(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.file_path = Path("file_mesh_interface_hexas.dat")
+        cls.file_path_top = Path("file_mesh_interface_top.dat")
+        cls.file_path_shell = Path("file_mesh_interface_shell.dat")
+        WriteFile(cls.file_path, dat_file_content)
+        WriteFile(cls.file_path_top, dat_file_content_top)
+        WriteFile(cls.file_path_shell, dat_file_content_shell)
+
+    @classmethod
+    def tearDownClass(cls):
+        DeleteFileIfExisting(cls.file_path)
+        DeleteFileIfExisting(cls.file_path_top)
+        DeleteFileIfExisting(cls.file_path_shell)
+
+    def setUp(self):
+        self.mesh_interface = FileMeshInterface(str(self.file_path))
+        self.mesh_interface_top = FileMeshInterface(str(self.file_path_top), str(self.file_path))
+        self.mesh_interface_non_exist_file = FileMeshInterface("non_existing_file.dat")
+
+    def test_GetNodes(self):
+        nodes = self.mesh_interface.GetNodes()
+        self.assertEqual(12, len(nodes))
+        self.assertEqual(list(range(1,13)), list(nodes.keys()))
+        self.assertEqual((1.0, 1.0, 1.0), nodes[11])
+
+        nodes_top = self.mesh_interface_top.GetNodes()
+        self.assertEqual(list(range(7,13)), list(nodes_top.keys()))
+
+        self.assertEqual({}, self.mesh_interface_non_exist_file.GetNodes())
+
+    def test_GetNodesAndGeometricalEntities(self):
+        nodes, geom_entities = self.mesh_interface.GetNodesAndGeometricalEntities(["Hexa", "Edge", "Node"])
+
+        self.assertEqual(12, len(nodes))
+        self.assertEqual(["Hexa", "Edge"], list(geom_entities.keys())) # Nodes are treated separately
+        self.assertEqual([3, 4], list(geom_entities["Hexa"].keys())) # sorted by Id
+        self.assertEqual([1, 2, 5, 4, 7, 8, 11, 10], geom_entities["Hexa"][4])
+        self.assertEqual({5 : [7, 8]}, geom_entities["Edge"])
+
+        # modifying the returned data must not change the data of the interface
+        geom_entities["Hexa"].clear()
+        self.assertEqual(2, len(self.mesh_interface.GetNodesAndGeometricalEntities(["Hexa"])[1]["Hexa"]))
+
+    def test_GetNodesAndGeometricalEntities_not_existing(self):
+        with self.assertLogs('kratos_salome_plugin.file_mesh_interface', level='WARNING') as cm:
+            nodes, geom_entities = self.mesh_interface_top.GetNodesAndGeometricalEntities(["Quadrangle", "Tetra"])
+
+        self.assertEqual(6, len(nodes))
+        self.assertEqual(2, len(geom_entities["Quadrangle"]))
+        self.assertEqual({}, geom_entities["Tetra"])
+        self.assertEqual(cm.output[0], 'WARNING:kratos_salome_plugin.file_mesh_interface:Entity type "Tetra" not in Mesh "file_mesh_interface_top"!')
+
+        self.assertEqual(({}, {}), self.mesh_interface_non_exist_file.GetNodesAndGeometricalEntities(["Tetra"]))
+
+    @unittest.skipUnless(numpy_available, "numpy not available")
+    def test_GetNodesArray(self):
+        ids, coords = self.mesh_interface.GetNodesArray()
+        nodes = self.mesh_interface.GetNodes()
+
+        self.assertEqual(np.int64, ids.dtype)
+        self.assertEqual(np.float64, coords.dtype)
+        self.assertEqual((12, 3), coords.shape)
+        self.assertEqual(list(nodes.keys()), ids.tolist())
+        self.assertEqual([list(c) for c in nodes.values()], coords.tolist())
+
+    @unittest.skipUnless(numpy_available, "numpy not available")
+    def test_GetEntitiesArrays(self):
+        entities_arrays = self.mesh_interface.GetEntitiesArrays(["Hexa", "Quadrangle", "Tetra", "Node"])
+        geom_entities = self.mesh_interface.GetNodesAndGeometricalEntities(["Hexa", "Quadrangle", "Tetra"])[1]
+
+        self.assertEqual(["Hexa", "Quadrangle", "Tetra"], list(entities_arrays.keys()))
+        for entity_type, (ids, connectivities) in entities_arrays.items():
+            self.assertEqual(list(geom_entities[entity_type].keys()), ids.tolist())
+            self.assertEqual(list(geom_entities[entity_type].values()), connectivities.tolist())
+        self.assertEqual((2, 8), entities_arrays["Hexa"][1].shape)
+        self.assertEqual((0, 0), entities_arrays["Tetra"][1].shape)
+
+    @unittest.skipUnless(numpy_available, "numpy not available")
+    def test_chunks(self):
+        ids, coords = self.mesh_interface.GetNodesArray()
+        nodes_chunks = list(self.mesh_interface.GetNodesChunks(5))
+        self.assertEqual([5, 5, 2], [chunk[0].size for chunk in nodes_chunks])
+        self.assertEqual(ids.tolist(), np.concatenate([chunk[0] for chunk in nodes_chunks]).tolist())
+        self.assertEqual(coords.tolist(), np.concatenate([chunk[1] for chunk in nodes_chunks]).tolist())
+
+        ids, connectivities = self.mesh_interface.GetEntitiesArrays(["Hexa"])["Hexa"]
+        hexa_chunks = list(self.mesh_interface.GetEntitiesChunks("Hexa", 1))
+        self.assertEqual(2, len(hexa_chunks))
+        self.assertEqual(ids.tolist(), np.concatenate([chunk[0] for chunk in hexa_chunks]).tolist())
+        self.assertEqual(connectivities.tolist(), np.concatenate([chunk[1] for chunk in hexa_chunks]).tolist())
+
+        with self.assertLogs('kratos_salome_plugin.file_mesh_interface', level='WARNING'):
+            self.assertEqual([], list(self.mesh_interface.GetEntitiesChunks("Tetra", 10)))
+
+        self.assertEqual([], list(self.mesh_interface_non_exist_file.GetNodesChunks(10)))
+
+    def test_counters(self):
+        self.assertEqual(12, self.mesh_interface.GetNumberOfNodes())
+        self.assertEqual(2, self.mesh_interface.GetNumberOfGeometries("Hexa"))
+        self.assertEqual(1, self.mesh_interface.GetNumberOfGeometries("Edge"))
+        self.assertEqual(-1, self.mesh_interface.GetNumberOfGeometries("Tetra"))
+
+        self.assertEqual(0, self.mesh_interface_non_exist_file.GetNumberOfNodes())
+        self.assertEqual(-1, self.mesh_interface_non_exist_file.GetNumberOfGeometries("Hexa"))
+
+    def test_GetMeshInformation(self):
+        exp_mesh_info = {"Node" : 12, "Hexa" : 2, "Quadrangle" : 2, "Edge" : 1}
+        self.assertDictEqual(exp_mesh_info, self.mesh_interface.GetMeshInformation())
+        self.assertCountEqual(exp_mesh_info.keys(), self.mesh_interface.GetEntityTypesInMesh())
+
+        self.assertDictEqual({}, self.mesh_interface_non_exist_file.GetMeshInformation())
+        self.assertEqual([], self.mesh_interface_non_exist_file.GetEntityTypesInMesh())
+
+    def test_CheckMeshIsValid(self):
+        self.assertTrue(self.mesh_interface.CheckMeshIsValid())
+
+        with self.assertLogs('kratos_salome_plugin.file_mesh_interface', level='CRITICAL') as cm:
+            self.assertFalse(self.mesh_interface_non_exist_file.CheckMeshIsValid())
+        self.assertEqual(cm.output[0], 'CRITICAL:kratos_salome_plugin.file_mesh_interface:File "non_existing_file.dat" in FileMeshInterface does not exist')
+
+        file_path = Path("file_mesh_interface.med")
+        self.addCleanup(lambda: DeleteFileIfExisting(file_path))
+        WriteFile(file_path, dat_file_content)
+
+        with self.assertLogs('kratos_salome_plugin.file_mesh_interface', level='CRITICAL') as cm:
+            self.assertFalse(FileMeshInterface(str(file_path)).CheckMeshIsValid())
+        self.assertEqual(cm.output[0], 'CRITICAL:kratos_salome_plugin.file_mesh_interface:File "file_mesh_interface.med" in FileMeshInterface has an unsupported format! Supported are: ".dat", ".unv"')
+
+        with self.assertLogs('kratos_salome_plugin.file_mesh_interface', level='CRITICAL') as cm:
+            self.assertFalse(FileMeshInterface(str(self.file_path), group_name="top").CheckMeshIsValid())
+        self.assertEqual(cm.output[0], 'CRITICAL:kratos_salome_plugin.file_mesh_interface:File "file_mesh_interface_hexas.dat" in FileMeshInterface has no groups, only UNV files contain groups')
+
+    def test_inconsistent_file(self):
+        file_path = Path("file_mesh_interface_inconsistent.dat")
+        self.addCleanup(lambda: DeleteFileIfExisting(file_path))
+        WriteFile(file_path, dat_file_content.replace("12 5", "12 7", 1))
+
+        with self.assertRaisesRegex(Exception, 'The header specifies 12 Nodes and 7 entities, but the file contains 17 lines'):
+            FileMeshInterface(str(file_path)).GetNodes()
+
+    def test_unsupported_entity_type(self):
+        file_path = Path("file_mesh_interface_unsupported.dat")
+        self.addCleanup(lambda: DeleteFileIfExisting(file_path))
+        WriteFile(file_path, dat_file_content.replace("5 102 7 8", "5 309 1 2 3 4 5 6 7 8 9"))
+
+        with self.assertRaisesRegex(Exception, 'Entity type "309" of entity with Id 5 in file ".*" is not supported!'):
+            FileMeshInterface(str(file_path)).GetNodes()
+
+    def test_GetMeshName(self):
+        self.assertEqual("file_mesh_interface_hexas", self.mesh_interface.GetMeshName())
+        self.assertEqual("", self.mesh_interface_non_exist_file.GetMeshName())
+
+    def test_DoMeshesBelongToSameMainMesh(self):
+        self.assertTrue(FileMeshInterface.DoMeshesBelongToSameMainMesh([self.mesh_interface, self.mesh_interface_top]))
+        self.assertFalse(FileMeshInterface.DoMeshesBelongToSameMainMesh([self.mesh_interface, FileMeshInterface(str(self.file_path_top))]))
+        self.assertFalse(FileMeshInterface.DoMeshesBelongToSameMainMesh([self.mesh_interface, self.mesh_interface_non_exist_file]))
+
+    def test_GetMainMeshIdentifier(self):
+        self.assertEqual(self.mesh_interface.GetMainMeshIdentifier(), self.mesh_interface_top.GetMainMeshIdentifier())
+        self.assertNotEqual(self.mesh_interface.GetMainMeshIdentifier(), FileMeshInterface(str(self.file_path_top)).GetMainMeshIdentifier())
+        self.assertEqual("", self.mesh_interface_non_exist_file.GetMainMeshIdentifier())
+
+    def test_print(self):
+        exp_str  = 'FileMeshInterface\n'
+        exp_str += '  File name: file_mesh_interface_top.dat\n'
+        exp_str += '  Mesh is valid: True\n'
+        exp_str += '  Mesh has the following entities:\n'
+        exp_str += '    Node: 6\n'
+        exp_str += '    Quadrangle: 2\n'
+        self.assertMultiLineEqual(exp_str, str(self.mesh_interface_top))
+
+    def test_create_model_part_without_salome(self):
+        meshes = [
+            geometries_io.Mesh(self.mesh_interface, {"elements" : {"Hexa" : {"Element3D8N" : 0}}}, "domain"),
+            geometries_io.Mesh(self.mesh_interface_top, {"conditions" : {"Quadrangle" : {"SurfaceLoadCondition3D4N" : 1}}}, "top")
+        ]
+
+        model_part = ModelPart()
+        geometries_io.GeometriesIO.AddMeshes(model_part, meshes)
+
+        self.assertEqual(12, model_part.NumberOfNodes())
+        self.assertEqual(2, model_part.NumberOfElements())
+        self.assertEqual(2, model_part.NumberOfConditions())
+        self.assertEqual(6, model_part.GetSubModelPart("top").NumberOfNodes())
+
+        file_path = Path("file_mesh_interface.mdpa")
+        self.addCleanup(lambda: DeleteFileIfExisting(file_path))
+        WriteMdpa(model_part, str(file_path))
+        self.assertTrue(file_path.is_file())
+
+
+    @unittest.skipUnless(numpy_available, "numpy not available")
+    def test_create_model_part_in_chunks_without_salome(self):
+        meshes = [
+            geometries_io.Mesh(self.mesh_interface, {"elements" : {"Hexa" : {"Element3D8N" : 0}}}, "domain"),
+            geometries_io.Mesh(self.mesh_interface_top, {"conditions" : {"Quadrangle" : {"SurfaceLoadCondition3D4N" : 1}}}, "top")
+        ]
+
+        model_part = ModelPart()
+        geometries_io.GeometriesIO.AddMeshes(model_part, meshes, chunk_size=5)
+
+        self.assertEqual(12, model_part.NumberOfNodes())
+        self.assertEqual(2, model_part.NumberOfElements())
+        self.assertEqual(2, model_part.NumberOfConditions())
+
+    def test_update_model_part_without_salome(self):
+        file_path_top = Path("file_mesh_interface_top_modified.dat")
+        self.addCleanup(lambda: DeleteFileIfExisting(file_path_top))
+        WriteFile(file_path_top, dat_file_content_top)
+
+        mesh_interface_top = FileMeshInterface(str(file_path_top), str(self.file_path))
+        meshes = [
+            geometries_io.Mesh(self.mesh_interface, {"elements" : {"Hexa" : {"Element3D8N" : 0}}}, "domain"),
+            geometries_io.Mesh(mesh_interface_top, {"conditions" : {"Quadrangle" : {"SurfaceLoadCondition3D4N" : 1}}}, "top")
+        ]
+
+        model_part = ModelPart()
+        conversion_state = geometries_io.GeometriesIO.AddMeshes(model_part, meshes, track_changes=True)
+        fingerprint = mesh_interface_top.GetFingerprint()
+        self.assertEqual(2, model_part.NumberOfConditions())
+
+        # removing one of the quadrilaterals
+        WriteFile(file_path_top, dat_file_content_top.replace("6 2", "6 1", 1).replace("2 204 8 9 12 11\n", ""))
+        self.assertNotEqual(fingerprint, mesh_interface_top.GetFingerprint())
+
+        elements = [(elem.Id, elem) for elem in model_part.Elements]
+        geometries_io.GeometriesIO.UpdateMeshes(model_part, meshes, conversion_state)
+
+        self.assertEqual(12, model_part.NumberOfNodes())
+        self.assertListEqual(elements, [(elem.Id, elem) for elem in model_part.Elements]) # unchanged
+        self.assertEqual(1, model_part.NumberOfConditions())
+        self.assertEqual(6, model_part.GetSubModelPart("top").NumberOfNodes())
+        self.assertEqual("", self.mesh_interface_non_exist_file.GetFingerprint())
+
+    def __GetMeshesOfMultipleMainMeshes(self, mesh_interface_shell):
+        return [
+            geometries_io.Mesh(self.mesh_interface, {"elements" : {"Hexa" : {"Element3D8N" : 0}}}, "domain"),
+            geometries_io.Mesh(mesh_interface_shell, {"elements" : {"Quadrangle" : {"ShellThinElement3D4N" : 1}}}, "shell"),
+            geometries_io.Mesh(self.mesh_interface_top, {"conditions" : {"Quadrangle" : {"SurfaceLoadCondition3D4N" : 2}}}, "top")
+        ]
+
+    def test_create_model_part_multiple_main_meshes_without_salome(self):
+        meshes = self.__GetMeshesOfMultipleMainMeshes(FileMeshInterface(str(self.file_path_shell)))
+
+        with self.assertRaisesRegex(Exception, "don't belong to the same main mesh!"):
+            geometries_io.GeometriesIO.AddMeshes(ModelPart(), meshes)
+
+        with self.assertRaisesRegex(Exception, 'Merging coincident Nodes requires "allow_multiple_main_meshes"!'):
+            geometries_io.GeometriesIO.AddMeshes(ModelPart(), meshes, coincident_nodes_tolerance=1e-6)
+
+        model_part = ModelPart()
+        conversion_state = geometries_io.GeometriesIO.AddMeshes(model_part, meshes, allow_multiple_main_meshes=True)
+
+        # the Ids of the shell are shifted by the largest Ids of the hexahedrons
+        self.assertEqual(18, model_part.NumberOfNodes())
+        self.assertEqual(4, model_part.NumberOfElements())
+        self.assertEqual(2, model_part.NumberOfConditions())
+        self.assertListEqual(list(range(13, 19)), [node.Id for node in model_part.GetSubModelPart("shell").Nodes])
+        self.assertListEqual([[13, 14, 17, 16], [14, 15, 18, 17]], [[node.Id for node in elem.GetNodes()] for elem in model_part.GetSubModelPart("shell").Elements])
+        self.assertEqual(2, len(conversion_state.main_meshes))
+
+        if numpy_available:
+            mapping_tables = conversion_state.GetMappingTables()
+            self.assertEqual(12, mapping_tables[1]["node_id_offset"])
+            self.assertListEqual([[1, 3], [2, 4]], mapping_tables[1]["elements"]["ShellThinElement3D4N"].tolist()) # the Ids of the geometries are not shifted
+
+    def test_create_model_part_multiple_main_meshes_merging_nodes_without_salome(self):
+        meshes = self.__GetMeshesOfMultipleMainMeshes(FileMeshInterface(str(self.file_path_shell)))
+
+        with self.assertRaisesRegex(Exception, "The tolerance for merging coincident Nodes must be positive, got: 0.0"):
+            geometries_io.GeometriesIO.AddMeshes(ModelPart(), meshes, allow_multiple_main_meshes=True, coincident_nodes_tolerance=0.0)
+
+        for use_arrays in [False, True] if numpy_available else [False]:
+            with self.subTest(use_arrays=use_arrays):
+                model_part = ModelPart()
+                geometries_io.GeometriesIO.AddMeshes(model_part, meshes, use_arrays=use_arrays, allow_multiple_main_meshes=True, coincident_nodes_tolerance=1e-6)
+
+                # the Nodes of the shell are merged with the Nodes of the top of the hexahedrons
+                self.assertEqual(12, model_part.NumberOfNodes())
+                self.assertEqual(4, model_part.NumberOfElements())
+                self.assertListEqual(list(range(7, 13)), [node.Id for node in model_part.GetSubModelPart("shell").Nodes])
+                self.assertListEqual([[7, 8, 11, 10], [8, 9, 12, 11]], [[node.Id for node in elem.GetNodes()] for elem in model_part.GetSubModelPart("shell").Elements])
+
+    def test_update_model_part_multiple_main_meshes_without_salome(self):
+        file_path_shell = Path("file_mesh_interface_shell_modified.dat")
+        self.addCleanup(lambda: DeleteFileIfExisting(file_path_shell))
+        WriteFile(file_path_shell, dat_file_content_shell)
+
+        meshes = self.__GetMeshesOfMultipleMainMeshes(FileMeshInterface(str(file_path_shell)))
+        meshes.insert(0, meshes.pop(1)) # the shell is the first main mesh, hence the Nodes of the hexahedrons are merged with the ones of the shell
+
+        model_part = ModelPart()
+        conversion_state = geometries_io.GeometriesIO.AddMeshes(model_part, meshes, allow_multiple_main_meshes=True, coincident_nodes_tolerance=1e-6, track_changes=True)
+
+        self.assertEqual(12, model_part.NumberOfNodes())
+        self.assertListEqual(list(range(1, 7)), [node.Id for node in model_part.GetSubModelPart("top").Nodes])
+        elements = [(elem.Id, elem) for elem in model_part.GetSubModelPart("domain").Elements]
+
+        # removing one of the quadrilaterals of the shell
+        WriteFile(file_path_shell, dat_file_content_shell.replace("6 2", "6 1", 1).replace("2 204 2 3 6 5\n", ""))
+        geometries_io.GeometriesIO.UpdateMeshes(model_part, meshes, conversion_state)
+
+        self.assertEqual(12, model_part.NumberOfNodes())
+        self.assertEqual(3, model_part.NumberOfElements())
+        self.assertEqual(2, model_part.NumberOfConditions())
+        self.assertListEqual(elements, [(elem.Id, elem) for elem in model_part.GetSubModelPart("domain").Elements]) # unchanged
+        self.assertListEqual([[1, 2, 5, 4]], [[node.Id for node in elem.GetNodes()] for elem in model_part.GetSubModelPart("shell").Elements])
+
+        # a larger Id than before does not fit in the range of the main mesh anymore
+        WriteFile(file_path_shell, dat_file_content_shell.replace("6 2.0 1.0 1.0", "16 2.0 1.0 1.0").replace("2 3 6 5", "2 3 16 5"))
+        with self.assertRaisesRegex(Exception, 'exceed the range that is reserved for it!'):
+            geometries_io.GeometriesIO.UpdateMeshes(model_part, meshes, conversion_state)
+
+
+class TestFileMeshInterfaceUNV(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.file_path = Path("file_mesh_interface_hexas.unv")
+        cls.file_path_dat = Path("file_mesh_interface_hexas_for_unv.dat")
+        WriteFile(cls.file_path, unv_file_content)
+        WriteFile(cls.file_path_dat, dat_file_content)
+
+    @classmethod
+    def tearDownClass(cls):
+        DeleteFileIfExisting(cls.file_path)
+        DeleteFileIfExisting(cls.file_path_dat)
+
+    def setUp(self):
+        self.mesh_interface = FileMeshInterface(str(self.file_path))
+        self.mesh_interface_top = FileMeshInterface(str(self.file_path), group_name="top")
+
+    def test_same_entities_as_dat(self):
+        # the node ordering is converted to the one of Salome, i.e. the one of the DAT file
+        entity_types = ["Hexa", "Quadrangle", "Edge"]
+        self.assertEqual(FileMeshInterface(str(self.file_path_dat)).GetNodesAndGeometricalEntities(entity_types), self.mesh_interface.GetNodesAndGeometricalEntities(entity_types))
+        self.assertDictEqual({"Node" : 12, "Edge" : 1, "Quadrangle" : 2, "Hexa" : 2}, self.mesh_interface.GetMeshInformation())
+        self.assertEqual("UNV-File", self.mesh_interface.GetMeshType())
+
+    def test_groups(self):
+        self.assertEqual(["top", "edge_and_nodes"], self.mesh_interface.GetGroupNames())
+
+        nodes, geom_entities = self.mesh_interface_top.GetNodesAndGeometricalEntities(["Quadrangle"])
+        self.assertEqual(list(range(7, 13)), list(nodes.keys()))
+        self.assertEqual({1 : [7, 8, 11, 10], 2 : [8, 9, 12, 11]}, geom_entities["Quadrangle"])
+        self.assertDictEqual({"Node" : 6, "Quadrangle" : 2}, self.mesh_interface_top.GetMeshInformation())
+        self.assertEqual("top", self.mesh_interface_top.GetMeshName())
+        self.assertEqual("UNV-File-Group", self.mesh_interface_top.GetMeshType())
+
+        # the Nodes of the group and the ones of its entities
+        mesh_interface_edge = FileMeshInterface(str(self.file_path), group_name="edge_and_nodes")
+        self.assertEqual([1, 4, 7, 8], list(mesh_interface_edge.GetNodes().keys()))
+        self.assertDictEqual({"Node" : 4, "Edge" : 1}, mesh_interface_edge.GetMeshInformation())
+
+        # the groups belong to the main mesh (the file)
+        self.assertTrue(FileMeshInterface.DoMeshesBelongToSameMainMesh([self.mesh_interface, self.mesh_interface_top, mesh_interface_edge]))
+        self.assertNotEqual(self.mesh_interface.GetFingerprint(), self.mesh_interface_top.GetFingerprint())
+
+        with self.assertRaisesRegex(Exception, 'Group "bottom" does not exist in file ".*"!\nThe following groups exist: "top", "edge_and_nodes"'):
+            FileMeshInterface(str(self.file_path), group_name="bottom").GetNodes()
+
+    def test_unsupported_entity_type(self):
+        file_path = Path("file_mesh_interface_unsupported.unv")
+        self.addCleanup(lambda: DeleteFileIfExisting(file_path))
+        WriteFile(file_path, unv_file_content.replace("         3       115", "         3       116", 1))
+
+        with self.assertRaisesRegex(Exception, r'Element type \(FE descriptor\) "116" of element with Id 3 in file ".*" is not supported!'):
+            FileMeshInterface(str(file_path)).GetNodes()
+
+    def test_create_model_part_without_salome(self):
+        meshes = [
+            geometries_io.Mesh(self.mesh_interface, {"elements" : {"Hexa" : {"Element3D8N" : 0}}}, "domain"),
+            geometries_io.Mesh(self.mesh_interface_top, {"conditions" : {"Quadrangle" : {"SurfaceLoadCondition3D4N" : 1}}}, "top")
+        ]
+
+        model_part = ModelPart()
+        geometries_io.GeometriesIO.AddMeshes(model_part, meshes)
+
+        self.assertEqual(12, model_part.NumberOfNodes())
+        self.assertEqual(2, model_part.NumberOfElements())
+        self.assertEqual(2, model_part.NumberOfConditions())
+        self.assertEqual(6, model_part.GetSubModelPart("top").NumberOfNodes())
+
+        # same result as with the DAT file
+        model_part_dat = ModelPart()
+        geometries_io.GeometriesIO.AddMeshes(model_part_dat, [geometries_io.Mesh(FileMeshInterface(str(self.file_path_dat)), {"elements" : {"Hexa" : {"Element3D8N" : 0}}}, "domain")])
+        self.assertListEqual([[node.Id for node in elem.GetNodes()] for elem in model_part_dat.Elements], [[node.Id for node in elem.GetNodes()] for elem in model_part.Elements])
+
+
+class TestFileMeshInterfaceWithSalome(SalomeTestCaseWithBox):
+    def test_same_entities_as_MeshInterface(self):
+        file_path = Path("file_mesh_interface_salome_hexa.dat")
+        self.addCleanup(lambda: DeleteFileIfExisting(file_path))
+        self.mesh_hexa.ExportDAT(str(file_path))
+
+        mesh_interface = MeshInterface(salome_utilities.GetSalomeID(self.mesh_hexa.GetMesh()))
+        file_mesh_interface = FileMeshInterface(str(file_path))
+
+        self.assertEqual(mesh_interface.GetNumberOfNodes(), file_mesh_interface.GetNumberOfNodes())
+        for geometry_type in ["Hexa", "Quadrangle", "Edge"]: # 0D and Ball elements are not exported
+            self.assertEqual(mesh_interface.GetNumberOfGeometries(geometry_type), file_mesh_interface.GetNumberOfGeometries(geometry_type))
+
+
+if __name__ == '__main__':
+    unittest.main()
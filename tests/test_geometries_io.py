@@ -13,6 +13,8 @@ import initialize_testing_environment
 
 # python imports
 import unittest
+import threading
+import time
 from unittest.mock import MagicMock
 from abc import ABCMeta, abstractmethod
 
@@ -23,13 +25,17 @@ from kratos_salome_plugin.mesh_interface import MeshInterface
 from kratos_salome_plugin import salome_utilities
 
 # tests imports
-from testing_utilities import SalomeTestCaseWithBox, CheckIfKratosAvailable
+from testing_utilities import SalomeTestCaseWithBox, CheckIfKratosAvailable, CheckIfNumpyAvailable
 
 # Kratos imports
 kratos_available = CheckIfKratosAvailable()
 if kratos_available:
     import KratosMultiphysics as KM
 
+numpy_available = CheckIfNumpyAvailable()
+if numpy_available:
+    import numpy as np
+
 
 class TestGeometriesIOWithMockMeshInterfaces:
     """This TestCase contains basic tests for the GeometriesIO where the MeshInterface is substituted by a Mock object
@@ -785,6 +791,275 @@ class TestGeometriesIOWithMockMeshInterfaces:
             with self.assertRaisesRegex(Exception, "Mismatch in properties Ids!\nTrying to use properties with Id 5 with an existing entity that has the properties with Id 3"):
                 geometries_io.GeometriesIO.AddMeshes(main_model_part, meshes)
 
+        @unittest.skipUnless(numpy_available, "numpy not available")
+        def test_add_shared_entities_from_arrays(self):
+            # the meshes share some of the geometries, the entities created from them must be reused
+            # the result has to be the same as when the geometries are given as dicts
+            mesh_description = { "conditions" : {"Line" : {"LineCondition2D2N" : 3} } }
+            mesh_description_other_props = { "conditions" : {"Line" : {"LineCondition2D2N" : 4} } }
+
+            nodes = {i+1 : [i+1,i*2,i+3.5] for i in range(30)}
+            geometries_mesh_1 = {i+1 : [i+1, i+2] for i in range(0, 14)}
+            geometries_mesh_2 = {i+1 : [i+1, i+2] for i in range(8, 25)} # partially overlapping with mesh 1
+
+            def CreateMeshInterface(geometries):
+                mesh_interface_mock = MagicMock(spec=MeshInterface)
+                mesh_interface_mock.GetNodesAndGeometricalEntities.return_value = (nodes, {"Line" : geometries})
+                mesh_interface_mock.GetNodesArray.return_value = (np.array(list(nodes.keys()), dtype=np.int64), np.array(list(nodes.values()), dtype=np.float64))
+                mesh_interface_mock.GetEntitiesArrays.return_value = {"Line" : (np.array(list(geometries.keys()), dtype=np.int64), np.array(list(geometries.values()), dtype=np.int64))}
+                return mesh_interface_mock
+
+            def CreateMeshes():
+                return [
+                    geometries_io.Mesh(CreateMeshInterface(geometries_mesh_1), mesh_description, "smp_1"),
+                    geometries_io.Mesh(CreateMeshInterface(geometries_mesh_2), mesh_description, "smp_2")
+                ]
+
+            model_part_dicts = self._CreateModelPart("from_dicts")
+            geometries_io.GeometriesIO.AddMeshes(model_part_dicts, CreateMeshes())
+
+            model_part_arrays = self._CreateModelPart("from_arrays")
+            geometries_io.GeometriesIO.AddMeshes(model_part_arrays, CreateMeshes(), use_arrays=True)
+
+            self.assertEqual(25, model_part_arrays.NumberOfConditions())
+            self.assertEqual(14, model_part_arrays.GetSubModelPart("smp_1").NumberOfConditions())
+            self.assertEqual(17, model_part_arrays.GetSubModelPart("smp_2").NumberOfConditions())
+
+            for smp_name in ["smp_1", "smp_2"]:
+                conditions_dicts = model_part_dicts.GetSubModelPart(smp_name).Conditions
+                conditions_arrays = model_part_arrays.GetSubModelPart(smp_name).Conditions
+                self.assertListEqual([cond.Id for cond in conditions_dicts], [cond.Id for cond in conditions_arrays])
+                for cond_dicts, cond_arrays in zip(conditions_dicts, conditions_arrays):
+                    self.assertListEqual([node.Id for node in cond_dicts.GetNodes()], [node.Id for node in cond_arrays.GetNodes()])
+
+            # using the shared geometries with different Properties is not possible
+            meshes = [
+                geometries_io.Mesh(CreateMeshInterface(geometries_mesh_1), mesh_description, "smp_1"),
+                geometries_io.Mesh(CreateMeshInterface(geometries_mesh_2), mesh_description_other_props, "smp_2")
+            ]
+            with self.assertRaisesRegex(Exception, "Mismatch in properties Ids!\nTrying to use properties with Id 4 with an existing entity that has the properties with Id 3"):
+                geometries_io.GeometriesIO.AddMeshes(self._CreateModelPart("other_props"), meshes, use_arrays=True)
+
+        @unittest.skipUnless(numpy_available, "numpy not available")
+        def test_mapping_tables(self):
+            nodes = {i+1 : [i+1, i*2, i+3.5] for i in range(30)}
+
+            def CreateMeshInterface(fingerprint, geometries):
+                mesh_interface_mock = MagicMock(spec=MeshInterface)
+                mesh_interface_mock.GetFingerprint.return_value = fingerprint
+                mesh_interface_mock.GetNodesAndGeometricalEntities.return_value = (nodes, geometries)
+                return mesh_interface_mock
+
+            lines = {i : [i, i+1] for i in range(20, 0, -1)} # not sorted by Id
+            triangles = {i+100 : [i, i+1, i+2] for i in range(1, 6)}
+            meshes = [
+                geometries_io.Mesh(CreateMeshInterface("mesh_1", {"Line" : lines}), {"conditions" : {"Line" : {"LineCondition2D2N" : 0}}}, "smp_1"),
+                geometries_io.Mesh(CreateMeshInterface("mesh_2", {"Line" : {i : lines[i] for i in range(5, 10)}, "Triangle" : triangles}),
+                    {"elements" : {"Triangle" : {"Element2D3N" : 1}}, "conditions" : {"Line" : {"LineCondition2D2N" : 0}}}, "smp_2")
+            ]
+
+            model_part = self._CreateModelPart()
+            conversion_state = geometries_io.GeometriesIO.AddMeshes(model_part, meshes)
+            mapping_tables = conversion_state.GetMappingTables()
+
+            self.assertEqual(2, len(mapping_tables))
+            self.assertEqual("smp_1", mapping_tables[0]["model_part_name"])
+            self.assertDictEqual({}, mapping_tables[0]["elements"])
+
+            table_lines = mapping_tables[0]["conditions"]["LineCondition2D2N"]
+            self.assertEqual((20, 2), table_lines.shape)
+            self.assertListEqual(list(range(1, 21)), table_lines[:,0].tolist())
+            self.assertListEqual(list(range(20, 0, -1)), table_lines[:,1].tolist()) # created in the order of the geometries
+            for geometry_id, cond_id in table_lines.tolist():
+                self.assertListEqual(lines[geometry_id], [node.Id for node in model_part.GetCondition(cond_id).GetNodes()])
+
+            # the conditions are shared between the meshes
+            self.assertListEqual([[i, 21-i] for i in range(5, 10)], mapping_tables[1]["conditions"]["LineCondition2D2N"].tolist())
+            self.assertListEqual([[i+100, i] for i in range(1, 6)], mapping_tables[1]["elements"]["Element2D3N"].tolist())
+
+            # mapping results of the entities back to the geometries
+            results = np.arange(model_part.NumberOfConditions()+1, dtype=np.float64) * 10.0 # indexed by Id
+            geometry_ids = np.array([3, 7, 1], dtype=np.int64)
+            self.assertListEqual([180.0, 140.0, 200.0], results[geometries_io.GetEntityIdsFromMappingTable(table_lines, geometry_ids)].tolist())
+
+            with self.assertRaisesRegex(Exception, r'No entities were created from the geometries with Ids: \[0, 21\]'):
+                geometries_io.GetEntityIdsFromMappingTable(table_lines, [0, 5, 21])
+            with self.assertRaisesRegex(Exception, r'No entities were created from the geometries with Ids: \[1\]'):
+                geometries_io.GetEntityIdsFromMappingTable(np.empty((0, 2), dtype=np.int64), [1])
+
+        def test_update_meshes(self):
+            # only the changed meshes are retrieved again, the entities of the unchanged meshes keep their Ids
+            conditions_description = { "conditions" : {"Line" : {"LineCondition2D2N" : 3} } }
+            elements_description = { "elements" : {"Line" : {"Element2D2N" : 1} } }
+
+            def CreateMeshInterface(fingerprint, first_geometry_id, last_geometry_id):
+                geometries = {i : [i, i+1] for i in range(first_geometry_id, last_geometry_id+1)}
+                nodes = {i : [i, i*2, i+3.5] for i in range(first_geometry_id, last_geometry_id+2)}
+                mesh_interface_mock = MagicMock(spec=MeshInterface)
+                mesh_interface_mock.GetFingerprint.return_value = fingerprint
+                mesh_interface_mock.GetNodesAndGeometricalEntities.return_value = (nodes, {"Line" : geometries})
+                return mesh_interface_mock
+
+            mesh_interface_1 = CreateMeshInterface("mesh_1", 1, 14)
+            meshes = [
+                geometries_io.Mesh(mesh_interface_1, conditions_description, "smp_1"),
+                geometries_io.Mesh(CreateMeshInterface("mesh_2", 9, 25), conditions_description, "smp_2"),
+                geometries_io.Mesh(CreateMeshInterface("mesh_3", 1, 5), elements_description, "smp_3")
+            ]
+
+            model_part = self._CreateModelPart()
+            conversion_state = geometries_io.GeometriesIO.AddMeshes(model_part, meshes, track_changes=True)
+
+            self.assertEqual(26, model_part.NumberOfNodes())
+            self.assertEqual(25, model_part.NumberOfConditions())
+            self.assertEqual(5, model_part.NumberOfElements())
+
+            # nothing changed, nothing is retrieved again
+            conversion_state = geometries_io.GeometriesIO.UpdateMeshes(model_part, meshes, conversion_state)
+            self.assertEqual(1, mesh_interface_1.GetNodesAndGeometricalEntities.call_count)
+            self.assertEqual(25, model_part.NumberOfConditions())
+
+            # mesh 2 changed, mesh 3 is removed and mesh 4 is new
+            mesh_interface_2_changed = CreateMeshInterface("mesh_2_changed", 20, 28)
+            updated_meshes = [
+                meshes[0],
+                geometries_io.Mesh(mesh_interface_2_changed, conditions_description, "smp_2"),
+                geometries_io.Mesh(CreateMeshInterface("mesh_4", 1, 3), elements_description, "smp_4")
+            ]
+            conversion_state = geometries_io.GeometriesIO.UpdateMeshes(model_part, updated_meshes, conversion_state)
+
+            self.assertEqual(1, mesh_interface_1.GetNodesAndGeometricalEntities.call_count)
+            self.assertEqual(1, mesh_interface_2_changed.GetNodesAndGeometricalEntities.call_count)
+            self.assertEqual(3, len(conversion_state.mesh_records))
+
+            # the Nodes that are not used anymore are removed
+            self.assertListEqual(list(range(1, 16)) + list(range(20, 30)), sorted([node.Id for node in model_part.Nodes]))
+
+            # the conditions of mesh 1 are unchanged, the ones of the changed mesh 2 are created again with new Ids
+            self.assertEqual(14+9, model_part.NumberOfConditions())
+            smp_1 = model_part.GetSubModelPart("smp_1")
+            self.assertListEqual(list(range(1, 15)), [cond.Id for cond in smp_1.Conditions])
+            for cond in smp_1.Conditions:
+                self.assertListEqual([cond.Id, cond.Id+1], [node.Id for node in cond.GetNodes()])
+
+            smp_2 = model_part.GetSubModelPart("smp_2")
+            self.assertEqual(10, smp_2.NumberOfNodes())
+            self.assertListEqual(list(range(26, 35)), [cond.Id for cond in smp_2.Conditions])
+            for i, cond in enumerate(smp_2.Conditions):
+                self.assertListEqual([20+i, 21+i], [node.Id for node in cond.GetNodes()])
+
+            # the SubModelPart of the removed mesh is removed too
+            self.assertFalse(model_part.HasSubModelPart("smp_3"))
+            self.assertEqual(3, model_part.NumberOfElements())
+            self.assertListEqual([6, 7, 8], [elem.Id for elem in model_part.GetSubModelPart("smp_4").Elements])
+
+            # the ConversionState belongs to the ModelPart it was created for
+            err_msg = 'The ConversionState was created for ModelPart "{}", it cannot be used to update ModelPart "other"!'.format(model_part.Name)
+            with self.assertRaisesRegex(Exception, err_msg):
+                geometries_io.GeometriesIO.UpdateMeshes(self._CreateModelPart("other"), updated_meshes, conversion_state)
+
+        def test_update_meshes_with_added_entities(self):
+            # the Ids of entities that were added after the conversion are not used for new entities
+            mesh_description = { "conditions" : {"Line" : {"LineCondition2D2N" : 0} } }
+
+            def CreateMeshInterface(fingerprint, num_geometries):
+                mesh_interface_mock = MagicMock(spec=MeshInterface)
+                mesh_interface_mock.GetFingerprint.return_value = fingerprint
+                nodes = {i+1 : [i+1, 0.0, 0.0] for i in range(num_geometries+1)}
+                geometries = {i+1 : [i+1, i+2] for i in range(num_geometries)}
+                mesh_interface_mock.GetNodesAndGeometricalEntities.return_value = (nodes, {"Line" : geometries})
+                return mesh_interface_mock
+
+            model_part = self._CreateModelPart()
+            meshes = [geometries_io.Mesh(CreateMeshInterface("mesh", 5), mesh_description)]
+            conversion_state = geometries_io.GeometriesIO.AddMeshes(model_part, meshes, track_changes=True)
+
+            model_part.CreateNewNode(100, 0.0, 1.0, 0.0)
+            model_part.CreateNewNode(101, 1.0, 1.0, 0.0)
+            model_part.CreateNewCondition("LineCondition2D2N", 7, [100, 101], model_part.GetProperties(0, 0))
+
+            meshes = [geometries_io.Mesh(CreateMeshInterface("mesh_changed", 10), mesh_description)]
+            geometries_io.GeometriesIO.UpdateMeshes(model_part, meshes, conversion_state)
+
+            # the gap between the Ids 5 and 7 is too small, the Ids of the removed Conditions are not reused
+            self.assertListEqual([7] + list(range(8, 18)), sorted([cond.Id for cond in model_part.Conditions]))
+
+        def test_update_meshes_with_replaced_entities(self):
+            # an entity was removed and another one was added, hence the number of entities is unchanged
+            mesh_description = { "conditions" : {"Line" : {"LineCondition2D2N" : 0} } }
+
+            def CreateMeshInterface(fingerprint, num_geometries):
+                mesh_interface_mock = MagicMock(spec=MeshInterface)
+                mesh_interface_mock.GetFingerprint.return_value = fingerprint
+                nodes = {i+1 : [i+1, 0.0, 0.0] for i in range(num_geometries+1)}
+                geometries = {i+1 : [i+1, i+2] for i in range(num_geometries)}
+                mesh_interface_mock.GetNodesAndGeometricalEntities.return_value = (nodes, {"Line" : geometries})
+                return mesh_interface_mock
+
+            model_part = self._CreateModelPart()
+            meshes = [geometries_io.Mesh(CreateMeshInterface("mesh", 5), mesh_description)]
+            conversion_state = geometries_io.GeometriesIO.AddMeshes(model_part, meshes, track_changes=True)
+
+            model_part.RemoveCondition(5)
+            model_part.CreateNewNode(100, 0.0, 1.0, 0.0)
+            model_part.CreateNewNode(101, 1.0, 1.0, 0.0)
+            model_part.CreateNewCondition("LineCondition2D2N", 6, [100, 101], model_part.GetProperties(0, 0))
+
+            meshes = [geometries_io.Mesh(CreateMeshInterface("mesh_changed", 3), mesh_description)]
+            geometries_io.GeometriesIO.UpdateMeshes(model_part, meshes, conversion_state)
+
+            # the Id of the added Condition is not used for the new Conditions
+            self.assertListEqual([6, 7, 8, 9], sorted([cond.Id for cond in model_part.Conditions]))
+            self.assertIs(model_part.GetCondition(6).GetNodes()[0], model_part.GetNode(100))
+
+        def test_update_meshes_shared_entities(self):
+            # the entities that are shared with unchanged meshes are kept
+            mesh_description = { "elements" : {"Line" : {"Element2D2N" : 1} } }
+            nodes = {i+1 : [i+1, i*2, i+3.5] for i in range(10)}
+
+            def CreateMeshInterface(fingerprint, geometries):
+                mesh_interface_mock = MagicMock(spec=MeshInterface)
+                mesh_interface_mock.GetFingerprint.return_value = fingerprint
+                mesh_interface_mock.GetNodesAndGeometricalEntities.return_value = (nodes, {"Line" : geometries})
+                return mesh_interface_mock
+
+            all_geometries = {i+1 : [i+1, i+2] for i in range(9)}
+            meshes = [
+                geometries_io.Mesh(CreateMeshInterface("all", all_geometries), mesh_description, "all"),
+                geometries_io.Mesh(CreateMeshInterface("part", {i : all_geometries[i] for i in range(1, 5)}), mesh_description, "all.part")
+            ]
+
+            model_part = self._CreateModelPart()
+            conversion_state = geometries_io.GeometriesIO.AddMeshes(model_part, meshes, track_changes=True)
+
+            meshes[1] = geometries_io.Mesh(CreateMeshInterface("part_changed", {i : all_geometries[i] for i in range(3, 8)}), mesh_description, "all.part")
+            geometries_io.GeometriesIO.UpdateMeshes(model_part, meshes, conversion_state)
+
+            self.assertEqual(10, model_part.NumberOfNodes())
+            self.assertListEqual(list(range(1, 10)), [elem.Id for elem in model_part.Elements])
+            self.assertListEqual(list(range(1, 10)), [elem.Id for elem in model_part.GetSubModelPart("all").Elements])
+            self.assertListEqual(list(range(3, 8)), sorted([elem.Id for elem in model_part.GetSubModelPart("all").GetSubModelPart("part").Elements]))
+
+        def test_update_meshes_without_tracking_changes(self):
+            # without the fingerprints all meshes are retrieved again in the first update
+            mesh_description = { "conditions" : {"Line" : {"LineCondition2D2N" : 0} } }
+            mesh_interface_mock = MagicMock(spec=MeshInterface)
+            mesh_interface_mock.GetFingerprint.return_value = "mesh"
+            mesh_interface_mock.GetNodesAndGeometricalEntities.return_value = ({i+1 : [i+1, 0.0, 0.0] for i in range(6)}, {"Line" : {i+1 : [i+1, i+2] for i in range(5)}})
+            meshes = [geometries_io.Mesh(mesh_interface_mock, mesh_description)]
+
+            model_part = self._CreateModelPart()
+            conversion_state = geometries_io.GeometriesIO.AddMeshes(model_part, meshes)
+            self.assertEqual(0, mesh_interface_mock.GetFingerprint.call_count)
+
+            geometries_io.GeometriesIO.UpdateMeshes(model_part, meshes, conversion_state)
+            self.assertEqual(2, mesh_interface_mock.GetNodesAndGeometricalEntities.call_count)
+            self.assertEqual(5, model_part.NumberOfConditions())
+
+            # the update computed the fingerprints, hence the next update does not retrieve the unchanged mesh
+            geometries_io.GeometriesIO.UpdateMeshes(model_part, meshes, conversion_state)
+            self.assertEqual(2, mesh_interface_mock.GetNodesAndGeometricalEntities.call_count)
+
         def test_add_elements_and_conditions_to_same_model_part(self):
             model_part = self._CreateModelPart()
             smp_name = "smp_elemes_conds"
@@ -1120,6 +1395,198 @@ class TestGeometriesIOWithMockMeshInterfaces:
             self.assertEqual(0, mp.NumberOfElements())
             self.assertEqual(9, mp.NumberOfConditions())
 
+        @unittest.skipUnless(numpy_available, "numpy not available")
+        def test_add_elements_and_conditions_from_arrays(self):
+            # the entities are given as arrays, the result has to be the same as when given as dicts
+            mesh_description = {
+                "elements"   : {"Tetra" : {"Element3D4N" : 1}},
+                "conditions" : {"Triangle" : {"SurfaceCondition3D3N" : 2}}
+            }
+
+            the_nodes = {i+1 : [i+1,i*2,i+3.5] for i in range(15)}
+            the_geom_entities = {
+                "Tetra"    : {i+3 : [(i+2)%15+1, (i+6)%15+1, (i+4)%15+1, (i+8)%15+1] for i in range(11)},
+                "Triangle" : {i+20 : [(i+1)%15+1, (i+3)%15+1, (i+4)%15+1] for i in range(7)}
+            }
+
+            nodes_arrays = (np.array(list(the_nodes.keys()), dtype=np.int64), np.array(list(the_nodes.values()), dtype=np.float64))
+            geom_entities_arrays = {geom_type : (np.array(list(geoms.keys()), dtype=np.int64), np.array(list(geoms.values()), dtype=np.int64)) for geom_type, geoms in the_geom_entities.items()}
+
+            attrs = {
+                'GetNodesAndGeometricalEntities.return_value': (the_nodes, the_geom_entities),
+                'GetNodesArray.return_value': nodes_arrays,
+                'GetEntitiesArrays.return_value': geom_entities_arrays
+            }
+            mesh_interface_mock = MagicMock(spec=MeshInterface)
+            mesh_interface_mock.configure_mock(**attrs)
+
+            model_part_dicts = self._CreateModelPart("from_dicts")
+            geometries_io.GeometriesIO.AddMeshes(model_part_dicts, [geometries_io.Mesh(mesh_interface_mock, mesh_description)])
+
+            model_part_arrays = self._CreateModelPart("from_arrays")
+            geometries_io.GeometriesIO.AddMeshes(model_part_arrays, [geometries_io.Mesh(mesh_interface_mock, mesh_description)], use_arrays=True)
+
+            self.assertEqual(mesh_interface_mock.GetNodesAndGeometricalEntities.call_count, 1)
+            self.assertEqual(mesh_interface_mock.GetNodesArray.call_count, 1)
+            self.assertEqual(mesh_interface_mock.GetEntitiesArrays.call_count, 1)
+
+            self.assertEqual(len(the_nodes), model_part_arrays.NumberOfNodes())
+            self.assertEqual(len(the_geom_entities["Tetra"]), model_part_arrays.NumberOfElements())
+            self.assertEqual(len(the_geom_entities["Triangle"]), model_part_arrays.NumberOfConditions())
+
+            for node_dicts, node_arrays in zip(model_part_dicts.Nodes, model_part_arrays.Nodes):
+                self.assertEqual(node_dicts.Id, node_arrays.Id)
+                self.assertIsInstance(node_arrays.Id, int)
+                self.assertAlmostEqual(node_dicts.X, node_arrays.X)
+                self.assertAlmostEqual(node_dicts.Y, node_arrays.Y)
+                self.assertAlmostEqual(node_dicts.Z, node_arrays.Z)
+
+            for entities_dicts, entities_arrays in [(model_part_dicts.Elements, model_part_arrays.Elements), (model_part_dicts.Conditions, model_part_arrays.Conditions)]:
+                for entity_dicts, entity_arrays in zip(entities_dicts, entities_arrays):
+                    self.assertEqual(entity_dicts.Id, entity_arrays.Id)
+                    self.assertEqual(entity_dicts.Properties.Id, entity_arrays.Properties.Id)
+                    self.assertListEqual([node.Id for node in entity_dicts.GetNodes()], [node.Id for node in entity_arrays.GetNodes()])
+
+        def test_add_meshes_with_multiple_threads(self):
+            # the meshes are retrieved concurrently but added in the order of the input
+            # hence the result has to be the same as when retrieving them sequentially
+            num_meshes = 4
+            mesh_description = { "conditions" : {"Line" : {"LineCondition2D2N" : 3} } }
+
+            # every mesh waits until all meshes are being retrieved at the same time
+            # this would fail with a timeout if the meshes were retrieved sequentially
+            barrier = threading.Barrier(num_meshes, timeout=10)
+
+            def CreateMeshes(wait_for_barrier):
+                meshes = []
+                for i_mesh in range(num_meshes):
+                    # meshes share some of the geometries, hence the order of adding matters for the numbering
+                    nodes = {i+1 : [i+1, i*2, i+3.5] for i in range(i_mesh*3, i_mesh*3+6)}
+                    geometries = {"Line" : {i+1 : [i+1, i+2] for i in range(i_mesh*3, i_mesh*3+5)}}
+
+                    def GetNodesAndGeometricalEntities(geometrical_entity_types, nodes=nodes, geometries=geometries):
+                        if wait_for_barrier:
+                            barrier.wait()
+                        return nodes, geometries
+
+                    mesh_interface_mock = MagicMock(spec=MeshInterface)
+                    mesh_interface_mock.GetNodesAndGeometricalEntities.side_effect = GetNodesAndGeometricalEntities
+                    meshes.append(geometries_io.Mesh(mesh_interface_mock, mesh_description, "smp_{}".format(i_mesh)))
+                return meshes
+
+            model_part_sequential = self._CreateModelPart("sequential")
+            geometries_io.GeometriesIO.AddMeshes(model_part_sequential, CreateMeshes(False))
+
+            model_part_threads = self._CreateModelPart("threads")
+            geometries_io.GeometriesIO.AddMeshes(model_part_threads, CreateMeshes(True), num_threads=num_meshes)
+
+            self.assertEqual(model_part_sequential.NumberOfNodes(), model_part_threads.NumberOfNodes())
+            self.assertEqual(model_part_sequential.NumberOfConditions(), model_part_threads.NumberOfConditions())
+
+            for i_mesh in range(num_meshes):
+                smp_name = "smp_{}".format(i_mesh)
+                smp_sequential = model_part_sequential.GetSubModelPart(smp_name)
+                smp_threads = model_part_threads.GetSubModelPart(smp_name)
+                self.assertListEqual([cond.Id for cond in smp_sequential.Conditions], [cond.Id for cond in smp_threads.Conditions])
+                for cond_sequential, cond_threads in zip(smp_sequential.Conditions, smp_threads.Conditions):
+                    self.assertListEqual([node.Id for node in cond_sequential.GetNodes()], [node.Id for node in cond_threads.GetNodes()])
+
+        @unittest.skipUnless(numpy_available, "numpy not available")
+        def test_add_meshes_in_chunks(self):
+            # the entities are given in chunks, the result has to be the same as when given as dicts
+            # two Conditions are created from the Triangles, hence their chunks have to be iterated twice
+            chunk_size = 4
+            mesh_description = {
+                "elements"   : {"Tetra" : {"Element3D4N" : 1}},
+                "conditions" : {"Triangle" : {"SurfaceCondition3D3N" : 2, "SurfaceLoadCondition3D3N" : 3}}
+            }
+
+            the_nodes = {i+1 : [i+1,i*2,i+3.5] for i in range(15)}
+            the_geom_entities = {
+                "Tetra"    : {i+3 : [(i+2)%15+1, (i+6)%15+1, (i+4)%15+1, (i+8)%15+1] for i in range(11)},
+                "Triangle" : {i+20 : [(i+1)%15+1, (i+3)%15+1, (i+4)%15+1] for i in range(7)}
+            }
+
+            def ToChunks(the_dict, chunk_size, dtype):
+                items = list(the_dict.items())
+                for start in range(0, len(items), chunk_size):
+                    chunk = items[start:start+chunk_size]
+                    yield np.array([k for k, _ in chunk], dtype=np.int64), np.array([v for _, v in chunk], dtype=dtype)
+
+            mesh_interface_mock = MagicMock(spec=MeshInterface)
+            mesh_interface_mock.GetNodesAndGeometricalEntities.return_value = (the_nodes, the_geom_entities)
+            mesh_interface_mock.GetNodesChunks.side_effect = lambda chunk_size: ToChunks(the_nodes, chunk_size, np.float64)
+            mesh_interface_mock.GetEntitiesChunks.side_effect = lambda geometry_type, chunk_size: ToChunks(the_geom_entities[geometry_type], chunk_size, np.int64)
+
+            model_part_dicts = self._CreateModelPart("from_dicts")
+            geometries_io.GeometriesIO.AddMeshes(model_part_dicts, [geometries_io.Mesh(mesh_interface_mock, mesh_description, "smp")])
+
+            model_part_chunks = self._CreateModelPart("from_chunks")
+            geometries_io.GeometriesIO.AddMeshes(model_part_chunks, [geometries_io.Mesh(mesh_interface_mock, mesh_description, "smp")], num_threads=2, chunk_size=chunk_size)
+
+            self.assertEqual(mesh_interface_mock.GetNodesAndGeometricalEntities.call_count, 1)
+            self.assertEqual(mesh_interface_mock.GetNodesChunks.call_count, 1)
+            self.assertEqual(mesh_interface_mock.GetEntitiesChunks.call_count, 3) # once per entity-name
+            for call_args in mesh_interface_mock.GetEntitiesChunks.call_args_list:
+                self.assertEqual(chunk_size, call_args[0][1])
+
+            self.assertEqual(len(the_nodes), model_part_chunks.NumberOfNodes())
+            self.assertEqual(len(the_geom_entities["Tetra"]), model_part_chunks.NumberOfElements())
+            self.assertEqual(2*len(the_geom_entities["Triangle"]), model_part_chunks.NumberOfConditions())
+            self.assertEqual(len(the_nodes), model_part_chunks.GetSubModelPart("smp").NumberOfNodes())
+
+            for node_dicts, node_chunks in zip(model_part_dicts.Nodes, model_part_chunks.Nodes):
+                self.assertEqual(node_dicts.Id, node_chunks.Id)
+                self.assertIsInstance(node_chunks.Id, int)
+                self.assertAlmostEqual(node_dicts.X, node_chunks.X)
+                self.assertAlmostEqual(node_dicts.Y, node_chunks.Y)
+                self.assertAlmostEqual(node_dicts.Z, node_chunks.Z)
+
+            for entities_dicts, entities_chunks in [(model_part_dicts.Elements, model_part_chunks.Elements), (model_part_dicts.Conditions, model_part_chunks.Conditions)]:
+                for entity_dicts, entity_chunks in zip(entities_dicts, entities_chunks):
+                    self.assertEqual(entity_dicts.Id, entity_chunks.Id)
+                    self.assertEqual(entity_dicts.Properties.Id, entity_chunks.Properties.Id)
+                    self.assertListEqual([node.Id for node in entity_dicts.GetNodes()], [node.Id for node in entity_chunks.GetNodes()])
+
+        def test_add_meshes_pipelined(self):
+            # the next mesh is retrieved while the current one is added, but the meshes are added in the order of the input
+            # hence the result has to be the same as when retrieving them sequentially
+            num_meshes = 5
+            mesh_description = { "conditions" : {"Line" : {"LineCondition2D2N" : 3} } }
+
+            def CreateMeshes():
+                meshes = []
+                for i_mesh in range(num_meshes):
+                    # meshes share some of the geometries, hence the order of adding matters for the numbering
+                    nodes = {i+1 : [i+1, i*2, i+3.5] for i in range(i_mesh*3, i_mesh*3+6)}
+                    geometries = {"Line" : {i+1 : [i+1, i+2] for i in range(i_mesh*3, i_mesh*3+5)}}
+
+                    mesh_interface_mock = MagicMock(spec=MeshInterface)
+                    mesh_interface_mock.GetNodesAndGeometricalEntities.return_value = (nodes, geometries)
+                    meshes.append(geometries_io.Mesh(mesh_interface_mock, mesh_description, "smp_{}".format(i_mesh)))
+                return meshes
+
+            model_part_sequential = self._CreateModelPart("sequential")
+            geometries_io.GeometriesIO.AddMeshes(model_part_sequential, CreateMeshes())
+
+            model_part_pipelined = self._CreateModelPart("pipelined")
+            meshes_pipelined = CreateMeshes()
+            geometries_io.GeometriesIO.AddMeshes(model_part_pipelined, meshes_pipelined, pipeline_depth=2)
+
+            for mesh in meshes_pipelined:
+                self.assertEqual(1, mesh.mesh_interface.GetNodesAndGeometricalEntities.call_count)
+
+            self.assertEqual(model_part_sequential.NumberOfNodes(), model_part_pipelined.NumberOfNodes())
+            self.assertEqual(model_part_sequential.NumberOfConditions(), model_part_pipelined.NumberOfConditions())
+
+            for i_mesh in range(num_meshes):
+                smp_name = "smp_{}".format(i_mesh)
+                smp_sequential = model_part_sequential.GetSubModelPart(smp_name)
+                smp_pipelined = model_part_pipelined.GetSubModelPart(smp_name)
+                self.assertListEqual([cond.Id for cond in smp_sequential.Conditions], [cond.Id for cond in smp_pipelined.Conditions])
+                for cond_sequential, cond_pipelined in zip(smp_sequential.Conditions, smp_pipelined.Conditions):
+                    self.assertListEqual([node.Id for node in cond_sequential.GetNodes()], [node.Id for node in cond_pipelined.GetNodes()])
+
 
         ### Auxiliar testing functions ###
         def __RecursiveCheckModelParts(self, model_part, model_part_name, check_fct_ptr):
@@ -1147,6 +1614,312 @@ class TestGeometriesIOWithMockMeshInterfaces_PyKratosModelPart(TestGeometriesIOW
         return py_model_part.ModelPart(name)
 
 
+class TestGeometryEntitiesMap(unittest.TestCase):
+    """This TestCase checks the map from the geometries to the entities created from them"""
+
+    def test_geometry_ids_as_list(self):
+        entities_map = geometries_io._GeometryEntitiesMap()
+
+        self.assertEqual(([], [0, 1, 2]), entities_map.FindExistingEntities([5, 2, 7], 1))
+        entities_map.AddEntities([5, 2, 7], [0, 2], 10, 1) # no entity is created from geometry 2
+
+        self.assertEqual(([10, 11], [1, 3]), entities_map.FindExistingEntities([5, 2, 7, 100], 1))
+
+        with self.assertRaisesRegex(Exception, "Mismatch in properties Ids!\nTrying to use properties with Id 2 with an existing entity that has the properties with Id 1"):
+            entities_map.FindExistingEntities([2, 7], 2)
+
+        self.assertEqual(([], [0]), entities_map.FindExistingEntities([2], 2)) # no entity was created from this geometry
+
+    def test_large_properties_ids(self):
+        entities_map = geometries_io._GeometryEntitiesMap()
+        large_props_id = 2**40 # does not fit in 32 bits
+
+        entities_map.AddEntities([3, 4], [0, 1], 1, large_props_id)
+        self.assertEqual(([1, 2], []), entities_map.FindExistingEntities([3, 4], large_props_id))
+
+        with self.assertRaisesRegex(Exception, "Trying to use properties with Id 1 with an existing entity that has the properties with Id {}".format(large_props_id)):
+            entities_map.FindExistingEntities([3], 1)
+
+    @unittest.skipUnless(numpy_available, "numpy not available")
+    def test_geometry_ids_as_array(self):
+        entities_map = geometries_io._GeometryEntitiesMap()
+
+        self.assertEqual(([], [0, 1, 2]), entities_map.FindExistingEntities(np.array([5, 2, 7], dtype=np.int64), 1))
+        entities_map.AddEntities(np.array([5, 2, 7], dtype=np.int64), [0, 2], 10, 1) # no entity is created from geometry 2
+
+        existing_entity_ids, new_geometries_indices = entities_map.FindExistingEntities(np.array([5, 2, 7, 100], dtype=np.int64), 1)
+        self.assertEqual([10, 11], existing_entity_ids)
+        self.assertEqual([1, 3], new_geometries_indices)
+        self.assertIsInstance(existing_entity_ids[0], int) # required by Kratos
+
+        with self.assertRaisesRegex(Exception, "Mismatch in properties Ids!\nTrying to use properties with Id 2 with an existing entity that has the properties with Id 1"):
+            entities_map.FindExistingEntities(np.array([2, 7], dtype=np.int64), 2)
+
+        # geometries given as list and as array use the same map
+        entities_map.AddEntities([100, 2], [0], 12, 1)
+        self.assertEqual(([12, 10], [2]), entities_map.FindExistingEntities(np.array([100, 5, 2], dtype=np.int64), 1))
+
+
+class TestIdAllocator(unittest.TestCase):
+    def test_reserve(self):
+        id_allocator = geometries_io._IdAllocator()
+        self.assertEqual(1, id_allocator.Reserve(10))
+        self.assertEqual(11, id_allocator.Reserve(5))
+        self.assertEqual(16, id_allocator.Reserve(0))
+        self.assertEqual(15, id_allocator.num_used_ids)
+
+    def test_reserve_sparse_ids(self):
+        id_allocator = geometries_io._IdAllocator([3, 1, 10, 4, 13, 20])
+        self.assertEqual(6, id_allocator.num_used_ids)
+
+        self.assertEqual(5, id_allocator.Reserve(5)) # the first gap is too small
+        self.assertEqual(2, id_allocator.Reserve(1))
+        self.assertEqual(11, id_allocator.Reserve(2)) # fills the gap exactly
+        self.assertEqual(14, id_allocator.Reserve(3))
+        self.assertEqual(21, id_allocator.Reserve(10))
+        self.assertEqual(17, id_allocator.Reserve(3))
+        self.assertEqual(31, id_allocator.Reserve(1))
+        self.assertEqual(31, id_allocator.num_used_ids)
+
+    def test_release(self):
+        id_allocator = geometries_io._IdAllocator()
+        id_allocator.Reserve(10)
+        id_allocator.Release(4)
+        self.assertEqual(6, id_allocator.num_used_ids)
+        self.assertEqual(11, id_allocator.Reserve(1)) # the released Ids are not reused
+
+    def test_are_used(self):
+        id_allocator = geometries_io._IdAllocator([3, 1, 4, 10])
+        self.assertTrue(id_allocator.AreUsed([1, 3, 4, 10]))
+        self.assertTrue(id_allocator.AreUsed([]))
+        self.assertFalse(id_allocator.AreUsed([1, 2])) # in a free range between the used Ids
+        self.assertFalse(id_allocator.AreUsed([11])) # in the last (open) range
+
+        self.assertEqual(5, id_allocator.Reserve(5))
+        self.assertTrue(id_allocator.AreUsed(range(5, 10)))
+
+
+class TestRetrieveMeshesDataPipelined(unittest.TestCase):
+    """This TestCase checks the producer-thread of the pipelined retrieval of the meshes"""
+
+    def _CreateMeshes(self, num_meshes, side_effect):
+        meshes = []
+        for i_mesh in range(num_meshes):
+            mesh_interface_mock = MagicMock(spec=MeshInterface)
+            mesh_interface_mock.GetNodesAndGeometricalEntities.side_effect = lambda geometrical_entity_types, i_mesh=i_mesh: side_effect(i_mesh)
+            meshes.append(geometries_io.Mesh(mesh_interface_mock, {"elements" : {}, "conditions" : {}}))
+        return meshes
+
+    def test_retrieving_next_meshes_while_processing(self):
+        num_meshes = 5
+        pipeline_depth = 1
+        retrieved_meshes = []
+        third_mesh_retrieved = threading.Event()
+
+        def RetrieveMesh(i_mesh):
+            retrieved_meshes.append(i_mesh)
+            if len(retrieved_meshes) == 3:
+                third_mesh_retrieved.set()
+            return {i_mesh+1 : [0,0,0]}, {}
+
+        meshes = self._CreateMeshes(num_meshes, RetrieveMesh)
+        meshes_data = geometries_io._RetrieveMeshesData(meshes, False, 1, pipeline_depth=pipeline_depth)
+
+        mesh, mesh_data = next(meshes_data)
+        self.assertIs(meshes[0], mesh)
+        self.assertEqual(({1 : [0,0,0]}, {}), mesh_data)
+
+        # while the first mesh is processed, the next ones are retrieved
+        # one is waiting in the queue and one is waiting to be put into the queue
+        self.assertTrue(third_mesh_retrieved.wait(timeout=10))
+        time.sleep(0.2)
+        self.assertEqual(2+pipeline_depth, len(retrieved_meshes))
+
+        self.assertEqual(list(range(1, num_meshes)), [list(mesh_data[0].keys())[0]-1 for _, mesh_data in meshes_data])
+        self.assertEqual(list(range(num_meshes)), retrieved_meshes)
+
+    def test_exception_in_producer(self):
+        def RetrieveMesh(i_mesh):
+            if i_mesh == 2:
+                raise Exception("Retrieving mesh failed")
+            return {}, {}
+
+        meshes = self._CreateMeshes(4, RetrieveMesh)
+        num_threads_before = threading.active_count()
+
+        with self.assertRaisesRegex(Exception, 'Retrieving mesh failed'):
+            geometries_io.GeometriesIO.AddMeshes(py_model_part.ModelPart("for_test"), meshes, pipeline_depth=1)
+
+        self.assertEqual(1, meshes[1].mesh_interface.GetNodesAndGeometricalEntities.call_count)
+        self.assertEqual(0, meshes[3].mesh_interface.GetNodesAndGeometricalEntities.call_count)
+        self.assertEqual(num_threads_before, threading.active_count())
+
+    def test_pipeline_and_threads_not_combined(self):
+        meshes = self._CreateMeshes(2, lambda i_mesh: ({}, {}))
+        model_part = py_model_part.ModelPart("for_test")
+        exp_err = r'Retrieving the meshes with multiple threads \(2\) and in a pipeline \(depth 1\) is not possible!'
+
+        with self.assertRaisesRegex(Exception, exp_err):
+            geometries_io.GeometriesIO.AddMeshes(model_part, meshes, num_threads=2, pipeline_depth=1)
+
+        conversion_state = geometries_io.GeometriesIO.AddMeshes(model_part, meshes, pipeline_depth=1)
+        with self.assertRaisesRegex(Exception, exp_err):
+            geometries_io.GeometriesIO.UpdateMeshes(model_part, meshes, conversion_state, num_threads=2, pipeline_depth=1)
+
+        # nothing was retrieved with the invalid settings
+        for mesh in meshes:
+            self.assertEqual(1, mesh.mesh_interface.GetNodesAndGeometricalEntities.call_count)
+
+    def test_stop_producer_if_processing_fails(self):
+        meshes = self._CreateMeshes(20, lambda i_mesh: ({}, {}))
+        num_threads_before = threading.active_count()
+
+        meshes_data = geometries_io._RetrieveMeshesData(meshes, False, 1, pipeline_depth=1)
+        next(meshes_data)
+        meshes_data.close() # e.g. adding the mesh failed
+
+        self.assertEqual(num_threads_before, threading.active_count())
+        num_retrieved_meshes = sum([mesh.mesh_interface.GetNodesAndGeometricalEntities.call_count for mesh in meshes])
+        self.assertLess(num_retrieved_meshes, 20)
+
+
+class TestRetrieveMeshesDataThreadPool(unittest.TestCase):
+    """This TestCase checks the retrieval of the meshes with multiple threads"""
+
+    def test_limited_number_of_meshes_in_flight(self):
+        num_meshes = 10
+        num_threads = 2
+        meshes = []
+        for i_mesh in range(num_meshes):
+            mesh_interface_mock = MagicMock(spec=MeshInterface)
+            mesh_interface_mock.GetNodesAndGeometricalEntities.return_value = ({i_mesh+1 : [0,0,0]}, {})
+            meshes.append(geometries_io.Mesh(mesh_interface_mock, {"elements" : {}, "conditions" : {}}))
+
+        def NumRetrievedMeshes():
+            return sum([mesh.mesh_interface.GetNodesAndGeometricalEntities.call_count for mesh in meshes])
+
+        meshes_data = geometries_io._RetrieveMeshesData(meshes, False, num_threads)
+
+        mesh, mesh_data = next(meshes_data)
+        self.assertIs(meshes[0], mesh)
+        time.sleep(0.2)
+        # the mesh that is processed and the ones that are retrieved ahead
+        self.assertLessEqual(NumRetrievedMeshes(), num_threads+1)
+
+        self.assertEqual(list(range(2, num_meshes+1)), [list(mesh_data[0].keys())[0] for _, mesh_data in meshes_data])
+        self.assertEqual(num_meshes, NumRetrievedMeshes())
+
+
+class TestCoincidentNodesFinder(unittest.TestCase):
+    def test_find(self):
+        main_mesh_1 = geometries_io._MainMesh(0, 0)
+        main_mesh_2 = geometries_io._MainMesh(10, 10)
+
+        coincident_nodes = geometries_io._CoincidentNodesFinder(0.1)
+        coincident_nodes.Add(1, [0.0, 0.0, 0.0], main_mesh_1)
+        coincident_nodes.Add(2, [-1.0, 0.05, 0.0], main_mesh_1)
+        coincident_nodes.Add(3, [-1.08, 0.05, 0.0], main_mesh_1)
+
+        self.assertEqual(1, coincident_nodes.Find([0.0, 0.0, 0.0], main_mesh_2))
+        self.assertEqual(1, coincident_nodes.Find([0.09, 0.0, 0.0], main_mesh_2)) # in the neighboring cell
+        self.assertEqual(3, coincident_nodes.Find([-1.07, 0.05, 0.0], main_mesh_2)) # the closest one
+        self.assertIsNone(coincident_nodes.Find([0.11, 0.0, 0.0], main_mesh_2))
+        self.assertIsNone(coincident_nodes.Find([0.0, 0.0, 0.0], main_mesh_1)) # Nodes of the same main mesh are not merged
+
+
+class TestGeometriesIOPlan(unittest.TestCase):
+    """This TestCase checks the planning of adding meshes, which must not retrieve the meshes"""
+
+    def _CreateMeshInterface(self, num_nodes, num_geometries, is_valid=True):
+        def GetNumberOfGeometries(geometry_type):
+            if geometry_type == "WeirdGeometry":
+                raise Exception('The requested entity type "WeirdGeometry" is not available!\nOnly the following entity types are available:')
+            return num_geometries.get(geometry_type, -1)
+
+        mesh_interface_mock = MagicMock(spec=MeshInterface)
+        mesh_interface_mock.CheckMeshIsValid.return_value = is_valid
+        mesh_interface_mock.DoMeshesBelongToSameMainMesh.return_value = True
+        mesh_interface_mock.GetNumberOfNodes.return_value = num_nodes
+        mesh_interface_mock.GetNumberOfGeometries.side_effect = GetNumberOfGeometries
+        return mesh_interface_mock
+
+    def test_plan(self):
+        model_part = py_model_part.ModelPart("for_test")
+        model_part.CreateSubModelPart("existing")
+
+        meshes = [
+            geometries_io.Mesh(self._CreateMeshInterface(100, {"Tetra" : 50, "Triangle" : 20}), {"elements" : {"Tetra" : {"Element3D4N" : 1}}, "conditions" : {"Triangle" : {"SurfaceCondition3D3N" : 0}}}, "domain"),
+            geometries_io.Mesh(self._CreateMeshInterface(20, {"Triangle" : 10}), {"conditions" : {"Triangle" : {"SurfaceCondition3D3N" : 0}}}, "domain.inlet"),
+            geometries_io.Mesh(self._CreateMeshInterface(15, {"Tetra" : 8}), {"elements" : {"Tetra" : {"Element3D4N" : 1, "ShellElement3D3N" : 2}}}, "other")
+        ]
+
+        plan = geometries_io.GeometriesIO.Plan(model_part, meshes)
+
+        self.assertTrue(plan.IsValid())
+        self.assertListEqual([], plan.warnings)
+        self.assertDictEqual({"existing" : {}, "domain" : {"inlet" : {}}, "other" : {}}, plan.sub_model_parts)
+        self.assertEqual(100, plan.num_nodes)
+        self.assertDictEqual({"Element3D4N" : 58, "ShellElement3D3N" : 8}, plan.num_entities["elements"])
+        self.assertDictEqual({"SurfaceCondition3D3N" : 30}, plan.num_entities["conditions"])
+        self.assertListEqual([("domain", "Element3D4N", 1, 50), ("other", "Element3D4N", 51, 58), ("other", "ShellElement3D3N", 59, 66)], plan.id_ranges["elements"])
+        self.assertListEqual([("domain", "SurfaceCondition3D3N", 1, 20), ("domain.inlet", "SurfaceCondition3D3N", 21, 30)], plan.id_ranges["conditions"])
+        self.assertListEqual([(100, 70, 50*4+20*3), (20, 10, 10*3), (15, 16, 2*8*4)], plan.mesh_sizes)
+
+        # nothing was retrieved and nothing was created
+        for mesh in meshes:
+            self.assertEqual(0, mesh.mesh_interface.GetNodesAndGeometricalEntities.call_count)
+        self.assertNotIn("elements", meshes[1].mesh_description) # no defaults are added
+        self.assertEqual(1, model_part.NumberOfSubModelParts())
+
+        self.assertIn('    Element3D4N in "other": Ids 51 - 58\n', str(plan))
+
+    def test_plan_errors(self):
+        model_part = py_model_part.ModelPart("for_test")
+        model_part.CreateNewNode(1, 0.0, 0.0, 0.0)
+
+        meshes = [
+            geometries_io.Mesh(self._CreateMeshInterface(10, {"Tetra" : 5}), {"element" : {"Tetra" : {"Element3D4N" : 1}}}),
+            geometries_io.Mesh(self._CreateMeshInterface(10, {"Tetra" : 5}), {"elements" : {"Hexa" : {"Element3D8N" : 1}, "WeirdGeometry" : {"Element3D8N" : 1}}}, "a..b"),
+            geometries_io.Mesh(self._CreateMeshInterface(10, {"Tetra" : 5}), {"elements" : {"Tetra" : {"Element3D4N" : 2, "Element3D4N_2" : "1"}}}),
+            geometries_io.Mesh(self._CreateMeshInterface(10, {}, is_valid=False), {"elements" : {"Tetra" : {"Element3D4N" : 1}}})
+        ]
+
+        plan = geometries_io.GeometriesIO.Plan(model_part, meshes)
+
+        self.assertFalse(plan.IsValid())
+        self.assertListEqual([
+            'The Root-ModelPart "for_test" is not empty!',
+            'Mesh #4 is not valid!',
+            'Mesh #1: unknown key "element" in the mesh description, only "elements" and "conditions" are allowed',
+            'Mesh #2: invalid ModelPart name "a..b"',
+            'Mesh #2: there are no geometries of type "Hexa" to create elements from',
+            'Mesh #2: The requested entity type "WeirdGeometry" is not available!',
+            'Mesh #3: the Properties-Id of "Element3D4N_2" must be a non-negative integer, got "1"'
+        ], plan.errors)
+
+        self.assertListEqual([], plan.warnings) # the first mesh has no (valid) elements
+
+        meshes[0].mesh_description = {"elements" : {"Tetra" : {"Element3D4N" : 1}}}
+        plan = geometries_io.GeometriesIO.Plan(model_part, meshes)
+        self.assertListEqual(['"Element3D4N" is created from geometries of type "Tetra" with different Properties-Ids (1 in meshes #1, 2 in meshes #3), this fails if the meshes share geometries'], plan.warnings)
+
+    def test_plan_multiple_main_meshes(self):
+        mesh_interface_mock = self._CreateMeshInterface(10, {"Tetra" : 5})
+        mesh_interface_mock.DoMeshesBelongToSameMainMesh.return_value = False
+        meshes = [geometries_io.Mesh(mesh_interface_mock, {"elements" : {"Tetra" : {"Element3D4N" : 1}}})]
+
+        plan = geometries_io.GeometriesIO.Plan(py_model_part.ModelPart("for_test"), meshes)
+        self.assertListEqual(['The meshes to be added to ModelPart "for_test" don\'t belong to the same main mesh!'], plan.errors)
+
+        plan = geometries_io.GeometriesIO.Plan(py_model_part.ModelPart("for_test"), meshes, allow_multiple_main_meshes=True)
+        self.assertTrue(plan.IsValid())
+
+    def test_plan_empty_input(self):
+        plan = geometries_io.GeometriesIO.Plan(py_model_part.ModelPart("for_test"), [])
+        self.assertTrue(plan.IsValid())
+        self.assertListEqual(['Empty input, no meshes would be added to ModelPart "for_test"'], plan.warnings)
+
+
 class TestGeometriesIOWithSalome(SalomeTestCaseWithBox):
     # Note: the number of nodes & geometries are hardcoded and could theoretically change with different versions of salome
     def test_create_line_elements(self):
@@ -1294,7 +2067,7 @@ class TestGeometriesIOWithSalome(SalomeTestCaseWithBox):
         self.assertEqual(10, mp.NumberOfConditions())
 
     def test_add_from_different_meshes(self):
-        # adding meshes from different main-meshes is not possible!
+        # adding meshes from different main-meshes is only possible if explicitly allowed
         model_part = py_model_part.ModelPart()
 
         existing_mesh_identifier = salome_utilities.GetSalomeID(self.sub_mesh_tetra_e_1)
@@ -1313,6 +2086,11 @@ class TestGeometriesIOWithSalome(SalomeTestCaseWithBox):
         with self.assertRaisesRegex(Exception, 'The meshes to be added to ModelPart "default" don\'t belong to the same main mesh!\nThis is necessary to ensure a consistent numbering.'):
             geometries_io.GeometriesIO.AddMeshes(model_part, meshes)
 
+        conversion_state = geometries_io.GeometriesIO.AddMeshes(model_part, meshes, allow_multiple_main_meshes=True)
+        self.assertEqual(2, len(conversion_state.main_meshes))
+        # the Ids of the Nodes of the second main mesh are shifted, hence no Nodes are shared
+        self.assertEqual(mesh_interface_tetra.GetNumberOfNodes()+mesh_interface_hexa.GetNumberOfNodes(), model_part.NumberOfNodes())
+
 
 if __name__ == '__main__':
     unittest.main()
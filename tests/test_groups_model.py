@@ -0,0 +1,243 @@
+#  _  __         _          ___       _               ___ _           _
+# | |/ /_ _ __ _| |_ ___ __/ __| __ _| |___ _ __  ___| _ \ |_  _ __ _(_)_ _
+# | ' <| '_/ _` |  _/ _ (_-<__ \/ _` | / _ \ '  \/ -_)  _/ | || / _` | | ' \
+# |_|\_\_| \__,_|\__\___/__/___/\__,_|_\___/_|_|_\___|_| |_|\_,_\__, |_|_||_|
+#                                                               |___/
+# License: BSD License ; see LICENSE
+#
+# Main authors: Philipp Bucher (https://github.com/philbucher)
+#
+
+# set up testing environment (before anything else)
+import initialize_testing_environment
+
+# python imports
+import time
+import threading
+from sys import executable
+from subprocess import Popen, PIPE
+from pathlib import Path
+import unittest
+from unittest.mock import patch
+
+# plugin imports
+from kratos_salome_plugin import IsExecutedInSalome
+from kratos_salome_plugin.gui.group import Group
+
+# tests imports
+from testing_utilities import QtTestCase
+
+# qt imports
+from PyQt5.QtCore import Qt, QModelIndex, QCoreApplication, QObject
+try:
+    from PyQt5 import sip
+except ImportError: # before PyQt5 5.11
+    import sip
+
+
+class TestGroupsModel(QtTestCase):
+    def setUp(self):
+        # imported here since the model is a Qt class
+        from kratos_salome_plugin.gui.groups_model import GroupsModel
+        self.model = GroupsModel()
+
+    def test_AddGroup(self):
+        group_1 = Group("group_1", "0:1:2:3", "Triangle")
+        group_2 = Group("group_2", "0:1:2:4", "Node")
+        group_3 = Group("group_3", "0:1:2:3", "Node")
+
+        generation = self.model.GetGeneration()
+        for group in [group_1, group_2, group_3]:
+            self.model.AddGroup(group)
+        self.assertEqual(self.model.GetGeneration(), generation+3)
+
+        self.assertEqual(self.model.rowCount(), 3)
+        self.assertEqual(self.model.GetNumberOfGroups(), 3)
+        self.assertIs(self.model.GetGroup(1), group_2)
+        self.assertListEqual(self.model.GetGroupsOfMesh("0:1:2:3"), [group_1, group_3])
+        self.assertListEqual(self.model.GetGroupsOfMesh("0:1:2:5"), [])
+
+        self.model.RemoveGroup(group_1)
+        self.assertEqual(self.model.rowCount(), 2)
+        self.assertListEqual(self.model.GetGroups(), [group_2, group_3])
+        self.assertListEqual(self.model.GetGroupsOfMesh("0:1:2:3"), [group_3])
+        self.assertEqual(self.model.data(self.model.index(1), Qt.ToolTipRole), "0:1:2:3")
+
+        self.model.RemoveGroup(group_3)
+        self.assertListEqual(self.model.GetGroupsOfMesh("0:1:2:3"), [])
+
+    def test_fetchMore(self):
+        self.model.fetch_batch_size = 4
+        self.model.Deserialize({"groups" : [["group_{}".format(i), "0:1:2:{}".format(i), "Node"] for i in range(10)]})
+
+        self.assertEqual(self.model.rowCount(), 4)
+        self.assertEqual(self.model.GetNumberOfGroups(), 10)
+
+        # groups that are added are not shown before the previous ones
+        self.model.AddGroup(Group("group_10", "0:1:2:10", "Node"))
+        self.assertEqual(self.model.rowCount(), 4)
+
+        num_rows = []
+        while self.model.canFetchMore(QModelIndex()):
+            self.model.fetchMore(QModelIndex())
+            num_rows.append(self.model.rowCount())
+        self.assertListEqual(num_rows, [8, 11])
+
+        self.model.AddGroup(Group("group_11", "0:1:2:11", "Node"))
+        self.assertEqual(self.model.rowCount(), 12)
+
+    def test_Serialize(self):
+        num_groups = 10000
+        serialized_groups = {"groups" : [["group_{}".format(i), "0:1:2:{}".format(i%100), "Triangle"] for i in range(num_groups)]}
+
+        self.model.Deserialize(serialized_groups)
+
+        self.assertEqual(self.model.GetNumberOfGroups(), num_groups)
+        self.assertEqual(self.model.rowCount(), self.model.fetch_batch_size)
+        self.assertEqual(len(self.model.GetGroupsOfMesh("0:1:2:5")), num_groups//100)
+        self.assertDictEqual(self.model.Serialize(), serialized_groups)
+
+    def test_GetChanges(self):
+        group_1 = Group("group_1", "0:1:2:3", "Triangle")
+        group_2 = Group("group_2", "0:1:2:4", "Node")
+
+        generation = self.model.GetGeneration()
+        self.model.AddGroup(group_1)
+        self.model.AddGroup(group_2)
+        self.model.RemoveGroup(group_1)
+
+        self.assertListEqual(self.model.GetChanges(generation), [
+            ("add", ["group_1", "0:1:2:3", "Triangle"]),
+            ("add", ["group_2", "0:1:2:4", "Node"]),
+            ("remove", ["group_1", "0:1:2:3", "Triangle"])
+        ])
+        self.assertListEqual(self.model.GetChanges(generation+2), [("remove", ["group_1", "0:1:2:3", "Triangle"])])
+        self.assertListEqual(self.model.GetChanges(generation+3), [])
+
+        # the changes up to the given generation are forgotten
+        self.assertIsNone(self.model.GetChanges(generation))
+
+        # modifications that are not recorded
+        self.model._IncreaseGeneration()
+        self.assertIsNone(self.model.GetChanges(generation+3))
+
+    def test_GetChanges_too_many(self):
+        from kratos_salome_plugin.gui.groups_model import GroupsModel
+        with patch.object(GroupsModel, 'max_recorded_changes', 5):
+            model = GroupsModel()
+
+        generation = model.GetGeneration()
+        for i in range(6):
+            model.AddGroup(Group("group_{}".format(i), "0:1:2:3", "Node"))
+
+        self.assertIsNone(model.GetChanges(generation)) # the first change is forgotten
+        self.assertEqual(len(model.GetChanges(generation+1)), 5)
+
+    def test_Deserialize_empty(self):
+        self.model.Deserialize({}) # projects that were saved before groups were implemented
+        self.assertEqual(self.model.GetNumberOfGroups(), 0)
+
+    def test_Deserialize_is_modification(self):
+        generation = self.model.GetGeneration()
+        self.model.Deserialize({"groups" : [["group_1", "0:1:2:3", "Node"]]})
+        self.assertEqual(self.model.GetGeneration(), generation) # e.g. opening a project
+
+        self.model.Deserialize({"groups" : [["group_1", "0:1:2:3", "Node"]]}, is_modification=True)
+        self.assertEqual(self.model.GetGeneration(), generation+1) # e.g. restoring unsaved groups
+        self.assertIsNone(self.model.GetChanges(generation)) # the modification is not recorded as single changes
+
+    @patch('kratos_salome_plugin.salome_mesh_utilities.EntityTypeToString', side_effect=lambda entity_type: entity_type)
+    @patch('kratos_salome_plugin.mesh_interface.MeshInterface')
+    def test_entity_counts(self, mock_mesh_interface, mock_entity_type_to_string):
+        mesh_interface = mock_mesh_interface.return_value
+        mesh_interface.GetMeshInformation.return_value = {"Triangle" : 12}
+        mesh_interface.GetNumberOfNodes.return_value = 8
+
+        self.model.AddGroup(Group("group_1", "0:1:2:3", "Triangle"))
+        self.model.AddGroup(Group("group_2", "0:1:2:3", "Node"))
+        self.model.AddGroup(Group("group_3", "0:1:2:3", "Quadrangle"))
+
+        self.assertEqual(self.model.data(self.model.index(0)), "group_1 (Triangle: ...)")
+        self.assertEqual(self.model.data(self.model.index(1)), "group_2 (Node: ...)")
+        _WaitForEntityCounts(self.model, self.model.GetGroup(0))
+
+        self.assertEqual(self.model.data(self.model.index(0)), "group_1 (Triangle: 12)")
+        self.assertEqual(self.model.data(self.model.index(1)), "group_2 (Node: 8)")
+        self.assertEqual(self.model.data(self.model.index(2)), "group_3 (Quadrangle: 0)")
+        self.assertEqual(mock_mesh_interface.call_count, 1) # counted once for all groups of the mesh
+
+        # the mesh was modified
+        mesh_interface.GetMeshInformation.return_value = {"Triangle" : 20}
+        self.model.RefreshEntityCounts("0:1:2:3")
+        _WaitForEntityCounts(self.model, self.model.GetGroup(0))
+        self.assertEqual(self.model.data(self.model.index(0)), "group_1 (Triangle: 20)")
+        self.assertEqual(mesh_interface.GetMeshInformation.call_count, 2)
+
+    @patch('kratos_salome_plugin.salome_mesh_utilities.EntityTypeToString', side_effect=lambda entity_type: entity_type)
+    @patch('kratos_salome_plugin.mesh_interface.MeshInterface')
+    def test_entity_counts_shared_thread(self, mock_mesh_interface, mock_entity_type_to_string):
+        from kratos_salome_plugin.gui.groups_model import GroupsModel, _GetExecutor
+        mock_mesh_interface.return_value.GetMeshInformation.return_value = {}
+        mock_mesh_interface.return_value.GetNumberOfNodes.return_value = 8
+
+        executor = _GetExecutor()
+        for _ in range(3): # e.g. creating new projects
+            model = GroupsModel()
+            model.AddGroup(Group("group_1", "0:1:2:3", "Node"))
+            model.GetEntityCount(model.GetGroup(0))
+            _WaitForEntityCounts(model, model.GetGroup(0))
+
+        self.assertIs(executor, _GetExecutor())
+        self.assertEqual(len(executor._threads), 1)
+
+    @patch('kratos_salome_plugin.salome_mesh_utilities.EntityTypeToString', side_effect=lambda entity_type: entity_type)
+    @patch('kratos_salome_plugin.mesh_interface.MeshInterface')
+    def test_entity_counts_deleted_model(self, mock_mesh_interface, mock_entity_type_to_string):
+        from kratos_salome_plugin.gui.groups_model import GroupsModel, _GetExecutor
+        counting_started = threading.Event()
+        continue_counting = threading.Event()
+        def GetNumberOfNodes():
+            counting_started.set()
+            continue_counting.wait(5)
+            return 8
+        mock_mesh_interface.return_value.GetMeshInformation.return_value = {}
+        mock_mesh_interface.return_value.GetNumberOfNodes.side_effect = GetNumberOfNodes
+
+        parent = QObject()
+        model = GroupsModel(parent)
+        model.AddGroup(Group("group_1", "0:1:2:3", "Node"))
+        self.assertIsNone(model.GetEntityCount(model.GetGroup(0)))
+        self.assertTrue(counting_started.wait(5))
+
+        sip.delete(parent) # deletes the model too, while the entities are counted
+        self.assertTrue(sip.isdeleted(model))
+
+        with self.assertNoLogs('concurrent.futures', level='ERROR'): # errors in the callback are logged here
+            continue_counting.set()
+            _GetExecutor().submit(lambda: None).result() # wait until the counting is done
+            QCoreApplication.processEvents()
+
+
+class TestGroupsModelImport(unittest.TestCase):
+    @unittest.skipIf(IsExecutedInSalome(), "The plugin imports Salome itself when executed in Salome")
+    def test_import_does_not_require_salome(self):
+        """the MeshInterface (which requires Salome) is only imported when the entities are counted"""
+        check_imports  = 'import sys; import kratos_salome_plugin.gui.groups_model; '
+        check_imports += 'sys.exit("kratos_salome_plugin.mesh_interface" in sys.modules)'
+        proc = Popen([executable, "-c", check_imports], stdout=PIPE, stderr=PIPE, cwd=str(Path(__file__).parent.parent))
+        stdout, stderr = proc.communicate()
+
+        self.assertEqual(proc.returncode, 0, msg=stderr.decode())
+
+
+def _WaitForEntityCounts(model, group):
+    for _ in range(500):
+        QCoreApplication.processEvents()
+        if model.GetEntityCount(group) is not None:
+            return
+        time.sleep(0.01)
+    raise Exception("Timeout while waiting for the number of entities")
+
+
+if __name__ == '__main__':
+    unittest.main()
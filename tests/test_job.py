@@ -0,0 +1,185 @@
+#  _  __         _          ___       _               ___ _           _
+# | |/ /_ _ __ _| |_ ___ __/ __| __ _| |___ _ __  ___| _ \ |_  _ __ _(_)_ _
+# | ' <| '_/ _` |  _/ _ (_-<__ \/ _` | / _ \ '  \/ -_)  _/ | || / _` | | ' \
+# |_|\_\_| \__,_|\__\___/__/___/\__,_|_\___/_|_|_\___|_| |_|\_,_\__, |_|_||_|
+#                                                               |___/
+# License: BSD License ; see LICENSE
+#
+# Main authors: Philipp Bucher (https://github.com/philbucher)
+#
+
+# set up testing environment (before anything else)
+import initialize_testing_environment
+
+# python imports
+from pathlib import Path
+import unittest
+
+# plugin imports
+from kratos_salome_plugin.job import Job, CopyFile
+from kratos_salome_plugin.exceptions import JobCancelledError
+
+# tests imports
+from testing_utilities import DeleteFileIfExisting
+
+
+class TestJob(unittest.TestCase):
+    def test_steps(self):
+        job = Job("my_job")
+        executed_steps = []
+        progress = []
+
+        def Step1(job):
+            executed_steps.append("step_1")
+            job.ReportProgress(0.5)
+            progress.append(job.GetProgress())
+            return 1
+
+        def Step2(job):
+            executed_steps.append("step_2")
+            progress.append(job.GetProgress())
+            return 2
+
+        job.AddStep(Step1, "first step")
+        job.AddStep(Step2, "second step", weight=3.0)
+
+        self.assertEqual(job.Run(), 2) # result of the last step
+        self.assertListEqual(executed_steps, ["step_1", "step_2"])
+
+        self.assertAlmostEqual(progress[0][0], 0.125)
+        self.assertEqual(progress[0][1], "first step")
+        self.assertAlmostEqual(progress[1][0], 0.25)
+        self.assertEqual(progress[1][1], "second step")
+
+        self.assertAlmostEqual(job.GetProgress()[0], 1.0)
+
+    def test_execute_step(self):
+        job = Job("my_job")
+        job.AddStep(lambda job: 5, "step", run_in_background=False)
+
+        executed_steps = []
+        def ExecuteStep(step, job):
+            executed_steps.append((step.description, step.run_in_background))
+            return 2*step.fct_ptr(job)
+
+        self.assertEqual(job.Run(ExecuteStep), 10)
+        self.assertListEqual(executed_steps, [("step", False)])
+
+    def test_cancel(self):
+        job = Job("my_job")
+        executed_steps = []
+        cleanups = []
+
+        def Step1(job):
+            executed_steps.append("step_1")
+            job.AddCleanup(lambda: cleanups.append("step_1"))
+            self.assertTrue(job.Cancel())
+            job.CheckCancelled()
+            executed_steps.append("step_1_end")
+
+        job.AddCleanup(lambda: cleanups.append("job"))
+        job.AddStep(Step1, "first step")
+        job.AddStep(lambda job: executed_steps.append("step_2"), "second step")
+
+        with self.assertRaisesRegex(JobCancelledError, 'Job "my_job" was cancelled'):
+            job.Run()
+
+        self.assertTrue(job.IsCancelled())
+        self.assertListEqual(executed_steps, ["step_1"])
+        self.assertListEqual(cleanups, ["step_1", "job"]) # reverse order
+
+    def test_cancel_before_step(self):
+        job = Job("my_job")
+        executed_steps = []
+
+        def Step1(job):
+            executed_steps.append("step_1")
+            job.Cancel()
+
+        job.AddStep(Step1, "first step")
+        job.AddStep(lambda job: executed_steps.append("step_2"), "second step", cancellable=False)
+
+        # a pending request is respected before the first step that cannot be cancelled
+        with self.assertRaises(JobCancelledError):
+            job.Run()
+
+        self.assertListEqual(executed_steps, ["step_1"])
+
+    def test_not_cancellable(self):
+        job = Job("my_job")
+        executed_steps = []
+
+        def Step1(job):
+            self.assertFalse(job.IsCancellable())
+            self.assertFalse(job.Cancel())
+            job.CheckCancelled() # does not raise
+            executed_steps.append("step_1")
+
+        job.AddStep(Step1, "first step", cancellable=False)
+        job.AddStep(lambda job: executed_steps.append("step_2"), "second step")
+
+        job.Run()
+
+        self.assertFalse(job.IsCancelled())
+        self.assertListEqual(executed_steps, ["step_1", "step_2"])
+
+    def test_exception(self):
+        job = Job("my_job")
+        cleanups = []
+
+        def Step1(job):
+            raise Exception("step failed")
+
+        def FailingCleanup():
+            raise Exception("cleanup failed")
+
+        job.AddCleanup(lambda: cleanups.append("job"))
+        job.AddCleanup(FailingCleanup)
+        job.AddStep(Step1, "first step", cancellable=False)
+
+        with self.assertLogs('kratos_salome_plugin.job', level='ERROR') as cm:
+            with self.assertRaisesRegex(Exception, "step failed"):
+                job.Run()
+            self.assertEqual(len(cm.output), 1)
+            self.assertEqual(cm.output[0], 'ERROR:kratos_salome_plugin.job:Exception in cleanup of job "my_job": "cleanup failed"')
+
+        self.assertListEqual(cleanups, ["job"]) # failing cleanups don't prevent the others from being called
+
+
+class TestCopyFile(unittest.TestCase):
+    def setUp(self):
+        self.source_path = Path("copy_file_source.txt")
+        self.target_path = Path("copy_file_target.txt")
+        self.addCleanup(lambda: DeleteFileIfExisting(self.source_path))
+        self.addCleanup(lambda: DeleteFileIfExisting(self.target_path))
+
+        with open(str(self.source_path), 'w') as source_file:
+            source_file.write("0123456789"*100)
+
+    def test_copy(self):
+        progress = []
+        def CopyStep(job):
+            CopyFile(self.source_path, self.target_path, job, chunk_size=300)
+            progress.append(job.GetProgress()[0])
+
+        job = Job("copy")
+        job.AddStep(CopyStep, "copying")
+        job.Run()
+
+        self.assertAlmostEqual(progress[0], 1.0)
+        with open(str(self.target_path)) as target_file:
+            self.assertEqual(target_file.read(), "0123456789"*100)
+
+    def test_copy_without_job(self):
+        CopyFile(self.source_path, self.target_path)
+        self.assertEqual(self.source_path.stat().st_size, self.target_path.stat().st_size)
+
+    def test_copy_cancelled(self):
+        job = Job("copy")
+        job.Cancel()
+        with self.assertRaises(JobCancelledError):
+            CopyFile(self.source_path, self.target_path, job, chunk_size=300)
+
+
+if __name__ == '__main__':
+    unittest.main()
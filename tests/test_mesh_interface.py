@@ -16,11 +16,16 @@ import unittest
 
 # plugin imports
 from kratos_salome_plugin.mesh_interface import MeshInterface
+from kratos_salome_plugin import mesh_interface
 from kratos_salome_plugin import salome_utilities
 
 # tests imports
 import testing_utilities
 
+numpy_available = testing_utilities.CheckIfNumpyAvailable()
+if numpy_available:
+    import numpy as np
+
 # salome imports
 import SMESH
 
@@ -30,6 +35,21 @@ class TestMeshInterfaceObservers(unittest.TestCase):
         self.skipTest("This test is not yet implemented")
 
 
+class TestFingerprintSampleNodeIds(unittest.TestCase):
+    def test_number_of_sampled_nodes(self):
+        num_sample_nodes = mesh_interface._NUM_FINGERPRINT_SAMPLE_NODES
+        for num_nodes in [0, 1, num_sample_nodes, num_sample_nodes+1, 2*num_sample_nodes-1, 2*num_sample_nodes, 10*num_sample_nodes+3]:
+            with self.subTest(num_nodes=num_nodes):
+                node_ids = list(range(num_nodes, 0, -1))
+                sample_node_ids = mesh_interface._GetFingerprintSampleNodeIds(node_ids)
+                self.assertEqual(sorted(sample_node_ids), sample_node_ids)
+                if num_nodes <= num_sample_nodes:
+                    self.assertEqual(sorted(node_ids), sample_node_ids)
+                else:
+                    self.assertLessEqual(len(sample_node_ids), num_sample_nodes)
+                    self.assertGreater(len(sample_node_ids), num_sample_nodes//2) # evenly spaced over all Nodes
+
+
 # The expected definitions are here to make the handling of the
 # multiline-stings easier (no need to deal with indentation)
 mesh_interface_str = '''MeshInterface
@@ -294,6 +314,144 @@ class TestMeshInterfaceMeshRelatedMethods(testing_utilities.SalomeTestCaseWithBo
         self.__Execute_GetGeomEntities_Test(self.mesh_interface_hexa_mesh_group_edges, entity_types, 92)
 
 
+    @unittest.skipUnless(numpy_available, "numpy not available")
+    def test_GetNodesArray_NonExistingMesh(self):
+        ids, coords = self.mesh_interface_non_exist_mesh.GetNodesArray()
+        self.assertEqual((0,), ids.shape)
+        self.assertEqual((0,3), coords.shape)
+
+    @unittest.skipUnless(numpy_available, "numpy not available")
+    def test_GetNodesArray(self):
+        mesh_interfaces = [
+            self.mesh_interface_main_mesh_tetra,
+            self.mesh_interface_sub_mesh_tetra_face,
+            self.mesh_interface_sub_mesh_group_hexa_edge,
+            self.mesh_interface_tetra_mesh_group_f1_nodes
+        ]
+
+        for mesh_interface in mesh_interfaces:
+            nodes = mesh_interface.GetNodes()
+            ids, coords = mesh_interface.GetNodesArray()
+
+            self.assertEqual("int64", ids.dtype.name)
+            self.assertEqual("float64", coords.dtype.name)
+            self.assertEqual((len(nodes), 3), coords.shape)
+            self.assertListEqual(list(nodes.keys()), ids.tolist()) # both are sorted
+            for node_coords, node_coords_array in zip(nodes.values(), coords.tolist()):
+                self.assertListEqual(list(node_coords), node_coords_array)
+
+    @unittest.skipUnless(numpy_available, "numpy not available")
+    def test_GetEntitiesArrays_NonExistingMesh(self):
+        self.assertEqual({}, self.mesh_interface_non_exist_mesh.GetEntitiesArrays(["Tetra"]))
+
+    @unittest.skipUnless(numpy_available, "numpy not available")
+    def test_GetEntitiesArrays(self):
+        entity_types = ["Quadrangle", "Triangle", "Edge", "Tetra", "0D", "Node"]
+        _, geom_entities = self.mesh_interface_main_mesh_tetra.GetNodesAndGeometricalEntities(entity_types)
+        geom_entities_arrays = self.mesh_interface_main_mesh_tetra.GetEntitiesArrays(entity_types)
+
+        self.assertEqual(len(geom_entities), len(geom_entities_arrays))
+        self.assertNotIn("Node", geom_entities_arrays)
+
+        for entity_type, entities in geom_entities.items():
+            ids, connectivities = geom_entities_arrays[entity_type]
+            self.assertEqual("int64", ids.dtype.name)
+            self.assertEqual("int64", connectivities.dtype.name)
+            self.assertEqual(len(entities), ids.size)
+            self.assertEqual(len(entities), connectivities.shape[0])
+            self.assertListEqual(list(entities.keys()), ids.tolist()) # both are sorted
+            for entity_conn, entity_conn_array in zip(entities.values(), connectivities.tolist()):
+                self.assertListEqual(list(entity_conn), entity_conn_array)
+
+    @unittest.skipUnless(numpy_available, "numpy not available")
+    def test_GetNodesChunks(self):
+        self.assertEqual([], list(self.mesh_interface_non_exist_mesh.GetNodesChunks(100)))
+
+        for mesh_interface in [self.mesh_interface_main_mesh_hexa, self.mesh_interface_sub_mesh_tetra_face, self.mesh_interface_hexa_mesh_group_edges]:
+            ids, coords = mesh_interface.GetNodesArray()
+            chunks = list(mesh_interface.GetNodesChunks(20))
+            self.assertTrue(all(chunk[0].size <= 20 for chunk in chunks))
+            self.assertEqual(ids.tolist(), np.concatenate([chunk[0] for chunk in chunks]).tolist())
+            self.assertEqual(coords.tolist(), np.concatenate([chunk[1] for chunk in chunks]).tolist())
+
+    @unittest.skipUnless(numpy_available, "numpy not available")
+    def test_GetEntitiesChunks(self):
+        mesh_interfaces_and_types = [
+            (self.mesh_interface_main_mesh_tetra, "Tetra"),
+            (self.mesh_interface_main_mesh_hexa, "Quadrangle"),
+            (self.mesh_interface_sub_mesh_tetra_face, "Triangle"),
+            (self.mesh_interface_hexa_mesh_group_edges, "Edge")
+        ]
+
+        for mesh_interface, entity_type in mesh_interfaces_and_types:
+            ids, connectivities = mesh_interface.GetEntitiesArrays([entity_type])[entity_type]
+            chunks = list(mesh_interface.GetEntitiesChunks(entity_type, 50))
+            self.assertTrue(all(chunk[0].size <= 50 for chunk in chunks))
+            self.assertEqual(ids.tolist(), np.concatenate([chunk[0] for chunk in chunks]).tolist())
+            self.assertEqual(connectivities.tolist(), np.concatenate([chunk[1] for chunk in chunks]).tolist())
+
+        self.assertEqual([], list(self.mesh_interface_main_mesh_tetra.GetEntitiesChunks("Hexa", 50)))
+
+    def test_GetNumberOfNodes(self):
+        self.assertEqual(0, self.mesh_interface_non_exist_mesh.GetNumberOfNodes())
+
+        mesh_interfaces = [
+            self.mesh_interface_main_mesh_tetra,
+            self.mesh_interface_main_mesh_hexa,
+            self.mesh_interface_sub_mesh_tetra_edge,
+            self.mesh_interface_sub_mesh_tetra_face,
+            self.mesh_interface_sub_mesh_group_hexa_edge,
+            self.mesh_interface_tetra_0D_elements,
+            self.mesh_interface_tetra_mesh_group_f1_nodes,
+            self.mesh_interface_hexa_mesh_group_edges
+        ]
+
+        for mesh_interface in mesh_interfaces:
+            self.assertEqual(len(mesh_interface.GetNodes()), mesh_interface.GetNumberOfNodes())
+
+    def test_GetNumberOfGeometries(self):
+        self.assertEqual(-1, self.mesh_interface_non_exist_mesh.GetNumberOfGeometries("Tetra"))
+
+        self.assertEqual(1355, self.mesh_interface_main_mesh_tetra.GetNumberOfGeometries("Tetra"))
+        self.assertEqual(480, self.mesh_interface_main_mesh_tetra.GetNumberOfGeometries("Triangle"))
+        self.assertEqual(-1, self.mesh_interface_main_mesh_tetra.GetNumberOfGeometries("Hexa")) # not in the mesh
+        self.assertEqual(512, self.mesh_interface_main_mesh_hexa.GetNumberOfGeometries("Hexa"))
+        self.assertEqual(80, self.mesh_interface_sub_mesh_tetra_face.GetNumberOfGeometries("Triangle"))
+        self.assertEqual(4, self.mesh_interface_sub_mesh_tetra_edge.GetNumberOfGeometries("Edge"))
+        self.assertEqual(6, self.mesh_interface_hexa_ball_elements.GetNumberOfGeometries("Ball"))
+        self.assertEqual(96, self.mesh_interface_hexa_mesh_group_edges.GetNumberOfGeometries("Edge"))
+
+        with self.assertRaisesRegex(Exception, 'The requested entity type "WeirdGeometry" is not available!'):
+            self.mesh_interface_main_mesh_tetra.GetNumberOfGeometries("WeirdGeometry")
+
+    def test_GetFingerprint(self):
+        self.assertEqual("", self.mesh_interface_non_exist_mesh.GetFingerprint())
+
+        mesh_interfaces = [
+            self.mesh_interface_main_mesh_tetra,
+            self.mesh_interface_main_mesh_hexa,
+            self.mesh_interface_sub_mesh_tetra_face,
+            self.mesh_interface_tetra_mesh_group_f1_nodes
+        ]
+
+        fingerprints = [mesh_interface.GetFingerprint() for mesh_interface in mesh_interfaces]
+        self.assertEqual(len(fingerprints), len(set(fingerprints))) # different meshes have different fingerprints
+        self.assertListEqual(fingerprints, [mesh_interface.GetFingerprint() for mesh_interface in mesh_interfaces]) # unchanged meshes keep the fingerprint
+
+    def test_GetFingerprint_moved_node(self):
+        # moving a Node changes the fingerprint, also if the bounding box does not change
+        mesh_interface = MeshInterface(salome_utilities.GetSalomeID(self.mesh_hexa.GetMesh()))
+        fingerprint = mesh_interface.GetFingerprint()
+
+        # the Node is moved to the center of the box, hence the bounding box stays the same
+        node_id = self.mesh_hexa.GetNodesId()[0]
+        coords = self.mesh_hexa.GetNodeXYZ(node_id)
+        bounding_box = self.mesh_hexa.BoundingBox()
+        self.assertTrue(self.mesh_hexa.MoveNode(node_id, (bounding_box.minX+bounding_box.maxX)/2, (bounding_box.minY+bounding_box.maxY)/2, (bounding_box.minZ+bounding_box.maxZ)/2))
+        self.addCleanup(lambda: self.mesh_hexa.MoveNode(node_id, *coords))
+
+        self.assertNotEqual(fingerprint, mesh_interface.GetFingerprint())
+
     def test_GetMeshName(self):
         self.assertEqual(self.name_main_mesh_tetra, self.mesh_interface_main_mesh_tetra.GetMeshName())
         self.assertEqual("", self.mesh_interface_non_exist_mesh.GetMeshName())
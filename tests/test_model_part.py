@@ -131,6 +131,8 @@ class TestModelPart:
                 self.assertEqual(1, node.Id)
 
             self.assertEqual(self.model_part.NumberOfNodes(), 1)
+            self.assertTrue(self.model_part.HasNode(1))
+            self.assertFalse(self.model_part.HasNode(2))
 
             #trying to create a node with Id 1 and coordinates which are different from the ones of the existing node 1. Error
             with self.assertRaisesRegex(RuntimeError, "already exists in the root model part"):
@@ -635,6 +637,44 @@ class TestModelPart:
             self.assertEqual(prop_counter, 0)
             self.assertEqual(smp_counter, 0)
 
+        def test_remove_entities(self):
+            smp = self.model_part.CreateSubModelPart("sub")
+            sub_smp = smp.CreateSubModelPart("sub_sub")
+            props = self.model_part.CreateNewProperties(0)
+
+            for i in range(1, 5):
+                sub_smp.CreateNewNode(i, 0.0, float(i), 0.0)
+            sub_smp.CreateNewElement("Element2D2N", 1, [1, 2], props)
+            sub_smp.CreateNewElement("Element2D2N", 2, [3, 4], props)
+            sub_smp.CreateNewCondition("LineCondition2D2N", 1, [1, 2], props)
+
+            # removing from a SubModelPart removes also from its SubModelParts, but not from the parents
+            smp.RemoveElement(1)
+            self.assertEqual(self.model_part.NumberOfElements(), 2)
+            self.assertEqual(smp.NumberOfElements(), 1)
+            self.assertEqual(sub_smp.NumberOfElements(), 1)
+
+            self.model_part.RemoveNode(4)
+            self.assertEqual(self.model_part.NumberOfNodes(), 3)
+            self.assertEqual(smp.NumberOfNodes(), 3)
+            self.assertEqual(sub_smp.NumberOfNodes(), 3)
+
+            self.model_part.RemoveCondition(1)
+            self.assertEqual(self.model_part.NumberOfConditions(), 0)
+            self.assertEqual(sub_smp.NumberOfConditions(), 0)
+
+            self.model_part.RemoveElement(1) # removing only from the root
+            self.assertEqual(self.model_part.NumberOfElements(), 1)
+            self.assertEqual(self.model_part.GetElement(2).Id, 2)
+
+            # removing again does nothing
+            smp.RemoveElement(1)
+            self.assertEqual(self.model_part.NumberOfElements(), 1)
+
+            smp.RemoveSubModelPart("sub_sub")
+            self.assertFalse(smp.HasSubModelPart("sub_sub"))
+            self.assertEqual(self.model_part.NumberOfNodes(), 3)
+
 
 @unittest.skipUnless(kratos_available, "Kratos not available")
 class TestKratosModelPart(TestModelPart.BaseTests):
@@ -650,6 +690,31 @@ class TestPyKratosModelPart(TestModelPart.BaseTests):
         with self.assertRaisesRegex(Exception, "Properties index not found: 212"):
             self.model_part.GetProperties(212) # Kratos also needs the Mesh-Index, this segfaults in Kratos as there is no Mesh with Id 212
 
+    def test_create_new_entities_in_bulk(self):
+        # not available in Kratos
+        sub1 = self.model_part.CreateSubModelPart("sub1")
+        subsub1 = sub1.CreateSubModelPart("subsub1")
+        for i in range(5):
+            self.model_part.CreateNewNode(i+1, float(i), 0.0, 0.0)
+        props = self.model_part.CreateNewProperties(1)
+
+        for fct_create_new_entities, fct_get_entities in [
+                (subsub1.CreateNewElements, lambda mp: mp.Elements),
+                (subsub1.CreateNewConditions, lambda mp: mp.Conditions)]:
+            new_entities = fct_create_new_entities("Entity2D2N", 3, [[1,2], [2,3], [3,4]], props)
+
+            self.assertListEqual([3, 4, 5], [entity.Id for entity in new_entities])
+            self.assertListEqual([2,3], [node.Id for node in new_entities[1].GetNodes()])
+            for model_part in [self.model_part, sub1, subsub1]:
+                self.assertListEqual(new_entities, list(fct_get_entities(model_part)))
+
+            # the Id 3 exists already
+            with self.assertRaisesRegex(RuntimeError, 'with IDs 1 to 3 however .* with Ids in this range already exist'):
+                fct_create_new_entities("Entity2D2N", 1, [[1,2], [2,3], [3,4]], props)
+            self.assertEqual(3, len(fct_get_entities(self.model_part)))
+
+            self.assertListEqual([], fct_create_new_entities("Entity2D2N", 10, [], props))
+
 
 class TestDataValueContainer:
     '''Interface matches the one of Kratos
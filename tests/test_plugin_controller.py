@@ -164,6 +164,50 @@ class TestPluginControllerProject(QtTestCase):
         self.assertIsNot(initial_project_path_handler, controller._project_path_handler)
 
 
+    def test_Groups_reuse_window(self):
+        controller = PluginController()
+
+        controller._Groups()
+        groups_window = controller._groups_window
+        self.assertIs(groups_window.model, controller._project_manager.groups_model)
+        self.assertFalse(controller._main_window.isVisible())
+
+        groups_window.close()
+        self.assertTrue(controller._main_window.isVisible())
+
+        controller._Groups()
+        self.assertIs(groups_window, controller._groups_window)
+        self.assertFalse(controller._main_window.isVisible())
+
+        # a new project has new groups
+        controller._New()
+        controller._Groups()
+        self.assertIsNot(groups_window, controller._groups_window)
+
+    def test_Groups_refresh_entity_counts(self):
+        controller = PluginController()
+        groups_model = controller._project_manager.groups_model
+
+        with patch.object(groups_model, 'RefreshEntityCounts') as patch_fct:
+            controller._Groups()
+            controller._groups_window.close()
+            controller._Groups() # the meshes might have been modified while the window was closed
+        self.assertEqual(patch_fct.call_count, 2)
+
+    def test_Autosave(self):
+        controller = PluginController()
+        autosave_timer = controller._PluginController__autosave_timer
+
+        with patch.object(controller._project_manager, 'Autosave') as patch_fct:
+            autosave_timer.timeout.emit()
+            self.assertEqual(patch_fct.call_count, 1)
+            self.assertIsNotNone(patch_fct.call_args[0][0]) # the study is autosaved with the job runner of the controller
+
+            # no autosaving while a modal dialog is open
+            with patch('kratos_salome_plugin.gui.plugin_controller.QApplication.activeModalWidget', return_value=controller._main_window):
+                autosave_timer.timeout.emit()
+            self.assertEqual(patch_fct.call_count, 1)
+
     def test_Close(self):
         controller = PluginController()
         controller._main_window.ShowOnTop()
@@ -0,0 +1,117 @@
+#  _  __         _          ___       _               ___ _           _
+# | |/ /_ _ __ _| |_ ___ __/ __| __ _| |___ _ __  ___| _ \ |_  _ __ _(_)_ _
+# | ' <| '_/ _` |  _/ _ (_-<__ \/ _` | / _ \ '  \/ -_)  _/ | || / _` | | ' \
+# |_|\_\_| \__,_|\__\___/__/___/\__,_|_\___/_|_|_\___|_| |_|\_,_\__, |_|_||_|
+#                                                               |___/
+# License: BSD License ; see LICENSE
+#
+# Main authors: Philipp Bucher (https://github.com/philbucher)
+#
+
+# set up testing environment (before anything else)
+import initialize_testing_environment
+
+# python imports
+import json
+from pathlib import Path
+import unittest
+
+# plugin imports
+from kratos_salome_plugin import profiling
+
+# tests imports
+from testing_utilities import DeleteFileIfExisting
+
+
+class TestProfiling(unittest.TestCase):
+    def setUp(self):
+        profiling.Reset()
+        self.addCleanup(profiling.Reset)
+        self.addCleanup(profiling.Disable)
+
+    def test_disabled(self):
+        self.assertFalse(profiling.IsEnabled())
+
+        with profiling.Timer("stage", 10) as timer:
+            timer.count = 20
+        profiling.AddCount("stage", 5)
+
+        self.assertEqual(0, len(profiling.GetReport()["stages"]))
+
+    def test_timers_and_counts(self):
+        profiling.Enable()
+        self.assertTrue(profiling.IsEnabled())
+
+        with profiling.Timer("stage_a", 10):
+            with profiling.Timer("stage_b") as timer:
+                timer.count = 3
+        with profiling.Timer("stage_a", 5):
+            pass
+        profiling.AddCount("stage_b", 4)
+        profiling.AddCount("stage_c", 2)
+
+        stages = profiling.GetReport()["stages"]
+        self.assertListEqual(["stage_a", "stage_b", "stage_c"], list(stages.keys()))
+
+        self.assertEqual(2, stages["stage_a"]["calls"])
+        self.assertEqual(15, stages["stage_a"]["count"])
+        self.assertEqual(1, stages["stage_b"]["calls"])
+        self.assertEqual(7, stages["stage_b"]["count"])
+        self.assertEqual(0, stages["stage_c"]["calls"])
+        self.assertEqual(2, stages["stage_c"]["count"])
+
+        self.assertGreaterEqual(stages["stage_a"]["time"], stages["stage_b"]["time"])
+        self.assertEqual(0.0, stages["stage_c"]["time"])
+        self.assertIsNone(stages["stage_c"]["throughput"])
+
+        profiling.Reset()
+        self.assertEqual(0, len(profiling.GetReport()["stages"]))
+
+    def test_timer_with_exception(self):
+        profiling.Enable()
+
+        with self.assertRaisesRegex(Exception, "abort"):
+            with profiling.Timer("stage", 2):
+                raise Exception("abort")
+
+        self.assertEqual(1, profiling.GetReport()["stages"]["stage"]["calls"])
+
+    def test_profile(self):
+        profiling.Enable()
+        with profiling.Timer("old_stage"):
+            pass
+        profiling.Disable()
+
+        with profiling.Profile() as profiler:
+            self.assertTrue(profiling.IsEnabled())
+            with profiling.Timer("stage", 3):
+                pass
+
+        self.assertFalse(profiling.IsEnabled())
+        self.assertListEqual(["stage"], list(profiler.report["stages"].keys()))
+        self.assertEqual(3, profiler.report["stages"]["stage"]["count"])
+
+    def test_peak_memory(self):
+        peak_memory = profiling.GetPeakMemory()
+        if peak_memory is not None:
+            self.assertGreater(peak_memory, 1024**2) # the python interpreter alone uses more than 1 MB
+        self.assertEqual(peak_memory is None, profiling.GetReport()["peak_memory"] is None)
+
+    def test_save_report(self):
+        report_file_name = Path("profiling_report.json")
+        self.addCleanup(lambda: DeleteFileIfExisting(report_file_name))
+
+        profiling.Enable()
+        with profiling.Timer("stage", 4):
+            pass
+        profiling.SaveReport(str(report_file_name))
+
+        with open(str(report_file_name)) as report_file:
+            report = json.load(report_file)
+
+        self.assertEqual(4, report["stages"]["stage"]["count"])
+        self.assertIn("peak_memory", report)
+
+
+if __name__ == '__main__':
+    unittest.main()
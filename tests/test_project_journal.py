@@ -0,0 +1,96 @@
+#  _  __         _          ___       _               ___ _           _
+# | |/ /_ _ __ _| |_ ___ __/ __| __ _| |___ _ __  ___| _ \ |_  _ __ _(_)_ _
+# | ' <| '_/ _` |  _/ _ (_-<__ \/ _` | / _ \ '  \/ -_)  _/ | || / _` | | ' \
+# |_|\_\_| \__,_|\__\___/__/___/\__,_|_\___/_|_|_\___|_| |_|\_,_\__, |_|_||_|
+#                                                               |___/
+# License: BSD License ; see LICENSE
+#
+# Main authors: Philipp Bucher (https://github.com/philbucher)
+#
+
+# set up testing environment (before anything else)
+import initialize_testing_environment
+
+# python imports
+from pathlib import Path
+import unittest
+
+# plugin imports
+from kratos_salome_plugin.gui.project_journal import ProjectJournal
+
+# tests imports
+from testing_utilities import DeleteFileIfExisting
+
+
+class TestProjectJournal(unittest.TestCase):
+    def setUp(self):
+        self.journal_path = Path("test_project_journal.journal")
+        DeleteFileIfExisting(self.journal_path)
+        self.addCleanup(lambda: DeleteFileIfExisting(self.journal_path))
+
+    def test_Append(self):
+        journal = ProjectJournal(self.journal_path)
+        self.assertListEqual(journal.Read(), [])
+        self.assertEqual(journal.num_entries, 0)
+
+        journal.Append({"part" : "groups", "data" : [1,2]})
+        journal.Append({"part" : "application", "data" : None})
+
+        self.assertListEqual(journal.Read(), [{"part" : "groups", "data" : [1,2]}, {"part" : "application", "data" : None}])
+        self.assertEqual(journal.num_entries, 2)
+        self.assertEqual(ProjectJournal(self.journal_path).num_entries, 2)
+
+    def test_Read_incomplete_entry(self):
+        journal = ProjectJournal(self.journal_path)
+        journal.Append({"part" : "groups", "data" : 1})
+        with open(str(self.journal_path), 'a') as journal_file:
+            journal_file.write('{"part" : "groups", "da') # simulating a crash while appending
+
+        with self.assertLogs('kratos_salome_plugin.gui.project_journal', level='WARNING'):
+            self.assertListEqual(journal.Read(), [{"part" : "groups", "data" : 1}])
+
+    def test_incomplete_entry_is_removed(self):
+        with open(str(self.journal_path), 'w') as journal_file:
+            journal_file.write('{"part" : "groups", "data" : 1}\n{"part" : "gro') # simulating a crash while appending
+
+        with self.assertLogs('kratos_salome_plugin.gui.project_journal', level='WARNING'):
+            journal = ProjectJournal(self.journal_path)
+        self.assertEqual(journal.num_entries, 1)
+
+        # the entries appended afterwards can be read
+        journal.Append({"part" : "groups_add", "data" : 2})
+        journal.Append({"part" : "groups_add", "data" : 3})
+        self.assertListEqual([entry["data"] for entry in journal.Read()], [1,2,3])
+
+    def test_only_incomplete_entry_is_removed(self):
+        self.journal_path.write_text('{"part": "gro') # the only entry is incomplete
+
+        with self.assertLogs('kratos_salome_plugin.gui.project_journal', level='WARNING'):
+            journal = ProjectJournal(self.journal_path)
+        self.assertEqual(journal.num_entries, 0)
+
+        journal.Append({"part" : "groups", "data" : 1})
+        self.assertListEqual(journal.Read(), [{"part" : "groups", "data" : 1}])
+
+    def test_Extend(self):
+        journal = ProjectJournal(self.journal_path)
+        journal.Append({"part" : "groups", "data" : 1})
+        journal.Extend([{"part" : "groups_add", "data" : 2}, {"part" : "groups_remove", "data" : 3}])
+
+        self.assertListEqual([entry["data"] for entry in journal.Read()], [1,2,3])
+        self.assertEqual(journal.num_entries, 3)
+
+    def test_Replace(self):
+        journal = ProjectJournal(self.journal_path)
+        for i in range(5):
+            journal.Append({"part" : "groups_add", "data" : i})
+
+        journal.Replace([{"part" : "groups", "data" : [0,1,2,3,4]}])
+
+        self.assertListEqual(journal.Read(), [{"part" : "groups", "data" : [0,1,2,3,4]}])
+        self.assertEqual(journal.num_entries, 1)
+        self.assertFalse(Path("test_project_journal.journal.tmp").exists())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -17,14 +17,17 @@ from os import makedirs
 import json
 from shutil import rmtree
 import unittest
-from unittest.mock import patch
+from unittest.mock import patch, MagicMock
 
 # plugin imports
 from kratos_salome_plugin import IsExecutedInSalome
 from kratos_salome_plugin.gui.project_manager import ProjectManager
+from kratos_salome_plugin.gui.group import Group
+from kratos_salome_plugin.exceptions import JobCancelledError
+from kratos_salome_plugin.base_application import Application
 
 # tests imports
-from testing_utilities import QtTestCase, DeleteDirectoryIfExisting, skipUnlessPythonVersionIsAtLeast, CreateHDFStudyFile, SalomeTestCaseWithBox
+from testing_utilities import QtTestCase, DeleteDirectoryIfExisting, DeleteFileIfExisting, skipUnlessPythonVersionIsAtLeast, CreateHDFStudyFile, SalomeTestCaseWithBox
 
 
 @skipUnlessPythonVersionIsAtLeast((3,6), 'pathlib.Path does not work with some fcts before 3.6 (e.g. "with open" or "os.makedirs")')
@@ -123,11 +126,508 @@ class TestProjectManager(QtTestCase):
         self.assertTrue(plugin_data_path.is_file())
         self.assertTrue(salome_study_path.is_file())
 
+    @patch('salome_version.getVersions', return_value=[1,2,3])
+    @patch('salome.myStudy.SaveAs', side_effect=CreateHDFStudyFile)
+    def test_SaveProject_unmodified_study(self, mock_save_study, mock_version):
+        """the study is saved only once if it is not modified afterwards"""
+        project_name = Path("project_unmodified_study")
+        project_dir = project_name.with_suffix(".ksp")
+        salome_study_path = project_dir / "salome_study.hdf"
+
+        _ExecuteTestSaveProject(self, project_name)
+        self.assertEqual(mock_save_study.call_count, 1)
+
+        with patch('kratos_salome_plugin.gui.project_manager.IsStudyModified', return_value=False):
+            with patch('kratos_salome_plugin.gui.project_manager.GetStudyFilePath', return_value=salome_study_path):
+                with self.assertLogs('kratos_salome_plugin.gui.project_manager', level='DEBUG') as cm:
+                    self.assertTrue(ProjectManager().SaveProject(project_name))
+                self.assertEqual(mock_save_study.call_count, 1) # study was not saved again
+                self.assertIn('DEBUG:kratos_salome_plugin.gui.project_manager:Salome study is unmodified, reusing "{}"'.format(salome_study_path), cm.output)
+                self.assertEqual(cm.output[-1], 'DEBUG:kratos_salome_plugin.gui.project_manager:Saved project (written: plugin data)')
+
+            # study was saved somewhere else
+            with patch('kratos_salome_plugin.gui.project_manager.GetStudyFilePath', return_value=None):
+                with self.assertLogs('kratos_salome_plugin.gui.project_manager', level='DEBUG') as cm:
+                    self.assertTrue(ProjectManager().SaveProject(project_name))
+                self.assertEqual(mock_save_study.call_count, 2)
+                self.assertEqual(cm.output[-1], 'DEBUG:kratos_salome_plugin.gui.project_manager:Saved project (written: salome study, plugin data)')
+
+    @patch('salome_version.getVersions', return_value=[1,2,3])
+    @patch('salome.myStudy.SaveAs', side_effect=CreateHDFStudyFile)
+    def test_SaveProject_copy_unmodified_study(self, mock_save_study, mock_version):
+        """an unmodified study that was saved elsewhere is copied instead of saved"""
+        project_name = Path("project_copy_unmodified_study")
+        project_dir = project_name.with_suffix(".ksp")
+        self.addCleanup(lambda: DeleteDirectoryIfExisting(project_dir))
+        DeleteDirectoryIfExisting(project_dir)
+
+        other_study_path = Path("other_salome_study.hdf")
+        self.addCleanup(lambda: DeleteFileIfExisting(other_study_path))
+        CreateHDFStudyFile(str(other_study_path))
+
+        with patch('kratos_salome_plugin.gui.project_manager.IsStudyModified', return_value=False):
+            with patch('kratos_salome_plugin.gui.project_manager.GetStudyFilePath', return_value=other_study_path):
+                with patch('kratos_salome_plugin.gui.project_manager.GetStudyModificationState', return_value=(1, "study")):
+                    manager = ProjectManager()
+                    with self.assertLogs('kratos_salome_plugin.gui.project_manager', level='DEBUG') as cm:
+                        self.assertTrue(manager.SaveProject(project_name))
+                    self.assertEqual(cm.output[-1], 'DEBUG:kratos_salome_plugin.gui.project_manager:Saved project (written: salome study (copied), plugin data)')
+                    self.assertEqual(mock_save_study.call_count, 0)
+                    self.assertEqual(other_study_path.read_bytes(), (project_dir / "salome_study.hdf").read_bytes())
+
+                    # the copy is reused as long as the study is not modified
+                    with self.assertLogs('kratos_salome_plugin.gui.project_manager', level='DEBUG') as cm:
+                        self.assertTrue(manager.SaveProject(project_name))
+                    self.assertEqual(cm.output[-1], 'DEBUG:kratos_salome_plugin.gui.project_manager:Saved project (written: plugin data)')
+
+                self.assertListEqual(sorted(p.name for p in project_dir.iterdir()), ["plugin_data.json", "salome_study.hdf"])
+
+    @patch('salome_version.getVersions', return_value=[1,2,3])
+    @patch('salome.myStudy.SaveAs', side_effect=CreateHDFStudyFile)
+    def test_SaveProject_cancelled(self, mock_save_study, mock_version):
+        """cancelling leaves the previously saved project intact"""
+        project_name = _ExecuteTestSaveProject(self)
+        project_dir = project_name.with_suffix(".ksp")
+        plugin_data_path = project_dir / "plugin_data.json"
+        plugin_data = plugin_data_path.read_text()
+        self.assertEqual(mock_save_study.call_count, 1)
+
+        with self.assertRaisesRegex(JobCancelledError, 'was cancelled'):
+            ProjectManager().SaveProject(project_name, _CancelAfterStep("Writing plugin data"))
+
+        self.assertEqual(mock_save_study.call_count, 1) # study was not saved
+        self.assertEqual(plugin_data, plugin_data_path.read_text())
+        self.assertListEqual(sorted(p.name for p in project_dir.iterdir()), ["plugin_data.json", "salome_study.hdf"])
+        self.assertFalse(Path("test_SaveProject_cancelled.ksp.tmp").exists()) # no leftover temporary files
+
+    @patch('salome_version.getVersions', return_value=[1,2,3])
+    @patch('salome.myStudy.SaveAs', side_effect=CreateHDFStudyFile)
+    @patch('kratos_salome_plugin.gui.project_manager.IsStudyModified', return_value=True)
+    def test_SaveProject_fails_after_saving_study(self, mock_is_study_modified, mock_save_study, mock_version):
+        """the study refers to its previous file if saving the project fails after the study was saved"""
+        project_name = _ExecuteTestSaveProject(self)
+        project_dir = project_name.with_suffix(".ksp")
+        previous_study_path = Path("previous_salome_study.hdf")
+
+        with patch('kratos_salome_plugin.gui.project_manager.GetStudyFilePath', return_value=previous_study_path):
+            with patch('kratos_salome_plugin.gui.project_manager.SetStudyFilePath') as patch_fct_set_study_file_path:
+                with patch('kratos_salome_plugin.gui.project_manager.SetStudyModified') as patch_fct_set_study_modified:
+                    with self.assertRaisesRegex(RuntimeError, 'failed after step "Saving Salome study"'):
+                        ProjectManager().SaveProject(project_name, _FailAfterStep("Saving Salome study"))
+
+        self.assertEqual(mock_save_study.call_count, 2)
+        patch_fct_set_study_file_path.assert_called_once_with(previous_study_path)
+        patch_fct_set_study_modified.assert_called_once_with()
+        self.assertListEqual(sorted(p.name for p in project_dir.iterdir()), ["plugin_data.json", "salome_study.hdf"])
+        self.assertFalse(Path("test_SaveProject_fails_after_saving_study.ksp.tmp").exists())
+
+    @patch('salome_version.getVersions', return_value=[1,2,3])
+    @patch('salome.myStudy.SaveAs', side_effect=CreateHDFStudyFile)
+    def test_SaveProject_new_project_cancelled(self, mock_save_study, mock_version):
+        project_dir = Path("project_new_cancelled.ksp")
+        self.addCleanup(lambda: DeleteDirectoryIfExisting(project_dir))
+        DeleteDirectoryIfExisting(project_dir)
+
+        with self.assertRaises(JobCancelledError):
+            ProjectManager().SaveProject(project_dir, _CancelAfterStep("Collecting plugin data"))
+
+        self.assertEqual(mock_save_study.call_count, 0)
+        self.assertFalse(project_dir.is_dir())
+        self.assertFalse(Path("project_new_cancelled.ksp.tmp").exists()) # the temporary folder of the new project is removed again
+
+    @patch('salome_version.getVersions', return_value=[1,2,3])
+    @patch('salome.myStudy.SaveAs', side_effect=CreateHDFStudyFile)
+    def test_SaveProject_keeps_existing_files_linked(self, mock_save_study, mock_version):
+        """files that are not written are kept by hardlinking them into the new version of the project"""
+        project_name = Path("project_keeps_existing_files")
+        project_dir = project_name.with_suffix(".ksp")
+        salome_study_path = project_dir / "salome_study.hdf"
+
+        _ExecuteTestSaveProject(self, project_name)
+        results_path = project_dir / "results" / "result.vtk"
+        makedirs(results_path.parent)
+        results_path.write_text("some results")
+        study_inode = salome_study_path.stat().st_ino
+        results_inode = results_path.stat().st_ino
+
+        with patch('kratos_salome_plugin.gui.project_manager.IsStudyModified', return_value=False):
+            with patch('kratos_salome_plugin.gui.project_manager.GetStudyFilePath', return_value=salome_study_path):
+                self.assertTrue(ProjectManager().SaveProject(project_name))
+
+        self.assertEqual(mock_save_study.call_count, 1)
+        self.assertEqual(study_inode, salome_study_path.stat().st_ino)
+        self.assertEqual(results_inode, results_path.stat().st_ino)
+        self.assertEqual(results_path.read_text(), "some results")
+        self.assertFalse(Path("project_keeps_existing_files.ksp.bak").exists())
+
+    @patch('salome_version.getVersions', return_value=[1,2,3])
+    @patch('salome.myStudy.SaveAs', side_effect=CreateHDFStudyFile)
+    def test_SaveProject_interrupted(self, mock_save_study, mock_version):
+        """if saving was interrupted while replacing the project, then the previous version is restored"""
+        project_name = _ExecuteTestSaveProject(self)
+        project_dir = project_name.with_suffix(".ksp")
+        backup_dir = Path("test_SaveProject_interrupted.ksp.bak")
+        tmp_dir = Path("test_SaveProject_interrupted.ksp.tmp")
+        self.addCleanup(lambda: DeleteDirectoryIfExisting(backup_dir))
+        self.addCleanup(lambda: DeleteDirectoryIfExisting(tmp_dir))
+
+        # simulate a crash after the project was moved to the backup
+        project_dir.rename(backup_dir)
+        makedirs(tmp_dir)
+
+        with self.assertLogs('kratos_salome_plugin.gui.project_manager', level='WARNING') as cm:
+            _ExecuteTestSaveProject(self, project_name)
+        self.assertEqual(cm.output[0], 'WARNING:kratos_salome_plugin.gui.project_manager:Saving project "{}" was interrupted, restoring the previous version'.format(project_dir))
+
+        self.assertFalse(backup_dir.exists())
+        self.assertFalse(tmp_dir.exists())
+
+        # simulate a crash while removing the backup
+        makedirs(backup_dir)
+        with patch('salome.myStudy.Open', return_value=True):
+            with patch('kratos_salome_plugin.salome_study_utilities.IsStudyEmpty', return_value=True):
+                self.assertTrue(ProjectManager().OpenProject(project_dir))
+        self.assertFalse(backup_dir.exists())
+
+    @patch('salome_version.getVersions', return_value=[1,2,3])
+    @patch('salome.myStudy.SaveAs', side_effect=CreateHDFStudyFile)
+    @patch('salome.myStudy.Open', return_value=True)
+    def test_OpenProject_cancelled(self, mock_open_study, mock_save_study, mock_version):
+        project_name = _ExecuteTestSaveProject(self)
+
+        manager = ProjectManager()
+        groups_model = manager.groups_model
+
+        with self.assertRaises(JobCancelledError):
+            manager.OpenProject(project_name.with_suffix(".ksp"), _CancelAfterStep("Reading plugin data"))
+
+        self.assertEqual(mock_open_study.call_count, 0)
+        self.assertIs(groups_model, manager.groups_model) # current project is unchanged
+
+    @patch('salome_version.getVersions', return_value=[1,2,3])
+    @patch('salome.myStudy.SaveAs', side_effect=CreateHDFStudyFile)
+    @patch('kratos_salome_plugin.gui.project_manager.IsStudyModified', return_value=False)
+    def test_ProjectHasUnsavedChanges(self, mock_is_study_modified, mock_save_study, mock_version):
+        manager = ProjectManager()
+        self.assertFalse(manager.ProjectHasUnsavedChanges()) # new project
+
+        manager.groups_model._IncreaseGeneration()
+        self.assertTrue(manager.ProjectHasUnsavedChanges())
+
+        _ExecuteTestSaveProject(self, manager=manager)
+        self.assertFalse(manager.ProjectHasUnsavedChanges())
+
+        manager.application = _MockApplication()
+        self.assertTrue(manager.ProjectHasUnsavedChanges())
+
+        self.assertTrue(manager.SaveProject(Path(self._testMethodName)))
+        self.assertFalse(manager.ProjectHasUnsavedChanges())
+
+        manager.application._IncreaseGeneration()
+        self.assertTrue(manager.ProjectHasUnsavedChanges())
+
+    @patch('salome_version.getVersions', return_value=[1,2,3])
+    @patch('salome.myStudy.SaveAs', side_effect=CreateHDFStudyFile)
+    @patch('salome.myStudy.Open', return_value=True)
+    @patch('kratos_salome_plugin.salome_study_utilities.IsStudyEmpty', return_value=True)
+    @patch('kratos_salome_plugin.gui.project_manager.IsStudyModified', return_value=False)
+    def test_SaveProject_failed_keeps_unsaved_changes(self, mock_is_study_modified, mock_is_study_empty, mock_open_study, mock_save_study, mock_version):
+        project_name = Path(self._testMethodName)
+        project_dir = project_name.with_suffix(".ksp")
+        journal_path = project_dir / "plugin_data.journal"
+
+        manager = ProjectManager()
+        _ExecuteTestSaveProject(self, project_name, manager)
+        manager.groups_model.AddGroup(Group("group_1", "0:1:2:3", "Node"))
+
+        # saving the study failed
+        with patch('salome.myStudy.SaveAs', return_value=False):
+            self.assertFalse(manager.SaveProject(project_name))
+        self.assertTrue(manager.ProjectHasUnsavedChanges())
+        self.assertTrue(journal_path.is_file())
+
+        # serializing the application failed
+        manager.application = _MockApplication()
+        with patch.object(_MockApplication, 'Serialize', return_value=(False, {"value" : 5})):
+            self.assertFalse(manager.SaveProject(project_name))
+        self.assertTrue(manager.ProjectHasUnsavedChanges())
+        manager.Autosave() # the written plugin data is journaled already
+        self.assertEqual(len(journal_path.read_text().splitlines()), 2)
+
+        # the changes are reported as unsaved when the project is opened again
+        reopened_manager = ProjectManager()
+        with self.assertLogs('kratos_salome_plugin.gui.project_manager', level='WARNING'):
+            self.assertTrue(reopened_manager.OpenProject(project_dir))
+        self.assertTrue(reopened_manager.ProjectHasUnsavedChanges())
+        self.assertEqual(reopened_manager.groups_model.GetNumberOfGroups(), 1)
+
+        self.assertTrue(manager.SaveProject(project_name))
+        self.assertFalse(manager.ProjectHasUnsavedChanges())
+        self.assertFalse(journal_path.exists())
+
+    @patch('salome_version.getVersions', return_value=[1,2,3])
+    @patch('salome.myStudy.SaveAs', side_effect=CreateHDFStudyFile)
+    @patch('salome.myStudy.Open', return_value=True)
+    @patch('kratos_salome_plugin.salome_study_utilities.IsStudyEmpty', return_value=True)
+    @patch('kratos_salome_plugin.gui.project_manager.IsStudyModified', return_value=False)
+    def test_OpenProject_lazy_application(self, mock_is_study_modified, mock_is_study_empty, mock_open_study, mock_save_study, mock_version):
+        project_name = Path(self._testMethodName)
+        self.addCleanup(lambda: DeleteDirectoryIfExisting(project_name.with_suffix(".ksp")))
+
+        manager = ProjectManager()
+        manager.application = _MockApplication()
+        self.assertTrue(manager.SaveProject(project_name))
+
+        with patch.object(_MockApplication, 'Deserialize', return_value=True) as patch_fct_deserialize:
+            manager = ProjectManager()
+            self.assertTrue(manager.OpenProject(project_name.with_suffix(".ksp")))
+            self.assertFalse(patch_fct_deserialize.called) # the application is loaded only when it is used
+
+            # saving does not load the application
+            self.assertTrue(manager.SaveProject(project_name))
+            self.assertFalse(patch_fct_deserialize.called)
+
+            self.assertIsInstance(manager.application, _MockApplication)
+            patch_fct_deserialize.assert_called_once_with({"value" : 5})
+            self.assertIs(manager.application, manager.application)
+
+        self.assertFalse(manager.ProjectHasUnsavedChanges())
+
+    @patch('salome_version.getVersions', return_value=[1,2,3])
+    @patch('salome.myStudy.SaveAs', side_effect=CreateHDFStudyFile)
+    @patch('salome.myStudy.Open', return_value=True)
+    @patch('kratos_salome_plugin.salome_study_utilities.IsStudyEmpty', return_value=True)
+    @patch('kratos_salome_plugin.gui.project_manager.IsStudyModified', return_value=False)
+    def test_OpenProject_lazy_application_failed_loading(self, mock_is_study_modified, mock_is_study_empty, mock_open_study, mock_save_study, mock_version):
+        project_name = Path(self._testMethodName)
+        project_dir = project_name.with_suffix(".ksp")
+        plugin_data_path = project_dir / "plugin_data.json"
+        self.addCleanup(lambda: DeleteDirectoryIfExisting(project_dir))
+
+        manager = ProjectManager()
+        manager.application = _MockApplication()
+        self.assertTrue(manager.SaveProject(project_name))
+        serialized_app = json.loads(plugin_data_path.read_text())["application"]
+
+        # deserializing the application fails
+        manager = ProjectManager()
+        self.assertTrue(manager.OpenProject(project_dir))
+        with patch.object(_MockApplication, 'Deserialize', return_value=False) as patch_fct_deserialize:
+            with self.assertLogs('kratos_salome_plugin.gui.project_manager', level='ERROR'):
+                self.assertIsNone(manager.application)
+            self.assertIsNone(manager.application)
+            self.assertEqual(patch_fct_deserialize.call_count, 1) # not loaded again
+        self.assertFalse(manager.ProjectHasUnsavedChanges())
+
+        # the data of the application is not lost when saving
+        self.assertTrue(manager.SaveProject(project_name))
+        self.assertDictEqual(json.loads(plugin_data_path.read_text())["application"], serialized_app)
+
+        # importing the module of the application fails
+        manager = ProjectManager()
+        self.assertTrue(manager.OpenProject(project_dir))
+        with patch('kratos_salome_plugin.gui.project_manager._ImportApplicationModule', side_effect=ImportError("No module named 'test_project_manager'")):
+            with self.assertLogs('kratos_salome_plugin.gui.project_manager', level='ERROR') as cm:
+                self.assertIsNone(manager.application)
+        self.assertIn('ERROR:kratos_salome_plugin.gui.project_manager:Failed to import the application module "test_project_manager": "No module named \'test_project_manager\'"', cm.output)
+
+    @patch('salome_version.getVersions', return_value=[1,2,3])
+    @patch('salome.myStudy.SaveAs', side_effect=CreateHDFStudyFile)
+    @patch('salome.myStudy.Open', return_value=True)
+    @patch('kratos_salome_plugin.salome_study_utilities.IsStudyEmpty', return_value=True)
+    @patch('kratos_salome_plugin.gui.project_manager.IsStudyModified', return_value=False)
+    def test_OpenProject_lazy_application_modified_groups(self, mock_is_study_modified, mock_is_study_empty, mock_open_study, mock_save_study, mock_version):
+        project_name = Path(self._testMethodName)
+        project_dir = project_name.with_suffix(".ksp")
+        journal_path = project_dir / "plugin_data.journal"
+
+        self.addCleanup(lambda: DeleteDirectoryIfExisting(project_dir))
+
+        manager = ProjectManager()
+        manager.application = _MockApplication()
+        self.assertTrue(manager.SaveProject(project_name))
+
+        manager = ProjectManager()
+        self.assertTrue(manager.OpenProject(project_dir))
+        manager.groups_model.AddGroup(Group("group_1", "0:1:2:3", "Node"))
+        self.assertTrue(manager.ProjectHasUnsavedChanges())
+
+        # loading the application keeps the unsaved changes of the groups
+        self.assertIsInstance(manager.application, _MockApplication)
+        self.assertTrue(manager.ProjectHasUnsavedChanges())
+
+        # loading the application is not journaled
+        manager.Autosave()
+        self.assertListEqual(journal_path.read_text().splitlines(), [json.dumps({"part" : "groups_add", "data" : ["group_1", "0:1:2:3", "Node"]})])
+
+    @patch('salome_version.getVersions', return_value=[1,2,3])
+    @patch('salome.myStudy.SaveAs', side_effect=CreateHDFStudyFile)
+    @patch('salome.myStudy.Open', return_value=True)
+    @patch('kratos_salome_plugin.salome_study_utilities.IsStudyEmpty', return_value=True)
+    @patch('kratos_salome_plugin.gui.project_manager.IsStudyModified', return_value=False)
+    def test_OpenProject_lazy_application_restored_from_journal(self, mock_is_study_modified, mock_is_study_empty, mock_open_study, mock_save_study, mock_version):
+        project_name = Path(self._testMethodName)
+        project_dir = project_name.with_suffix(".ksp")
+        journal_path = project_dir / "plugin_data.journal"
+
+        manager = ProjectManager()
+        _ExecuteTestSaveProject(self, project_name, manager)
+        manager.application = _MockApplication()
+        manager.Autosave()
+
+        # simulate a crash, the application is restored from the journal
+        manager = ProjectManager()
+        with self.assertLogs('kratos_salome_plugin.gui.project_manager', level='WARNING'):
+            self.assertTrue(manager.OpenProject(project_dir))
+        self.assertTrue(manager.ProjectHasUnsavedChanges())
+        journal_content = journal_path.read_text()
+
+        # loading the restored application keeps it an unsaved change
+        self.assertIsInstance(manager.application, _MockApplication)
+        self.assertTrue(manager.ProjectHasUnsavedChanges())
+
+        # the restored application is journaled already
+        manager.Autosave()
+        self.assertEqual(journal_path.read_text(), journal_content)
+
+    @patch('salome_version.getVersions', return_value=[1,2,3])
+    @patch('salome.myStudy.SaveAs', side_effect=CreateHDFStudyFile)
+    @patch('salome.myStudy.Open', return_value=True)
+    @patch('kratos_salome_plugin.salome_study_utilities.IsStudyEmpty', return_value=True)
+    @patch('kratos_salome_plugin.gui.project_manager.IsStudyModified', return_value=False)
+    def test_Autosave_plugin_data(self, mock_is_study_modified, mock_is_study_empty, mock_open_study, mock_save_study, mock_version):
+        project_name = Path(self._testMethodName)
+        project_dir = project_name.with_suffix(".ksp")
+        journal_path = project_dir / "plugin_data.journal"
+
+        manager = ProjectManager()
+        manager.Autosave() # project was not saved, nothing to do
+        self.assertFalse(journal_path.exists())
+
+        _ExecuteTestSaveProject(self, project_name, manager)
+        manager.Autosave() # nothing changed
+        self.assertFalse(journal_path.exists())
+
+        manager.groups_model._IncreaseGeneration()
+        manager.application = _MockApplication()
+        manager.Autosave()
+        manager.Autosave() # nothing changed since the last autosave
+        self.assertEqual(len(journal_path.read_text().splitlines()), 2)
+
+        # simulate a crash, the autosaved changes are restored when opening the project
+        with patch.object(_MockApplication, 'Deserialize', return_value=True) as patch_fct_deserialize:
+            with self.assertLogs('kratos_salome_plugin.gui.project_manager', level='WARNING') as cm:
+                manager = ProjectManager()
+                self.assertTrue(manager.OpenProject(project_dir))
+            self.assertIn('WARNING:kratos_salome_plugin.gui.project_manager:Restoring 2 autosaved changes of project "{}"'.format(project_dir), cm.output)
+            self.assertTrue(manager.ProjectHasUnsavedChanges())
+            self.assertIsInstance(manager.application, _MockApplication)
+            patch_fct_deserialize.assert_called_once_with({"value" : 5})
+
+        # saving removes the journal
+        self.assertTrue(manager.SaveProject(project_name))
+        self.assertFalse(journal_path.exists())
+        self.assertFalse(manager.ProjectHasUnsavedChanges())
+
+    @patch('salome_version.getVersions', return_value=[1,2,3])
+    @patch('salome.myStudy.SaveAs', side_effect=CreateHDFStudyFile)
+    @patch('salome.myStudy.Open', return_value=True)
+    @patch('kratos_salome_plugin.salome_study_utilities.IsStudyEmpty', return_value=True)
+    @patch('kratos_salome_plugin.gui.project_manager.IsStudyModified', return_value=False)
+    def test_Autosave_groups(self, mock_is_study_modified, mock_is_study_empty, mock_open_study, mock_save_study, mock_version):
+        project_name = Path(self._testMethodName)
+        project_dir = project_name.with_suffix(".ksp")
+        journal_path = project_dir / "plugin_data.journal"
+
+        manager = ProjectManager()
+        manager.groups_model.AddGroup(Group("saved_group", "0:1:2:3", "Node"))
+        _ExecuteTestSaveProject(self, project_name, manager)
+
+        # the modifications of the groups are journaled, not all groups
+        manager.groups_model.AddGroup(Group("group_1", "0:1:2:3", "Triangle"))
+        manager.groups_model.AddGroup(Group("group_2", "0:1:2:4", "Node"))
+        manager.Autosave()
+        manager.groups_model.RemoveGroup(manager.groups_model.GetGroup(0))
+        manager.Autosave()
+
+        journal_entries = [json.loads(line) for line in journal_path.read_text().splitlines()]
+        self.assertListEqual(journal_entries, [
+            {"part" : "groups_add", "data" : ["group_1", "0:1:2:3", "Triangle"]},
+            {"part" : "groups_add", "data" : ["group_2", "0:1:2:4", "Node"]},
+            {"part" : "groups_remove", "data" : ["saved_group", "0:1:2:3", "Node"]}
+        ])
+
+        # simulate a crash, the journaled modifications are restored when opening the project
+        manager = ProjectManager()
+        with self.assertLogs('kratos_salome_plugin.gui.project_manager', level='WARNING'):
+            self.assertTrue(manager.OpenProject(project_dir))
+        self.assertListEqual(manager.groups_model.Serialize()["groups"], [["group_1", "0:1:2:3", "Triangle"], ["group_2", "0:1:2:4", "Node"]])
+        self.assertTrue(manager.ProjectHasUnsavedChanges())
+
+        # the journal was compacted when opening the project
+        self.assertListEqual(journal_path.read_text().splitlines(), [json.dumps({"part" : "groups", "data" : manager.groups_model.Serialize()})])
+
+    @patch('salome_version.getVersions', return_value=[1,2,3])
+    @patch('salome.myStudy.SaveAs', side_effect=CreateHDFStudyFile)
+    @patch('kratos_salome_plugin.gui.project_manager.IsStudyModified', return_value=False)
+    def test_Autosave_compact_journal(self, mock_is_study_modified, mock_save_study, mock_version):
+        project_name = Path(self._testMethodName)
+        journal_path = project_name.with_suffix(".ksp") / "plugin_data.journal"
+
+        manager = ProjectManager()
+        manager.journal_max_entries = 3
+        _ExecuteTestSaveProject(self, project_name, manager)
+
+        for i in range(4):
+            manager.groups_model._IncreaseGeneration()
+            manager.Autosave()
+            self.assertEqual(len(journal_path.read_text().splitlines()), [1,2,3,1][i])
+
+    @patch('salome_version.getVersions', return_value=[1,2,3])
+    @patch('salome.myStudy.SaveAs', side_effect=CreateHDFStudyFile)
+    @patch('salome.myStudy.Open', return_value=True)
+    @patch('kratos_salome_plugin.salome_study_utilities.IsStudyEmpty', return_value=True)
+    def test_Autosave_study(self, mock_is_study_empty, mock_open_study, mock_save_study, mock_version):
+        project_name = Path(self._testMethodName)
+        project_dir = project_name.with_suffix(".ksp")
+        autosave_study_path = project_dir / "salome_study.autosave.hdf"
+
+        manager = ProjectManager()
+        _ExecuteTestSaveProject(self, project_name, manager)
+        self.assertEqual(mock_save_study.call_count, 1)
+
+        with patch('kratos_salome_plugin.gui.project_manager.IsStudyModified', return_value=True):
+            manager.Autosave()
+            self.assertEqual(mock_save_study.call_count, 1) # the study is autosaved only after "study_autosave_interval"
+
+            manager.study_autosave_interval = 0.0
+            job_runner = MagicMock(side_effect=lambda job: job.Run())
+            manager.Autosave(job_runner)
+            self.assertEqual(mock_save_study.call_count, 2)
+            self.assertEqual(job_runner.call_count, 1) # saving the study is run as job
+            self.assertTrue(autosave_study_path.is_file())
+
+        with patch('kratos_salome_plugin.gui.project_manager.IsStudyModified', return_value=False):
+            manager.Autosave()
+            self.assertEqual(mock_save_study.call_count, 2) # the study is not modified
+            self.assertTrue(manager.ProjectHasUnsavedChanges())
+
+            # the autosaved study is opened
+            with self.assertLogs('kratos_salome_plugin.gui.project_manager', level='WARNING') as cm:
+                self.assertTrue(ProjectManager().OpenProject(project_dir))
+            self.assertIn('WARNING:kratos_salome_plugin.gui.project_manager:Opening the autosaved Salome study of project "{}"'.format(project_dir), cm.output)
+            mock_open_study.assert_called_once_with(str(autosave_study_path))
+
+    @patch('kratos_salome_plugin.gui.project_manager.IsStudyModified', return_value=True)
+    def test_ProjectHasUnsavedChanges_modified_study(self, mock_is_study_modified):
+        self.assertTrue(ProjectManager().ProjectHasUnsavedChanges())
+
     @patch('salome_version.getVersions', return_value=[1,2,3])
     @patch('salome.myStudy.SaveAs', side_effect=CreateHDFStudyFile)
     @patch('salome.myStudy.Open', return_value=True)
     @patch('kratos_salome_plugin.salome_study_utilities.GetNumberOfObjectsInStudy', return_value=0)
-    def test_SaveAndReOpenProject_mocked_salome(self, mock_num_objs_study, mock_open_study, mock_save_study, mock_version):
+    @patch('kratos_salome_plugin.salome_study_utilities.IsStudyEmpty', return_value=True)
+    def test_SaveAndReOpenProject_mocked_salome(self, mock_is_study_empty, mock_num_objs_study, mock_open_study, mock_save_study, mock_version):
         _ExecuteTestSaveAndOpenProject(self)
 
 
@@ -138,8 +638,55 @@ class TestProjectManagerWithSalome(SalomeTestCaseWithBox):
     def test_SaveAndReOpenProject(self):
         _ExecuteTestSaveAndOpenProject(self)
 
-
-def _ExecuteTestSaveProject(test_case, project_name=None):
+    def test_SaveProject_unmodified_study(self):
+        project_name = _ExecuteTestSaveProject(self)
+        salome_study_path = project_name.with_suffix(".ksp") / "salome_study.hdf"
+        modification_time = salome_study_path.stat().st_mtime_ns
+
+        with patch('kratos_salome_plugin.gui.project_manager.SaveStudy') as patch_fct_save_study:
+            self.assertTrue(ProjectManager().SaveProject(project_name))
+            self.assertFalse(patch_fct_save_study.called)
+
+        self.assertEqual(modification_time, salome_study_path.stat().st_mtime_ns)
+
+        # after modifying the study it has to be saved again
+        self.geompy.addToStudy(self.geompy.MakeBoxDXDYDZ(10, 10, 10), 'new_box')
+        self.assertTrue(ProjectManager().SaveProject(project_name))
+        self.assertNotEqual(modification_time, salome_study_path.stat().st_mtime_ns)
+
+
+class _MockApplication(Application):
+    def WriteCalculationFiles(self, path): return True
+    def Serialize(self): return True, {"value" : 5}
+    def Deserialize(self, serialized_obj): return True
+
+def Create():
+    """for loading the _MockApplication when opening a project"""
+    return _MockApplication()
+
+def _CancelAfterStep(step_description):
+    """creates a job runner that cancels the job after the given step"""
+    def RunJob(job):
+        def ExecuteStep(step, job):
+            result = step.fct_ptr(job)
+            if step.description == step_description:
+                job.Cancel()
+            return result
+        return job.Run(ExecuteStep)
+    return RunJob
+
+def _FailAfterStep(step_description):
+    """creates a job runner that fails after the given step (e.g. when the job cannot be cancelled anymore)"""
+    def RunJob(job):
+        def ExecuteStep(step, job):
+            result = step.fct_ptr(job)
+            if step.description == step_description:
+                raise RuntimeError('failed after step "{}"'.format(step_description))
+            return result
+        return job.Run(ExecuteStep)
+    return RunJob
+
+def _ExecuteTestSaveProject(test_case, project_name=None, manager=None):
     if not project_name:
         project_name = Path(test_case._testMethodName)
 
@@ -147,7 +694,8 @@ def _ExecuteTestSaveProject(test_case, project_name=None):
 
     test_case.addCleanup(lambda: DeleteDirectoryIfExisting(project_dir))
 
-    manager = ProjectManager()
+    if not manager:
+        manager = ProjectManager()
 
     test_case.assertTrue(manager.SaveProject(project_name))
 
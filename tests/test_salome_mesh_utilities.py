@@ -15,6 +15,8 @@ import initialize_testing_environment
 import os
 import shutil
 import unittest
+from unittest.mock import patch
+from concurrent.futures import ThreadPoolExecutor
 
 # plugin imports
 from kratos_salome_plugin import salome_utilities
@@ -192,6 +194,25 @@ class TestSalomeMeshUtilities(testing_utilities.SalomeTestCaseWithBox):
         with self.assertRaisesRegex(Exception, 'Object with identifier "0:1:1:1" is not a mesh! Name: "main_box" , Type:'):
             salome_mesh_utilities.DoMeshesBelongToSameMainMesh(identifiers_not_meshes)
 
+    def test_GetMainMeshIdentifier(self):
+        main_mesh_identifier = salome_utilities.GetSalomeID(self.mesh_tetra.GetMesh())
+
+        meshes_of_main_mesh = [
+            self.mesh_tetra.GetMesh(),
+            self.sub_mesh_tetra_f_1,
+            self.sub_mesh_tetra_e_2,
+            self.group_tetra_f1_faces,
+            self.group_tetra_0D_elements
+        ]
+
+        for mesh in meshes_of_main_mesh:
+            self.assertEqual(main_mesh_identifier, salome_mesh_utilities.GetMainMeshIdentifier(salome_utilities.GetSalomeID(mesh)))
+
+        self.assertNotEqual(main_mesh_identifier, salome_mesh_utilities.GetMainMeshIdentifier(salome_utilities.GetSalomeID(self.mesh_hexa.GetMesh())))
+
+        with self.assertRaisesRegex(Exception, 'Object with identifier "0:1:1:1" is not a mesh! Name: "main_box" , Type:'):
+            salome_mesh_utilities.GetMainMeshIdentifier(salome_utilities.GetSalomeID(self.box))
+
     def test_EntityTypeToString(self):
         self.assertEqual("Tetra", salome_mesh_utilities.EntityTypeToString(SMESH.Entity_Tetra))
         self.assertEqual("Quadrangle", salome_mesh_utilities.EntityTypeToString(SMESH.Entity_Quadrangle))
@@ -203,6 +224,99 @@ class TestSalomeMeshUtilities(testing_utilities.SalomeTestCaseWithBox):
         with self.assertRaisesRegex(Exception, 'The requested entity type "WeirdGeometry" is not available!\nOnly the following entity types are available:\n'):
             salome_mesh_utilities.EntityTypeFromString("WeirdGeometry")
 
+    def test_EntityType_round_trip(self):
+        for entity_type in SMESH.EntityType._items:
+            entity_type_str = salome_mesh_utilities.EntityTypeToString(entity_type)
+            self.assertEqual(str(entity_type)[7:], entity_type_str)
+            self.assertEqual(entity_type, salome_mesh_utilities.EntityTypeFromString(entity_type_str))
+
+    def test_GetMeshInformation(self):
+        mesh_info = salome_mesh_utilities.GetMeshInformation(self.group_tetra_0D_elements)
+        self.assertDictEqual({"0D" : 10}, mesh_info)
+        self.assertTrue(salome_mesh_utilities.MeshHasEntitiesOfType(self.group_tetra_0D_elements, "0D"))
+        self.assertFalse(salome_mesh_utilities.MeshHasEntitiesOfType(self.group_tetra_0D_elements, "Tetra"))
+
+    def test_GetMeshInfo_cache(self):
+        mesh_identifier = salome_utilities.GetSalomeID(self.mesh_tetra.GetMesh())
+        self.assertEqual(14, salome_mesh_utilities.GetMeshInfo(mesh_identifier)[SMESH.Entity_0D])
+
+        with salome_mesh_utilities.MeshInfoCache():
+            self.assertEqual(14, salome_mesh_utilities.GetMeshInfo(mesh_identifier)[SMESH.Entity_0D])
+            self.mesh_tetra.Add0DElement(20)
+            self.assertEqual(14, salome_mesh_utilities.GetMeshInfo(mesh_identifier)[SMESH.Entity_0D]) # from the cache
+
+            salome_mesh_utilities.InvalidateMeshInfoCache(mesh_identifier)
+            self.assertEqual(15, salome_mesh_utilities.GetMeshInfo(mesh_identifier)[SMESH.Entity_0D])
+
+            self.mesh_tetra.Add0DElement(21)
+            with salome_mesh_utilities.MeshInfoCache(): # nested, the cache is still used
+                self.assertEqual(15, salome_mesh_utilities.GetMeshInfo(mesh_identifier)[SMESH.Entity_0D])
+            self.assertEqual(15, salome_mesh_utilities.GetMeshInfo(mesh_identifier)[SMESH.Entity_0D])
+
+        # the cache is cleared after leaving it
+        self.assertEqual(16, salome_mesh_utilities.GetMeshInfo(mesh_identifier)[SMESH.Entity_0D])
+
+    def test_GetMeshInfo_cache_threads(self):
+        mesh_identifier = salome_utilities.GetSalomeID(self.mesh_tetra.GetMesh())
+
+        def GetNumber0DElements(_):
+            with salome_mesh_utilities.MeshInfoCache():
+                return salome_mesh_utilities.GetMeshInfo(mesh_identifier)[SMESH.Entity_0D]
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            self.assertListEqual([14]*100, list(executor.map(GetNumber0DElements, range(100))))
+
+        # all threads left the cache, hence it is disabled and empty
+        self.assertEqual(0, salome_mesh_utilities._mesh_info_cache_depth)
+        self.assertDictEqual({}, salome_mesh_utilities._mesh_info_cache)
+
+    def test_GetMeshInfo_cache_invalidated_while_querying(self):
+        mesh_identifier = salome_utilities.GetSalomeID(self.mesh_tetra.GetMesh())
+        smesh_get_mesh_info = salome_mesh_utilities.smesh.GetMeshInfo
+
+        def GetMeshInfo(mesh):
+            mesh_info = smesh_get_mesh_info(mesh)
+            # e.g. another thread modified the mesh while it was queried
+            self.mesh_tetra.Add0DElement(20)
+            salome_mesh_utilities.InvalidateMeshInfoCache(mesh_identifier)
+            return mesh_info
+
+        with salome_mesh_utilities.MeshInfoCache():
+            with patch.object(salome_mesh_utilities.smesh, 'GetMeshInfo', side_effect=GetMeshInfo):
+                self.assertEqual(14, salome_mesh_utilities.GetMeshInfo(mesh_identifier)[SMESH.Entity_0D])
+            # the outdated result was not cached
+            self.assertEqual(15, salome_mesh_utilities.GetMeshInfo(mesh_identifier)[SMESH.Entity_0D])
+
+    def test_GetMeshInformation_cache(self):
+        mesh = self.mesh_tetra.GetMesh()
+        num_0D_elements = salome_mesh_utilities.GetMeshInformation(mesh)["0D"]
+
+        with salome_mesh_utilities.MeshInfoCache():
+            self.assertEqual(num_0D_elements, salome_mesh_utilities.GetMeshInformation(mesh)["0D"])
+            self.mesh_tetra.Add0DElement(20)
+            # all queries use the cache
+            self.assertEqual(num_0D_elements, salome_mesh_utilities.GetMeshInformation(mesh)["0D"])
+            self.assertIn("0D", salome_mesh_utilities.GetEntityTypesInMesh(mesh))
+            self.assertTrue(salome_mesh_utilities.MeshHasEntitiesOfType(mesh, "0D"))
+            with patch.object(salome_mesh_utilities.smesh, 'GetMeshInfo') as patch_get_mesh_info:
+                salome_mesh_utilities.GetEntityTypesInMesh(mesh)
+                salome_mesh_utilities.MeshHasEntitiesOfType(mesh, "0D")
+                self.assertEqual(patch_get_mesh_info.call_count, 0)
+
+        self.assertEqual(num_0D_elements+1, salome_mesh_utilities.GetMeshInformation(mesh)["0D"])
+
+    def test_GetMeshInformation_cache_unpublished_objects(self):
+        mesh = self.mesh_tetra.GetMesh()
+        mesh_info = salome_mesh_utilities.GetMeshInformation(mesh)
+        group_mesh_info = salome_mesh_utilities.GetMeshInformation(self.group_tetra_0D_elements)
+        self.assertNotEqual(mesh_info, group_mesh_info)
+
+        # objects that are not published in the study have no identifier, they must not share the cached information
+        with patch.object(salome_mesh_utilities.salome_utilities, 'GetSalomeID', return_value=""):
+            with salome_mesh_utilities.MeshInfoCache():
+                self.assertDictEqual(mesh_info, salome_mesh_utilities.GetMeshInformation(mesh))
+                self.assertDictEqual(group_mesh_info, salome_mesh_utilities.GetMeshInformation(self.group_tetra_0D_elements))
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -25,6 +25,7 @@ from testing_utilities import SalomeTestCase, SalomeTestCaseWithBox, GetTestsPat
 
 # salome imports
 import salome
+import SMESH
 
 
 class TestSalomeTestCaseStudyCleaning(SalomeTestCase):
@@ -104,6 +105,92 @@ class TestSalomeStudyUtilities(SalomeTestCaseWithBox):
         salome_study_utilities.ResetStudy()
         self.assertEqual(salome_study_utilities.GetNumberOfObjectsInStudy(), 0)
 
+    def test_GetNumberOfObjectsInStudy_max_depth(self):
+        self.assertEqual(salome_study_utilities.GetNumberOfObjectsInStudy(0), 0)
+        num_objs_depth_1 = salome_study_utilities.GetNumberOfObjectsInStudy(1)
+        self.assertGreater(num_objs_depth_1, 0)
+        self.assertLess(num_objs_depth_1, 80)
+        self.assertEqual(salome_study_utilities.GetNumberOfObjectsInStudy(100), 80)
+
+    def test_GetNumberOfObjectsInStudy_cache(self):
+        self.assertEqual(salome_study_utilities.GetNumberOfObjectsInStudy(), 80)
+
+        with patch('salome.myStudy.NewComponentIterator') as patch_fct:
+            # study was not modified, hence the cached result is used
+            self.assertEqual(salome_study_utilities.GetNumberOfObjectsInStudy(), 80)
+            self.assertEqual(patch_fct.call_count, 0)
+
+        self.geompy.addToStudy(self.geompy.MakeBoxDXDYDZ(10, 10, 10), 'box_cache')
+        self.assertEqual(salome_study_utilities.GetNumberOfObjectsInStudy(), 81)
+
+    def test_IsStudyEmpty(self):
+        self.assertFalse(salome_study_utilities.IsStudyEmpty())
+        salome_study_utilities.ResetStudy()
+        self.assertTrue(salome_study_utilities.IsStudyEmpty())
+
+    def test_IterateStudy(self):
+        objs_and_paths = list(salome_study_utilities.IterateStudy())
+        self.assertEqual(len(objs_and_paths), 80)
+        for obj, path in objs_and_paths:
+            self.assertEqual(path, self.study.GetObjectPath(obj))
+
+        self.assertEqual(len(list(salome_study_utilities.IterateStudy(max_depth=0))), 0)
+        self.assertEqual(len(list(salome_study_utilities.IterateStudy(max_depth=100))), 80)
+
+        geom_names = [obj.GetName() for obj, _ in salome_study_utilities.IterateStudy(max_depth=1, component_types=["GEOM"])]
+        self.assertListEqual(geom_names, [self.name_main_box])
+
+        mesh_names = [obj.GetName() for obj, _ in salome_study_utilities.IterateStudy(object_types=SMESH.SMESH_Mesh)]
+        self.assertListEqual(mesh_names, [self.name_main_mesh_tetra, self.name_main_mesh_hexa])
+
+        group_names = [obj.GetName() for obj, _ in salome_study_utilities.IterateStudy(object_types=(SMESH.SMESH_Group, SMESH.SMESH_GroupOnGeom))]
+        self.assertCountEqual(group_names, ["subset_0D_elements", "subset_ball_elements", "face_1_nodes", "face_1_faces"])
+
+        root = salome.myStudy.FindObjectID(salome.ObjectToID(self.mesh_tetra.GetMesh()))
+        self.assertEqual(len(list(salome_study_utilities.IterateStudy(root))), salome_study_utilities.GetNumberOfObjectsInComponent(root))
+
+    def test_StudyIndex(self):
+        index = salome_study_utilities.StudyIndex()
+        self.assertEqual(len(index), 80)
+        self.assertTrue(index.IsUpToDate())
+
+        mesh_entry = salome.ObjectToID(self.mesh_tetra.GetMesh())
+        mesh_path = self.study.GetObjectPath(self.study.FindObjectID(mesh_entry))
+        self.assertEqual(index.GetEntryByPath(mesh_path), mesh_entry)
+        self.assertListEqual(index.GetEntriesByName(self.name_main_mesh_tetra), [mesh_entry])
+        self.assertIsNone(index.GetEntryByPath("/not/existing"))
+        self.assertListEqual(index.GetEntriesByName("not_existing"), [])
+
+        self.assertEqual(len(index.GetEntriesByName("subset_0D_elements")), 1)
+
+        # adding an object modifies the study
+        new_group = self.mesh_tetra.CreateEmptyGroup(SMESH.NODE, "subset_0D_elements")
+        self.assertFalse(index.IsUpToDate())
+
+        # existing paths are still found without rebuilding the index
+        self.assertEqual(index.GetEntryByPath(mesh_path), mesh_entry)
+        self.assertFalse(index.IsUpToDate())
+
+        # names are not unique, now two objects exist
+        self.assertEqual(len(index.GetEntriesByName("subset_0D_elements")), 2)
+        self.assertTrue(index.IsUpToDate())
+        self.assertEqual(len(index), 81)
+
+        salome_study_utilities.ResetStudy()
+        self.assertIsNone(index.GetEntryByPath(mesh_path))
+        self.assertEqual(len(index), 0)
+
+    def test_GetStudyModificationState(self):
+        state = salome_study_utilities.GetStudyModificationState()
+        self.assertEqual(state, salome_study_utilities.GetStudyModificationState())
+
+        self.geompy.addToStudy(self.geompy.MakeBoxDXDYDZ(10, 10, 10), 'box_state')
+        new_state = salome_study_utilities.GetStudyModificationState()
+        self.assertNotEqual(state, new_state)
+
+        salome_study_utilities.ResetStudy()
+        self.assertNotEqual(new_state, salome_study_utilities.GetStudyModificationState())
+
     def test_SaveStudy(self):
         file_path = Path("my_study_saved.hdf")
 
@@ -118,6 +205,23 @@ class TestSalomeStudyUtilities(SalomeTestCaseWithBox):
         self.assertTrue(save_successful)
         self.assertTrue(file_path.is_file())
 
+    def test_SetStudyFilePath(self):
+        file_path = Path("my_study_moved.hdf")
+        salome_study_utilities.SetStudyFilePath(file_path)
+        self.assertEqual(salome_study_utilities.GetStudyFilePath(), file_path)
+
+        salome_study_utilities.SetStudyFilePath(None)
+        self.assertIsNone(salome_study_utilities.GetStudyFilePath())
+
+    def test_SetStudyModified(self):
+        file_path = Path("my_study_set_modified.hdf")
+        self.addCleanup(lambda: DeleteFileIfExisting(file_path))
+        self.assertTrue(salome_study_utilities.SaveStudy(file_path))
+        self.assertFalse(salome_study_utilities.IsStudyModified())
+
+        salome_study_utilities.SetStudyModified()
+        self.assertTrue(salome_study_utilities.IsStudyModified())
+
     def test_SaveStudy_empty_input(self):
         with self.assertRaisesRegex(NameError, 'Path cannot be empty!'):
             salome_study_utilities.SaveStudy(Path())
@@ -289,8 +393,8 @@ class TestSalomeStudyUtilities(SalomeTestCaseWithBox):
 
     @patch('salome.myStudy.Open', return_value=True)
     @patch('kratos_salome_plugin.salome_study_utilities.IsStudyModified', return_value=False)
-    @patch('kratos_salome_plugin.salome_study_utilities.GetNumberOfObjectsInStudy', return_value=0)
-    def test_OpenStudy_warning_logs_wrong_suffix(self, mock_num_objs_study, mock_is_modified, mock_open_study):
+    @patch('kratos_salome_plugin.salome_study_utilities.IsStudyEmpty', return_value=True)
+    def test_OpenStudy_warning_logs_wrong_suffix(self, mock_is_study_empty, mock_is_modified, mock_open_study):
         file_path = Path("without_suffix")
         self.addCleanup(lambda: DeleteFileIfExisting(file_path))
         file_path.touch()
@@ -302,8 +406,8 @@ class TestSalomeStudyUtilities(SalomeTestCaseWithBox):
 
     @patch('salome.myStudy.Open', return_value=True)
     @patch('kratos_salome_plugin.salome_study_utilities.IsStudyModified', return_value=True)
-    @patch('kratos_salome_plugin.salome_study_utilities.GetNumberOfObjectsInStudy', return_value=3)
-    def test_OpenStudy_warning_logs_modified_study(self, mock_num_objs_study, mock_is_modified, mock_open_study):
+    @patch('kratos_salome_plugin.salome_study_utilities.IsStudyEmpty', return_value=False)
+    def test_OpenStudy_warning_logs_modified_study(self, mock_is_study_empty, mock_is_modified, mock_open_study):
         file_path = Path("my_study_file.hdf")
         self.addCleanup(lambda: DeleteFileIfExisting(file_path))
         file_path.touch()
@@ -315,8 +419,8 @@ class TestSalomeStudyUtilities(SalomeTestCaseWithBox):
 
     @patch('salome.myStudy.Open', return_value=True)
     @patch('kratos_salome_plugin.salome_study_utilities.IsStudyModified', return_value=True)
-    @patch('kratos_salome_plugin.salome_study_utilities.GetNumberOfObjectsInStudy', return_value=0)
-    def test_OpenStudy_warning_logs_modified_but_empty_study(self, mock_num_objs_study, mock_is_modified, mock_open_study):
+    @patch('kratos_salome_plugin.salome_study_utilities.IsStudyEmpty', return_value=True)
+    def test_OpenStudy_warning_logs_modified_but_empty_study(self, mock_is_study_empty, mock_is_modified, mock_open_study):
         # if the study is modified but empty it should not give the warning
         file_path = Path("my_empty_study_file.hdf")
         self.addCleanup(lambda: DeleteFileIfExisting(file_path))
@@ -363,9 +467,9 @@ class TestSalomeStudyUtilities(SalomeTestCaseWithBox):
             self.assertEqual(cm.output[1], 'CRITICAL:kratos_salome_plugin.salome_study_utilities:Study could not be opened from path: "{}"'.format(file_path))
 
     def test_ResetStudy(self):
-        self.assertGreater(salome_study_utilities.GetNumberOfObjectsInStudy(), 0)
+        self.assertFalse(salome_study_utilities.IsStudyEmpty())
         salome_study_utilities.ResetStudy()
-        self.assertEqual(salome_study_utilities.GetNumberOfObjectsInStudy(), 0)
+        self.assertTrue(salome_study_utilities.IsStudyEmpty())
 
     def test_IsStudyModified(self):
         # the test-study was never saved hence it should be modified
@@ -257,6 +257,23 @@ class TestWriteMdpa(unittest.TestCase):
 
         CompareMdpaWithReferenceFile(file_name, self)
 
+    def test_WriteMdpa_buffer_size(self):
+        mp = CreateFullModelPart()
+        additional_header_info = "The very cool model"
+        file_name = "full_model_part.mdpa"
+        write_mdpa.WriteMdpa(mp, file_name, additional_header_info, buffer_size=1024**2)
+
+        CompareMdpaWithReferenceFile(file_name, self)
+
+    def test_WriteMdpa_chunks(self):
+        mp = CreateFullModelPart()
+        additional_header_info = "The very cool model"
+        file_name = "full_model_part.mdpa"
+        for chunk_size in [1, 2, 1000]: # also chunks that are larger than the number of entities
+            write_mdpa.WriteMdpa(mp, file_name, additional_header_info, chunk_size=chunk_size)
+
+            CompareMdpaWithReferenceFile(file_name, self)
+
 
 def CreateFullModelPart():
     # just creating a full ModelPart for testing
@@ -22,7 +22,7 @@ from shutil import rmtree
 
 # plugin imports
 from kratos_salome_plugin import IsExecutedInSalome
-from kratos_salome_plugin.salome_study_utilities import ResetStudy, GetNumberOfObjectsInStudy
+from kratos_salome_plugin.salome_study_utilities import ResetStudy, IsStudyEmpty
 
 # salome imports
 import salome
@@ -54,6 +54,18 @@ def CheckIfKratosAvailable():
         except:
             return False
 
+def CheckIfNumpyAvailable():
+    if "NUMPY_AVAILABLE" in os.environ:
+        # this is intended to be used in the CI
+        # there "try-except" might lead to an undiscovered failure
+        return (os.environ["NUMPY_AVAILABLE"] == "1")
+    else:
+        try:
+            import numpy
+            return True
+        except:
+            return False
+
 def CheckIfApplicationsAvailable(*application_names):
     raise Exception("This function is untested!")
     if not CheckIfKratosAvailable():
@@ -104,7 +116,7 @@ class SalomeTestCase(unittest.TestCase):
         # This is much faster than re-launching salome for each test
         self.study = salome.myStudy
         ResetStudy()
-        self.assertEqual(GetNumberOfObjectsInStudy(), 0, msg="Resetting the study failed!")
+        self.assertTrue(IsStudyEmpty(), msg="Resetting the study failed!")
 
         self.geompy = geomBuilder.New()
         self.smesh = smeshBuilder.New()